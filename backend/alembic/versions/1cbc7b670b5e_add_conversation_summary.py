@@ -0,0 +1,34 @@
+"""Add conversation summary
+
+Revision ID: 1cbc7b670b5e
+Revises: e1eecc76ebe4
+Create Date: 2026-10-17 16:05:12.640918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1cbc7b670b5e'
+down_revision: Union[str, Sequence[str], None] = 'e1eecc76ebe4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('conversations', sa.Column('summary', sa.Text(), nullable=True))
+    op.add_column('conversations', sa.Column('summary_token_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('conversations', sa.Column('summarized_until', sa.DateTime(), nullable=True))
+    op.add_column('conversations', sa.Column('summarized_through_id', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('conversations', 'summarized_through_id')
+    op.drop_column('conversations', 'summarized_until')
+    op.drop_column('conversations', 'summary_token_count')
+    op.drop_column('conversations', 'summary')
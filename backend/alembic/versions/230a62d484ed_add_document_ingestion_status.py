@@ -0,0 +1,43 @@
+"""Add document ingestion status
+
+Revision ID: 230a62d484ed
+Revises: 40251d739481
+Create Date: 2026-10-17 17:20:41.518203
+
+Documents are now ingested by a background worker; status/progress/error
+are what clients poll. Existing rows were ingested inside the upload
+request, so they start out as READY.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '230a62d484ed'
+down_revision: Union[str, Sequence[str], None] = '40251d739481'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+document_status = sa.Enum('PENDING', 'PROCESSING', 'READY', 'FAILED', name='documentstatus')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # add_column does not create the Postgres enum type by itself
+    document_status.create(op.get_bind(), checkfirst=True)
+    op.add_column('documents', sa.Column('status', document_status, nullable=False, server_default='READY'))
+    op.add_column('documents', sa.Column('progress', sa.Integer(), nullable=False, server_default='100'))
+    op.add_column('documents', sa.Column('error', sa.Text(), nullable=True))
+    op.add_column('documents', sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('documents', 'attempts')
+    op.drop_column('documents', 'error')
+    op.drop_column('documents', 'progress')
+    op.drop_column('documents', 'status')
+    document_status.drop(op.get_bind(), checkfirst=True)
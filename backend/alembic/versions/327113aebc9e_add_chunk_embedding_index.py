@@ -0,0 +1,43 @@
+"""Add chunk embedding vector index
+
+Revision ID: 327113aebc9e
+Revises: 501da2c14bd2
+Create Date: 2026-10-17 11:26:52.908114
+
+The index type and build parameters come from Settings
+(VECTOR_INDEX_TYPE, HNSW_M, HNSW_EF_CONSTRUCTION, IVFFLAT_LISTS).
+To change them later on a live database, use
+`python -m app.admin reindex-vectors`, which rebuilds concurrently.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db import vector_index
+
+
+# revision identifiers, used by Alembic.
+revision: str = '327113aebc9e'
+down_revision: Union[str, Sequence[str], None] = '501da2c14bd2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # pgvector indexes only exist on Postgres
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute(vector_index.create_index_sql(halfvec=False))  # embedding_half comes later
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for name in vector_index.INDEX_NAMES.values():
+        op.execute(f'DROP INDEX IF EXISTS {name}')
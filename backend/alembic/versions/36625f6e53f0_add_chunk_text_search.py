@@ -0,0 +1,53 @@
+"""Add chunk full-text search column
+
+Revision ID: 36625f6e53f0
+Revises: 327113aebc9e
+Create Date: 2026-10-17 14:02:11.417530
+
+search_vector is a generated column, so Postgres keeps it in sync with
+document_chunks.text on every insert (including COPY) and update. It is
+not mapped on the DocumentChunk model; the keyword retriever references
+it by name.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = '36625f6e53f0'
+down_revision: Union[str, Sequence[str], None] = '327113aebc9e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # tsvector / GIN only exist on Postgres
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute(
+        "ALTER TABLE document_chunks ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS (to_tsvector('{settings.TEXT_SEARCH_CONFIG}', text)) STORED"
+    )
+    op.create_index(
+        'ix_document_chunks_search_vector',
+        'document_chunks',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.drop_index('ix_document_chunks_search_vector', table_name='document_chunks')
+    op.drop_column('document_chunks', 'search_vector')
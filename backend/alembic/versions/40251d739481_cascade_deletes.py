@@ -0,0 +1,54 @@
+"""Cascade deletes to messages and chunks
+
+Revision ID: 40251d739481
+Revises: 1cbc7b670b5e
+Create Date: 2026-10-17 16:48:03.271954
+
+Deleting a conversation or document lets the database remove its
+messages / chunks (ON DELETE CASCADE) instead of the ORM loading and
+deleting every row. documents.deleted_at marks documents whose chunks are
+being removed by the background purge job.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '40251d739481'
+down_revision: Union[str, Sequence[str], None] = '1cbc7b670b5e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, referenced table); constraint names are Postgres defaults
+FOREIGN_KEYS = [
+    ('messages', 'conversation_id', 'conversations'),
+    ('document_chunks', 'document_id', 'documents'),
+]
+
+
+def _replace_foreign_keys(ondelete: Union[str, None]) -> None:
+    for table, column, referent in FOREIGN_KEYS:
+        name = f'{table}_{column}_fkey'
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, referent, [column], ['id'], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('documents', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+
+    # SQLite cannot alter constraints; development databases created with
+    # create_all already get the CASCADE from the models
+    if op.get_bind().dialect.name == 'postgresql':
+        _replace_foreign_keys('CASCADE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        _replace_foreign_keys(None)
+
+    op.drop_column('documents', 'deleted_at')
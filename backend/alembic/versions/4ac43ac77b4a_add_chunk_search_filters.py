@@ -0,0 +1,72 @@
+"""Add chunk owner and doc_type search filters
+
+Revision ID: 4ac43ac77b4a
+Revises: 9c3ae77362b2
+Create Date: 2026-10-17 19:52:37.184406
+
+Copies each document's owner_id and doc_type onto its chunks so vector
+and keyword searches filter chunks directly, adds a btree on
+(owner_id, doc_type) and, on Postgres, one partial vector index per
+DocumentType (VECTOR_INDEX_PER_DOC_TYPE). On a large live table the
+partial indexes can instead be built later, without blocking writes,
+with `python -m app.admin reindex-vectors`.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.db import vector_index
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4ac43ac77b4a'
+down_revision: Union[str, Sequence[str], None] = '9c3ae77362b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    is_postgres = op.get_bind().dialect.name == 'postgresql'
+    doc_type = (
+        postgresql.ENUM('ACADEMIC', 'COURSE', 'CODE', 'OTHER', name='documenttype', create_type=False)
+        if is_postgres else sa.Enum('ACADEMIC', 'COURSE', 'CODE', 'OTHER', name='documenttype')
+    )
+    op.add_column('document_chunks', sa.Column('owner_id', sa.Integer(), nullable=True))
+    op.add_column('document_chunks', sa.Column('doc_type', doc_type, nullable=True))
+
+    if is_postgres:
+        op.execute(
+            "UPDATE document_chunks AS c SET owner_id = d.owner_id, doc_type = d.doc_type "
+            "FROM documents AS d WHERE d.id = c.document_id"
+        )
+    else:
+        op.execute(
+            "UPDATE document_chunks SET "
+            "owner_id = (SELECT owner_id FROM documents WHERE documents.id = document_chunks.document_id), "
+            "doc_type = (SELECT doc_type FROM documents WHERE documents.id = document_chunks.document_id)"
+        )
+
+    with op.batch_alter_table('document_chunks') as batch_op:
+        batch_op.alter_column('owner_id', existing_type=sa.Integer(), nullable=False)
+    op.create_index('ix_document_chunks_owner_id_doc_type', 'document_chunks', ['owner_id', 'doc_type'])
+
+    # pgvector indexes only exist on Postgres
+    if is_postgres:
+        for doc_type in vector_index.indexed_doc_types()[1:]:
+            op.execute(vector_index.create_index_sql(doc_type=doc_type, halfvec=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        for index_type in vector_index.INDEX_NAMES:
+            for statement in vector_index.drop_statements(index_type, concurrently=False)[1:]:
+                op.execute(statement)
+
+    op.drop_index('ix_document_chunks_owner_id_doc_type', table_name='document_chunks')
+    op.drop_column('document_chunks', 'doc_type')
+    op.drop_column('document_chunks', 'owner_id')
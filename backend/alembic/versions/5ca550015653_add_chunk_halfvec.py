@@ -0,0 +1,59 @@
+"""Add chunk halfvec embedding copy
+
+Revision ID: 5ca550015653
+Revises: 4ac43ac77b4a
+Create Date: 2026-10-17 20:38:04.615920
+
+embedding_half is a generated column holding the embedding as halfvec
+(float16, pgvector 0.7+). Adding it rewrites the table once, which fills
+it in for every existing chunk. After that Postgres keeps it in sync on
+every insert (including COPY). Like search_vector it is not mapped on
+the DocumentChunk model.
+
+Its vector indexes are only built here when VECTOR_INDEX_HALFVEC is set.
+To switch later, set it and run
+`python -m app.admin reindex-vectors --drop-other`.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+from app.db import vector_index
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5ca550015653'
+down_revision: Union[str, Sequence[str], None] = '4ac43ac77b4a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # halfvec only exists on Postgres
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    dim = int(settings.EMBEDDING_DIM)
+    op.execute(
+        f"ALTER TABLE document_chunks ADD COLUMN {vector_index.HALF_COLUMN} halfvec({dim}) "
+        f"GENERATED ALWAYS AS (embedding::halfvec({dim})) STORED"
+    )
+
+    if settings.VECTOR_INDEX_HALFVEC:
+        for doc_type in vector_index.indexed_doc_types():
+            op.execute(vector_index.create_index_sql(doc_type=doc_type, halfvec=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for index_type in vector_index.INDEX_NAMES:
+        for statement in vector_index.drop_statements(index_type, concurrently=False, halfvec=True):
+            op.execute(statement)
+    op.drop_column('document_chunks', vector_index.HALF_COLUMN)
@@ -0,0 +1,41 @@
+"""Add document and chunk content hashes
+
+Revision ID: 82ddcfaf06d3
+Revises: 230a62d484ed
+Create Date: 2026-10-17 17:58:26.904117
+
+Re-uploads diff chunks by content_hash and only embed new ones. Existing
+chunk hashes are backfilled on Postgres (sha256() needs PostgreSQL 11+);
+elsewhere, and for documents (whose files are not read here), they stay
+NULL until the next upload.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '82ddcfaf06d3'
+down_revision: Union[str, Sequence[str], None] = '230a62d484ed'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('documents', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.add_column('document_chunks', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(
+            "UPDATE document_chunks "
+            "SET content_hash = encode(sha256(convert_to(text, 'UTF8')), 'hex')"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('document_chunks', 'content_hash')
+    op.drop_column('documents', 'content_hash')
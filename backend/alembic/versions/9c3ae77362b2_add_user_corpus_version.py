@@ -0,0 +1,31 @@
+"""Add user corpus version
+
+Revision ID: 9c3ae77362b2
+Revises: 82ddcfaf06d3
+Create Date: 2026-10-17 18:41:09.377512
+
+Bumped on every change to a user's documents; the semantic answer cache
+keys entries by it.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c3ae77362b2'
+down_revision: Union[str, Sequence[str], None] = '82ddcfaf06d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('corpus_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'corpus_version')
@@ -0,0 +1,32 @@
+"""Add messages history index
+
+Revision ID: e1eecc76ebe4
+Revises: 36625f6e53f0
+Create Date: 2026-10-17 15:20:37.184562
+
+Serves keyset pagination of a conversation's history:
+WHERE conversation_id = ? AND (created_at, id) < (?, ?)
+ORDER BY created_at DESC, id DESC LIMIT ?
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1eecc76ebe4'
+down_revision: Union[str, Sequence[str], None] = '36625f6e53f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_messages_conversation_id_created_at_id', 'messages', ['conversation_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_messages_conversation_id_created_at_id', table_name='messages')
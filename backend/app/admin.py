@@ -0,0 +1,89 @@
+"""
+Admin commands.
+
+Usage (from backend/):
+    python -m app.admin reindex-vectors [--type hnsw|ivfflat] [--drop-other]
+    python -m app.admin purge-deleted
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from sqlalchemy import select, text
+
+from app.core.config import settings
+from app.db import vector_index
+from app.db.session import AsyncSessionLocal, async_engine, engine
+from app.models.document import Document
+from app.services.deletion import purge_document
+
+
+def reindex_vectors(index_type: str, drop_other: bool = False) -> None:
+    """
+    Rebuild the chunk embedding index with the current Settings.
+
+    Uses CREATE/DROP INDEX CONCURRENTLY, so searches and ingestion keep
+    running while the new index is built. The per-doc_type partial
+    indexes are rebuilt too (VECTOR_INDEX_PER_DOC_TYPE), on embedding_half
+    when VECTOR_INDEX_HALFVEC is set. --drop-other drops the indexes of
+    the other index type and of the other column.
+    """
+    if engine.dialect.name != "postgresql":
+        sys.exit("Vector indexes require PostgreSQL with pgvector")
+
+    # CONCURRENTLY cannot run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        started = time.perf_counter()
+        for statement in vector_index.rebuild_statements(index_type):
+            print(statement)
+            conn.execute(text(statement))
+
+        if drop_other:
+            current = (index_type, settings.VECTOR_INDEX_HALFVEC)
+            for other in vector_index.INDEX_NAMES:
+                for halfvec in (False, True):
+                    if (other, halfvec) != current:
+                        for statement in vector_index.drop_statements(other, halfvec=halfvec):
+                            print(statement)
+                            conn.execute(text(statement))
+
+    print(f"Rebuilt {vector_index.index_name(index_type)} in {time.perf_counter() - started:.1f}s")
+
+
+async def purge_deleted() -> None:
+    """
+    Finish deleting documents whose background purge was interrupted
+    (e.g. by a restart between the DELETE request and the purge job).
+    """
+    async with AsyncSessionLocal() as db:
+        document_ids = (await db.execute(
+            select(Document.id).where(Document.deleted_at.is_not(None))
+        )).scalars().all()
+
+    for document_id in document_ids:
+        chunks = await purge_document(document_id)
+        print(f"Purged document {document_id} ({chunks} chunks)")
+
+    await async_engine.dispose()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.admin", description="Admin commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    reindex = commands.add_parser("reindex-vectors", help="Rebuild the chunk embedding index concurrently")
+    reindex.add_argument("--type", choices=sorted(vector_index.INDEX_NAMES), default=settings.VECTOR_INDEX_TYPE)
+    reindex.add_argument("--drop-other", action="store_true", help="Drop the indexes of the other type and column")
+
+    commands.add_parser("purge-deleted", help="Finish interrupted background document deletes")
+
+    args = parser.parse_args(argv)
+    if args.command == "reindex-vectors":
+        reindex_vectors(args.type, drop_other=args.drop_other)
+    elif args.command == "purge-deleted":
+        asyncio.run(purge_deleted())
+
+
+if __name__ == "__main__":
+    main()
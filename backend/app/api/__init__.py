@@ -1,3 +1,3 @@
-"""
-API package.
+"""
+API package.
 """
\ No newline at end of file
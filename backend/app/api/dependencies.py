@@ -1,82 +1,98 @@
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.core.security import decode_access_token
-from app.models.user import User
-
-# HTTPBearer scheme - simpler than OAuth2PasswordBearer
-# This creates a simple "Bearer Token" input in Swagger UI
-security = HTTPBearer()
-
-
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """
-    Dependency to get the current authenticated user.
-    
-    Extracts and validates JWT token from Authorization header.
-    
-    Usage in endpoints:
-        @app.get("/profile")
-        def get_profile(current_user: User = Depends(get_current_user)):
-            return current_user
-    
-    Args:
-        credentials: HTTP credentials with bearer token
-        db: Database session
-        
-    Returns:
-        User object if token is valid
-        
-    Raises:
-        HTTPException: If token is invalid or user not found
-    """
-    # Define exception for invalid credentials
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    
-    # Extract token from credentials
-    token = credentials.credentials
-    
-    # Decode token to get email
-    email = decode_access_token(token)
-    
-    if email is None:
-        raise credentials_exception
-    
-    # Fetch user from database
-    user = db.query(User).filter(User.email == email).first()
-    
-    if user is None:
-        raise credentials_exception
-    
-    if not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Inactive user"
-        )
-    
-    return user
-
-
-def get_current_active_superuser(
-    current_user: User = Depends(get_current_user)
-) -> User:
-    """
-    Dependency to require superuser privileges.
-    
-    Use this for admin-only endpoints.
-    """
-    if not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough privileges"
-        )
-    
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db
+from app.core.config import settings
+from app.core.security import decode_access_token_payload
+from app.models.user import User
+from app.services.principal_cache import Principal, principal_cache
+
+# HTTPBearer scheme - simpler than OAuth2PasswordBearer
+# This creates a simple "Bearer Token" input in Swagger UI
+security = HTTPBearer()
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    """
+    Dependency to get the current authenticated user.
+    
+    Extracts and validates JWT token from Authorization header.
+    The user snapshot is served from the principal cache when possible,
+    so most authenticated requests make no database round-trip.
+    
+    Usage in endpoints:
+        @app.get("/profile")
+        async def get_profile(current_user: Principal = Depends(get_current_user)):
+            return current_user
+    
+    Args:
+        credentials: HTTP credentials with bearer token
+        db: Database session
+        
+    Returns:
+        Principal snapshot of the user if token is valid
+        
+    Raises:
+        HTTPException: If token is invalid or user not found
+    """
+    # Define exception for invalid credentials
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    
+    # Extract token from credentials
+    token = credentials.credentials
+    
+    # Serve from cache (cached entries never outlive the token)
+    user = None
+    if settings.PRINCIPAL_CACHE_ENABLED:
+        user = await principal_cache.get(token)
+    
+    if user is None:
+        # Decode token to get email
+        payload = decode_access_token_payload(token)
+        
+        if payload is None:
+            raise credentials_exception
+        
+        # Fetch user from database
+        result = await db.execute(select(User).where(User.email == payload["sub"]))
+        db_user = result.scalars().first()
+        
+        if db_user is None:
+            raise credentials_exception
+        
+        user = Principal.from_user(db_user)
+        if settings.PRINCIPAL_CACHE_ENABLED:
+            await principal_cache.set(token, user, expires_at=payload["exp"])
+    
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Inactive user"
+        )
+    
+    return user
+
+
+async def get_current_active_superuser(
+    current_user: Principal = Depends(get_current_user)
+) -> Principal:
+    """
+    Dependency to require superuser privileges.
+    
+    Use this for admin-only endpoints.
+    """
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough privileges"
+        )
+    
     return current_user
\ No newline at end of file
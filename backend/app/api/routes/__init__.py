@@ -1,3 +1,3 @@
-"""
-API routes package.
+"""
+API routes package.
 """
\ No newline at end of file
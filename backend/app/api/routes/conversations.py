@@ -0,0 +1,250 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.background import BackgroundTasks
+from app.core.config import settings
+from app.db.session import get_async_db
+from app.models.conversation import Conversation
+from app.schemas.conversation import ConversationCreate, ConversationResponse
+from app.schemas.message import ChatRequest, MessagePage
+from app.api.dependencies import get_current_user
+from app.services.answer_cache import answer_cache
+from app.services.chat import (
+    ChatTurn, build_messages, cache_turn, embed_question, persist_turn, prompt_token_count,
+    retrieve_context, source_list, stream_cached, stream_chat
+)
+from app.services.context import pack_context
+from app.services.corpus import corpus_version
+from app.services.history import InvalidCursor, fetch_message_page
+from app.services.llm import get_llm_backend
+from app.services.memory import conversation_memory
+from app.services.principal_cache import Principal
+from app.services.single_flight import llm_flight, retrieval_flight
+
+router = APIRouter(prefix="/conversations", tags=["conversations"])
+
+
+async def get_owned_conversation(db: AsyncSession, conversation_id: int, user_id: int) -> Conversation:
+    """Load a conversation belonging to the user, or raise 404."""
+    conversation = await db.get(Conversation, conversation_id)
+    if conversation is None or conversation.user_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Conversation not found"
+        )
+    return conversation
+
+
+@router.post("", response_model=ConversationResponse, status_code=status.HTTP_201_CREATED)
+async def create_conversation(
+    conversation_in: ConversationCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Start a new conversation.
+    
+    **This is a protected endpoint** - requires authentication.
+    
+    The default title is replaced by the first question once it is answered.
+    """
+    conversation = Conversation(title=conversation_in.title, user_id=current_user.id)
+    db.add(conversation)
+    await db.commit()
+    await db.refresh(conversation)
+    
+    return conversation
+
+
+@router.get("", response_model=List[ConversationResponse])
+async def list_conversations(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    List the current user's conversations, most recently active first.
+    """
+    result = await db.execute(
+        select(Conversation)
+        .where(Conversation.user_id == current_user.id)
+        .order_by(Conversation.updated_at.desc())
+    )
+    return result.scalars().all()
+
+
+@router.get("/{conversation_id}", response_model=ConversationResponse)
+async def get_conversation(
+    conversation_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Get one of the current user's conversations.
+    
+    **Errors:**
+    - 404: Conversation not found (or owned by someone else)
+    """
+    return await get_owned_conversation(db, conversation_id, current_user.id)
+
+
+@router.delete("/{conversation_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_conversation(
+    conversation_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Delete one of the current user's conversations and all its messages.
+    
+    **This is a protected endpoint** - requires authentication.
+    
+    Issued as a single DELETE; the database removes the messages through
+    ON DELETE CASCADE, so they are never loaded into the API.
+    
+    **Errors:**
+    - 404: Conversation not found (or owned by someone else)
+    """
+    await get_owned_conversation(db, conversation_id, current_user.id)
+    await db.execute(
+        delete(Conversation).where(Conversation.id == conversation_id),
+        execution_options={"synchronize_session": False}
+    )
+    await db.commit()
+    
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get("/{conversation_id}/messages", response_model=MessagePage)
+async def list_messages(
+    conversation_id: int,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Page through a conversation's messages, newest page first.
+    
+    **This is a protected endpoint** - requires authentication.
+    
+    Each page lists its messages oldest first (ready to render). To load
+    older messages, pass the page's `next_cursor` as `cursor`; it is null
+    on the oldest page. Cursor pagination keeps every page equally fast,
+    however far back the user scrolls.
+    
+    **Errors:**
+    - 400: Invalid cursor
+    - 404: Conversation not found (or owned by someone else)
+    """
+    await get_owned_conversation(db, conversation_id, current_user.id)
+    
+    try:
+        messages, next_cursor = await fetch_message_page(db, conversation_id, limit, cursor)
+    except InvalidCursor:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    
+    return MessagePage(items=messages, next_cursor=next_cursor)
+
+
+@router.post("/{conversation_id}/chat")
+async def chat(
+    conversation_id: int,
+    chat_in: ChatRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Ask a question and stream the answer as Server-Sent Events.
+    
+    **This is a protected endpoint** - requires authentication.
+    
+    Relevant chunks of the user's documents are retrieved first, then the
+    answer is streamed fragment by fragment as the model produces it.
+    
+    **Events:**
+```
+    event: sources
+    data: [{"index": 1, "document_id": 4, "chunk_id": 120, "page": 2, "score": 0.83}]
+
+    event: token
+    data: {"text": "Gradient "}
+
+    event: done
+    data: {"token_count": 42}
+```
+    An `error` event replaces `done` if the model fails mid-answer.
+    
+    Identical questions asked at the same moment share one retrieval and
+    one model stream; every asker receives all of its tokens.
+    
+    The first question of a conversation may be answered from the semantic
+    answer cache when an earlier question over the same documents was
+    close enough; `done` then has `"cached": true`.
+    
+    The prompt carries the conversation's rolling summary plus the newest
+    messages that fit MEMORY_TOKEN_BUDGET. Retrieved chunks are merged with
+    their neighbours, de-duplicated and packed into CHAT_CONTEXT_TOKEN_BUDGET.
+    
+    The question and the answer (with its sources and token count) are
+    saved after the stream ends, so they show up in the history once the
+    `done` event has been received.
+    
+    **Errors:**
+    - 404: Conversation not found (or owned by someone else)
+    """
+    conversation = await get_owned_conversation(db, conversation_id, current_user.id)
+    memory = await conversation_memory.window(db, conversation)
+    embedding = await embed_question(chat_in.content)
+    background = BackgroundTasks()
+    
+    # Only standalone questions are cacheable: a follow-up's answer depends on the conversation
+    scope = None
+    if settings.ANSWER_CACHE_ENABLED and embedding is not None and not memory.messages and not memory.summary:
+        doc_type = chat_in.doc_type.value if chat_in.doc_type else None
+        scope = answer_cache.scope_key(current_user.id, doc_type, await corpus_version(db, current_user.id))
+        cached = answer_cache.lookup(scope, embedding)
+        if cached is not None:
+            entry, similarity = cached
+            turn = ChatTurn(conversation_id=conversation_id, question=chat_in.content,
+                            sources=entry.sources, cached=True)
+            background.add_task(persist_turn, turn)
+            return event_stream(stream_cached(turn, entry, similarity), background)
+    
+    coalesce = settings.SINGLE_FLIGHT_ENABLED
+    candidates = await retrieve_context(
+        current_user.id, chat_in.content, chat_in.doc_type,
+        embedding=embedding, flight=retrieval_flight if coalesce else None
+    )
+    context = pack_context(candidates)
+    messages = build_messages(chat_in.content, context.chunks, memory, context_tokens=context.token_count)
+    turn = ChatTurn(
+        conversation_id=conversation_id,
+        question=chat_in.content,
+        sources=source_list(context.chunks),
+        cache_scope=scope,
+        embedding=embedding,
+        prompt_tokens=prompt_token_count(chat_in.content, context, memory)
+    )
+    
+    background.add_task(persist_turn, turn)
+    background.add_task(cache_turn, turn)
+    flight = llm_flight if coalesce else None
+    return event_stream(stream_chat(turn, get_llm_backend(), messages, flight), background)
+
+
+def event_stream(events, background: BackgroundTasks) -> StreamingResponse:
+    """Server-Sent Events response; `background` runs after the last event."""
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # Stop nginx from buffering the stream
+        },
+        background=background
+    )
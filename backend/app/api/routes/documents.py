@@ -0,0 +1,362 @@
+import os
+import uuid
+from typing import List, Optional
+from datetime import datetime
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.db.session import get_async_db
+from app.models.document import Document, DocumentStatus, DocumentType
+from app.schemas.document import DocumentResponse, DocumentStatusResponse
+from app.api.dependencies import get_current_user
+from app.services.corpus import bump_corpus_version
+from app.services.deletion import purge_document
+from app.services.embeddings import get_embedding_provider
+from app.services.ingestion import apply_chunk_diff, chunk_file, diff_chunks, ingest_document, version_snapshot
+from app.services.jobs import get_job_queue, ingest_job
+from app.services.parsing import SUPPORTED_FILE_TYPES
+from app.services.principal_cache import Principal
+from app.services.retrieval.inprocess import index_document, reindex_document
+from app.services.retrieval.numpy_index import numpy_store
+from app.services.storage import UploadTooLarge, remove_file, save_stream, upload_path
+
+router = APIRouter(prefix="/documents", tags=["documents"])
+
+# A document in one of these states has an ingestion queued or running
+BUSY_STATUSES = (DocumentStatus.PENDING, DocumentStatus.PROCESSING)
+
+
+async def get_owned_document(db: AsyncSession, document_id: int, owner_id: int) -> Document:
+    """Load a document belonging to the user, or raise 404."""
+    document = await db.get(Document, document_id)
+    if document is None or document.owner_id != owner_id or document.deleted_at is not None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found"
+        )
+    return document
+
+
+@router.post("", response_model=DocumentResponse, status_code=status.HTTP_201_CREATED)
+async def upload_document(
+    request: Request,
+    response: Response,
+    filename: str = Query(..., description="Original file name, e.g. lecture1.pdf"),
+    title: Optional[str] = Query(None, description="Defaults to the file name"),
+    description: Optional[str] = Query(None),
+    doc_type: DocumentType = Query(DocumentType.OTHER),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Upload a document (PDF, DOCX, Markdown, text or code).
+    
+    **This is a protected endpoint** - requires authentication.
+    
+    The request body is the raw file (`Content-Type: application/octet-stream`),
+    not multipart form data. It is streamed to storage in fixed-size blocks,
+    so large files never sit in memory.
+    
+    **Example:**
+```
+    curl -X POST "http://localhost:8000/documents?filename=lecture1.pdf&doc_type=course" \\
+         -H "Authorization: Bearer <token>" \\
+         -H "Content-Type: application/octet-stream" \\
+         --data-binary @lecture1.pdf
+```
+    
+    **Errors:**
+    - 413: File larger than MAX_UPLOAD_BYTES
+    - 415: Unsupported file type
+    - 422: File could not be parsed (only when INGEST_ASYNC is off)
+    
+    With INGEST_ASYNC (the default) the file is only stored and queued:
+    the response is 202 with `status: "pending"`, and
+    `GET /documents/{id}/status` reports progress until it is `ready`
+    (or `failed`, with the error).
+    """
+    file_type = os.path.splitext(filename)[1].lower()
+    if file_type not in SUPPORTED_FILE_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Unsupported file type '{file_type}'"
+        )
+    
+    # Stream the body to disk (never buffer the whole file)
+    dest = upload_path(current_user.id, f"{uuid.uuid4().hex}{file_type}")
+    try:
+        stored = await save_stream(request.stream(), dest)
+    except UploadTooLarge:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="File too large"
+        )
+    
+    document = Document(
+        title=title or filename,
+        description=description,
+        file_path=stored.path,
+        file_type=file_type,
+        doc_type=doc_type,
+        size_bytes=stored.size_bytes,
+        content_hash=stored.sha256,
+        owner_id=current_user.id
+    )
+    
+    if settings.INGEST_ASYNC:
+        document.status = DocumentStatus.PENDING
+        document.progress = 0
+        document.chunk_count = 0
+        db.add(document)
+        await db.commit()
+        await db.refresh(document)
+        await get_job_queue().enqueue(ingest_job(document.id, current_user.id))
+        response.status_code = status.HTTP_202_ACCEPTED
+        return document
+    
+    try:
+        await ingest_document(db, document, embedder=get_embedding_provider())
+        await bump_corpus_version(db, current_user.id)
+    except Exception:
+        await db.rollback()
+        await remove_file(stored.path)
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Could not parse document"
+        )
+    
+    await db.commit()
+    await db.refresh(document)
+    
+    # The in-process index lives outside the database; add the new vectors
+    # only once the chunks are committed
+    if settings.RETRIEVER_BACKEND == "numpy":
+        await index_document(db, document.owner_id, document.id)
+    
+    return document
+
+
+@router.put("/{document_id}", response_model=DocumentResponse)
+async def replace_document(
+    document_id: int,
+    request: Request,
+    response: Response,
+    filename: Optional[str] = Query(None, description="New file name; defaults to keeping the file type"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Upload a new version of one of the current user's documents.
+    
+    **This is a protected endpoint** - requires authentication.
+    
+    The body is the raw file, as for `POST /documents`. Only what changed
+    is processed: chunks whose text is unchanged keep their embeddings,
+    new or edited chunks are embedded, and removed ones are deleted. A
+    byte-identical file is a no-op.
+    
+    The previous version stays searchable (and its file stored) until the
+    new one is. If queued ingestion fails for good, the previous version
+    is restored and the error recorded on the document.
+    
+    Returns 202 with `status: "pending"` when ingestion is queued
+    (INGEST_ASYNC), 200 otherwise.
+    
+    **Errors:**
+    - 404: Document not found (or owned by someone else)
+    - 409: The previous version is still being processed
+    - 413: File larger than MAX_UPLOAD_BYTES
+    - 415: Unsupported file type
+    - 422: File could not be parsed (only when INGEST_ASYNC is off)
+    """
+    document = await get_owned_document(db, document_id, current_user.id)
+    if document.status in BUSY_STATUSES:
+        # Answer early rather than after streaming the body; the claim below is what guards
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Document is still being processed"
+        )
+    
+    file_type = os.path.splitext(filename)[1].lower() if filename else document.file_type
+    if file_type not in SUPPORTED_FILE_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Unsupported file type '{file_type}'"
+        )
+    
+    dest = upload_path(current_user.id, f"{uuid.uuid4().hex}{file_type}")
+    try:
+        stored = await save_stream(request.stream(), dest)
+    except UploadTooLarge:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="File too large"
+        )
+    
+    if stored.sha256 == document.content_hash and file_type == document.file_type:
+        await remove_file(stored.path)
+        return document
+    
+    previous = await version_snapshot(db, document)
+    
+    # Claim the document with a conditional UPDATE: it locks the row, so of
+    # two concurrent PUTs only one finds it idle and the other gets 409.
+    # Two ingestions of one document at once would both insert its new chunks.
+    claimed = await db.execute(
+        update(Document)
+        .where(
+            Document.id == document.id,
+            Document.deleted_at.is_(None),
+            Document.status.not_in(BUSY_STATUSES)
+        )
+        .values(
+            file_path=stored.path,
+            file_type=file_type,
+            size_bytes=stored.size_bytes,
+            content_hash=stored.sha256,
+            error=None,
+            attempts=0,
+            status=DocumentStatus.PENDING if settings.INGEST_ASYNC else DocumentStatus.PROCESSING,
+            progress=0
+        ),
+        execution_options={"synchronize_session": False}
+    )
+    if claimed.rowcount == 0:
+        await db.rollback()
+        await remove_file(stored.path)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Document is still being processed"
+        )
+    
+    if settings.INGEST_ASYNC:
+        # The previous file stays until the worker has the new version stored
+        await db.commit()
+        await db.refresh(document)
+        await get_job_queue().enqueue(ingest_job(document.id, current_user.id, previous=previous))
+        response.status_code = status.HTTP_202_ACCEPTED
+        return document
+    
+    try:
+        chunks = await run_in_threadpool(chunk_file, stored.path, file_type)
+        diff = await diff_chunks(db, document.id, chunks)
+        await apply_chunk_diff(db, document.id, diff, embedder=get_embedding_provider())
+    except Exception:
+        await db.rollback()
+        await remove_file(stored.path)
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Could not parse document"
+        )
+    
+    await db.execute(
+        update(Document)
+        .where(Document.id == document.id)
+        .values(chunk_count=diff.chunk_count, status=DocumentStatus.READY, progress=100),
+        execution_options={"synchronize_session": False}
+    )
+    await bump_corpus_version(db, current_user.id)
+    await db.commit()
+    await db.refresh(document)
+    await remove_file(previous["file_path"])
+    
+    if settings.RETRIEVER_BACKEND == "numpy":
+        await reindex_document(db, document.owner_id, document.id)
+    
+    return document
+
+
+@router.get("", response_model=List[DocumentResponse])
+async def list_documents(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    List the current user's documents, newest first.
+    """
+    result = await db.execute(
+        select(Document)
+        .where(Document.owner_id == current_user.id, Document.deleted_at.is_(None))
+        .order_by(Document.created_at.desc())
+    )
+    return result.scalars().all()
+
+
+@router.get("/{document_id}", response_model=DocumentResponse)
+async def get_document(
+    document_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Get one of the current user's documents.
+    
+    **Errors:**
+    - 404: Document not found (or owned by someone else)
+    """
+    return await get_owned_document(db, document_id, current_user.id)
+
+
+@router.get("/{document_id}/status", response_model=DocumentStatusResponse)
+async def get_document_status(
+    document_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Ingestion status and progress (0-100) of one of the current user's documents.
+    
+    Meant to be polled after an upload, so it reads only the status
+    columns of one row.
+    
+    **Errors:**
+    - 404: Document not found (or owned by someone else)
+    """
+    result = await db.execute(
+        select(Document.id, Document.status, Document.progress, Document.chunk_count, Document.error)
+        .where(
+            Document.id == document_id,
+            Document.owner_id == current_user.id,
+            Document.deleted_at.is_(None)
+        )
+    )
+    row = result.first()
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found"
+        )
+    return row
+
+
+@router.delete("/{document_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_document(
+    document_id: int,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Delete one of the current user's documents.
+    
+    **This is a protected endpoint** - requires authentication.
+    
+    Returns immediately, however many chunks the document has: it is
+    hidden from listings and search right away, and its chunks, row and
+    file are removed by a background job in small batches.
+    
+    **Errors:**
+    - 404: Document not found (or owned by someone else)
+    """
+    document = await get_owned_document(db, document_id, current_user.id)
+    document.deleted_at = datetime.utcnow()
+    await bump_corpus_version(db, current_user.id)
+    await db.commit()
+    
+    if settings.RETRIEVER_BACKEND == "numpy":
+        numpy_store.index_for(document.owner_id).delete_document(document.id)
+    
+    background_tasks.add_task(purge_document, document.id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
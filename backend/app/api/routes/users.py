@@ -0,0 +1,55 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db
+from app.models.user import User
+from app.schemas.user import UserAdminUpdate, UserResponse
+from app.api.dependencies import get_current_active_superuser
+from app.services.principal_cache import Principal, principal_cache
+
+# Admin-only user management
+router = APIRouter(prefix="/users", tags=["users"])
+
+
+@router.patch("/{user_id}", response_model=UserResponse)
+async def update_user_flags(
+    user_id: int,
+    user_in: UserAdminUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    admin: Principal = Depends(get_current_active_superuser)
+):
+    """
+    Activate/deactivate a user or change their superuser flag.
+    
+    **This is an admin endpoint** - requires a superuser token.
+    
+    Cached principals for the user are invalidated, so the change takes
+    effect on their next request instead of when the cache expires.
+    
+    **Request Body:**
+```json
+    {
+        "is_active": false
+    }
+```
+    
+    **Errors:**
+    - 403: Not a superuser
+    - 404: User not found
+    """
+    user = await db.get(User, user_id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    
+    # Only apply fields that were actually sent
+    for field, value in user_in.model_dump(exclude_unset=True).items():
+        setattr(user, field, value)
+    
+    await db.commit()
+    await db.refresh(user)
+    
+    await principal_cache.invalidate_user(user.id)
+    
+    return user
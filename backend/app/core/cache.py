@@ -0,0 +1,88 @@
+"""
+In-process TTL + LRU cache.
+
+Entries expire after a time-to-live and the least recently used entry is
+evicted once the cache is full. Used as the local (per-worker) tier in
+front of Redis-backed caches.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterator, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Bounded mapping with per-entry expiry.
+
+    Args:
+        max_entries: Entries kept before the least recently used is evicted
+        ttl_seconds: Default time-to-live for new entries
+        clock: Monotonic time source (injectable for tests)
+
+    Example:
+        >>> cache = TTLCache(max_entries=2, ttl_seconds=60)
+        >>> cache.set("a", 1)
+        >>> cache.get("a")
+        1
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._data[key]
+                return None
+
+            self._data.move_to_end(key)  # Mark as most recently used
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = (self._clock() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate: Callable[[Hashable, Any], bool]) -> int:
+        """Remove every entry matching predicate(key, value); return how many."""
+        with self._lock:
+            doomed = [key for key, (_, value) in self._data.items() if predicate(key, value)]
+            for key in doomed:
+                del self._data[key]
+            return len(doomed)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def items(self) -> Iterator[Tuple[Hashable, Any]]:
+        """Snapshot of live (unexpired) entries."""
+        now = self._clock()
+        with self._lock:
+            entries = [(key, value) for key, (expires_at, value) in self._data.items() if expires_at > now]
+        return iter(entries)
+
+    def __len__(self) -> int:
+        return len(self._data)
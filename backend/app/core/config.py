@@ -1,33 +1,156 @@
-from pydantic_settings import BaseSettings
-from typing import Optional
-
-class Settings(BaseSettings):
-    # Application
-    APP_NAME: str = "RAG Chatbot API"
-    ENVIRONMENT: str = "development"
-    DEBUG: bool = True
-
-    # Security
-    SECRET_KEY: str
-    ALGORITHM: str = "HS256"
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
-
-    # Database
-    DATABASE_URL: str
-
-    # OpenAI
-    OPENAI_API_KEY: str
-
-    # AWS
-    AWS_REGION: str = "us-east-1"
-    AWS_ACCESS_KEY_ID: Optional[str] = None
-    AWS_SECRET_ACCESS_KEY: Optional[str] = None
-
-    # Redis
-    REDIS_URL: str = "redis://localhost:6379"
-
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
-        
+from pydantic_settings import BaseSettings
+from typing import Optional
+
+class Settings(BaseSettings):
+    # Application
+    APP_NAME: str = "RAG Chatbot API"
+    ENVIRONMENT: str = "development"
+    DEBUG: bool = True
+
+    # Security
+    SECRET_KEY: str
+    ALGORITHM: str = "HS256"
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+
+    # Password hashing executor
+    PASSWORD_HASH_WORKERS: Optional[int] = None  # Defaults to CPU count
+    PASSWORD_HASH_MAX_QUEUE: int = 64  # Waiting jobs before returning 503
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
+
+    # Database
+    DATABASE_URL: str
+    ASYNC_DATABASE_URL: Optional[str] = None  # Derived from DATABASE_URL when unset
+
+    # OpenAI (only needed when EMBEDDING_PROVIDER is "openai")
+    OPENAI_API_KEY: Optional[str] = None
+
+    # Embeddings
+    EMBEDDING_PROVIDER: str = "openai"  # "openai", "hashing" (local, offline), "fake" (tests) or "none"
+    EMBEDDING_MODEL: str = "text-embedding-3-small"
+
+    # Embedding micro-batching (merges concurrent callers into shared provider calls)
+    EMBEDDING_SCHEDULER_ENABLED: bool = True
+    EMBEDDING_BATCH_SIZE: int = 256  # Texts per provider call
+    EMBEDDING_BATCH_MAX_WAIT_MS: int = 10  # Longest a text waits for its batch to fill
+    EMBEDDING_MAX_CONCURRENT_BATCHES: int = 4  # Provider calls in flight
+
+    # Embedding cache (keyed by model + SHA-256 of the normalised text)
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 10000  # ~60 MB of 1536-dim vectors per worker
+    EMBEDDING_CACHE_LOCAL_TTL_SECONDS: int = 3600  # Per-worker tier
+    EMBEDDING_CACHE_TTL_SECONDS: int = 30 * 24 * 3600  # Redis tier
+
+    # LLM
+    LLM_BACKEND: str = "openai"  # "openai" or "fake" (tests, offline development)
+    LLM_MODEL: str = "gpt-4o-mini"
+    LLM_TEMPERATURE: float = 0.2
+
+    # Model routing (cheap tier by default, strong tier for hard questions)
+    LLM_ROUTER_ENABLED: bool = True
+    LLM_STRONG_MODEL: str = "gpt-4o"
+    LLM_STRONG_PROMPT_COST_PER_1K_TOKENS: float = 0.0025  # USD
+    LLM_STRONG_COMPLETION_COST_PER_1K_TOKENS: float = 0.01
+    ROUTER_STRONG_QUERY_TOKENS: int = 64  # Longer questions go to the strong tier
+    ROUTER_STRONG_CONTEXT_TOKENS: int = 3000  # So do prompts with more retrieved context
+    LLM_HEDGE_ENABLED: bool = True  # Ask the fallback too when the primary is slower than its p95
+    LLM_HEDGE_PERCENTILE: float = 95
+    LLM_HEDGE_MIN_SAMPLES: int = 20  # First-token samples needed before hedging
+    LLM_LATENCY_WINDOW: int = 500  # Recent samples behind the rolling percentiles
+
+    # Chat
+    CHAT_CONTEXT_CHUNKS: int = 8  # Candidate chunks retrieved per question
+    CHAT_CONTEXT_TOKEN_BUDGET: int = 2500  # Context passages packed into the prompt
+    CHAT_CONTEXT_DUPLICATE_THRESHOLD: float = 0.8  # Word-shingle overlap at which a passage is a near-duplicate
+    LLM_PROMPT_COST_PER_1K_TOKENS: float = 0.00015  # USD, for cost reporting
+    LLM_COMPLETION_COST_PER_1K_TOKENS: float = 0.0006
+
+    # Request coalescing
+    SINGLE_FLIGHT_ENABLED: bool = True  # Identical concurrent retrievals / LLM calls share one call
+    SINGLE_FLIGHT_LOCK_TTL_SECONDS: int = 120  # Cross-process lock (Redis); must exceed the longest answer
+
+    # Semantic answer cache
+    ANSWER_CACHE_ENABLED: bool = True
+    ANSWER_CACHE_THRESHOLD: float = 0.95  # Cosine similarity between questions for a hit
+    ANSWER_CACHE_MAX_ENTRIES: int = 256  # Answers kept per owner / document set
+    ANSWER_CACHE_MAX_SCOPES: int = 1000  # Owner / document sets kept per worker
+    ANSWER_CACHE_TTL_SECONDS: int = 24 * 3600
+
+    # Conversation memory
+    MEMORY_TOKEN_BUDGET: int = 2000  # Summary + recent messages in the prompt
+    MEMORY_SUMMARY_MAX_TOKENS: int = 400
+    MEMORY_MAX_MESSAGES: int = 50  # Recent messages read per turn (safety cap)
+    MEMORY_SUMMARIZER: str = "llm"  # "llm" or "extractive" (no model call)
+
+    # Document uploads
+    UPLOAD_DIR: str = "uploads"  # Local storage root for uploaded files
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024  # Bytes written per aiofiles write
+    MAX_UPLOAD_BYTES: int = 100 * 1024 * 1024
+
+    # Background ingestion
+    INGEST_ASYNC: bool = True  # Queue uploads for the ingestion worker (False = ingest in the request)
+    INGEST_WORKER_IN_PROCESS: bool = True  # Run a worker in the API process (else: python -m app.worker)
+    INGEST_WORKER_CONCURRENCY: int = 4  # Jobs handled at once per worker
+    INGEST_PROCESS_POOL_SIZE: Optional[int] = None  # Parse/chunk processes (None = one per core)
+    INGEST_MAX_ATTEMPTS: int = 3
+    INGEST_RETRY_BACKOFF_SECONDS: float = 5.0  # Doubled after every failed attempt
+    INGEST_MAX_JOBS_PER_USER: int = 2  # Documents of one user ingested at once
+    INGEST_JOB_LEASE_SECONDS: int = 3600  # A job in progress this long is presumed lost and run again
+
+    # Text chunking
+    CHUNK_SIZE: int = 1000  # Characters per chunk
+    CHUNK_OVERLAP: int = 200  # Characters shared by consecutive chunks
+    TOKENIZER_ENCODING: str = "cl100k_base"
+    TOKEN_CACHE_SIZE: int = 4096  # Recurring prompt fragments whose token counts are cached
+
+    # Chunk storage
+    EMBEDDING_DIM: int = 1536  # Must match the document_chunks.embedding column
+    CHUNK_INSERT_BATCH_SIZE: int = 500  # Chunks per COPY / multi-row INSERT
+    DELETE_BATCH_SIZE: int = 1000  # Chunks per transaction when a document is deleted
+
+    # Vector index (pgvector)
+    VECTOR_INDEX_TYPE: str = "hnsw"  # "hnsw" or "ivfflat"
+    HNSW_M: int = 16  # Graph links per node (build time)
+    HNSW_EF_CONSTRUCTION: int = 64  # Candidate list size while building
+    HNSW_EF_SEARCH: int = 40  # Candidate list size per query (recall vs latency)
+    IVFFLAT_LISTS: int = 100  # Clusters (build time); ~rows/1000 is a good start
+    IVFFLAT_PROBES: int = 10  # Clusters scanned per query
+    VECTOR_INDEX_PER_DOC_TYPE: bool = True  # Partial index per DocumentType (filtered searches)
+    VECTOR_ITERATIVE_SCAN: str = "relaxed_order"  # Scan on until k rows pass the filters; "off" before pgvector 0.8
+    VECTOR_INDEX_HALFVEC: bool = False  # ANN over the float16 embedding_half column (pgvector 0.7+), exact re-rank
+
+    # Retrieval
+    RETRIEVER_BACKEND: str = "pgvector"  # "pgvector" or "numpy" (in-process, no pgvector needed)
+    VECTOR_INDEX_DIR: str = "vector_index"  # Memory-mapped in-process indexes live here
+    VECTOR_INDEX_COMPACT_RATIO: float = 0.25  # Compact once this share of rows is deleted
+    VECTOR_INDEX_QUANTIZATION: str = "none"  # "none" or "int8" (in-process index scans int8 codes)
+    VECTOR_RERANK_FACTOR: int = 4  # Compressed search: candidates re-scored in float32 per hit
+
+    # Hybrid (vector + keyword) search
+    HYBRID_SEARCH_ENABLED: bool = True  # Needs Postgres full-text search
+    TEXT_SEARCH_CONFIG: str = "english"  # Must match the search_vector column
+    HYBRID_CANDIDATES: int = 20  # Hits fetched from each stage before fusion
+    HYBRID_RRF_K: int = 60  # Reciprocal-rank-fusion damping constant
+    HYBRID_VECTOR_TIMEOUT_MS: int = 500
+    HYBRID_KEYWORD_TIMEOUT_MS: int = 300
+
+    # AWS
+    AWS_REGION: str = "us-east-1"
+    AWS_ACCESS_KEY_ID: Optional[str] = None
+    AWS_SECRET_ACCESS_KEY: Optional[str] = None
+
+    # Redis
+    REDIS_URL: str = "redis://localhost:6379"
+    REDIS_ENABLED: bool = False  # Share caches across workers via Redis
+
+    # Authenticated-principal cache
+    PRINCIPAL_CACHE_ENABLED: bool = True
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    PRINCIPAL_CACHE_LOCAL_TTL_SECONDS: int = 30  # Per-worker tier
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 300  # Redis tier
+
+    class Config:
+        env_file = ".env"
+        case_sensitive = True
+        
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,150 @@
+"""
+Dedicated executor for bcrypt password hashing.
+
+bcrypt is slow by design (~250ms at 12 rounds). Running it inline in a
+request would tie up a worker, and a login burst could block every other
+endpoint (including /health). Instead, hashing runs on its own small
+thread pool (bcrypt releases the GIL) with a bounded backlog: when the
+backlog is full, callers get PasswordHasherSaturated, which the API turns
+into 503 + Retry-After instead of letting requests pile up.
+"""
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.security import hash_password, verify_password
+
+queue_depth = metrics.gauge(
+    "password_hash_queue_depth", "Hash jobs waiting for a free worker"
+)
+in_flight = metrics.gauge(
+    "password_hash_in_flight", "Hash jobs queued or running"
+)
+queue_wait = metrics.histogram(
+    "password_hash_queue_wait_seconds", "Time a hash job waited for a worker"
+)
+hash_latency = metrics.histogram(
+    "password_hash_latency_seconds", "Time spent inside bcrypt"
+)
+rejected = metrics.counter(
+    "password_hash_rejected_total", "Hash jobs rejected because the executor was saturated"
+)
+
+
+class PasswordHasherSaturated(Exception):
+    """Raised when the hashing backlog is full. Maps to HTTP 503."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Password hashing executor is saturated")
+        self.retry_after = retry_after
+
+
+class PasswordHashExecutor:
+    """
+    Bounded thread pool for bcrypt work.
+
+    Args:
+        max_workers: Threads running bcrypt (defaults to the CPU count)
+        max_queue: Jobs allowed to wait for a thread before rejecting
+        retry_after: Seconds suggested to rejected clients
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_queue: int = 64, retry_after: int = 1):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self._pending = 0  # Only touched from the event loop thread
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="password-hash"
+        )
+
+    @property
+    def capacity(self) -> int:
+        """Maximum jobs accepted at once (running + waiting)."""
+        return self.max_workers + self.max_queue
+
+    def _update_gauges(self) -> None:
+        in_flight.set(self._pending)
+        queue_depth.set(max(0, self._pending - self.max_workers))
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run fn(*args) on the hashing pool and await the result.
+
+        Raises:
+            PasswordHasherSaturated: If the backlog is already full
+        """
+        if self._pending >= self.capacity:
+            rejected.inc()
+            raise PasswordHasherSaturated(self.retry_after)
+
+        self._pending += 1
+        self._update_gauges()
+        submitted = time.perf_counter()
+
+        def timed():
+            started = time.perf_counter()
+            queue_wait.observe(started - submitted)
+            try:
+                return fn(*args)
+            finally:
+                hash_latency.observe(time.perf_counter() - started)
+
+        # Released when the pool is done with the job, not when the caller
+        # stops waiting: a cancelled request's bcrypt call still holds a thread
+        loop = asyncio.get_running_loop()
+        try:
+            future = self._executor.submit(timed)
+        except RuntimeError:  # Executor shut down
+            self._release()
+            raise
+
+        def done(_) -> None:
+            try:
+                loop.call_soon_threadsafe(self._release)
+            except RuntimeError:  # Loop closed (shutdown); nothing left to count
+                pass
+
+        future.add_done_callback(done)
+        return await asyncio.wrap_future(future, loop=loop)
+
+    def _release(self) -> None:
+        self._pending -= 1
+        self._update_gauges()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHashExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+    retry_after=settings.PASSWORD_HASH_RETRY_AFTER_SECONDS
+)
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Hash a password on the dedicated hashing executor.
+
+    Example:
+        >>> await hash_password_async("mypassword123")
+        '$2b$12$KIXxkjhsd...'
+    """
+    return await password_hasher.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password on the dedicated hashing executor.
+
+    Example:
+        >>> await verify_password_async("mypassword123", hashed)
+        True
+    """
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
@@ -0,0 +1,147 @@
+"""
+In-process metrics.
+
+A deliberately small registry of counters, gauges and histograms so
+hot paths can record what they are doing without an external agent.
+GET /metrics returns a JSON snapshot of everything registered here.
+
+Example:
+    >>> requests_total = metrics.counter("requests_total", "Requests served")
+    >>> requests_total.inc()
+    >>> latency = metrics.histogram("latency_seconds", "Request latency")
+    >>> latency.observe(0.012)
+"""
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+
+class Counter:
+    """Monotonically increasing value (e.g. total cache hits)."""
+
+    def __init__(self, name: str, description: str = ""):
+        self.name = name
+        self.description = description
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"type": "counter", "value": self._value}
+
+
+class Gauge:
+    """Value that goes up and down (e.g. current queue depth)."""
+
+    def __init__(self, name: str, description: str = ""):
+        self.name = name
+        self.description = description
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        self._value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"type": "gauge", "value": self._value}
+
+
+class Histogram:
+    """
+    Distribution of observed values.
+
+    Keeps a running count/sum plus a bounded window of recent samples,
+    so percentiles reflect current behaviour rather than all-time history.
+    """
+
+    def __init__(self, name: str, description: str = "", window: int = 2048):
+        self.name = name
+        self.description = description
+        self.count = 0
+        self.sum = 0.0
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.sum += value
+            self._samples.append(value)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Nearest-rank percentile over the recent window (None if empty)."""
+        with self._lock:
+            ordered = sorted(self._samples)
+        if not ordered:
+            return None
+        index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "type": "histogram",
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else None,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+
+class MetricsRegistry:
+    """
+    Holds every metric by name.
+
+    Asking for an existing name returns the same object, so modules can
+    declare their metrics at import time without coordinating.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, description: str, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, description, **kwargs)
+                self._metrics[name] = metric
+            return metric
+
+    def counter(self, name: str, description: str = "") -> Counter:
+        return self._get_or_create(Counter, name, description)
+
+    def gauge(self, name: str, description: str = "") -> Gauge:
+        return self._get_or_create(Gauge, name, description)
+
+    def histogram(self, name: str, description: str = "", window: int = 2048) -> Histogram:
+        return self._get_or_create(Histogram, name, description, window=window)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """All metrics as plain dicts, sorted by name."""
+        with self._lock:
+            items = sorted(self._metrics.items())
+        return {name: metric.snapshot() for name, metric in items}
+
+
+# Process-wide registry
+metrics = MetricsRegistry()
@@ -0,0 +1,43 @@
+"""
+Optional shared Redis client.
+
+Redis is an optional tier: caches and queues work per-process without it
+and use it to share state across workers when REDIS_ENABLED is true.
+"""
+from typing import Optional
+
+from app.core.config import settings
+
+try:
+    from redis import asyncio as redis_asyncio
+except ImportError:  # redis is optional for local development and tests
+    redis_asyncio = None
+
+_client = None
+
+
+def get_redis() -> Optional["redis_asyncio.Redis"]:
+    """
+    Return the shared async Redis client, or None if Redis is disabled.
+
+    The client is created lazily and reused, so it shares one connection
+    pool per process.
+    """
+    global _client
+
+    if not settings.REDIS_ENABLED or redis_asyncio is None:
+        return None
+
+    if _client is None:
+        _client = redis_asyncio.from_url(settings.REDIS_URL)
+
+    return _client
+
+
+async def close_redis() -> None:
+    """Close the shared client (called on application shutdown)."""
+    global _client
+
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -1,4 +1,4 @@
-"""
-Database package initialization.
-This file makes 'db' a Python package.
+"""
+Database package initialization.
+This file makes 'db' a Python package.
 """
\ No newline at end of file
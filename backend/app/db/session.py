@@ -1,47 +1,131 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from app.core.config import settings
-
-# Create database engine
-# echo=True means print all SQL queries (useful for debugging)
-engine = create_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG, # Only log SQL in development
-    pool_pre_ping=True # Verify connections before using
-)
-
-# SessionLocal = factory for creating database sessions
-# autocommit=False: We control when to save
-# autoflush=False: We control when to send changes to DB
-SessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    bind=engine
-)
-
-# Base class for all database models
-# All our models (User, Document, etc.) will inherit from this
-Base = declarative_base()
-
-def get_db():
-    """
-    Dependency function that provides a database session.
-    
-    This is used by FastAPI to inject database sessions into endpoints.
-    The session is automatically closed after the request completes.
-    
-    Yields:
-        Session: Database session
-        
-    Example usage in an endpoint:
-        @app.get("/users")
-        def get_users(db: Session = Depends(get_db)):
-            users = db.query(User).all()
-            return users
-    """
-    db = SessionLocal()
-    try:
-        yield db # Give the session to the endpoint
-    finally:
-        db.close() # Always close the session, even if there is an error
\ No newline at end of file
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+
+# Create database engine
+# echo=True means print all SQL queries (useful for debugging)
+# The sync engine is kept for Alembic migrations and standalone scripts
+engine = create_engine(
+    settings.DATABASE_URL,
+    echo=settings.DEBUG, # Only log SQL in development
+    pool_pre_ping=True # Verify connections before using
+)
+
+# SessionLocal = factory for creating database sessions
+# autocommit=False: We control when to save
+# autoflush=False: We control when to send changes to DB
+SessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=engine
+)
+
+
+# Sync drivers and their asyncio counterparts
+# postgresql://          -> postgresql+asyncpg://
+# sqlite:///./local.db   -> sqlite+aiosqlite:///./local.db
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
+
+def get_async_database_url(url: str) -> str:
+    """
+    Convert a sync DATABASE_URL into one that uses an asyncio driver.
+
+    URLs that already name a driver (e.g. postgresql+asyncpg://) are
+    returned unchanged, so ASYNC_DATABASE_URL can be set explicitly.
+
+    Example:
+        >>> get_async_database_url("postgresql://user:pw@localhost/ragchatbot")
+        'postgresql+asyncpg://user:pw@localhost/ragchatbot'
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    driver = ASYNC_DRIVERS.get(backend)
+
+    if driver is None or parsed.get_driver_name() == driver:
+        return url
+
+    return parsed.set(drivername=f"{backend}+{driver}").render_as_string(hide_password=False)
+
+
+# Async engine used by the API
+# Requests await the database instead of holding a threadpool worker
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL or get_async_database_url(settings.DATABASE_URL),
+    echo=settings.DEBUG,
+    pool_pre_ping=True
+)
+
+# expire_on_commit=False: objects stay readable after commit
+# (lazy refresh is not possible without an await)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+
+
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    # SQLite ignores foreign keys (and ON DELETE CASCADE) unless asked per connection
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+for _engine in (engine, async_engine.sync_engine):
+    if _engine.dialect.name == "sqlite":
+        event.listen(_engine, "connect", _enable_sqlite_foreign_keys)
+
+# Base class for all database models
+# All our models (User, Document, etc.) will inherit from this
+Base = declarative_base()
+
+def get_db():
+    """
+    Dependency function that provides a database session.
+
+    This is used by FastAPI to inject database sessions into endpoints.
+    The session is automatically closed after the request completes.
+
+    Yields:
+        Session: Database session
+
+    Example usage in an endpoint:
+        @app.get("/users")
+        def get_users(db: Session = Depends(get_db)):
+            users = db.query(User).all()
+            return users
+    """
+    db = SessionLocal()
+    try:
+        yield db # Give the session to the endpoint
+    finally:
+        db.close() # Always close the session, even if there is an error
+
+
+async def get_async_db():
+    """
+    Dependency function that provides an async database session.
+
+    Same lifecycle as get_db, but queries are awaited so the endpoint
+    can be an `async def` and never blocks the event loop.
+
+    Yields:
+        AsyncSession: Async database session
+
+    Example usage in an endpoint:
+        @app.get("/users")
+        async def get_users(db: AsyncSession = Depends(get_async_db)):
+            result = await db.execute(select(User))
+            return result.scalars().all()
+    """
+    async with AsyncSessionLocal() as db:
+        yield db # Session is closed when the context exits
@@ -0,0 +1,160 @@
+"""
+pgvector index management for document_chunks.embedding.
+
+Without an index every similarity query scans every chunk. Two index
+types are supported:
+
+- HNSW: graph index, best recall/latency trade-off, slower to build
+- IVFFlat: clustered index, fast to build, needs data before building
+
+Build parameters (m, ef_construction, lists) come from Settings and are
+fixed when the index is built; per-query parameters (ef_search, probes)
+are applied with SET LOCAL inside the search transaction.
+
+Searches are always filtered by owner and often by doc_type. Filtering
+the results of an ANN scan returns fewer than k rows once the filter is
+selective, so with VECTOR_INDEX_PER_DOC_TYPE there is also one partial
+index per DocumentType (WHERE doc_type = ...) next to the full one, and
+pgvector's iterative scan (0.8+) keeps walking the index until k rows
+pass the owner filter.
+
+With VECTOR_INDEX_HALFVEC the indexes are built on embedding_half, a
+generated float16 copy of the embedding (halfvec, pgvector 0.7+). Those
+indexes are about half the size. The retriever re-scores the candidates
+they return against the float32 column.
+"""
+from typing import List, Optional
+
+from app.core.config import settings
+from app.models.document import DocumentType
+
+TABLE = "document_chunks"
+COLUMN = "embedding"
+OPCLASS = "vector_cosine_ops"  # Queries order by cosine distance (<=>)
+HALF_COLUMN = "embedding_half"
+HALF_OPCLASS = "halfvec_cosine_ops"
+
+INDEX_NAMES = {
+    "hnsw": "ix_document_chunks_embedding_hnsw",
+    "ivfflat": "ix_document_chunks_embedding_ivfflat",
+}
+ITERATIVE_SCAN_MODES = {"off", "relaxed_order", "strict_order"}
+
+
+def _check_type(index_type: str) -> str:
+    if index_type not in INDEX_NAMES:
+        raise ValueError(f"Unknown vector index type '{index_type}' (expected hnsw or ivfflat)")
+    return index_type
+
+
+def index_name(
+    index_type: str = settings.VECTOR_INDEX_TYPE,
+    doc_type: Optional[DocumentType] = None,
+    halfvec: bool = settings.VECTOR_INDEX_HALFVEC
+) -> str:
+    """
+    Name of the full index, or of the partial index of one doc_type.
+
+    Example:
+        >>> index_name("hnsw", DocumentType.CODE, halfvec=False)
+        'ix_document_chunks_embedding_hnsw_code'
+        >>> index_name("hnsw", halfvec=True)
+        'ix_document_chunks_embedding_half_hnsw'
+    """
+    name = INDEX_NAMES[_check_type(index_type)]
+    if halfvec:
+        name = name.replace(COLUMN, HALF_COLUMN)
+    return f"{name}_{doc_type.value}" if doc_type is not None else name
+
+
+def indexed_doc_types() -> List[Optional[DocumentType]]:
+    """None (the full index) plus every doc_type with its own partial index."""
+    return [None] + (list(DocumentType) if settings.VECTOR_INDEX_PER_DOC_TYPE else [])
+
+
+def doc_type_predicate(doc_type: DocumentType, table: Optional[str] = None) -> str:
+    """
+    WHERE clause of a partial index.
+
+    Queries must repeat it with a constant (not a bind parameter) for the
+    planner to match the partial index under a generic plan; pass `table`
+    to qualify the column in joined queries.
+    """
+    column = f"{table}.doc_type" if table else "doc_type"
+    return f"{column} = '{doc_type.name}'"
+
+
+def build_options(index_type: str = settings.VECTOR_INDEX_TYPE) -> str:
+    """WITH (...) clause holding the configured build parameters."""
+    if _check_type(index_type) == "hnsw":
+        return f"m = {int(settings.HNSW_M)}, ef_construction = {int(settings.HNSW_EF_CONSTRUCTION)}"
+    return f"lists = {int(settings.IVFFLAT_LISTS)}"
+
+
+def create_index_sql(
+    index_type: str = settings.VECTOR_INDEX_TYPE,
+    name: str = None,
+    concurrently: bool = False,
+    doc_type: Optional[DocumentType] = None,
+    halfvec: bool = settings.VECTOR_INDEX_HALFVEC
+) -> str:
+    """
+    CREATE INDEX statement for the embedding (or embedding_half) column.
+
+    Example:
+        >>> create_index_sql("hnsw", halfvec=False)
+        'CREATE INDEX IF NOT EXISTS ix_document_chunks_embedding_hnsw ON document_chunks
+         USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64)'
+    """
+    column, opclass = (HALF_COLUMN, HALF_OPCLASS) if halfvec else (COLUMN, OPCLASS)
+    return (
+        f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS "
+        f"{name or index_name(index_type, doc_type, halfvec)} ON {TABLE} "
+        f"USING {index_type} ({column} {opclass}) WITH ({build_options(index_type)})"
+        + (f" WHERE {doc_type_predicate(doc_type)}" if doc_type is not None else "")
+    )
+
+
+def search_settings_sql(index_type: str = settings.VECTOR_INDEX_TYPE) -> List[str]:
+    """SET LOCAL statements that tune a single search transaction."""
+    if _check_type(index_type) == "hnsw":
+        statements = [f"SET LOCAL hnsw.ef_search = {int(settings.HNSW_EF_SEARCH)}"]
+    else:
+        statements = [f"SET LOCAL ivfflat.probes = {int(settings.IVFFLAT_PROBES)}"]
+    if settings.VECTOR_ITERATIVE_SCAN not in ITERATIVE_SCAN_MODES:
+        raise ValueError(f"Unknown VECTOR_ITERATIVE_SCAN '{settings.VECTOR_ITERATIVE_SCAN}'")
+    if settings.VECTOR_ITERATIVE_SCAN != "off":
+        statements.append(f"SET LOCAL {index_type}.iterative_scan = {settings.VECTOR_ITERATIVE_SCAN}")
+    return statements
+
+
+def rebuild_statements(
+    index_type: str = settings.VECTOR_INDEX_TYPE,
+    halfvec: bool = settings.VECTOR_INDEX_HALFVEC
+) -> List[str]:
+    """
+    Statements that rebuild the index without blocking writes.
+
+    REINDEX would keep the old build parameters, so a new index is built
+    concurrently under a temporary name with the current settings, then
+    swapped in. Must run outside a transaction (autocommit).
+    """
+    statements = []
+    for doc_type in indexed_doc_types():
+        name = index_name(index_type, doc_type, halfvec)
+        temp = f"{name}_rebuild"
+        statements += [
+            f"DROP INDEX CONCURRENTLY IF EXISTS {temp}",  # Leftover from an interrupted rebuild
+            create_index_sql(index_type, name=temp, concurrently=True, doc_type=doc_type, halfvec=halfvec),
+            f"DROP INDEX CONCURRENTLY IF EXISTS {name}",
+            f"ALTER INDEX {temp} RENAME TO {name}",
+        ]
+    return statements
+
+
+def drop_statements(index_type: str, concurrently: bool = True, halfvec: bool = False) -> List[str]:
+    """DROP INDEX for the full and every partial index of one index type and column."""
+    return [
+        f"DROP INDEX {'CONCURRENTLY ' if concurrently else ''}IF EXISTS {index_name(index_type, doc_type, halfvec)}"
+        for doc_type in [None, *DocumentType]
+    ]
@@ -0,0 +1,84 @@
+"""
+Bulk ingestion CLI.
+
+Usage (from backend/):
+    python -m app.ingest DIRECTORY --owner EMAIL [--doc-type course]
+                         [--processes N] [--max-pending N] [--state FILE]
+
+Ingests every supported file under DIRECTORY for one user, parsing in a
+process pool and writing in batched transactions. Re-running the same
+command after a crash (or Ctrl-C) skips the files that were committed.
+"""
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.redis import close_redis
+from app.db.session import AsyncSessionLocal, async_engine
+from app.models.document import DocumentType
+from app.models.user import User
+from app.services.bulk_ingestion import BulkIngester, IngestJournal, IngestStats
+from app.services.embeddings import close_embedding_provider
+from app.services.jobs.worker import create_process_pool
+
+
+def print_progress(stats: IngestStats) -> None:
+    print(stats.summary(), flush=True)
+
+
+async def ingest(directory: Path, owner_email: str, doc_type: DocumentType,
+                 processes: int, max_pending: int, state: Path) -> IngestStats:
+    async with AsyncSessionLocal() as db:
+        owner_id = (await db.execute(select(User.id).where(User.email == owner_email))).scalar_one_or_none()
+    if owner_id is None:
+        sys.exit(f"No user with email {owner_email}")
+
+    pool = create_process_pool(processes)
+    try:
+        ingester = BulkIngester(
+            owner_id,
+            doc_type,
+            IngestJournal(state),
+            pool,
+            max_pending=max_pending,
+            report=print_progress
+        )
+        return await ingester.run(directory)
+    finally:
+        pool.shutdown(cancel_futures=True)
+        await close_embedding_provider()
+        await close_redis()
+        await async_engine.dispose()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.ingest", description="Bulk-ingest a directory of documents")
+    parser.add_argument("directory", type=Path)
+    parser.add_argument("--owner", required=True, help="Email of the user who will own the documents")
+    parser.add_argument("--doc-type", choices=[t.value for t in DocumentType], default=DocumentType.OTHER.value)
+    parser.add_argument("--processes", type=int, default=settings.INGEST_PROCESS_POOL_SIZE,
+                        help="Parse/chunk processes (default: one per core)")
+    parser.add_argument("--max-pending", type=int, default=32,
+                        help="Files parsed but not yet written, at most (bounds memory)")
+    parser.add_argument("--state", type=Path, default=None,
+                        help="Resume journal (default: ./ingest-<directory name>.jsonl)")
+    args = parser.parse_args(argv)
+
+    # Files that cannot be parsed are skipped with a warning
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(message)s")
+    if not args.directory.is_dir():
+        sys.exit(f"{args.directory} is not a directory")
+    state = args.state or Path(f"ingest-{args.directory.resolve().name}.jsonl")
+
+    print(f"Ingesting {args.directory} for {args.owner} (journal: {state})")
+    stats = asyncio.run(ingest(args.directory, args.owner, DocumentType(args.doc_type), args.processes, args.max_pending, state))
+    print(f"Done: {stats.summary()}")
+
+
+if __name__ == "__main__":
+    main()
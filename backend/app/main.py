@@ -1,39 +1,87 @@
-from app.api.routes import auth
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-
-app = FastAPI(
-    title="RAG Chatbot API",
-    description="Academicc and Programming RAG Chatbot",
-    version="1.0.0",
-    swagger_ui_parameters={
-        "persistAuthorization": True,
-    }
-)
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-app.include_router(auth.router)
-
-@app.get("/")
-async def root():
-    return {
-        "message" : "RAG Chatbot API is running!",
-        "status" : "healthy",
-        "version" : "1.0.0",
-        "docs" : "/docs"
-    }
-
-@app.get("/health")
-async def health_check():
-    return {
-        "status" : "healthy",
-        "database" : "connected",
-        "vector_db" : "connected"
-    }
+import asyncio
+from contextlib import asynccontextmanager
+from app.api.routes import auth, conversations, documents, users
+from app.core.config import settings
+from app.core.hashing import PasswordHasherSaturated, password_hasher
+from app.core.metrics import metrics
+from app.core.redis import close_redis
+from app.services.embeddings import close_embedding_provider
+from app.services.jobs import get_job_queue
+from app.services.jobs.worker import IngestionWorker
+from fastapi import FastAPI, Request, status
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup: ingest queued uploads in this process unless a separate
+    # worker (python -m app.worker) does it
+    worker = worker_task = None
+    if settings.INGEST_ASYNC and settings.INGEST_WORKER_IN_PROCESS:
+        worker = IngestionWorker(get_job_queue())
+        worker_task = asyncio.create_task(worker.run())
+    yield
+    # Shutdown: stop background executors
+    if worker is not None:
+        worker.stop()
+        await worker_task
+        worker.shutdown()
+    password_hasher.shutdown()
+    await close_embedding_provider()
+    await close_redis()
+
+
+app = FastAPI(
+    title="RAG Chatbot API",
+    description="Academicc and Programming RAG Chatbot",
+    version="1.0.0",
+    swagger_ui_parameters={
+        "persistAuthorization": True,
+    },
+    lifespan=lifespan
+)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+app.include_router(auth.router)
+app.include_router(users.router)
+app.include_router(documents.router)
+app.include_router(conversations.router)
+
+
+@app.exception_handler(PasswordHasherSaturated)
+async def password_hasher_saturated_handler(request: Request, exc: PasswordHasherSaturated):
+    # Shed load instead of queueing logins behind a full bcrypt backlog
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server is busy, please retry shortly"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+@app.get("/")
+async def root():
+    return {
+        "message" : "RAG Chatbot API is running!",
+        "status" : "healthy",
+        "version" : "1.0.0",
+        "docs" : "/docs"
+    }
+
+@app.get("/health")
+async def health_check():
+    return {
+        "status" : "healthy",
+        "database" : "connected",
+        "vector_db" : "connected"
+    }
+
+@app.get("/metrics")
+async def get_metrics():
+    return metrics.snapshot()
@@ -1,9 +1,11 @@
-from app.models.user import User
-from app.models.document import Document
-from app.models.conversation import Conversation
-from app.models.message import Message
-
-# This allows: from app.models import User
-# Instead of: from app.models.user import User
-
-__all__ = ["User", "Document", "Conversation", "Message"]
\ No newline at end of file
+from app.models.user import User
+from app.models.document import Document
+from app.models.document_chunk import DocumentChunk
+from app.models.conversation import Conversation
+from app.models.message import Message
+from app.models.refresh_token import RefreshToken
+
+# This allows: from app.models import User
+# Instead of: from app.models.user import User
+
+__all__ = ["User", "Document", "DocumentChunk", "Conversation", "Message", "RefreshToken"]
\ No newline at end of file
@@ -1,38 +1,50 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
-from sqlalchemy.orm import relationship
-from app.db.session import Base
-from app.db.base_class import TimestampMixin
-
-
-class Conversation(Base, TimestampMixin):
-    """
-    Conversation model.
-    
-    A conversation contains multiple messages between user and AI.
-    Think of it like a WhatsApp chat thread.
-    
-    Attributes:
-        id: Primary key
-        title: Conversation title (auto-generated from first message)
-        user_id: Foreign key to User
-        
-    Relationships:
-        user: The user who started this conversation
-        messages: All messages in this conversation
-    """
-    
-    __tablename__ = "conversations"
-    
-    id = Column(Integer, primary_key=True, index=True)
-    title = Column(String, default="New Conversation")
-    
-    # Foreign key to User
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    
-    # Relationships
-    user = relationship("User", back_populates="conversations")
-    messages = relationship("Message", back_populates="conversation", cascade="all, delete-orphan")
-    # cascade="all, delete-orphan" means: if conversation is deleted, delete all messages too
-    
-    def __repr__(self):
+from sqlalchemy import Column, DateTime, Integer, String, Text, ForeignKey
+from sqlalchemy.orm import relationship
+from app.db.session import Base
+from app.db.base_class import TimestampMixin
+
+
+class Conversation(Base, TimestampMixin):
+    """
+    Conversation model.
+    
+    A conversation contains multiple messages between user and AI.
+    Think of it like a WhatsApp chat thread.
+    
+    Attributes:
+        id: Primary key
+        title: Conversation title (auto-generated from first message)
+        user_id: Foreign key to User
+        summary: Rolling summary of messages that no longer fit the prompt
+        summary_token_count: Tokens in summary
+        summarized_until: created_at of the last message folded into summary
+        summarized_through_id: id of the last message folded into summary
+        
+    Relationships:
+        user: The user who started this conversation
+        messages: All messages in this conversation
+    """
+    
+    __tablename__ = "conversations"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    title = Column(String, default="New Conversation")
+    
+    # Foreign key to User
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    
+    # Conversation memory (see app.services.memory)
+    summary = Column(Text, nullable=True)
+    summary_token_count = Column(Integer, default=0, nullable=False)
+    summarized_until = Column(DateTime, nullable=True)
+    summarized_through_id = Column(Integer, nullable=True)  # Not a FK: messages may be deleted
+    
+    # Relationships
+    user = relationship("User", back_populates="conversations")
+    messages = relationship("Message", back_populates="conversation", cascade="all, delete-orphan", passive_deletes=True)
+    # cascade="all, delete-orphan" means: if conversation is deleted, delete all messages too
+    # passive_deletes=True leaves that to the database (ON DELETE CASCADE) instead of
+    # loading every message and deleting them one by one
+    
+    def __repr__(self):
         return f"<Conversation {self.title}>"
\ No newline at end of file
@@ -1,62 +1,92 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Enum
-from sqlalchemy.orm import relationship
-import enum
-from app.db.session import Base
-from app.db.base_class import TimestampMixin
-
-
-class DocumentType(str, enum.Enum):
-    """
-    Enum for document types.
-    
-    Enum = a set of named values (like multiple choice options)
-    This ensures only valid types can be stored.
-    """
-    ACADEMIC = "academic"      # Research papers, journal articles
-    COURSE = "course"          # Lecture notes, assignments
-    CODE = "code"              # Programming documentation
-    OTHER = "other"            # Anything else
-
-
-class Document(Base, TimestampMixin):
-    """
-    Document model.
-    
-    Attributes:
-        id: Primary key
-        title: Document title
-        description: Optional description
-        file_path: S3 path to the file
-        file_type: Extension (.pdf, .docx, etc.)
-        doc_type: Category (academic, course, code)
-        size_bytes: File size in bytes
-        chunk_count: Number of text chunks created
-        owner_id: Foreign key to User
-        
-    Relationships:
-        owner: The user who uploaded this document
-    """
-    
-    __tablename__ = "documents"
-    
-    id = Column(Integer, primary_key=True, index=True)
-    
-    # Document metadata
-    title = Column(String, nullable=False)
-    description = Column(Text, nullable=True)
-    file_path = Column(String, nullable=False)  # S3 path
-    file_type = Column(String, nullable=False)  # .pdf, .docx, etc.
-    doc_type = Column(Enum(DocumentType), default=DocumentType.OTHER)
-    size_bytes = Column(Integer, nullable=False)
-    
-    # Processing status
-    chunk_count = Column(Integer, default=0)  # Number of chunks created
-    
-    # Foreign key to User
-    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    
-    # Relationship
-    owner = relationship("User", back_populates="documents")
-    
-    def __repr__(self):
+from sqlalchemy import Column, DateTime, Integer, String, Text, ForeignKey, Enum
+from sqlalchemy.orm import relationship
+import enum
+from app.db.session import Base
+from app.db.base_class import TimestampMixin
+
+
+class DocumentType(str, enum.Enum):
+    """
+    Enum for document types.
+    
+    Enum = a set of named values (like multiple choice options)
+    This ensures only valid types can be stored.
+    """
+    ACADEMIC = "academic"      # Research papers, journal articles
+    COURSE = "course"          # Lecture notes, assignments
+    CODE = "code"              # Programming documentation
+    OTHER = "other"            # Anything else
+
+
+class DocumentStatus(str, enum.Enum):
+    """
+    Ingestion state of a document.
+    
+    pending -> processing -> ready, or failed once retries run out.
+    A failed attempt that will be retried goes back to pending. A
+    re-upload that fails for good goes back to ready, on the previous
+    version, with the error recorded.
+    """
+    PENDING = "pending"        # Queued for the ingestion worker
+    PROCESSING = "processing"  # Being parsed, chunked and embedded
+    READY = "ready"            # All chunks stored and searchable
+    FAILED = "failed"          # Gave up after INGEST_MAX_ATTEMPTS
+
+
+class Document(Base, TimestampMixin):
+    """
+    Document model.
+    
+    Attributes:
+        id: Primary key
+        title: Document title
+        description: Optional description
+        file_path: S3 path to the file
+        file_type: Extension (.pdf, .docx, etc.)
+        doc_type: Category (academic, course, code)
+        size_bytes: File size in bytes
+        content_hash: SHA-256 of the file (a re-upload with the same hash is a no-op)
+        chunk_count: Number of text chunks created
+        status: Ingestion state (pending, processing, ready, failed)
+        progress: Ingestion progress, 0-100
+        error: Last ingestion error, if any
+        attempts: Failed ingestion attempts so far
+        owner_id: Foreign key to User
+        deleted_at: Set when deletion is requested; the row and its chunks
+            are removed by a background job, and it is hidden until then
+        
+    Relationships:
+        owner: The user who uploaded this document
+        chunks: Text chunks (with embeddings) created from the file
+    """
+    
+    __tablename__ = "documents"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # Document metadata
+    title = Column(String, nullable=False)
+    description = Column(Text, nullable=True)
+    file_path = Column(String, nullable=False)  # S3 path
+    file_type = Column(String, nullable=False)  # .pdf, .docx, etc.
+    doc_type = Column(Enum(DocumentType), default=DocumentType.OTHER)
+    size_bytes = Column(Integer, nullable=False)
+    content_hash = Column(String(64), nullable=True)
+    
+    # Processing status
+    chunk_count = Column(Integer, default=0)  # Number of chunks created
+    status = Column(Enum(DocumentStatus), nullable=False, default=DocumentStatus.PENDING)
+    progress = Column(Integer, nullable=False, default=0)  # Percent, polled by clients
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    deleted_at = Column(DateTime, nullable=True)  # Pending background delete
+    
+    # Foreign key to User
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    
+    # Relationships
+    owner = relationship("User", back_populates="documents")
+    chunks = relationship("DocumentChunk", back_populates="document", passive_deletes=True)
+    
+    def __repr__(self):
         return f"<Document {self.title}>"
\ No newline at end of file
@@ -0,0 +1,79 @@
+from sqlalchemy import Column, Enum, Integer, String, Text, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from pgvector.sqlalchemy import Vector
+from app.core.config import settings
+from app.db.session import Base
+from app.models.document import DocumentType
+
+
+class DocumentChunk(Base):
+    """
+    Document chunk model.
+    
+    A piece of a document's text plus its embedding. Retrieval searches
+    chunks, not whole documents.
+    
+    Chunks are written in bulk (COPY / multi-row INSERT) during ingestion.
+    A re-upload only inserts chunks whose content_hash is new, deletes
+    the ones that disappeared and renumbers the rest; text and embedding
+    are never edited, so chunks carry no updated_at timestamp.
+    
+    On Postgres the table also has a generated `search_vector` tsvector
+    column (GIN indexed) for keyword search. It is maintained by the
+    database and deliberately not mapped here.
+    
+    owner_id and doc_type are copied from the document when a chunk is
+    written, so searches can filter chunks without a join: Postgres has a
+    partial vector index per doc_type, and a btree on (owner_id, doc_type)
+    lets the planner search a small owner's chunks exactly instead of
+    post-filtering the shared ANN index. A document's owner and type never
+    change after upload.
+    
+    Attributes:
+        id: Primary key
+        document_id: Foreign key to Document
+        ordinal: Position of the chunk within the document (0, 1, 2, ...)
+        text: The chunk text
+        page: Page number the chunk came from (PDFs only)
+        token_count: Tokens in text (counted once, at ingestion)
+        content_hash: SHA-256 of text, used to diff re-uploads
+        owner_id: Copy of document.owner_id (search filter)
+        doc_type: Copy of document.doc_type (search filter)
+        embedding: Embedding vector (pgvector), filled in by the embedder
+        
+    Relationships:
+        document: The document this chunk belongs to
+    """
+    
+    __tablename__ = "document_chunks"
+    __table_args__ = (
+        # Serves "all chunks of a document, in order"
+        Index("ix_document_chunks_document_id_ordinal", "document_id", "ordinal"),
+        # Serves owner / doc_type pre-filtered searches
+        Index("ix_document_chunks_owner_id_doc_type", "owner_id", "doc_type"),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    
+    # Foreign key to Document
+    document_id = Column(Integer, ForeignKey("documents.id", ondelete="CASCADE"), nullable=False)
+    
+    # Chunk content
+    ordinal = Column(Integer, nullable=False)
+    text = Column(Text, nullable=False)
+    page = Column(Integer, nullable=True)
+    token_count = Column(Integer, nullable=False, default=0)
+    content_hash = Column(String(64), nullable=True)  # NULL for chunks stored before hashing
+    
+    # Search filters, denormalised from the document
+    owner_id = Column(Integer, nullable=False)
+    doc_type = Column(Enum(DocumentType), nullable=True)
+    
+    # Semantic search
+    embedding = Column(Vector(settings.EMBEDDING_DIM), nullable=True)
+    
+    # Relationship
+    document = relationship("Document", back_populates="chunks")
+    
+    def __repr__(self):
+        return f"<DocumentChunk {self.document_id}#{self.ordinal}>"
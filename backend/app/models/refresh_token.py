@@ -0,0 +1,46 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from app.db.session import Base
+from app.db.base_class import TimestampMixin
+
+
+class RefreshToken(Base, TimestampMixin):
+    """
+    Refresh token model.
+    
+    Long-lived tokens that can be exchanged for a new access token
+    without sending the password again (no bcrypt on renewal).
+    Only a SHA-256 hash of the token is stored, so a database leak
+    does not leak usable tokens. Tokens are single-use: each refresh
+    revokes the old token and issues a new one (rotation).
+    
+    Attributes:
+        id: Primary key
+        token_hash: SHA-256 hex digest of the token (unique lookup index)
+        user_id: Foreign key to User
+        expires_at: When the token stops being accepted
+        revoked_at: When the token was used or revoked (None = still valid)
+        replaced_by_id: The token issued when this one was rotated
+        
+    Relationships:
+        user: The user this token belongs to
+    """
+    
+    __tablename__ = "refresh_tokens"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    token_hash = Column(String(64), unique=True, index=True, nullable=False)
+    
+    # Foreign key to User
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    
+    # Lifecycle
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime, nullable=True)
+    replaced_by_id = Column(Integer, ForeignKey("refresh_tokens.id"), nullable=True)
+    
+    # Relationship
+    user = relationship("User", back_populates="refresh_tokens")
+    
+    def __repr__(self):
+        return f"<RefreshToken user={self.user_id} revoked={self.revoked_at is not None}>"
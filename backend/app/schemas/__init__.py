@@ -1,17 +1,22 @@
-from app.schemas.user import UserCreate, UserLogin, UserResponse, Token
-from app.schemas.document import DocumentCreate, DocumentResponse
-from app.schemas.conversation import ConversationCreate, ConversationResponse
-from app.schemas.message import MessageCreate, MessageResponse
-
-__all__ = [
-    "UserCreate",
-    "UserLogin", 
-    "UserResponse",
-    "Token",
-    "DocumentCreate",
-    "DocumentResponse",
-    "ConversationCreate",
-    "ConversationResponse",
-    "MessageCreate",
-    "MessageResponse",
+from app.schemas.user import UserCreate, UserLogin, UserAdminUpdate, UserResponse, Token, RefreshTokenRequest
+from app.schemas.document import DocumentCreate, DocumentResponse, DocumentStatusResponse
+from app.schemas.conversation import ConversationCreate, ConversationResponse
+from app.schemas.message import MessageCreate, MessageResponse, MessagePage, ChatRequest
+
+__all__ = [
+    "UserCreate",
+    "UserLogin", 
+    "UserAdminUpdate",
+    "UserResponse",
+    "Token",
+    "RefreshTokenRequest",
+    "DocumentCreate",
+    "DocumentResponse",
+    "DocumentStatusResponse",
+    "ConversationCreate",
+    "ConversationResponse",
+    "MessageCreate",
+    "MessageResponse",
+    "MessagePage",
+    "ChatRequest",
 ]
\ No newline at end of file
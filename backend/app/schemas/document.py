@@ -1,23 +1,39 @@
-from pydantic import BaseModel
-from typing import Optional
-from datetime import datetime
-from app.models.document import DocumentType
-
-
-class DocumentCreate(BaseModel):
-    title: str
-    description: Optional[str] = None
-    file_path: str
-    file_type: str
-    doc_type: DocumentType
-    size_bytes: int
-
-
-class DocumentResponse(DocumentCreate):
-    id: int
-    owner_id: int
-    chunk_count: int
-    created_at: datetime
-    
-    class Config:
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+from app.models.document import DocumentStatus, DocumentType
+
+
+class DocumentCreate(BaseModel):
+    title: str
+    description: Optional[str] = None
+    file_path: str
+    file_type: str
+    doc_type: DocumentType
+    size_bytes: int
+
+
+class DocumentResponse(DocumentCreate):
+    id: int
+    owner_id: int
+    chunk_count: int
+    content_hash: Optional[str] = None
+    status: DocumentStatus
+    progress: int
+    error: Optional[str] = None
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class DocumentStatusResponse(BaseModel):
+    """Ingestion progress, polled while a document is being processed."""
+    id: int
+    status: DocumentStatus
+    progress: int
+    chunk_count: int
+    error: Optional[str] = None
+    
+    class Config:
         from_attributes = True
\ No newline at end of file
@@ -1,19 +1,30 @@
-from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
-from datetime import datetime
-
-
-class MessageCreate(BaseModel):
-    content: str
-    conversation_id: int
-
-
-class MessageResponse(MessageCreate):
-    id: int
-    is_user: bool
-    sources: Optional[List[Dict[str, Any]]] = None
-    token_count: int
-    created_at: datetime
-    
-    class Config:
-        from_attributes = True
\ No newline at end of file
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict, Any
+from datetime import datetime
+from app.models.document import DocumentType
+
+
+class MessageCreate(BaseModel):
+    content: str
+    conversation_id: int
+
+
+class MessageResponse(MessageCreate):
+    id: int
+    is_user: bool
+    sources: Optional[List[Dict[str, Any]]] = None
+    token_count: int
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class ChatRequest(BaseModel):
+    content: str = Field(..., min_length=1, max_length=8000)
+    doc_type: Optional[DocumentType] = None  # Only search this kind of document
+
+
+class MessagePage(BaseModel):
+    items: List[MessageResponse]  # Oldest first
+    next_cursor: Optional[str] = None  # Pass as ?cursor= to get older messages
\ No newline at end of file
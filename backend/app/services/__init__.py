@@ -0,0 +1,5 @@
+"""
+Services package.
+
+Business logic that sits between the API routes and the database.
+"""
\ No newline at end of file
@@ -0,0 +1,142 @@
+"""
+Semantic answer cache.
+
+Students of one course ask the same question in many phrasings. Before
+retrieval and the LLM call, the question's embedding is compared with
+the questions already answered for the same owner and document set; a
+cosine similarity of ANSWER_CACHE_THRESHOLD or more returns the stored
+answer and sources instead.
+
+Entries are grouped by scope = (owner, doc_type filter, corpus version).
+Any document change bumps the corpus version (app.services.corpus), so
+older answers become unreachable at once and age out of the LRU.
+
+Only standalone questions are cached: an answer that depended on earlier
+messages of a conversation is neither stored nor served.
+
+Scopes live in the worker (one matrix-vector product per lookup); the
+shared Redis tier used by the other caches would have to ship every
+vector of a scope per lookup, so it is not used here.
+"""
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import metrics
+
+hits = metrics.counter("answer_cache_hits_total", "Questions answered from the semantic cache")
+misses = metrics.counter("answer_cache_misses_total", "Questions that needed retrieval and the LLM")
+hit_rate = metrics.gauge("answer_cache_hit_rate", "Share of cacheable questions answered from the cache")
+latency_saved = metrics.counter("answer_cache_latency_saved_seconds_total", "Answer time avoided by cache hits")
+cost_saved = metrics.counter("answer_cache_cost_saved_usd_total", "Estimated LLM spend avoided by cache hits")
+
+
+def estimate_cost(prompt_tokens: int, completion_tokens: int) -> float:
+    """USD cost of one completion at the configured per-1K-token prices."""
+    return (
+        prompt_tokens / 1000 * settings.LLM_PROMPT_COST_PER_1K_TOKENS
+        + completion_tokens / 1000 * settings.LLM_COMPLETION_COST_PER_1K_TOKENS
+    )
+
+
+@dataclass
+class CachedAnswer:
+    """
+    A stored answer.
+
+    Attributes:
+        latency: Seconds the original answer took (retrieval + stream)
+        cost: Estimated USD cost of the original LLM call
+    """
+    question: str
+    answer: str
+    sources: List[Dict[str, Any]]
+    latency: float
+    cost: float
+    created_at: float = field(default_factory=time.time)
+
+
+class _Scope:
+    """Unit-normalised question vectors of one scope, oldest first."""
+
+    def __init__(self, dim: int):
+        self.vectors = np.empty((0, dim), dtype=np.float32)
+        self.entries: List[CachedAnswer] = []
+
+
+class AnswerCache:
+    """
+    Args:
+        threshold: Minimum cosine similarity for a hit
+        max_entries: Answers per scope (oldest dropped first)
+        max_scopes: Scopes kept (least recently used dropped first)
+        ttl: Seconds a scope lives after its first answer
+    """
+
+    def __init__(self, threshold: float, max_entries: int, max_scopes: int, ttl: float):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.scopes = TTLCache(max_entries=max_scopes, ttl_seconds=ttl)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _unit(embedding: np.ndarray) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    @staticmethod
+    def scope_key(owner_id: int, doc_type: Optional[str], version: int) -> Tuple:
+        return (owner_id, doc_type, version)
+
+    def lookup(self, scope: Tuple, embedding: np.ndarray) -> Optional[Tuple[CachedAnswer, float]]:
+        """
+        Best cached answer within the threshold, with its similarity.
+
+        Counts a hit or a miss for the hit-rate metrics.
+        """
+        found = None
+        entries: Optional[_Scope] = self.scopes.get(scope)
+        if entries is not None and entries.entries:
+            scores = entries.vectors @ self._unit(embedding)
+            best = int(np.argmax(scores))
+            if scores[best] >= self.threshold:
+                found = (entries.entries[best], float(scores[best]))
+
+        if found is None:
+            self.misses += 1
+            misses.inc()
+        else:
+            self.hits += 1
+            hits.inc()
+        hit_rate.set(self.hits / (self.hits + self.misses))
+        return found
+
+    def store(self, scope: Tuple, embedding: np.ndarray, entry: CachedAnswer) -> None:
+        vector = self._unit(embedding)
+        entries: Optional[_Scope] = self.scopes.get(scope)
+        if entries is None:
+            entries = _Scope(len(vector))
+            self.scopes.set(scope, entries)
+
+        entries.vectors = np.vstack([entries.vectors, vector[None, :]])[-self.max_entries:]
+        entries.entries = (entries.entries + [entry])[-self.max_entries:]
+
+    @staticmethod
+    def record_hit(entry: CachedAnswer, elapsed: float) -> None:
+        """Add a hit's savings to the metrics (elapsed = time taken to serve it)."""
+        latency_saved.inc(max(0.0, entry.latency - elapsed))
+        cost_saved.inc(entry.cost)
+
+
+answer_cache = AnswerCache(
+    threshold=settings.ANSWER_CACHE_THRESHOLD,
+    max_entries=settings.ANSWER_CACHE_MAX_ENTRIES,
+    max_scopes=settings.ANSWER_CACHE_MAX_SCOPES,
+    ttl=settings.ANSWER_CACHE_TTL_SECONDS,
+)
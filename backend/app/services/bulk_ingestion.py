@@ -0,0 +1,354 @@
+"""
+Bulk ingestion of a directory tree (see `python -m app.ingest`).
+
+Seeding tens of thousands of files through the upload endpoint costs an
+HTTP request, a transaction and several embedding calls per file. Here:
+
+- files are copied into upload storage and parsed/chunked in a process
+  pool, so every core is busy parsing
+- each file's chunks are embedded in EMBEDDING_BATCH_SIZE batches, and
+  several files are embedded at once, so the embedding scheduler merges
+  small files into full provider calls
+- one writer groups finished files into a single transaction
+  (Document rows + batched chunk inserts) per GROUP_CHUNKS chunks
+- at most `max_pending` files are in flight, which bounds memory
+
+Resuming: every file is journalled (JSON lines: source path, stored
+file path) before it is copied into storage, and again with its
+document id before its group commits. On restart a file counts as done
+only if that document row exists with that file path, i.e. its
+transaction committed; everything else is ingested again, and stored
+copies that never committed are removed.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.document import Document, DocumentStatus, DocumentType
+from app.services.chunk_store import insert_chunk_batch
+from app.services.chunking import Chunk
+from app.services.corpus import bump_corpus_version
+from app.services.embeddings import EmbeddingProvider, get_embedding_provider
+from app.services.ingestion import chunk_file
+from app.services.parsing import SUPPORTED_FILE_TYPES
+from app.services.retrieval.inprocess import index_document
+from app.services.storage import upload_path
+
+logger = logging.getLogger(__name__)
+
+# Chunks written per transaction (small files are grouped until this many)
+GROUP_CHUNKS = 2000
+GROUP_FILES = 200
+
+
+def iter_files(root: Path) -> Iterator[Path]:
+    """Supported files under `root`, in a stable (sorted) order."""
+    for directory, subdirs, names in os.walk(root):
+        subdirs.sort()
+        for name in sorted(names):
+            if os.path.splitext(name)[1].lower() in SUPPORTED_FILE_TYPES:
+                yield Path(directory) / name
+
+
+def prepare_file(source: str, dest: str, file_type: str) -> Tuple[List[Chunk], int, str]:
+    """
+    Copy a file into upload storage and chunk it (runs in a worker process).
+
+    Returns:
+        (chunks, size in bytes, SHA-256 of the content)
+    """
+    Path(dest).parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(source, dest)
+    try:
+        with open(dest, "rb") as f:
+            sha256 = hashlib.file_digest(f, "sha256").hexdigest()
+        return chunk_file(dest, file_type), os.path.getsize(dest), sha256
+    except BaseException:
+        os.remove(dest)
+        raise
+
+
+class IngestJournal:
+    """Append-only JSON-lines record of the files copied to storage and the groups about to commit."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def load(self) -> List[dict]:
+        try:
+            with open(self.path) as f:
+                return [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    def record(self, entries: List[dict]) -> None:
+        with open(self.path, "a") as f:
+            f.writelines(json.dumps(entry) + "\n" for entry in entries)
+            f.flush()
+            os.fsync(f.fileno())  # Must be on disk before the transaction commits
+
+
+async def completed_sources(
+    session_factory: async_sessionmaker[AsyncSession],
+    entries: List[dict],
+    batch_size: int = 1000
+) -> Set[str]:
+    """
+    Journalled sources whose document committed.
+
+    Files copied to storage that no committed document points at are
+    removed.
+    """
+    done: Set[str] = set()
+    kept: Set[str] = set()
+    grouped = [entry for entry in entries if "document_id" in entry]
+    async with session_factory() as db:
+        for start in range(0, len(grouped), batch_size):
+            batch = grouped[start:start + batch_size]
+            rows = await db.execute(
+                select(Document.id, Document.file_path)
+                .where(Document.id.in_([entry["document_id"] for entry in batch]))
+            )
+            committed = {(row.id, row.file_path) for row in rows}
+            for entry in batch:
+                if (entry["document_id"], entry["file_path"]) in committed:
+                    done.add(entry["source"])
+                    kept.add(entry["file_path"])
+
+    for entry in entries:
+        if entry["file_path"] not in kept and os.path.exists(entry["file_path"]):
+            os.remove(entry["file_path"])
+    return done
+
+
+@dataclass
+class IngestStats:
+    files: int = 0
+    chunks: int = 0
+    bytes: int = 0
+    skipped: int = 0  # Already ingested by an earlier run
+    failed: int = 0
+    started: float = field(default_factory=time.perf_counter)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def chunks_per_second(self) -> float:
+        return self.chunks / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.files} files, {self.chunks} chunks, {self.bytes / 1e6:.1f} MB in {self.elapsed:.1f}s "
+            f"({self.files_per_second:.1f} files/s, {self.chunks_per_second:.0f} chunks/s); "
+            f"{self.skipped} skipped, {self.failed} failed"
+        )
+
+
+@dataclass
+class _Prepared:
+    source: str
+    dest: str
+    file_type: str
+    size_bytes: int
+    content_hash: str
+    chunks: List[Chunk]
+    embeddings: list
+
+
+class BulkIngester:
+    """
+    Ingest every supported file under a directory for one owner.
+
+    Args:
+        owner_id: User the documents belong to
+        doc_type: Category given to every document
+        journal: Resume journal
+        pool: Runs prepare_file() (a ProcessPoolExecutor in production)
+        session_factory: Sessions for the writer
+        embedder: Defaults to get_embedding_provider()
+        max_pending: Files parsed/embedded but not yet written, at most
+        report: Called with the stats every `report_every` seconds
+    """
+
+    def __init__(
+        self,
+        owner_id: int,
+        doc_type: DocumentType,
+        journal: IngestJournal,
+        pool: Executor,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        embedder: Optional[EmbeddingProvider] = None,
+        max_pending: int = 32,
+        embed_batch_size: int = settings.EMBEDDING_BATCH_SIZE,
+        report: Optional[Callable[[IngestStats], None]] = None,
+        report_every: float = 5.0
+    ):
+        self.owner_id = owner_id
+        self.doc_type = doc_type
+        self.journal = journal
+        self.pool = pool
+        self.session_factory = session_factory
+        self.embedder = embedder if embedder is not None else get_embedding_provider()
+        self.max_pending = max_pending
+        self.embed_batch_size = embed_batch_size
+        self.report = report
+        self.report_every = report_every
+        self.stats = IngestStats()
+        self._reported = 0.0
+
+    async def run(self, root: Path) -> IngestStats:
+        root = Path(root).resolve()
+        done = await completed_sources(self.session_factory, self.journal.load())
+
+        self.stats = IngestStats()
+        slots = asyncio.Semaphore(self.max_pending)
+        written: asyncio.Queue = asyncio.Queue()
+        writer = asyncio.create_task(self._write(written, slots))
+        tasks: Set[asyncio.Task] = set()
+
+        for path in iter_files(root):
+            source = str(path.relative_to(root))
+            if source in done:
+                self.stats.skipped += 1
+                continue
+            # A slot is released once the file is written (or has failed)
+            if not await self._acquire(slots, writer):
+                break  # Writer failed; stop feeding it and surface its error below
+            task = asyncio.create_task(self._prepare(root, source, written, slots))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.gather(*tasks)
+        await written.put(None)
+        await writer
+        self._report(force=True)
+        return self.stats
+
+    @staticmethod
+    async def _acquire(slots: asyncio.Semaphore, writer: asyncio.Task) -> bool:
+        """Wait for a free slot; False if the writer stopped first."""
+        acquire = asyncio.ensure_future(slots.acquire())
+        await asyncio.wait({acquire, writer}, return_when=asyncio.FIRST_COMPLETED)
+        if acquire.done():
+            return True
+        acquire.cancel()
+        return False
+
+    async def _prepare(self, root: Path, source: str, written: asyncio.Queue, slots: asyncio.Semaphore) -> None:
+        """Parse (in the pool) and embed one file, then hand it to the writer."""
+        file_type = os.path.splitext(source)[1].lower()
+        dest = str(upload_path(self.owner_id, f"{uuid.uuid4().hex}{file_type}"))
+        # Journalled before the copy exists, so a crash cannot leave it untracked
+        self.journal.record([{"source": source, "file_path": dest}])
+        loop = asyncio.get_running_loop()
+        try:
+            chunks, size_bytes, content_hash = await loop.run_in_executor(
+                self.pool, prepare_file, str(root / source), dest, file_type
+            )
+            embeddings = []
+            if self.embedder is not None:
+                for start in range(0, len(chunks), self.embed_batch_size):
+                    batch = chunks[start:start + self.embed_batch_size]
+                    embeddings.append(await self.embedder.embed([chunk.text for chunk in batch]))
+        except Exception as exc:
+            logger.warning("Skipping %s: %s: %s", source, type(exc).__name__, exc)
+            if os.path.exists(dest):
+                os.remove(dest)
+            self.stats.failed += 1
+            slots.release()
+            return
+
+        await written.put(_Prepared(source, dest, file_type, size_bytes, content_hash, chunks, embeddings))
+
+    async def _write(self, written: asyncio.Queue, slots: asyncio.Semaphore) -> None:
+        """Commit prepared files in groups of about GROUP_CHUNKS chunks."""
+        finished = False
+        while not finished:
+            item = await written.get()
+            if item is None:
+                return
+            group = [item]
+            while sum(len(i.chunks) for i in group) < GROUP_CHUNKS and len(group) < GROUP_FILES:
+                try:
+                    item = written.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if item is None:
+                    finished = True
+                    break
+                group.append(item)
+
+            await self._commit_group(group)
+            for item in group:
+                self.stats.files += 1
+                self.stats.chunks += len(item.chunks)
+                self.stats.bytes += item.size_bytes
+                slots.release()
+            self._report()
+
+    async def _commit_group(self, group: List[_Prepared]) -> None:
+        async with self.session_factory() as db:
+            documents = [
+                Document(
+                    title=os.path.basename(item.source),
+                    file_path=item.dest,
+                    file_type=item.file_type,
+                    doc_type=self.doc_type,
+                    size_bytes=item.size_bytes,
+                    content_hash=item.content_hash,
+                    owner_id=self.owner_id,
+                    chunk_count=len(item.chunks),
+                    status=DocumentStatus.READY,
+                    progress=100
+                )
+                for item in group
+            ]
+            db.add_all(documents)
+            await db.flush()  # Assign ids for the journal and the chunk rows
+
+            self.journal.record([
+                {"source": item.source, "document_id": document.id, "file_path": item.dest}
+                for item, document in zip(group, documents)
+            ])
+
+            for item, document in zip(group, documents):
+                for i, start in enumerate(range(0, len(item.chunks), self.embed_batch_size)):
+                    batch = item.chunks[start:start + self.embed_batch_size]
+                    await insert_chunk_batch(
+                        db, document.id, batch, item.embeddings[i] if item.embeddings else None,
+                        self.owner_id, self.doc_type
+                    )
+            await bump_corpus_version(db, self.owner_id)
+            await db.commit()
+
+            if settings.RETRIEVER_BACKEND == "numpy":
+                for document in documents:
+                    await index_document(db, self.owner_id, document.id)
+
+    def _report(self, force: bool = False) -> None:
+        now = time.perf_counter()
+        if self.report is not None and (force or now - self._reported >= self.report_every):
+            self._reported = now
+            self.report(self.stats)
+
@@ -0,0 +1,310 @@
+"""
+Chat turns: retrieve -> build prompt -> stream -> persist.
+
+The route does retrieval and prompt assembly up front, then returns a
+Server-Sent-Events stream that forwards LLM fragments as they arrive.
+Nothing is written to the database while tokens are flowing: the user
+message and the finished AI message are saved by a background task that
+runs after the last event has been sent, so a slow commit never delays
+the first (or any) token.
+
+Standalone questions go through the semantic answer cache first
+(app.services.answer_cache): a hit streams the stored answer without
+retrieval or an LLM call, and a fresh answer is stored once it is saved.
+Identical questions asked at the same moment share one retrieval and one
+LLM stream (app.services.single_flight).
+"""
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.db.session import AsyncSessionLocal
+from app.models.conversation import Conversation
+from app.models.document import DocumentType
+from app.models.message import Message
+from app.services.answer_cache import AnswerCache, CachedAnswer, answer_cache, estimate_cost
+from app.services.context import CONTEXT_HEADER, PASSAGE_SEPARATOR, PackedContext, passage_header
+from app.services.embeddings import get_embedding_provider
+from app.services.embeddings.cache import normalize_text
+from app.services.llm import ChatMessage, LLMBackend
+from app.services.memory import ConversationMemory, MemoryWindow, conversation_memory, message_tokens
+from app.services.retrieval import RetrievalQuery, RetrievedChunk, get_retriever
+from app.services.single_flight import SingleFlight, StreamFlight, prompt_key
+from app.services.tokens import count_tokens, count_tokens_cached
+
+logger = logging.getLogger(__name__)
+
+time_to_first_token = metrics.histogram("chat_time_to_first_token_seconds", "Request start to first streamed token")
+stream_duration = metrics.histogram("chat_stream_seconds", "Request start to last streamed token")
+persist_failures = metrics.counter("chat_persist_failures_total", "Chat turns that could not be saved")
+
+DEFAULT_TITLE = "New Conversation"
+TITLE_LENGTH = 60
+
+SYSTEM_PROMPT = (
+    "You are a study assistant for a student's course materials and code. "
+    "Answer using the numbered context passages below and cite them like [1]. "
+    "If the context does not contain the answer, say so instead of guessing."
+)
+SUMMARY_HEADER = "\n\nSummary of the earlier conversation:\n"
+
+
+@dataclass
+class ChatTurn:
+    """
+    One question and its streamed answer.
+
+    Filled in by stream_chat and saved by persist_turn afterwards.
+    """
+    conversation_id: int
+    question: str
+    sources: List[Dict[str, Any]]
+    started: float = field(default_factory=time.perf_counter)
+    asked_at: datetime = field(default_factory=datetime.utcnow)
+    parts: List[str] = field(default_factory=list)
+    completed: bool = False
+    duration: Optional[float] = None  # Seconds from start to the last token
+    # Answer cache: where to store the answer (None = not cacheable)
+    cache_scope: Optional[Tuple] = None
+    embedding: Optional[np.ndarray] = None
+    prompt_tokens: int = 0
+    cached: bool = False  # Served from the answer cache
+
+    @property
+    def answer(self) -> str:
+        return "".join(self.parts)
+
+
+async def embed_question(question: str) -> Optional[np.ndarray]:
+    """The question's embedding, or None when embeddings are off."""
+    embedder = get_embedding_provider()
+    return (await embedder.embed([question]))[0] if embedder is not None else None
+
+
+async def retrieve_context(
+    owner_id: int,
+    question: str,
+    doc_type: Optional[DocumentType] = None,
+    k: int = settings.CHAT_CONTEXT_CHUNKS,
+    embedding: Optional[np.ndarray] = None,
+    flight: Optional[SingleFlight] = None
+) -> List[RetrievedChunk]:
+    """
+    Find the chunks of the user's documents most relevant to the question.
+
+    Pass `embedding` when the question was already embedded (e.g. for the
+    answer cache) to avoid embedding it twice. With a `flight`, concurrent
+    calls for the same owner, filter and (normalised) question share one
+    search.
+    """
+    if flight is not None:
+        key = (owner_id, doc_type, k, normalize_text(question))
+        return await flight.do(key, lambda: retrieve_context(owner_id, question, doc_type, k, embedding))
+
+    if embedding is None:
+        embedding = await embed_question(question)
+
+    retriever = get_retriever()
+    if embedding is None and retriever.needs_embedding:
+        return []
+
+    query = RetrievalQuery(text=question, owner_id=owner_id, embedding=embedding, doc_type=doc_type)
+    return await retriever.search(query, k)
+
+
+def source_list(context: List[RetrievedChunk]) -> List[Dict[str, Any]]:
+    """Citations stored on the AI message (index matches the [n] in the prompt)."""
+    return [
+        {
+            "index": n,
+            "document_id": chunk.document_id,
+            "chunk_id": chunk.chunk_id,
+            "page": chunk.page,
+            "score": round(float(chunk.score), 4),
+        }
+        for n, chunk in enumerate(context, start=1)
+    ]
+
+
+def build_messages(
+    question: str,
+    context: List[RetrievedChunk],
+    memory: MemoryWindow,
+    context_tokens: Optional[int] = None
+) -> List[ChatMessage]:
+    """
+    Assemble the prompt: instructions + summary + numbered context, recent messages, question.
+
+    With `context_tokens` (PackedContext.token_count) every message carries
+    its token count, taken from stored counts as in prompt_token_count.
+    """
+    blocks = [passage_header(n, chunk) + chunk.text for n, chunk in enumerate(context, start=1)]
+    history = [(message, message_tokens(message)) for message in memory.messages]
+
+    system = SYSTEM_PROMPT
+    system_tokens = None
+    if context_tokens is not None:
+        system_tokens = count_tokens_cached(SYSTEM_PROMPT) + context_tokens
+    if memory.summary:
+        system += SUMMARY_HEADER + memory.summary
+        if system_tokens is not None:
+            summary_tokens = memory.token_count - sum(tokens for _, tokens in history)
+            system_tokens += count_tokens_cached(SUMMARY_HEADER) + summary_tokens
+    if blocks:
+        system += CONTEXT_HEADER + PASSAGE_SEPARATOR.join(blocks)
+
+    known = context_tokens is not None
+    messages = [ChatMessage("system", system, system_tokens)]
+    messages.extend(
+        ChatMessage("user" if message.is_user else "assistant", message.content, tokens if known else None)
+        for message, tokens in history
+    )
+    messages.append(ChatMessage("user", question, count_tokens(question) if known else None))
+    return messages
+
+
+def prompt_token_count(question: str, context: PackedContext, memory: MemoryWindow) -> int:
+    """
+    Tokens in the prompt build_messages assembles, from stored counts.
+
+    Chunks and messages were counted when they were saved; only the
+    question is new, and the fixed parts come from the token LRU.
+    """
+    tokens = count_tokens_cached(SYSTEM_PROMPT) + context.token_count + memory.token_count + count_tokens(question)
+    if memory.summary:
+        tokens += count_tokens_cached(SUMMARY_HEADER)
+    return tokens
+
+
+def sse_event(event: str, data: Any) -> str:
+    """
+    Format one Server-Sent Event (data is JSON, so newlines are safe).
+
+    Example:
+        >>> sse_event("token", {"text": "Hi"})
+        'event: token\\ndata: {"text": "Hi"}\\n\\n'
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def stream_chat(
+    turn: ChatTurn,
+    backend: LLMBackend,
+    messages: List[ChatMessage],
+    flight: Optional[StreamFlight] = None
+) -> AsyncIterator[str]:
+    """
+    Stream a turn as SSE: `sources`, then one `token` per fragment, then `done`.
+
+    A backend failure ends the stream with an `error` event. The turn is
+    marked completed only if the backend finished. With a `flight`,
+    concurrent turns with the same prompt share one backend stream.
+    """
+    yield sse_event("sources", turn.sources)
+
+    if flight is not None:
+        fragments = flight.stream(prompt_key(backend.model, messages), lambda: backend.stream(messages))
+    else:
+        fragments = backend.stream(messages)
+
+    try:
+        async for fragment in fragments:
+            if not turn.parts:
+                time_to_first_token.observe(time.perf_counter() - turn.started)
+            turn.parts.append(fragment)
+            yield sse_event("token", {"text": fragment})
+    except Exception:
+        logger.exception("LLM backend %s failed", backend.name)
+        yield sse_event("error", {"detail": "The model failed to answer, please retry"})
+        return
+
+    turn.completed = True
+    turn.duration = time.perf_counter() - turn.started
+    stream_duration.observe(turn.duration)
+    yield sse_event("done", {"token_count": count_tokens(turn.answer)})
+
+
+async def stream_cached(turn: ChatTurn, entry: CachedAnswer, similarity: float) -> AsyncIterator[str]:
+    """
+    Stream a cached answer with the same events as stream_chat.
+
+    The whole answer is one `token` event; `done` carries `cached: true`
+    and the similarity to the cached question.
+    """
+    yield sse_event("sources", turn.sources)
+    turn.parts.append(entry.answer)
+    yield sse_event("token", {"text": entry.answer})
+    turn.completed = True
+    turn.duration = time.perf_counter() - turn.started
+    AnswerCache.record_hit(entry, turn.duration)
+    yield sse_event("done", {
+        "token_count": count_tokens(entry.answer),
+        "cached": True,
+        "similarity": round(similarity, 4),
+    })
+
+
+def cache_turn(turn: ChatTurn, cache: AnswerCache = answer_cache) -> None:
+    """Store a finished, cacheable answer (runs after the response)."""
+    if not turn.completed or turn.cached or turn.cache_scope is None or turn.embedding is None:
+        return
+    cache.store(turn.cache_scope, turn.embedding, CachedAnswer(
+        question=turn.question,
+        answer=turn.answer,
+        sources=turn.sources,
+        latency=turn.duration or 0.0,
+        cost=estimate_cost(turn.prompt_tokens, count_tokens(turn.answer)),
+    ))
+
+
+async def persist_turn(
+    turn: ChatTurn,
+    session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+    memory: ConversationMemory = conversation_memory
+) -> None:
+    """
+    Save the user message and (if the stream finished) the AI message,
+    then fold older turns into the conversation summary if needed.
+
+    Runs as a background task after the response, so it uses its own session.
+    """
+    try:
+        async with session_factory() as db:
+            db.add(Message(
+                content=turn.question,
+                is_user=True,
+                conversation_id=turn.conversation_id,
+                token_count=count_tokens(turn.question),
+                created_at=turn.asked_at,
+                updated_at=turn.asked_at
+            ))
+            if turn.completed:
+                db.add(Message(
+                    content=turn.answer,
+                    is_user=False,
+                    conversation_id=turn.conversation_id,
+                    sources=turn.sources,
+                    token_count=count_tokens(turn.answer)
+                ))
+
+            conversation = await db.get(Conversation, turn.conversation_id)
+            if conversation is not None:
+                if not conversation.title or conversation.title == DEFAULT_TITLE:
+                    conversation.title = turn.question.strip()[:TITLE_LENGTH]
+                conversation.updated_at = datetime.utcnow()
+
+            await db.commit()
+
+            if conversation is not None:
+                await memory.update(db, conversation)
+    except Exception:
+        persist_failures.inc()
+        logger.exception("Could not save chat turn for conversation %s", turn.conversation_id)
@@ -0,0 +1,166 @@
+"""
+Bulk writes of document chunks.
+
+Ingestion can produce thousands of chunks per document. Adding them one
+ORM object at a time costs a round-trip (and Python overhead) per row, so
+chunks are written in batches instead:
+
+- Postgres (asyncpg): COPY ... FROM STDIN in CSV format
+- Other databases: one multi-row INSERT per batch
+
+Re-uploads remove and renumber chunks in bulk as well (DELETE ... IN,
+executemany UPDATE by primary key).
+
+Every row also carries its document's owner_id and doc_type, which
+retrieval filters on (see DocumentChunk).
+"""
+import csv
+import io
+from itertools import islice
+from typing import Iterator, List, Optional, Sequence
+
+import numpy as np
+from pgvector.utils import Vector
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.document import Document, DocumentType
+from app.models.document_chunk import DocumentChunk
+from app.services.chunking import Chunk
+
+COPY_COLUMNS = [
+    "document_id", "ordinal", "text", "page", "token_count", "content_hash", "owner_id", "doc_type", "embedding"
+]
+
+
+def next_batch(chunks: Iterator[Chunk], size: int = settings.CHUNK_INSERT_BATCH_SIZE) -> List[Chunk]:
+    """Pull up to `size` chunks from a (lazy) chunk iterator."""
+    return list(islice(chunks, size))
+
+
+def _copy_payload(
+    document_id: int,
+    chunks: Sequence[Chunk],
+    embeddings: Optional[np.ndarray],
+    owner_id: int,
+    doc_type: Optional[DocumentType]
+) -> bytes:
+    """Render a batch as CSV for COPY (empty unquoted field = NULL)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    doc_type = doc_type.name if doc_type is not None else None  # Postgres enum labels are the names
+    for i, chunk in enumerate(chunks):
+        embedding = Vector._to_db(embeddings[i]) if embeddings is not None else None
+        writer.writerow([
+            document_id, chunk.ordinal, chunk.text, chunk.page, chunk.token_count, chunk.content_hash,
+            owner_id, doc_type, embedding
+        ])
+    return buffer.getvalue().encode()
+
+
+async def _document_scope(db: AsyncSession, document_id: int):
+    """(owner_id, doc_type) of a document, copied onto its chunks."""
+    row = (await db.execute(
+        select(Document.owner_id, Document.doc_type).where(Document.id == document_id)
+    )).one()
+    return row.owner_id, row.doc_type
+
+
+async def insert_chunk_batch(
+    db: AsyncSession,
+    document_id: int,
+    chunks: Sequence[Chunk],
+    embeddings: Optional[np.ndarray] = None,
+    owner_id: Optional[int] = None,
+    doc_type: Optional[DocumentType] = None
+) -> int:
+    """
+    Write one batch of chunks in a single statement.
+
+    Runs inside the session's current transaction; the caller commits.
+
+    Args:
+        db: Session whose transaction the rows are written in
+        document_id: Owning document (must already be flushed)
+        chunks: Chunks to write
+        embeddings: Optional (len(chunks), EMBEDDING_DIM) float32 matrix
+        owner_id, doc_type: The document's owner and type; looked up
+            when owner_id is not given
+
+    Returns:
+        Number of rows written
+    """
+    if not chunks:
+        return 0
+    if owner_id is None:
+        owner_id, doc_type = await _document_scope(db, document_id)
+
+    connection = await db.connection()
+
+    if connection.dialect.name == "postgresql" and connection.dialect.driver == "asyncpg":
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_to_table(
+            DocumentChunk.__tablename__,
+            source=io.BytesIO(_copy_payload(document_id, chunks, embeddings, owner_id, doc_type)),
+            columns=COPY_COLUMNS,
+            format="csv"
+        )
+    else:
+        rows = [
+            {
+                "document_id": document_id,
+                "ordinal": chunk.ordinal,
+                "text": chunk.text,
+                "page": chunk.page,
+                "token_count": chunk.token_count,
+                "content_hash": chunk.content_hash,
+                "owner_id": owner_id,
+                "doc_type": doc_type,
+                "embedding": embeddings[i] if embeddings is not None else None,
+            }
+            for i, chunk in enumerate(chunks)
+        ]
+        await db.execute(insert(DocumentChunk), rows)
+
+    return len(chunks)
+
+
+async def delete_chunks(
+    db: AsyncSession,
+    chunk_ids: Sequence[int],
+    batch_size: int = settings.DELETE_BATCH_SIZE
+) -> int:
+    """Delete chunks by id, `batch_size` ids per statement; the caller commits."""
+    for start in range(0, len(chunk_ids), batch_size):
+        await db.execute(
+            delete(DocumentChunk).where(DocumentChunk.id.in_(chunk_ids[start:start + batch_size])),
+            execution_options={"synchronize_session": False}
+        )
+    return len(chunk_ids)
+
+
+async def last_chunk_id(db: AsyncSession, document_id: int) -> int:
+    """Highest chunk id of a document (0 if it has none); later inserts get larger ids."""
+    result = await db.execute(select(func.max(DocumentChunk.id)).where(DocumentChunk.document_id == document_id))
+    return result.scalar() or 0
+
+
+async def delete_chunks_after(db: AsyncSession, document_id: int, chunk_id: int) -> None:
+    """Delete a document's chunks inserted after `chunk_id`; the caller commits."""
+    await db.execute(
+        delete(DocumentChunk).where(DocumentChunk.document_id == document_id, DocumentChunk.id > chunk_id),
+        execution_options={"synchronize_session": False}
+    )
+
+
+async def update_chunk_positions(db: AsyncSession, positions: Sequence[dict]) -> int:
+    """
+    Renumber kept chunks in one executemany; the caller commits.
+
+    Args:
+        positions: [{"id": ..., "ordinal": ..., "page": ...}, ...]
+    """
+    if positions:
+        await db.execute(update(DocumentChunk), list(positions))
+    return len(positions)
@@ -0,0 +1,90 @@
+"""
+Streaming text chunker.
+
+Turns a stream of Segments into overlapping Chunks of roughly CHUNK_SIZE
+characters. Only the current partial chunk is buffered, and chunks never
+span PDF pages, so every chunk can be cited with a single page number.
+"""
+import hashlib
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional
+
+from app.core.config import settings
+from app.services.parsing import Segment
+from app.services.tokens import count_tokens
+
+
+@dataclass
+class Chunk:
+    """A piece of document text ready to be embedded."""
+    ordinal: int  # Position of the chunk within its document
+    text: str
+    page: Optional[int]
+    token_count: int
+
+    @property
+    def content_hash(self) -> str:
+        """SHA-256 of the text; chunks with equal hashes share an embedding."""
+        return hashlib.sha256(self.text.encode()).hexdigest()
+
+
+def _split_point(text: str, chunk_size: int) -> int:
+    """Cut at the last whitespace before chunk_size (or hard-cut if none)."""
+    cut = text.rfind(" ", chunk_size // 2, chunk_size)
+    if cut == -1:
+        cut = text.rfind("\n", chunk_size // 2, chunk_size)
+    return cut if cut != -1 else chunk_size
+
+
+def _overlap_start(text: str, cut: int, overlap: int) -> int:
+    """Start the next chunk `overlap` characters back, on a word boundary."""
+    start = max(cut - overlap, 0)
+    boundary = text.find(" ", start, cut)
+    return boundary + 1 if boundary != -1 else cut
+
+
+def chunk_segments(
+    segments: Iterable[Segment],
+    chunk_size: int = settings.CHUNK_SIZE,
+    overlap: int = settings.CHUNK_OVERLAP
+) -> Iterator[Chunk]:
+    """
+    Split segments into overlapping chunks.
+
+    Example:
+        >>> chunks = list(chunk_segments([Segment("word " * 500, page=1)]))
+        >>> chunks[0].page, chunks[0].ordinal
+        (1, 0)
+    """
+    if overlap >= chunk_size:
+        raise ValueError("overlap must be smaller than chunk_size")
+
+    ordinal = 0
+    buffer = ""
+    page: Optional[int] = None
+
+    def make_chunk(text: str) -> Chunk:
+        nonlocal ordinal
+        chunk = Chunk(ordinal=ordinal, text=text, page=page, token_count=count_tokens(text))
+        ordinal += 1
+        return chunk
+
+    for segment in segments:
+        if segment.page != page:
+            # Flush what is left of the previous page; no overlap across pages
+            if buffer.strip():
+                yield make_chunk(buffer.strip())
+            buffer = ""
+            page = segment.page
+
+        buffer = f"{buffer}\n{segment.text}" if buffer else segment.text
+
+        while len(buffer) >= chunk_size:
+            cut = _split_point(buffer, chunk_size)
+            text = buffer[:cut].strip()
+            if text:
+                yield make_chunk(text)
+            buffer = buffer[_overlap_start(buffer, cut, overlap):]
+
+    if buffer.strip():
+        yield make_chunk(buffer.strip())
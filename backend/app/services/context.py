@@ -0,0 +1,188 @@
+"""
+Token-budgeted context packing.
+
+Retrieval returns more candidate chunks than fit in a prompt. Before they
+go in, the candidates are:
+
+1. merged: chunks of the same document page with consecutive ordinals
+   become one passage, with the text they share (the chunker's overlap)
+   kept once
+2. de-duplicated: a passage whose word shingles mostly match a better
+   passage (e.g. the same notes uploaded twice) is dropped
+3. packed: passages are taken best score first while they fit the token
+   budget; a merged passage that does not fit is retried piece by piece
+
+Sizes come from the token_count stored on each chunk at ingestion, so
+packing never re-tokenises chunk text. The only text counted per request
+is the short passage headers, through the LRU in count_tokens_cached.
+"""
+from dataclasses import dataclass, field, replace
+from typing import FrozenSet, List, Optional
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.retrieval import RetrievedChunk
+from app.services.tokens import count_tokens, count_tokens_cached
+
+merged_chunks = metrics.counter("context_merged_chunks_total", "Retrieved chunks merged into a neighbouring passage")
+duplicate_passages = metrics.counter("context_duplicate_passages_total", "Near-duplicate passages left out of prompts")
+overflow_passages = metrics.counter("context_over_budget_passages_total", "Passages left out because the budget was full")
+
+CONTEXT_HEADER = "\n\nContext:\n\n"
+PASSAGE_SEPARATOR = "\n\n"
+SHINGLE_SIZE = 3
+MIN_OVERLAP_CHARS = 10  # Shorter matches between neighbours are coincidence
+
+
+def passage_header(n: int, chunk: RetrievedChunk) -> str:
+    """
+    The line that introduces a passage in the prompt.
+
+    Example:
+        >>> passage_header(1, RetrievedChunk(chunk_id=7, document_id=4, score=0.9, page=2))
+        '[1] (document 4, page 2)\\n'
+    """
+    location = f"document {chunk.document_id}" + (f", page {chunk.page}" if chunk.page else "")
+    return f"[{n}] ({location})\n"
+
+
+def chunk_tokens(chunk: RetrievedChunk) -> int:
+    """Stored token count (counted once at ingestion)."""
+    # Chunks stored before token counts were recorded fall back to counting
+    return chunk.token_count or count_tokens(chunk.text or "")
+
+
+def join_overlapping(first: str, second: str, max_overlap: int = 2 * settings.CHUNK_OVERLAP) -> str:
+    """
+    Concatenate consecutive chunks, keeping the text they share only once.
+
+    Example:
+        >>> join_overlapping("a heap is a complete binary tree", "complete binary tree stored in an array")
+        'a heap is a complete binary tree stored in an array'
+    """
+    for start in range(max(0, len(first) - max_overlap), len(first) - MIN_OVERLAP_CHARS + 1):
+        if second.startswith(first[start:]) and (start == 0 or first[start - 1].isspace()):
+            return first + second[len(first) - start:]
+    return f"{first}\n{second}"
+
+
+@dataclass
+class Passage:
+    """One or more consecutive chunks of a page, as they will appear in the prompt."""
+    chunks: List[RetrievedChunk]
+    text: str
+    token_count: int
+    score: float
+    shingles: FrozenSet = field(default_factory=frozenset)
+
+    @classmethod
+    def of(cls, chunk: RetrievedChunk) -> "Passage":
+        return cls([chunk], chunk.text or "", chunk_tokens(chunk), chunk.score)
+
+    def extend(self, chunk: RetrievedChunk) -> None:
+        text = join_overlapping(self.text, chunk.text or "")
+        shared = len(self.text) + len(chunk.text or "") - len(text)
+        shared_tokens = count_tokens((chunk.text or "")[:shared]) if shared > 0 else 0
+        self.chunks.append(chunk)
+        self.text = text
+        self.token_count += chunk_tokens(chunk) - shared_tokens
+        self.score = max(self.score, chunk.score)
+
+    def as_chunk(self) -> RetrievedChunk:
+        """The passage as a single hit (cited by its best-scoring chunk)."""
+        best = max(self.chunks, key=lambda chunk: chunk.score)
+        return replace(best, ordinal=self.chunks[0].ordinal, text=self.text,
+                       token_count=self.token_count, score=self.score)
+
+
+@dataclass
+class PackedContext:
+    """The passages that made it into the prompt, best first, and their token cost."""
+    chunks: List[RetrievedChunk] = field(default_factory=list)
+    token_count: int = 0  # Passages + headers + separators
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> FrozenSet:
+    words = text.lower().split()
+    if len(words) <= size:
+        return frozenset([tuple(words)])
+    return frozenset(tuple(words[i:i + size]) for i in range(len(words) - size + 1))
+
+
+def similarity(a: FrozenSet, b: FrozenSet) -> float:
+    """Jaccard similarity of two shingle sets."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def merge_adjacent(candidates: List[RetrievedChunk]) -> List[Passage]:
+    """Merge chunks of the same document page with consecutive ordinals."""
+    ordered = sorted(
+        (chunk for chunk in candidates if chunk.text),
+        key=lambda chunk: (chunk.document_id, chunk.page or 0, chunk.ordinal if chunk.ordinal is not None else -1)
+    )
+    passages: List[Passage] = []
+    for chunk in ordered:
+        last = passages[-1].chunks[-1] if passages else None
+        if (
+            last is not None and chunk.ordinal is not None and last.ordinal is not None
+            and (chunk.document_id, chunk.page) == (last.document_id, last.page)
+            and chunk.ordinal - last.ordinal <= 1
+        ):
+            if chunk.ordinal == last.ordinal:
+                continue  # Same chunk returned twice
+            passages[-1].extend(chunk)
+            merged_chunks.inc()
+        else:
+            passages.append(Passage.of(chunk))
+    return passages
+
+
+def drop_duplicates(passages: List[Passage], threshold: float) -> List[Passage]:
+    """Keep passages best score first, skipping those too similar to one already kept."""
+    kept: List[Passage] = []
+    for passage in sorted(passages, key=lambda p: p.score, reverse=True):
+        passage.shingles = shingles(passage.text)
+        if any(similarity(passage.shingles, other.shingles) >= threshold for other in kept):
+            duplicate_passages.inc()
+            continue
+        kept.append(passage)
+    return kept
+
+
+def pack_context(
+    candidates: List[RetrievedChunk],
+    budget: int = settings.CHAT_CONTEXT_TOKEN_BUDGET,
+    duplicate_threshold: float = settings.CHAT_CONTEXT_DUPLICATE_THRESHOLD,
+    max_passages: Optional[int] = None
+) -> PackedContext:
+    """
+    Merge, de-duplicate and greedily pack candidates into `budget` tokens.
+
+    The returned chunks are numbered [1], [2], ... in the prompt in the
+    order given (best first); the token count includes their headers.
+    """
+    packed = PackedContext()
+    passages = drop_duplicates(merge_adjacent(candidates), duplicate_threshold)
+    if not passages:
+        return packed
+
+    used = count_tokens_cached(CONTEXT_HEADER)
+    queue = list(passages)
+    while queue and (max_passages is None or len(packed.chunks) < max_passages):
+        passage = queue.pop(0)
+        cost = count_tokens_cached(passage_header(len(packed.chunks) + 1, passage.chunks[0]))
+        cost += passage.token_count + (count_tokens_cached(PASSAGE_SEPARATOR) if packed.chunks else 0)
+        if used + cost <= budget:
+            packed.chunks.append(passage.as_chunk())
+            used += cost
+        elif len(passage.chunks) > 1:
+            # Too big as a whole: its pieces compete on their own scores
+            pieces = sorted((Passage.of(chunk) for chunk in passage.chunks), key=lambda p: p.score, reverse=True)
+            queue = sorted(pieces + queue, key=lambda p: p.score, reverse=True)
+        else:
+            overflow_passages.inc()
+
+    packed.token_count = used if packed.chunks else 0
+    return packed
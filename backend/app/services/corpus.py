@@ -0,0 +1,27 @@
+"""
+Corpus version: a per-user counter of changes to their document set.
+
+Anything derived from a user's documents (e.g. cached answers) records
+the version it was computed at and is ignored once the version moves.
+Every code path that makes documents appear, change or disappear calls
+bump_corpus_version() in the same transaction as the change.
+"""
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+
+
+async def corpus_version(db: AsyncSession, owner_id: int) -> int:
+    """Current version of the user's document set (one primary-key lookup)."""
+    result = await db.execute(select(User.corpus_version).where(User.id == owner_id))
+    return result.scalar_one_or_none() or 0
+
+
+async def bump_corpus_version(db: AsyncSession, owner_id: int) -> None:
+    """Invalidate everything derived from the user's documents; the caller commits."""
+    await db.execute(
+        update(User)
+        .where(User.id == owner_id)
+        .values(corpus_version=User.corpus_version + 1)
+    )
@@ -0,0 +1,78 @@
+"""
+Background deletion of documents.
+
+A document can have tens of thousands of chunks. Deleting it in the
+request, even with ON DELETE CASCADE, would hold one long transaction
+(and its row locks and WAL) while the client waits. Instead the endpoint
+only marks the document deleted (it disappears from listings and search
+immediately) and this job removes the chunks in short batches, each in
+its own transaction, and finally the document row and its file.
+"""
+import logging
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.db.session import AsyncSessionLocal
+from app.models.document import Document
+from app.models.document_chunk import DocumentChunk
+from app.services.storage import remove_file
+
+logger = logging.getLogger(__name__)
+
+purged_documents = metrics.counter("documents_purged_total", "Documents removed by the background delete job")
+purged_chunks = metrics.counter("document_chunks_purged_total", "Chunks removed by the background delete job")
+purge_failures = metrics.counter("document_purge_failures_total", "Background document deletes that failed")
+
+
+async def purge_document(
+    document_id: int,
+    session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+    batch_size: int = settings.DELETE_BATCH_SIZE
+) -> int:
+    """
+    Delete a document's chunks in batches, then the document and its file.
+
+    Safe to re-run: a purge interrupted half-way simply continues with the
+    chunks that are left.
+
+    Returns:
+        Number of chunks deleted
+    """
+    total = 0
+    try:
+        while True:
+            async with session_factory() as db:
+                batch = (
+                    select(DocumentChunk.id)
+                    .where(DocumentChunk.document_id == document_id)
+                    .limit(batch_size)
+                    .scalar_subquery()
+                )
+                result = await db.execute(
+                    delete(DocumentChunk).where(DocumentChunk.id.in_(batch)),
+                    execution_options={"synchronize_session": False}
+                )
+                await db.commit()
+            total += result.rowcount
+            purged_chunks.inc(result.rowcount)
+            if result.rowcount < batch_size:
+                break
+
+        async with session_factory() as db:
+            document = await db.get(Document, document_id)
+            if document is None:
+                return total
+            file_path = document.file_path
+            await db.delete(document)  # Chunks are gone; nothing left to cascade
+            await db.commit()
+
+        await remove_file(file_path)
+        purged_documents.inc()
+        return total
+    except Exception:
+        purge_failures.inc()
+        logger.exception("Could not purge document %s", document_id)
+        raise
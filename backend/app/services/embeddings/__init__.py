@@ -0,0 +1,67 @@
+"""
+Embedding package.
+
+Providers turn chunk texts and questions into vectors. They all share the
+EmbeddingProvider interface in base.py; get_embedding_provider() picks one
+from Settings and wraps it:
+
+    CachedEmbeddingProvider -> EmbeddingScheduler -> provider
+
+so cache hits return immediately and only misses are queued, merged with
+other callers' misses, and sent in shared batches.
+"""
+from functools import lru_cache
+from typing import Optional
+
+from app.core.config import settings
+from app.services.embeddings.base import EmbeddingProvider
+from app.services.embeddings.cache import CachedEmbeddingProvider, embedding_cache
+from app.services.embeddings.scheduler import EmbeddingScheduler
+
+_scheduler: Optional[EmbeddingScheduler] = None
+
+
+@lru_cache(maxsize=1)
+def get_embedding_provider() -> Optional[EmbeddingProvider]:
+    """
+    The provider selected by EMBEDDING_PROVIDER, or None when embeddings are off.
+
+    Built once per process, so API clients and their connection pools are
+    reused across requests.
+
+    - "openai": OpenAI embeddings API
+    - "hashing": local feature-hashing embedder (offline, no API key)
+    - "fake": deterministic random vectors (tests)
+    - "none": chunks are stored without embeddings
+    """
+    global _scheduler
+
+    if settings.EMBEDDING_PROVIDER == "none":
+        return None
+
+    if settings.EMBEDDING_PROVIDER == "openai":
+        from app.services.embeddings.openai_provider import OpenAIEmbeddingProvider
+        provider: EmbeddingProvider = OpenAIEmbeddingProvider()
+    elif settings.EMBEDDING_PROVIDER == "hashing":
+        from app.services.embeddings.hashing import HashingEmbeddingProvider
+        provider = HashingEmbeddingProvider()
+    elif settings.EMBEDDING_PROVIDER == "fake":
+        from app.services.embeddings.fake import FakeEmbeddingProvider
+        provider = FakeEmbeddingProvider()
+    else:
+        raise ValueError(f"Unknown EMBEDDING_PROVIDER '{settings.EMBEDDING_PROVIDER}'")
+
+    if settings.EMBEDDING_SCHEDULER_ENABLED:
+        provider = _scheduler = EmbeddingScheduler(provider)
+    if settings.EMBEDDING_CACHE_ENABLED:
+        provider = CachedEmbeddingProvider(provider, embedding_cache)
+    return provider
+
+
+async def close_embedding_provider() -> None:
+    """Stop the batching worker (called on application shutdown)."""
+    if _scheduler is not None:
+        await _scheduler.aclose()
+
+
+__all__ = ["EmbeddingProvider", "close_embedding_provider", "get_embedding_provider"]
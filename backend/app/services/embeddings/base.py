@@ -0,0 +1,25 @@
+"""
+Embedding provider interface.
+"""
+from abc import ABC, abstractmethod
+from typing import Sequence
+
+import numpy as np
+
+
+class EmbeddingProvider(ABC):
+    """
+    Turns texts into vectors.
+
+    Attributes:
+        model: Model name (part of every cache key, so vectors from
+            different models never mix)
+        dim: Length of each vector
+    """
+
+    model: str
+    dim: int
+
+    @abstractmethod
+    async def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Return a (len(texts), dim) float32 matrix, one row per text, in order."""
@@ -0,0 +1,164 @@
+"""
+Content-hash embedding cache.
+
+The same course material is uploaded by many students, and embedding it
+again gives the same vectors. Vectors are cached by
+(model name, SHA-256 of the normalised text) in two tiers:
+
+- local: per-worker TTL + LRU cache
+- redis: optional shared tier (REDIS_URL), so every worker and every
+  later upload benefits from one API call
+
+Vectors are stored as raw little-endian float32 bytes (6 KB for 1536
+dimensions, about a quarter of the JSON size).
+"""
+import hashlib
+import unicodedata
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.redis import get_redis
+from app.services.embeddings.base import EmbeddingProvider
+
+local_hits = metrics.counter("embedding_cache_local_hits_total", "Embeddings served from the worker cache")
+redis_hits = metrics.counter("embedding_cache_redis_hits_total", "Embeddings served from Redis")
+misses = metrics.counter("embedding_cache_misses_total", "Embeddings computed by the provider")
+
+VECTOR_DTYPE = np.dtype("<f4")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Canonical form of a text for hashing.
+
+    Unicode is NFC-normalised and runs of whitespace collapse to one space,
+    so the same paragraph extracted with different line breaks or
+    indentation shares one cache entry. Case is kept: it can change the
+    embedding.
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def cache_key(model: str, text: str) -> str:
+    """
+    Example:
+        >>> cache_key("text-embedding-3-small", "Hello   world")
+        'text-embedding-3-small:64ec88ca00b268e5ba1a35678a1b5316d212f4f366b2477232534a8aeca37f3c'
+    """
+    digest = hashlib.sha256(normalize_text(text).encode()).hexdigest()
+    return f"{model}:{digest}"
+
+
+def to_bytes(vector: np.ndarray) -> bytes:
+    return np.asarray(vector, dtype=VECTOR_DTYPE).tobytes()
+
+
+def from_bytes(raw: bytes) -> np.ndarray:
+    return np.frombuffer(raw, dtype=VECTOR_DTYPE)
+
+
+class EmbeddingCache:
+    """
+    Two-tier cache of vectors keyed by cache_key().
+
+    Args:
+        max_entries: Local tier capacity
+        local_ttl: Seconds a vector stays in the local tier
+        redis_ttl: Seconds a vector stays in Redis
+    """
+
+    KEY_PREFIX = "embedding:"
+
+    def __init__(self, max_entries: int, local_ttl: int, redis_ttl: int):
+        self.local = TTLCache(max_entries=max_entries, ttl_seconds=local_ttl)
+        self.redis_ttl = redis_ttl
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """Look up many keys (one Redis round-trip for all local misses)."""
+        found: List[Optional[np.ndarray]] = [self.local.get(key) for key in keys]
+        local_hits.inc(sum(vector is not None for vector in found))
+
+        remote = [i for i, vector in enumerate(found) if vector is None]
+        redis = get_redis()
+        if remote and redis is not None:
+            values = await redis.mget([self.KEY_PREFIX + keys[i] for i in remote])
+            for i, raw in zip(remote, values):
+                if raw is not None:
+                    found[i] = from_bytes(raw)
+                    self.local.set(keys[i], found[i])
+            redis_hits.inc(sum(raw is not None for raw in values))
+
+        return found
+
+    async def set_many(self, items: Dict[str, np.ndarray]) -> None:
+        """Store vectors in both tiers."""
+        if not items:
+            return
+
+        for key, vector in items.items():
+            self.local.set(key, np.asarray(vector, dtype=VECTOR_DTYPE))
+
+        redis = get_redis()
+        if redis is not None:
+            async with redis.pipeline(transaction=False) as pipe:
+                for key, vector in items.items():
+                    pipe.set(self.KEY_PREFIX + key, to_bytes(vector), ex=self.redis_ttl)
+                await pipe.execute()
+
+    def clear(self) -> None:
+        self.local.clear()
+
+
+class CachedEmbeddingProvider(EmbeddingProvider):
+    """
+    Wraps a provider so only texts missing from the cache are sent to it.
+
+    Texts that repeat within one call are embedded once.
+
+    Args:
+        provider: Provider that computes missing vectors
+        cache: Where vectors are looked up and stored
+    """
+
+    def __init__(self, provider: EmbeddingProvider, cache: "EmbeddingCache"):
+        self.provider = provider
+        self.cache = cache
+        self.model = provider.model
+        self.dim = provider.dim
+
+    async def embed(self, texts: Sequence[str]) -> np.ndarray:
+        if not texts:
+            return np.empty((0, self.dim), dtype=np.float32)
+
+        keys = [cache_key(self.model, text) for text in texts]
+        vectors: Dict[str, np.ndarray] = {}
+        for key, vector in zip(keys, await self.cache.get_many(keys)):
+            if vector is not None:
+                vectors[key] = vector
+
+        # First text for each missing key (duplicates are embedded once)
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors and key not in missing:
+                missing[key] = text
+
+        if missing:
+            misses.inc(len(missing))
+            computed = await self.provider.embed(list(missing.values()))
+            fresh = dict(zip(missing.keys(), computed))
+            await self.cache.set_many(fresh)
+            vectors.update(fresh)
+
+        return np.stack([vectors[key] for key in keys]).astype(np.float32, copy=False)
+
+
+# Process-wide cache shared by every provider (keys include the model name)
+embedding_cache = EmbeddingCache(
+    max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+    local_ttl=settings.EMBEDDING_CACHE_LOCAL_TTL_SECONDS,
+    redis_ttl=settings.EMBEDDING_CACHE_TTL_SECONDS
+)
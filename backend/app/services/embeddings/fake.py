@@ -0,0 +1,45 @@
+"""
+Fake embedding provider for tests.
+"""
+import asyncio
+import hashlib
+from typing import List, Sequence
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.embeddings.base import EmbeddingProvider
+
+
+class FakeEmbeddingProvider(EmbeddingProvider):
+    """
+    Deterministic pseudo-random unit vectors; no network.
+
+    The same text always gets the same vector (seeded by its SHA-256), but
+    vectors carry no meaning, so similarity between different texts is
+    noise. Records the size of every call so tests can check batching.
+
+    Args:
+        dim: Vector length
+        latency: Seconds each call sleeps, to mimic an API round-trip
+    """
+
+    model = "fake"
+
+    def __init__(self, dim: int = settings.EMBEDDING_DIM, latency: float = 0.0):
+        self.dim = dim
+        self.latency = latency
+        self.calls: List[int] = []
+
+    def _vector(self, text: str) -> np.ndarray:
+        seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "little")
+        vector = np.random.default_rng(seed).standard_normal(self.dim).astype(np.float32)
+        return vector / np.linalg.norm(vector)
+
+    async def embed(self, texts: Sequence[str]) -> np.ndarray:
+        self.calls.append(len(texts))
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if not texts:
+            return np.empty((0, self.dim), dtype=np.float32)
+        return np.stack([self._vector(text) for text in texts])
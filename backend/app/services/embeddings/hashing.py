@@ -0,0 +1,87 @@
+"""
+Local embeddings by feature hashing (no network, no model download).
+
+Each text becomes a bag of word unigrams and bigrams; every feature is
+hashed to one of `dim` buckets with a +1/-1 sign (the "hashing trick"),
+counts are log-scaled and rows are L2-normalised. Texts that share
+vocabulary get a high cosine similarity, which is enough for keyword-ish
+retrieval and for running and load-testing the whole pipeline offline.
+It does not understand paraphrases: use a real model in production, or
+this as a cheap tier for corpora indexed with it.
+
+The tier is chosen per deployment (EMBEDDING_PROVIDER="hashing"), not
+per query: a question must be embedded by the same provider as the
+chunks it is compared with, and nothing routes trivial questions here.
+
+A whole batch is built with one np.bincount over (row, bucket) pairs, so
+the per-text cost is tokenisation plus a cached hash per feature.
+"""
+import hashlib
+import re
+from functools import lru_cache
+from typing import List, Sequence
+
+import numpy as np
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.services.embeddings.base import EmbeddingProvider
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+@lru_cache(maxsize=1 << 18)
+def _feature_hash(feature: str) -> int:
+    """Stable 64-bit hash (Python's hash() is salted per process)."""
+    return int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+
+
+def _features(text: str) -> List[str]:
+    tokens = TOKEN_PATTERN.findall(text.lower())
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+
+class HashingEmbeddingProvider(EmbeddingProvider):
+    """
+    Deterministic hashed bag-of-words embeddings.
+
+    Args:
+        dim: Vector length (buckets)
+
+    Example:
+        >>> provider = HashingEmbeddingProvider(dim=256)
+        >>> provider.embed_batch(["gradient descent", "descent gradient"]).shape
+        (2, 256)
+    """
+
+    def __init__(self, dim: int = settings.EMBEDDING_DIM):
+        self.dim = dim
+        self.model = f"hashing-v1-{dim}"  # Vectors depend on dim, so it is part of the name
+
+    def embed_batch(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed synchronously (CPU only)."""
+        rows: List[int] = []
+        hashes: List[int] = []
+        for row, text in enumerate(texts):
+            features = _features(text)
+            rows.extend([row] * len(features))
+            hashes.extend(_feature_hash(feature) for feature in features)
+
+        hashed = np.asarray(hashes, dtype=np.uint64)
+        buckets = (hashed % np.uint64(self.dim)).astype(np.int64)
+        signs = np.where(hashed >> np.uint64(63), -1.0, 1.0)  # Top bit picks the sign
+
+        # One scatter-add for the whole batch: flat index = row * dim + bucket
+        flat = np.asarray(rows, dtype=np.int64) * self.dim + buckets
+        counts = np.bincount(flat, weights=signs, minlength=len(texts) * self.dim)
+        matrix = counts.reshape(len(texts), self.dim).astype(np.float32)
+
+        matrix = np.sign(matrix) * np.log1p(np.abs(matrix))  # Dampen repeated terms
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1, norms)
+
+    async def embed(self, texts: Sequence[str]) -> np.ndarray:
+        if not texts:
+            return np.empty((0, self.dim), dtype=np.float32)
+        # Tokenising large batches takes milliseconds; keep it off the event loop
+        return await run_in_threadpool(self.embed_batch, texts)
@@ -0,0 +1,56 @@
+"""
+Embeddings from the OpenAI API.
+"""
+from typing import Optional, Sequence
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.embeddings.base import EmbeddingProvider
+
+# The API accepts at most 2048 inputs per request
+MAX_INPUTS_PER_REQUEST = 2048
+
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    """
+    Calls the OpenAI embeddings endpoint with the async client.
+
+    Args:
+        model: Embedding model, e.g. text-embedding-3-small
+        dim: Vector length; sent as `dimensions` so text-embedding-3 models
+            can be shortened to match the document_chunks.embedding column
+        api_key: Defaults to OPENAI_API_KEY
+    """
+
+    def __init__(
+        self,
+        model: str = settings.EMBEDDING_MODEL,
+        dim: int = settings.EMBEDDING_DIM,
+        api_key: Optional[str] = None
+    ):
+        from openai import AsyncOpenAI
+
+        api_key = api_key or settings.OPENAI_API_KEY
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY must be set to use OpenAI embeddings")
+
+        self.model = model
+        self.dim = dim
+        self.client = AsyncOpenAI(api_key=api_key)
+
+    async def embed(self, texts: Sequence[str]) -> np.ndarray:
+        if not texts:
+            return np.empty((0, self.dim), dtype=np.float32)
+
+        vectors = []
+        for start in range(0, len(texts), MAX_INPUTS_PER_REQUEST):
+            response = await self.client.embeddings.create(
+                model=self.model,
+                input=list(texts[start:start + MAX_INPUTS_PER_REQUEST]),
+                dimensions=self.dim
+            )
+            # Results carry their input index; don't rely on response order
+            vectors.extend(item.embedding for item in sorted(response.data, key=lambda item: item.index))
+
+        return np.asarray(vectors, dtype=np.float32)
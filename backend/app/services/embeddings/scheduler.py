@@ -0,0 +1,193 @@
+"""
+Micro-batching scheduler for embedding calls.
+
+Ingestion jobs and chat queries each want a few vectors at a time. Sending
+each request on its own wastes a round-trip per request and hits provider
+rate limits long before the token limits. The scheduler queues texts from
+every caller and sends them to the provider in shared batches:
+
+- a batch is sent as soon as it holds `max_batch_size` texts, or when its
+  oldest text has waited `max_wait` seconds, whichever comes first
+- at most `max_concurrent_batches` provider calls are in flight
+- each caller awaits only its own vectors (a large request can span
+  several batches; a batch can serve many requests)
+
+Under light load a request pays at most `max_wait` extra latency; under
+heavy load batches fill instantly and throughput is bounded by the
+provider, not by the number of callers.
+"""
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.embeddings.base import EmbeddingProvider
+
+batch_size = metrics.histogram("embedding_batch_size", "Texts per provider call")
+queue_wait = metrics.histogram("embedding_queue_wait_seconds", "Time a request waited before its batch was sent")
+batch_latency = metrics.histogram("embedding_batch_latency_seconds", "Provider call latency per batch")
+queued_texts = metrics.gauge("embedding_queued_texts", "Texts waiting for a batch")
+
+
+@dataclass
+class _Request:
+    """One embed() call; filled in as its texts come back from batches."""
+    texts: Sequence[str]
+    future: asyncio.Future
+    enqueued: float
+    vectors: Optional[np.ndarray] = None
+    remaining: int = 0
+    waited: bool = False  # queue_wait observed (first batch only)
+
+
+@dataclass
+class _State:
+    """Queue and worker bound to one event loop."""
+    loop: asyncio.AbstractEventLoop
+    pending: Deque[Tuple[_Request, int]] = field(default_factory=deque)
+    wake: asyncio.Event = field(default_factory=asyncio.Event)
+    slots: Optional[asyncio.Semaphore] = None
+    worker: Optional[asyncio.Task] = None
+    in_flight: Dict[asyncio.Task, List[Tuple[_Request, int]]] = field(default_factory=dict)
+
+
+class EmbeddingScheduler(EmbeddingProvider):
+    """
+    Merges concurrent embed() calls into batched provider calls.
+
+    Args:
+        provider: Provider that receives the merged batches
+        max_batch_size: Texts per provider call
+        max_wait: Seconds the oldest queued text may wait for a batch to fill
+        max_concurrent_batches: Provider calls allowed in flight
+
+    Example:
+        >>> scheduler = EmbeddingScheduler(OpenAIEmbeddingProvider())
+        >>> vectors = await scheduler.embed(["What is backpropagation?"])
+    """
+
+    def __init__(
+        self,
+        provider: EmbeddingProvider,
+        max_batch_size: int = settings.EMBEDDING_BATCH_SIZE,
+        max_wait: float = settings.EMBEDDING_BATCH_MAX_WAIT_MS / 1000,
+        max_concurrent_batches: int = settings.EMBEDDING_MAX_CONCURRENT_BATCHES
+    ):
+        self.provider = provider
+        self.model = provider.model
+        self.dim = provider.dim
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.max_concurrent_batches = max_concurrent_batches
+        self._state: Optional[_State] = None
+
+    def _current_state(self) -> _State:
+        """Queue for the running loop (a new loop, e.g. in tests, gets a fresh one)."""
+        loop = asyncio.get_running_loop()
+        if self._state is None or self._state.loop is not loop:
+            self._state = _State(loop=loop, slots=asyncio.Semaphore(self.max_concurrent_batches))
+        state = self._state
+        if state.worker is None or state.worker.done():
+            state.worker = loop.create_task(self._run(state))
+        return state
+
+    async def embed(self, texts: Sequence[str]) -> np.ndarray:
+        if not texts:
+            return np.empty((0, self.dim), dtype=np.float32)
+
+        state = self._current_state()
+        request = _Request(
+            texts=texts,
+            future=state.loop.create_future(),
+            enqueued=time.perf_counter(),
+            vectors=np.empty((len(texts), self.dim), dtype=np.float32),
+            remaining=len(texts),
+        )
+        state.pending.extend((request, i) for i in range(len(texts)))
+        queued_texts.set(len(state.pending))
+        state.wake.set()
+        return await request.future
+
+    async def _run(self, state: _State) -> None:
+        """Cut batches off the queue and dispatch them."""
+        while True:
+            if not state.pending:
+                state.wake.clear()
+                await state.wake.wait()
+                continue
+
+            # Wait for a full batch, but never past the oldest text's deadline
+            deadline = state.pending[0][0].enqueued + self.max_wait
+            while len(state.pending) < self.max_batch_size:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                state.wake.clear()
+                try:
+                    await asyncio.wait_for(state.wake.wait(), timeout)
+                except asyncio.TimeoutError:
+                    break
+
+            await state.slots.acquire()
+            size = min(len(state.pending), self.max_batch_size)
+            batch = [state.pending.popleft() for _ in range(size)]
+            queued_texts.set(len(state.pending))
+
+            task = state.loop.create_task(self._dispatch(state, batch))
+            state.in_flight[task] = batch  # Keep a reference until it finishes
+            task.add_done_callback(lambda done: state.in_flight.pop(done, None))
+
+    async def _dispatch(self, state: _State, batch: List[Tuple[_Request, int]]) -> None:
+        """Send one batch and hand each vector back to its request."""
+        try:
+            now = time.perf_counter()
+            for request, _ in batch:
+                if not request.waited:
+                    request.waited = True
+                    queue_wait.observe(now - request.enqueued)
+            batch_size.observe(len(batch))
+
+            try:
+                vectors = await self.provider.embed([request.texts[i] for request, i in batch])
+            except Exception as exc:
+                for request, _ in batch:
+                    if not request.future.done():
+                        request.future.set_exception(exc)
+                return
+            finally:
+                batch_latency.observe(time.perf_counter() - now)
+
+            for (request, i), vector in zip(batch, vectors):
+                request.vectors[i] = vector
+                request.remaining -= 1
+                if request.remaining == 0 and not request.future.done():
+                    request.future.set_result(request.vectors)
+        finally:
+            state.slots.release()
+
+    async def aclose(self) -> None:
+        """
+        Stop the worker and fail every request not answered yet (called on
+        application shutdown).
+        """
+        state, self._state = self._state, None
+        if state is None or state.loop.is_closed():
+            return
+
+        error = RuntimeError("Embedding scheduler closed")
+        for request, _ in [*state.pending, *(item for batch in state.in_flight.values() for item in batch)]:
+            if not request.future.done():
+                request.future.set_exception(error)
+        state.pending.clear()
+        queued_texts.set(0)
+
+        tasks = [task for task in (state.worker, *state.in_flight) if task is not None]
+        for task in tasks:
+            task.cancel()
+        if state.loop is asyncio.get_running_loop():
+            await asyncio.gather(*tasks, return_exceptions=True)
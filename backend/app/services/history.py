@@ -0,0 +1,87 @@
+"""
+Keyset (cursor) pagination of conversation history.
+
+OFFSET pagination makes the database walk past and discard every row
+before the requested page, so page 500 costs 500 pages of work. A keyset
+cursor instead remembers where the previous page ended, the
+(created_at, id) of its oldest message, and asks for rows strictly older
+than that. With the (conversation_id, created_at, id) index every page,
+first or five-hundredth, is one index range scan of `limit` rows.
+
+id breaks ties between messages saved in the same instant, so no row is
+ever skipped or repeated between pages.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.message import Message
+
+
+class InvalidCursor(ValueError):
+    """The cursor was not produced by encode_cursor (or was altered)."""
+
+
+def encode_cursor(message: Message) -> str:
+    """
+    Opaque cursor pointing just before `message`.
+
+    Example:
+        >>> encode_cursor(message)
+        'WyIyMDI2LTEwLTE3VDE1OjIwOjM3IiwgNDJd'
+    """
+    raw = json.dumps([message.created_at.isoformat(), message.id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Return the (created_at, id) a cursor points at."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, message_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(message_id)
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor("Invalid cursor") from exc
+
+
+async def fetch_message_page(
+    db: AsyncSession,
+    conversation_id: int,
+    limit: int,
+    cursor: Optional[str] = None
+) -> Tuple[List[Message], Optional[str]]:
+    """
+    One page of a conversation, walking backwards from the newest message.
+
+    Args:
+        db: Session to read with
+        conversation_id: Conversation to page through
+        limit: Messages per page
+        cursor: next_cursor of the previous page (None = newest page)
+
+    Returns:
+        (messages oldest first, cursor for the next older page or None)
+
+    Raises:
+        InvalidCursor: If the cursor cannot be decoded
+    """
+    statement = (
+        select(Message)
+        .where(Message.conversation_id == conversation_id)
+        .order_by(Message.created_at.desc(), Message.id.desc())
+        .limit(limit + 1)  # One extra row tells us whether an older page exists
+    )
+    if cursor is not None:
+        created_at, message_id = decode_cursor(cursor)
+        statement = statement.where(tuple_(Message.created_at, Message.id) < (created_at, message_id))
+
+    rows = list((await db.execute(statement)).scalars().all())
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = encode_cursor(rows[-1]) if has_more else None
+    return list(reversed(rows)), next_cursor
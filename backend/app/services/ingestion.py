@@ -0,0 +1,190 @@
+"""
+Document ingestion pipeline: parse -> chunk -> embed -> bulk insert.
+
+Parsing is CPU-bound and synchronous (pypdf, python-docx), so batches of
+chunks are produced in a worker thread and the event loop stays free to
+serve other requests. Only one batch is in memory at a time.
+
+Uploads are normally queued instead (see app.services.jobs): the
+ingestion worker runs chunk_file() in a process pool, so parsing uses
+every core rather than sharing one GIL with the API.
+
+Re-uploads are incremental: diff_chunks() matches the new chunks to the
+stored ones by content hash, and only new or changed chunks are
+embedded and inserted. Removed chunks are deleted in bulk and the rest
+are renumbered, so an update costs in proportion to what changed.
+A queued re-upload carries a version_snapshot() of what it replaces, so
+the worker can put the previous version back if every attempt fails.
+"""
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.models.document import Document, DocumentStatus
+from app.models.document_chunk import DocumentChunk
+from app.services.chunk_store import (
+    delete_chunks, insert_chunk_batch, last_chunk_id, next_batch, update_chunk_positions
+)
+from app.services.chunking import Chunk, chunk_segments
+from app.services.embeddings import EmbeddingProvider
+from app.services.parsing import iter_segments
+
+
+def iter_document_chunks(path: str, file_type: str) -> Iterator[Chunk]:
+    """Parse a stored file and yield its chunks one at a time."""
+    return chunk_segments(iter_segments(path, file_type))
+
+
+def chunk_file(path: str, file_type: str) -> List[Chunk]:
+    """
+    Parse and chunk a whole file.
+
+    Runs in a worker process, so it must stay a picklable top-level
+    function; the chunks are sent back to the caller in one piece.
+    """
+    return list(iter_document_chunks(path, file_type))
+
+
+async def ingest_document(
+    db: AsyncSession,
+    document: Document,
+    embedder: Optional[EmbeddingProvider] = None
+) -> Document:
+    """
+    Parse, chunk and embed an uploaded document and store its chunks.
+
+    Adds the document to the session and writes chunks in batches inside
+    the same transaction. The caller commits (or rolls back on error).
+
+    Args:
+        db: Session to write in
+        document: New (unsaved) document whose file is already stored
+        embedder: Embeds each batch before it is written; None stores
+            chunks without embeddings
+    """
+    db.add(document)
+    await db.flush()  # Assign document.id for the chunk rows
+
+    chunks = iter_document_chunks(document.file_path, document.file_type)
+    total = 0
+
+    while True:
+        batch = await run_in_threadpool(next_batch, chunks)
+        if not batch:
+            break
+        embeddings = None
+        if embedder is not None:
+            embeddings = await embedder.embed([chunk.text for chunk in batch])
+        total += await insert_chunk_batch(db, document.id, batch, embeddings, document.owner_id, document.doc_type)
+
+    document.chunk_count = total
+    document.status = DocumentStatus.READY
+    document.progress = 100
+    return document
+
+# Document columns a re-upload replaces (and a failed one restores)
+VERSION_FIELDS = ("file_path", "file_type", "size_bytes", "content_hash", "chunk_count")
+
+
+@dataclass
+class ChunkDiff:
+    """
+    What a re-upload changes in a document's stored chunks.
+
+    Attributes:
+        added: New chunks to embed and insert
+        moved: Kept chunks whose ordinal or page changed ({"id", "ordinal", "page"})
+        removed: Ids of stored chunks that are gone
+        kept: Stored chunks reused as they are (or only renumbered)
+    """
+    added: List[Chunk] = field(default_factory=list)
+    moved: List[dict] = field(default_factory=list)
+    removed: List[int] = field(default_factory=list)
+    kept: int = 0
+
+    @property
+    def chunk_count(self) -> int:
+        return self.kept + len(self.added)
+
+
+async def diff_chunks(db: AsyncSession, document_id: int, chunks: List[Chunk]) -> ChunkDiff:
+    """
+    Match a new chunk list against the chunks stored for a document.
+
+    Only ids, hashes and positions are read (no text or embeddings).
+    Identical texts can repeat, so each stored chunk matches at most one
+    new chunk. Chunks stored before hashing (content_hash NULL) never
+    match and are replaced once.
+    """
+    stored: Dict[Optional[str], List[tuple]] = defaultdict(list)
+    rows = await db.execute(
+        select(DocumentChunk.id, DocumentChunk.content_hash, DocumentChunk.ordinal, DocumentChunk.page)
+        .where(DocumentChunk.document_id == document_id)
+        .order_by(DocumentChunk.ordinal)
+    )
+    for row in rows:
+        stored[row.content_hash].append(row)
+
+    diff = ChunkDiff()
+    for chunk in chunks:
+        matches = stored.get(chunk.content_hash)
+        if not matches:
+            diff.added.append(chunk)
+            continue
+        row = matches.pop(0)
+        diff.kept += 1
+        if (row.ordinal, row.page) != (chunk.ordinal, chunk.page):
+            diff.moved.append({"id": row.id, "ordinal": chunk.ordinal, "page": chunk.page})
+
+    diff.removed = [row.id for rows in stored.values() for row in rows]
+    return diff
+
+
+async def apply_chunk_diff(
+    db: AsyncSession,
+    document_id: int,
+    diff: ChunkDiff,
+    embedder: Optional[EmbeddingProvider] = None,
+    batch_size: int = settings.CHUNK_INSERT_BATCH_SIZE,
+    on_batch: Optional[Callable[[int], Awaitable[None]]] = None
+) -> None:
+    """
+    Embed and insert the added chunks, then delete and renumber in bulk.
+
+    The caller commits. Re-running after a failure is safe: chunks that
+    were already inserted match by hash on the next diff.
+
+    Args:
+        on_batch: Awaited with the number of chunks inserted so far after
+            each batch (the ingestion worker commits progress there)
+    """
+    written = 0
+    for start in range(0, len(diff.added), batch_size):
+        batch = diff.added[start:start + batch_size]
+        embeddings = None
+        if embedder is not None:
+            embeddings = await embedder.embed([chunk.text for chunk in batch])
+        written += await insert_chunk_batch(db, document_id, batch, embeddings)
+        if on_batch is not None:
+            await on_batch(written)
+
+    await delete_chunks(db, diff.removed)
+    await update_chunk_positions(db, diff.moved)
+
+
+async def version_snapshot(db: AsyncSession, document: Document) -> dict:
+    """
+    The current version of a document, taken before a queued re-upload.
+
+    Plain JSON (it travels in the job payload). Chunks the re-upload
+    inserts all get ids above `last_chunk_id`, so they can be told apart
+    from the previous version's.
+    """
+    snapshot = {name: getattr(document, name) for name in VERSION_FIELDS}
+    snapshot["last_chunk_id"] = await last_chunk_id(db, document.id)
+    return snapshot
@@ -0,0 +1,48 @@
+"""
+Background job queue.
+
+Uploads enqueue an "ingest_document" job and return straight away; an
+IngestionWorker (in the API process, or `python -m app.worker`) picks it
+up, parses and chunks the file in a process pool, embeds and stores the
+chunks, and records status/progress on the Document row for clients to
+poll.
+
+get_job_queue() returns the Redis queue when REDIS_ENABLED is true (jobs
+are shared by every process and survive restarts) and the in-memory
+stand-in otherwise.
+"""
+from functools import lru_cache
+from typing import Optional
+
+from app.core.redis import get_redis
+from app.services.jobs.base import Job, JobQueue
+from app.services.jobs.memory import InMemoryJobQueue
+from app.services.jobs.redis_queue import RedisJobQueue
+
+INGEST_DOCUMENT = "ingest_document"
+
+
+@lru_cache(maxsize=1)
+def get_job_queue() -> JobQueue:
+    """The process-wide job queue."""
+    redis = get_redis()
+    if redis is not None:
+        return RedisJobQueue(redis)
+    return InMemoryJobQueue()
+
+
+def ingest_job(document_id: int, user_id: int, previous: Optional[dict] = None) -> Job:
+    """
+    Build the job that ingests an uploaded document.
+
+    Args:
+        previous: For a re-upload, the version_snapshot() it replaces; the
+            worker deletes its file on success and restores it on failure
+    """
+    payload = {"document_id": document_id}
+    if previous is not None:
+        payload["previous"] = previous
+    return Job(kind=INGEST_DOCUMENT, payload=payload, user_id=user_id)
+
+
+__all__ = ["INGEST_DOCUMENT", "InMemoryJobQueue", "Job", "JobQueue", "RedisJobQueue", "get_job_queue", "ingest_job"]
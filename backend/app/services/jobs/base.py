@@ -0,0 +1,81 @@
+"""
+Job queue interface.
+"""
+import json
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Optional
+
+
+@dataclass
+class Job:
+    """
+    A unit of background work.
+
+    Attributes:
+        kind: What to do (e.g. "ingest_document")
+        payload: JSON-serialisable arguments
+        user_id: Owner, used for per-user concurrency limits
+        attempts: Failed attempts so far
+        id: Unique job id
+    """
+    kind: str
+    payload: Dict[str, Any]
+    user_id: int
+    attempts: int = 0
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, raw) -> "Job":
+        return cls(**json.loads(raw))
+
+
+class JobQueue(ABC):
+    """
+    At-least-once job queue with delayed retries and per-user slots.
+
+    A dequeued job stays "in progress" until complete() or requeue() is
+    called for it, or until requeue_stale() finds it has been in progress
+    too long.
+    """
+
+    @abstractmethod
+    async def enqueue(self, job: Job, delay: float = 0) -> None:
+        """Add a job, runnable after `delay` seconds."""
+
+    @abstractmethod
+    async def dequeue(self, timeout: float) -> Optional[Job]:
+        """Wait up to `timeout` seconds for a runnable job."""
+
+    @abstractmethod
+    async def complete(self, job: Job) -> None:
+        """Forget a finished (or permanently failed) job."""
+
+    @abstractmethod
+    async def requeue(self, job: Job, delay: float) -> None:
+        """Put an in-progress job back, runnable after `delay` seconds."""
+
+    @abstractmethod
+    async def acquire_user_slot(self, user_id: int, limit: int) -> bool:
+        """Take one of the user's `limit` concurrent job slots, if one is free."""
+
+    @abstractmethod
+    async def release_user_slot(self, user_id: int) -> None:
+        """Give back a slot taken by acquire_user_slot."""
+
+    async def requeue_stale(self) -> int:
+        """
+        Put back in-progress jobs whose worker presumably died; returns how many.
+
+        Called periodically by every worker. Queues that lose in-progress
+        jobs with their process anyway have nothing to do.
+        """
+        return 0
+
+    async def size(self) -> int:
+        """Jobs waiting (ready or delayed); used for metrics and tests."""
+        return 0
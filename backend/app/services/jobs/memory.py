@@ -0,0 +1,83 @@
+"""
+In-memory job queue (single process).
+
+Stand-in for RedisJobQueue in tests and local development: same
+semantics, but jobs live in this process and are lost on restart.
+"""
+import asyncio
+import heapq
+import itertools
+import time
+from collections import Counter, deque
+from typing import Deque, List, Optional, Tuple
+
+from app.services.jobs.base import Job, JobQueue
+
+
+class InMemoryJobQueue(JobQueue):
+    """Ready deque + delayed heap, with a wake-up event for waiting workers."""
+
+    def __init__(self):
+        self._ready: Deque[Job] = deque()
+        self._delayed: List[Tuple[float, int, Job]] = []
+        self._sequence = itertools.count()  # Heap tie-breaker
+        self._running: Counter = Counter()
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _event(self) -> asyncio.Event:
+        loop = asyncio.get_running_loop()
+        if self._wake is None or self._loop is not loop:
+            self._wake, self._loop = asyncio.Event(), loop
+        return self._wake
+
+    def _promote_due(self) -> Optional[float]:
+        """Move due delayed jobs to the ready deque; return seconds until the next one."""
+        now = time.monotonic()
+        while self._delayed and self._delayed[0][0] <= now:
+            self._ready.append(heapq.heappop(self._delayed)[2])
+        return self._delayed[0][0] - now if self._delayed else None
+
+    async def enqueue(self, job: Job, delay: float = 0) -> None:
+        if delay > 0:
+            heapq.heappush(self._delayed, (time.monotonic() + delay, next(self._sequence), job))
+        else:
+            self._ready.append(job)
+        self._event().set()
+
+    async def dequeue(self, timeout: float) -> Optional[Job]:
+        deadline = time.monotonic() + timeout
+        wake = self._event()
+        while True:
+            next_due = self._promote_due()
+            if self._ready:
+                return self._ready.popleft()
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            wake.clear()
+            try:
+                await asyncio.wait_for(wake.wait(), min(remaining, next_due if next_due is not None else remaining))
+            except asyncio.TimeoutError:
+                pass
+
+    async def complete(self, job: Job) -> None:
+        pass  # Nothing is kept for in-progress jobs
+
+    async def requeue(self, job: Job, delay: float) -> None:
+        await self.enqueue(job, delay)
+
+    async def acquire_user_slot(self, user_id: int, limit: int) -> bool:
+        if self._running[user_id] >= limit:
+            return False
+        self._running[user_id] += 1
+        return True
+
+    async def release_user_slot(self, user_id: int) -> None:
+        self._running[user_id] -= 1
+        if self._running[user_id] <= 0:
+            del self._running[user_id]
+
+    async def size(self) -> int:
+        return len(self._ready) + len(self._delayed)
@@ -0,0 +1,123 @@
+"""
+Redis-backed job queue (shared by every API and worker process).
+
+Keys:
+    jobs:ready        list of runnable jobs (LPUSH in, BLMOVE out)
+    jobs:processing   list of jobs taken by a worker and not finished yet
+    jobs:leases       sorted set of in-progress jobs, scored by when their
+                      lease runs out
+    jobs:delayed      sorted set of retries, scored by when they become runnable
+    jobs:user:{id}    running-job counter per user
+
+BLMOVE moves a job into jobs:processing atomically, so a job taken by a
+worker that dies is still in Redis rather than lost. requeue_stale()
+moves it back to jobs:ready once its lease has run out. A job found in
+jobs:processing without a lease (its worker died right after BLMOVE) is
+given one, so it is put back one lease later.
+"""
+import time
+from typing import Optional
+
+from app.core.config import settings
+from app.services.jobs.base import Job, JobQueue
+
+# Safety net so a crashed worker cannot hold a user's slot forever
+USER_SLOT_TTL_SECONDS = 3600
+
+
+class RedisJobQueue(JobQueue):
+    """
+    Args:
+        redis: redis.asyncio client
+        prefix: Key prefix (lets several environments share one Redis)
+        lease_seconds: How long a job may stay in progress before it is
+            presumed lost; must exceed the longest ingestion
+    """
+
+    def __init__(self, redis, prefix: str = "jobs:", lease_seconds: float = settings.INGEST_JOB_LEASE_SECONDS):
+        self.redis = redis
+        self.lease_seconds = lease_seconds
+        self.ready = prefix + "ready"
+        self.processing = prefix + "processing"
+        self.leases = prefix + "leases"
+        self.delayed = prefix + "delayed"
+        self.user_prefix = prefix + "user:"
+
+    async def _promote_due(self) -> None:
+        """Move retries whose time has come onto the ready list."""
+        due = await self.redis.zrangebyscore(self.delayed, 0, time.time())
+        for raw in due:
+            # ZREM succeeds for exactly one worker, so a job is promoted once
+            if await self.redis.zrem(self.delayed, raw):
+                await self.redis.lpush(self.ready, raw)
+
+    async def enqueue(self, job: Job, delay: float = 0) -> None:
+        if delay > 0:
+            await self.redis.zadd(self.delayed, {job.to_json(): time.time() + delay})
+        else:
+            await self.redis.lpush(self.ready, job.to_json())
+
+    async def dequeue(self, timeout: float) -> Optional[Job]:
+        await self._promote_due()
+        raw = await self.redis.blmove(self.ready, self.processing, timeout, "RIGHT", "LEFT")
+        if raw is None:
+            return None
+        await self.redis.zadd(self.leases, {raw: time.time() + self.lease_seconds})
+        job = Job.from_json(raw)
+        job._raw = raw  # Exact bytes, needed to remove it from jobs:processing
+        return job
+
+    async def complete(self, job: Job) -> None:
+        raw = getattr(job, "_raw", job.to_json())
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.lrem(self.processing, 1, raw)
+            pipe.zrem(self.leases, raw)
+            await pipe.execute()
+
+    async def requeue(self, job: Job, delay: float) -> None:
+        raw = getattr(job, "_raw", job.to_json())
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.lrem(self.processing, 1, raw)
+            pipe.zrem(self.leases, raw)
+            if delay > 0:
+                pipe.zadd(self.delayed, {job.to_json(): time.time() + delay})
+            else:
+                pipe.lpush(self.ready, job.to_json())
+            await pipe.execute()
+
+    async def requeue_stale(self) -> int:
+        now = time.time()
+        # Adopt jobs taken by a worker that died before recording a lease
+        for raw in await self.redis.lrange(self.processing, 0, -1):
+            await self.redis.zadd(self.leases, {raw: now + self.lease_seconds}, nx=True)
+
+        requeued = 0
+        for raw in await self.redis.zrangebyscore(self.leases, 0, now):
+            # ZREM succeeds for exactly one worker; LREM finds nothing if the
+            # job was completed in the meantime
+            if await self.redis.zrem(self.leases, raw) and await self.redis.lrem(self.processing, 1, raw):
+                await self.redis.lpush(self.ready, raw)
+                requeued += 1
+        return requeued
+
+    async def acquire_user_slot(self, user_id: int, limit: int) -> bool:
+        key = f"{self.user_prefix}{user_id}"
+        async with self.redis.pipeline(transaction=True) as pipe:
+            # The TTL is set only when the counter is created, so a busy user
+            # does not keep pushing it back
+            pipe.set(key, 0, ex=USER_SLOT_TTL_SECONDS, nx=True)
+            pipe.incr(key)
+            _, running = await pipe.execute()
+        if running > limit:
+            await self.release_user_slot(user_id)
+            return False
+        return True
+
+    async def release_user_slot(self, user_id: int) -> None:
+        key = f"{self.user_prefix}{user_id}"
+        if await self.redis.decr(key) <= 0:
+            # Idle (or below zero after the TTL reset a busy counter): start over
+            await self.redis.delete(key)
+
+    async def size(self) -> int:
+        return await self.redis.llen(self.ready) + await self.redis.zcard(self.delayed)
@@ -0,0 +1,334 @@
+"""
+Ingestion worker.
+
+Each worker runs INGEST_WORKER_CONCURRENCY consumer loops over the job
+queue. For an ingestion job it:
+
+1. marks the document PROCESSING
+2. parses and chunks the file in a process pool (CPU-bound, one core each)
+3. diffs the chunks against the stored ones by content hash, then embeds
+   and inserts only the new ones in batches, committing progress after
+   each batch so polling clients see it move
+4. deletes removed chunks, renumbers kept ones and marks the document READY
+
+A failed attempt is retried with exponential backoff until
+INGEST_MAX_ATTEMPTS, then the document is marked FAILED with the error
+and the chunks its attempts stored are deleted, so it is never searched.
+A re-upload that fails for good is rolled back instead: the chunks its
+attempts inserted are deleted and the previous file and chunk count put
+back, so the document stays READY on its previous version. The previous
+file is only deleted once the new version is stored.
+A user with INGEST_MAX_JOBS_PER_USER jobs already running has further
+jobs put back briefly, so one large batch of uploads cannot hold every
+worker slot while other users wait. Every worker also puts back jobs
+left in progress by a worker that died (JobQueue.requeue_stale).
+"""
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Optional
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.db.session import AsyncSessionLocal
+from app.models.document import Document, DocumentStatus
+from app.services.corpus import bump_corpus_version
+from app.services.embeddings import EmbeddingProvider, get_embedding_provider
+from app.services.chunk_store import delete_chunks_after
+from app.services.ingestion import VERSION_FIELDS, apply_chunk_diff, chunk_file, diff_chunks
+from app.services.jobs import INGEST_DOCUMENT
+from app.services.jobs.base import Job, JobQueue
+from app.services.retrieval.inprocess import reindex_document
+from app.services.storage import remove_file
+
+logger = logging.getLogger(__name__)
+
+# Share of the progress bar given to parsing + chunking (the rest is embedding)
+PARSE_PROGRESS = 10
+# How long a job waits when its user already has the maximum running
+USER_BUSY_RETRY_SECONDS = 1.0
+
+jobs_completed = metrics.counter("ingest_jobs_completed_total", "Documents ingested by the worker")
+jobs_retried = metrics.counter("ingest_jobs_retried_total", "Failed ingestion attempts that will be retried")
+jobs_failed = metrics.counter("ingest_jobs_failed_total", "Documents that failed every ingestion attempt")
+jobs_deferred = metrics.counter("ingest_jobs_deferred_total", "Jobs put back because their user was at the limit")
+chunks_reused = metrics.counter("ingest_chunks_reused_total", "Stored chunks kept by a re-upload (not re-embedded)")
+chunks_embedded = metrics.counter("ingest_chunks_embedded_total", "Chunks embedded and inserted by the worker")
+job_seconds = metrics.histogram("ingest_job_seconds", "Time to ingest one document")
+parse_seconds = metrics.histogram("ingest_parse_seconds", "Time to parse and chunk one document")
+
+
+class DocumentGone(Exception):
+    """The document was deleted while it was being ingested."""
+
+
+def create_process_pool(size: Optional[int] = settings.INGEST_PROCESS_POOL_SIZE) -> ProcessPoolExecutor:
+    """
+    Process pool for parsing and chunking.
+
+    "spawn" rather than fork: the parent runs an event loop and threads,
+    which must not be copied into the children.
+    """
+    return ProcessPoolExecutor(max_workers=size, mp_context=multiprocessing.get_context("spawn"))
+
+
+class IngestionWorker:
+    """
+    Consumes ingestion jobs from a JobQueue.
+
+    Args:
+        queue: Where jobs come from
+        session_factory: Sessions for the document and chunk writes
+        embedder: Embeds chunks; defaults to get_embedding_provider()
+        pool: Runs chunk_file(); defaults to a new process pool
+        concurrency: Jobs handled at once
+        max_attempts: Attempts before a document is marked FAILED
+        retry_backoff: Delay before the first retry, doubled each time
+        max_jobs_per_user: Jobs of one user handled at once
+        poll_interval: Seconds a consumer waits for a job before checking
+            whether it should stop
+        reap_interval: Seconds between checks for in-progress jobs whose
+            worker died (JobQueue.requeue_stale)
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        embedder: Optional[EmbeddingProvider] = None,
+        pool: Optional[Executor] = None,
+        concurrency: int = settings.INGEST_WORKER_CONCURRENCY,
+        max_attempts: int = settings.INGEST_MAX_ATTEMPTS,
+        retry_backoff: float = settings.INGEST_RETRY_BACKOFF_SECONDS,
+        max_jobs_per_user: int = settings.INGEST_MAX_JOBS_PER_USER,
+        batch_size: int = settings.CHUNK_INSERT_BATCH_SIZE,
+        poll_interval: float = 1.0,
+        reap_interval: float = 60.0
+    ):
+        self.queue = queue
+        self.session_factory = session_factory
+        self.embedder = embedder if embedder is not None else get_embedding_provider()
+        self._owns_pool = pool is None
+        self.pool = pool if pool is not None else create_process_pool()
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.max_jobs_per_user = max_jobs_per_user
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.reap_interval = reap_interval
+        self._stopping = asyncio.Event()
+
+    # ----- lifecycle -----
+
+    async def run(self) -> None:
+        """Consume jobs until stop() is called."""
+        self._stopping = asyncio.Event()
+        await asyncio.gather(self._reap(), *(self._consume() for _ in range(self.concurrency)))
+
+    async def _consume(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                job = await self.queue.dequeue(timeout=self.poll_interval)
+                if job is not None:
+                    await self.process(job)
+            except Exception:
+                # A Redis outage must not end the consumer for good. process()
+                # puts its job back on other failures, so what lands here is the
+                # queue failing; a Redis job left in progress is put back by
+                # requeue_stale() once its lease runs out.
+                logger.exception("Ingestion consumer failed; retrying in %.1fs", self.poll_interval)
+                await asyncio.sleep(self.poll_interval)
+
+    async def _reap(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                requeued = await self.queue.requeue_stale()
+                if requeued:
+                    logger.warning("Requeued %d ingestion jobs left in progress by a dead worker", requeued)
+            except Exception:
+                logger.exception("Could not check for stale ingestion jobs")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.reap_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def stop(self) -> None:
+        """Ask the consumers to exit once their current job is done."""
+        self._stopping.set()
+
+    def shutdown(self) -> None:
+        if self._owns_pool:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+    # ----- jobs -----
+
+    async def process(self, job: Job) -> None:
+        """Handle one dequeued job: run it, retry it, or give up on it."""
+        if job.kind != INGEST_DOCUMENT:
+            logger.error("Dropping job %s of unknown kind %r", job.id, job.kind)
+            await self.queue.complete(job)
+            return
+
+        if not await self.queue.acquire_user_slot(job.user_id, self.max_jobs_per_user):
+            jobs_deferred.inc()
+            await self.queue.requeue(job, USER_BUSY_RETRY_SECONDS)
+            return
+
+        document_id = job.payload["document_id"]
+        previous = job.payload.get("previous")
+        try:
+            await self.ingest(document_id)
+        except DocumentGone:
+            if previous is not None:
+                await remove_file(previous["file_path"])
+            await self.queue.complete(job)
+        except Exception as exc:
+            logger.exception("Ingestion of document %s failed (attempt %d)", document_id, job.attempts + 1)
+            job.attempts += 1
+            retry = job.attempts < self.max_attempts
+            try:
+                await self._record_failure(document_id, job.attempts, exc, retry, previous)
+                if retry:
+                    jobs_retried.inc()
+                    await self.queue.requeue(job, self._backoff(job))
+                else:
+                    jobs_failed.inc()
+                    await self.queue.complete(job)
+            except Exception:
+                # E.g. the database is down too. Dropping the job would leave
+                # the document PENDING/PROCESSING (and locked against re-uploads)
+                logger.exception("Could not record the failure of job %s; putting it back", job.id)
+                await self.queue.requeue(job, self._backoff(job))
+        else:
+            if previous is not None:
+                await remove_file(previous["file_path"])
+            jobs_completed.inc()
+            await self.queue.complete(job)
+        finally:
+            await self.queue.release_user_slot(job.user_id)
+
+    def _backoff(self, job: Job) -> float:
+        """Delay before the next attempt of a job that failed `job.attempts` times."""
+        return self.retry_backoff * 2 ** max(job.attempts - 1, 0)
+
+    async def _set_document(self, db: AsyncSession, document_id: int, **values) -> None:
+        """Update a document that has not been deleted, or raise DocumentGone."""
+        result = await db.execute(
+            update(Document)
+            .where(Document.id == document_id, Document.deleted_at.is_(None))
+            .values(**values)
+        )
+        if result.rowcount == 0:
+            await db.rollback()
+            raise DocumentGone(document_id)
+
+    async def ingest(self, document_id: int) -> int:
+        """
+        Ingest (or re-ingest) one document; returns its chunk count.
+
+        The new chunks are diffed against the stored ones, so only new or
+        changed chunks are embedded. Safe to re-run: chunks inserted by an
+        earlier, failed attempt match by hash and are kept.
+        """
+        started = time.perf_counter()
+        async with self.session_factory() as db:
+            document = await db.get(Document, document_id)
+            if document is None or document.deleted_at is not None:
+                raise DocumentGone(document_id)
+            path, file_type, owner_id = document.file_path, document.file_type, document.owner_id
+
+            await self._set_document(db, document_id, status=DocumentStatus.PROCESSING, progress=0)
+            await db.commit()
+
+            loop = asyncio.get_running_loop()
+            chunks = await loop.run_in_executor(self.pool, chunk_file, path, file_type)
+            parse_seconds.observe(time.perf_counter() - started)
+            await self._set_document(db, document_id, progress=PARSE_PROGRESS)
+            await db.commit()
+
+            diff = await diff_chunks(db, document_id, chunks)
+
+            async def report_progress(written: int) -> None:
+                progress = PARSE_PROGRESS + (100 - PARSE_PROGRESS) * written // len(diff.added)
+                await self._set_document(db, document_id, progress=min(progress, 99))
+                await db.commit()
+
+            await apply_chunk_diff(db, document_id, diff, self.embedder, self.batch_size, on_batch=report_progress)
+            await self._set_document(
+                db, document_id, status=DocumentStatus.READY, progress=100, chunk_count=diff.chunk_count, error=None
+            )
+            await bump_corpus_version(db, owner_id)
+            await db.commit()
+            chunks_reused.inc(diff.kept)
+            chunks_embedded.inc(len(diff.added))
+
+            if settings.RETRIEVER_BACKEND == "numpy":
+                await reindex_document(db, owner_id, document_id)
+
+        job_seconds.observe(time.perf_counter() - started)
+        return diff.chunk_count
+
+    async def _record_failure(
+        self,
+        document_id: int,
+        attempts: int,
+        exc: Exception,
+        retry: bool,
+        previous: Optional[dict] = None
+    ) -> None:
+        """
+        Store the error; the document goes back to PENDING or to FAILED.
+
+        Chunks are left alone on a retry: the next attempt reuses the ones
+        this attempt inserted. A first upload marked FAILED loses the chunks
+        its batches committed, so a failed document is never searched. A
+        re-upload (`previous` set) that will not be retried is rolled back
+        to its previous version instead.
+        """
+        error = f"{type(exc).__name__}: {exc}"[:1000]
+        try:
+            async with self.session_factory() as db:
+                if retry:
+                    await self._set_document(
+                        db, document_id, status=DocumentStatus.PENDING, progress=0, attempts=attempts, error=error
+                    )
+                    await db.commit()
+                    return
+
+                document = await db.get(Document, document_id)
+                if document is None:
+                    raise DocumentGone(document_id)
+                failed_path, owner_id = document.file_path, document.owner_id
+
+                if previous is None:
+                    await self._set_document(
+                        db, document_id,
+                        status=DocumentStatus.FAILED, progress=0, chunk_count=0, attempts=attempts, error=error
+                    )
+                    await delete_chunks_after(db, document_id, 0)
+                    # They were searchable while the document was being ingested
+                    await bump_corpus_version(db, owner_id)
+                    await db.commit()
+                    return
+
+                await delete_chunks_after(db, document_id, previous["last_chunk_id"])
+                await self._set_document(
+                    db, document_id,
+                    **{name: previous[name] for name in VERSION_FIELDS},
+                    status=DocumentStatus.READY,
+                    progress=100,
+                    attempts=attempts,
+                    error=error,
+                )
+                # Chunks of the failed version were searchable while it was ingested
+                await bump_corpus_version(db, owner_id)
+                await db.commit()
+            await remove_file(failed_path)
+        except DocumentGone:
+            pass
@@ -0,0 +1,58 @@
+"""
+LLM package.
+
+Backends stream chat completions. They all share the LLMBackend interface
+in base.py, so the chat route works the same against OpenAI or the local
+fake used by tests.
+"""
+from functools import lru_cache
+
+from app.core.config import settings
+from app.services.llm.base import ChatMessage, LLMBackend
+
+
+def _build_backend(**kwargs) -> LLMBackend:
+    if settings.LLM_BACKEND == "openai":
+        from app.services.llm.openai_backend import OpenAIChatBackend
+        return OpenAIChatBackend(**kwargs)
+
+    if settings.LLM_BACKEND == "fake":
+        from app.services.llm.fake import FakeLLMBackend
+        return FakeLLMBackend(**kwargs)
+
+    raise ValueError(f"Unknown LLM_BACKEND '{settings.LLM_BACKEND}'")
+
+
+@lru_cache(maxsize=1)
+def get_llm_backend() -> LLMBackend:
+    """
+    The backend selected by LLM_BACKEND (built once per process).
+
+    - "openai": OpenAI chat completions
+    - "fake": deterministic local answers (tests, offline development)
+
+    With LLM_ROUTER_ENABLED, a fast (LLM_MODEL) and a strong
+    (LLM_STRONG_MODEL) backend sit behind a ModelRouter that picks one
+    per prompt and hedges slow requests to the other.
+    """
+    if not settings.LLM_ROUTER_ENABLED:
+        return _build_backend()
+
+    from app.services.llm.router import ModelRouter, Tier
+    fast = _build_backend(model=settings.LLM_MODEL, name=f"{settings.LLM_BACKEND}_fast")
+    strong = _build_backend(model=settings.LLM_STRONG_MODEL, name=f"{settings.LLM_BACKEND}_strong")
+    return ModelRouter(
+        fast=Tier(
+            "fast", fast, fallback=strong,
+            prompt_cost=settings.LLM_PROMPT_COST_PER_1K_TOKENS,
+            completion_cost=settings.LLM_COMPLETION_COST_PER_1K_TOKENS
+        ),
+        strong=Tier(
+            "strong", strong, fallback=fast,
+            prompt_cost=settings.LLM_STRONG_PROMPT_COST_PER_1K_TOKENS,
+            completion_cost=settings.LLM_STRONG_COMPLETION_COST_PER_1K_TOKENS
+        )
+    )
+
+
+__all__ = ["ChatMessage", "LLMBackend", "get_llm_backend"]
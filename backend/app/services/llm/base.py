@@ -0,0 +1,36 @@
+"""
+LLM backend interface.
+"""
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Optional
+
+
+@dataclass
+class ChatMessage:
+    """
+    One prompt message. role is "system", "user" or "assistant".
+
+    tokens is the content's token count when the caller already knows it
+    (from stored counts), so the model router need not re-tokenise.
+    """
+    role: str
+    content: str
+    tokens: Optional[int] = None
+
+
+class LLMBackend(ABC):
+    """
+    Streams a chat completion.
+
+    Attributes:
+        name: Short backend name (used in metrics and routing)
+        model: Model identifier sent to the provider
+    """
+
+    name: str
+    model: str
+
+    @abstractmethod
+    def stream(self, messages: List[ChatMessage]) -> AsyncIterator[str]:
+        """Yield the answer as text fragments, as soon as each one arrives."""
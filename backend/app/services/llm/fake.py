@@ -0,0 +1,54 @@
+"""
+Fake LLM backend for tests and offline development.
+"""
+import asyncio
+import re
+from typing import AsyncIterator, List
+
+from app.services.llm.base import ChatMessage, LLMBackend
+
+# Context blocks in the prompt start with "[1] (document 4, page 2)" on their own line
+SOURCE_PATTERN = re.compile(r"^\[(\d+)\] \([^)]*\)\n(.+)$", re.MULTILINE)
+
+
+class FakeLLMBackend(LLMBackend):
+    """
+    Streams a deterministic answer word by word; no network.
+
+    The answer quotes the first sentence of the first context block in the
+    prompt (or says nothing was found), so tests can check that retrieval
+    results reach the model.
+
+    Args:
+        token_delay: Seconds to sleep before each fragment, to mimic a
+            real model's generation speed
+        name: Backend name (lets tests register several fakes)
+        first_token_delay: Extra seconds before the first fragment, to
+            mimic queueing at the provider (e.g. to trigger hedging)
+        model: Model name reported to callers
+    """
+
+    def __init__(self, token_delay: float = 0.0, name: str = "fake",
+                 first_token_delay: float = 0.0, model: str = "fake-llm"):
+        self.token_delay = token_delay
+        self.name = name
+        self.first_token_delay = first_token_delay
+        self.model = model
+
+    def answer_for(self, messages: List[ChatMessage]) -> str:
+        prompt = "\n".join(m.content for m in messages if m.role != "assistant")
+        question = messages[-1].content.strip().splitlines()[-1] if messages else ""
+        match = SOURCE_PATTERN.search(prompt)
+        if match is None:
+            return f"I could not find anything about \"{question}\" in your documents."
+        sentence = match.group(2).split(". ")[0].strip().rstrip(".")
+        return f"According to your notes [{match.group(1)}]: {sentence}."
+
+    async def stream(self, messages: List[ChatMessage]) -> AsyncIterator[str]:
+        words = self.answer_for(messages).split(" ")
+        if self.first_token_delay:
+            await asyncio.sleep(self.first_token_delay)
+        for i, word in enumerate(words):
+            if self.token_delay:
+                await asyncio.sleep(self.token_delay)
+            yield word if i == len(words) - 1 else word + " "
@@ -0,0 +1,48 @@
+"""
+Chat completions from the OpenAI API.
+"""
+from typing import AsyncIterator, List, Optional
+
+from app.core.config import settings
+from app.services.llm.base import ChatMessage, LLMBackend
+
+
+class OpenAIChatBackend(LLMBackend):
+    """
+    Streams chat completions with the async OpenAI client.
+
+    Args:
+        model: Chat model, e.g. gpt-4o-mini
+        temperature: Sampling temperature
+        api_key: Defaults to OPENAI_API_KEY
+        name: Backend name (distinguishes tiers in routing and metrics)
+    """
+
+    def __init__(
+        self,
+        model: str = settings.LLM_MODEL,
+        temperature: float = settings.LLM_TEMPERATURE,
+        api_key: Optional[str] = None,
+        name: str = "openai"
+    ):
+        from openai import AsyncOpenAI
+
+        api_key = api_key or settings.OPENAI_API_KEY
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY must be set to use the OpenAI chat backend")
+
+        self.name = name
+        self.model = model
+        self.temperature = temperature
+        self.client = AsyncOpenAI(api_key=api_key)
+
+    async def stream(self, messages: List[ChatMessage]) -> AsyncIterator[str]:
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": m.role, "content": m.content} for m in messages],
+            temperature=self.temperature,
+            stream=True
+        )
+        async for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
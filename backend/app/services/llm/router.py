@@ -0,0 +1,268 @@
+"""
+Latency- and cost-aware model routing.
+
+ModelRouter is itself an LLMBackend, so the chat route does not know it
+is there. For every prompt it:
+
+1. picks a tier: the cheap tier unless the question is long, the prompt
+   carries a lot of retrieved context, or a keyword classifier flags it
+   as needing reasoning (why / compare / derive / code ...)
+2. streams from that tier's backend, tracking time-to-first-token per
+   backend in a rolling window
+3. hedges: if the backend has not produced its first token within its
+   own rolling p95, the tier's fallback is asked as well and whichever
+   answers first is streamed (the other request is cancelled). A backend
+   that fails before its first token fails over to the fallback.
+
+Hedging only starts once a backend has LLM_HEDGE_MIN_SAMPLES samples, so
+a cold process never doubles its traffic.
+"""
+import asyncio
+import logging
+import re
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from app.core.metrics import Histogram, metrics
+from app.services.llm.base import ChatMessage, LLMBackend
+from app.services.tokens import count_tokens
+
+logger = logging.getLogger(__name__)
+
+
+def message_tokens(message: ChatMessage) -> int:
+    """The message's known token count, or a fresh count."""
+    return message.tokens if message.tokens is not None else count_tokens(message.content)
+
+hedges = metrics.counter("llm_hedged_requests_total", "Fallback requests sent because the primary was slow")
+hedge_wins = metrics.counter("llm_hedge_wins_total", "Hedged requests where the fallback answered first")
+failovers = metrics.counter("llm_failovers_total", "Fallback requests sent because the primary failed")
+routed_cost = metrics.counter("llm_router_cost_usd_total", "Estimated spend of routed completions")
+
+# Words that usually mean multi-step reasoning rather than a lookup
+COMPLEX_PATTERN = re.compile(
+    r"\b(why|explain|compare|contrast|differences?|derive|prove|proof|analy[sz]e|evaluate|"
+    r"justify|trade-?offs?|design|optimi[sz]e|debug|step by step|implement)\b",
+    re.IGNORECASE
+)
+
+
+def is_complex(question: str) -> bool:
+    """
+    Cheap classifier: reasoning keywords, code, or several questions at once.
+
+    Example:
+        >>> is_complex("What is a heap?"), is_complex("Why is quicksort O(n log n) on average?")
+        (False, True)
+    """
+    return bool(
+        COMPLEX_PATTERN.search(question)
+        or "```" in question
+        or question.count("?") > 1
+    )
+
+
+@dataclass
+class Tier:
+    """
+    A model tier.
+
+    Attributes:
+        name: Tier name ("fast", "strong")
+        backend: Where prompts routed to this tier go
+        fallback: Hedge / failover target (None = no hedging)
+        prompt_cost: USD per 1K prompt tokens
+        completion_cost: USD per 1K completion tokens
+    """
+    name: str
+    backend: LLMBackend
+    fallback: Optional[LLMBackend] = None
+    prompt_cost: float = 0.0
+    completion_cost: float = 0.0
+
+
+class LatencyTracker:
+    """Rolling time-to-first-token per backend (exported as metrics histograms)."""
+
+    def __init__(self, window: int = settings.LLM_LATENCY_WINDOW):
+        self.window = window
+        self._histograms: Dict[str, Histogram] = {}
+
+    def histogram(self, backend: LLMBackend) -> Histogram:
+        histogram = self._histograms.get(backend.name)
+        if histogram is None:
+            histogram = self._histograms[backend.name] = metrics.histogram(
+                f"llm_{backend.name}_first_token_seconds",
+                f"Time to first token from {backend.name}",
+                window=self.window
+            )
+        return histogram
+
+    def observe(self, backend: LLMBackend, seconds: float) -> None:
+        self.histogram(backend).observe(seconds)
+
+    def budget(self, backend: LLMBackend, percentile: float, min_samples: int) -> Optional[float]:
+        """The backend's rolling percentile, or None until it has enough samples."""
+        histogram = self.histogram(backend)
+        if histogram.count < min_samples:
+            return None
+        return histogram.percentile(percentile)
+
+
+class ModelRouter(LLMBackend):
+    """
+    Args:
+        fast: Cheap default tier
+        strong: Tier for long, context-heavy or complex questions
+        strong_query_tokens: Questions longer than this go to `strong`
+        strong_context_tokens: Prompts with more context than this go to `strong`
+        hedge: Send hedged requests to the tier's fallback
+        hedge_percentile: Latency budget percentile (of the primary's first-token time)
+        min_samples: Samples needed before the budget is trusted
+    """
+
+    name = "router"
+    model = "router"
+
+    def __init__(
+        self,
+        fast: Tier,
+        strong: Tier,
+        strong_query_tokens: int = settings.ROUTER_STRONG_QUERY_TOKENS,
+        strong_context_tokens: int = settings.ROUTER_STRONG_CONTEXT_TOKENS,
+        hedge: bool = settings.LLM_HEDGE_ENABLED,
+        hedge_percentile: float = settings.LLM_HEDGE_PERCENTILE,
+        min_samples: int = settings.LLM_HEDGE_MIN_SAMPLES,
+        latency: Optional[LatencyTracker] = None
+    ):
+        self.fast = fast
+        self.strong = strong
+        self.strong_query_tokens = strong_query_tokens
+        self.strong_context_tokens = strong_context_tokens
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.min_samples = min_samples
+        self.latency = latency or LatencyTracker()
+        self._routed = {
+            tier.name: metrics.counter(f"llm_router_{tier.name}_total", f"Prompts routed to the {tier.name} tier")
+            for tier in (fast, strong)
+        }
+
+    # ----- routing -----
+
+    def choose(self, messages: Sequence[ChatMessage]) -> Tuple[Tier, str]:
+        """Pick a tier for a prompt; returns (tier, reason)."""
+        question = next((m for m in reversed(messages) if m.role == "user"), None)
+        context_tokens = sum(message_tokens(m) for m in messages if m.role == "system")
+
+        if question is not None and message_tokens(question) > self.strong_query_tokens:
+            return self.strong, "long question"
+        if context_tokens > self.strong_context_tokens:
+            return self.strong, "large context"
+        if question is not None and is_complex(question.content):
+            return self.strong, "complex question"
+        return self.fast, "simple question"
+
+    async def stream(self, messages: List[ChatMessage]) -> AsyncIterator[str]:
+        tier, reason = self.choose(messages)
+        self._routed[tier.name].inc()
+        logger.debug("Routing to %s tier (%s)", tier.name, reason)
+
+        backend, iterator, first = await self._race(tier, messages)
+        parts = []
+        try:
+            if first is not None:
+                parts.append(first)
+                yield first
+            async for fragment in iterator:
+                parts.append(fragment)
+                yield fragment
+        finally:
+            await iterator.aclose()
+
+        # Priced by whichever backend answered (a hedge or failover is the other tier)
+        answered = self._tier_of(backend) or tier
+        routed_cost.inc(
+            sum(message_tokens(m) for m in messages) / 1000 * answered.prompt_cost
+            + count_tokens("".join(parts)) / 1000 * answered.completion_cost
+        )
+
+    def _tier_of(self, backend: LLMBackend) -> Optional[Tier]:
+        return next((tier for tier in (self.fast, self.strong) if tier.backend is backend), None)
+
+    # ----- hedging -----
+
+    async def _first(self, backend: LLMBackend, messages: List[ChatMessage], budget: Optional[float] = None):
+        """
+        Start a stream and wait for its first fragment; returns (iterator, fragment or None).
+
+        A primary cancelled after being hedged (`budget` set) is sampled at
+        its elapsed time, at least `budget`: a lower bound, but it lets the
+        budget of a primary that got slower grow until it wins again,
+        instead of staying at its old p95 and hedging every request.
+        Other losers are not sampled.
+        """
+        started = time.perf_counter()
+        iterator = backend.stream(messages).__aiter__()
+        try:
+            first = await iterator.__anext__()
+        except StopAsyncIteration:
+            first = None
+        except asyncio.CancelledError:
+            if budget is not None:
+                self.latency.observe(backend, max(time.perf_counter() - started, budget))
+            await iterator.aclose()
+            raise
+        self.latency.observe(backend, time.perf_counter() - started)
+        return iterator, first
+
+    async def _race(self, tier: Tier, messages: List[ChatMessage]):
+        """
+        Run the tier's backend (plus a hedge or failover to its fallback)
+        until one produces a first fragment; losers are cancelled.
+
+        Returns:
+            (backend that answered, its stream, first fragment or None)
+        """
+        budget = None
+        if self.hedge and tier.fallback is not None:
+            budget = self.latency.budget(tier.backend, self.hedge_percentile, self.min_samples)
+        primary = asyncio.create_task(self._first(tier.backend, messages, budget))
+        runners = {primary: (tier.backend, "primary")}
+        try:
+            if budget is not None:
+                done, _ = await asyncio.wait({primary}, timeout=budget)
+                if not done:
+                    hedges.inc()
+                    runners[asyncio.create_task(self._first(tier.fallback, messages))] = (tier.fallback, "hedge")
+
+            pending = set(runners)
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winners = [task for task in done if task.exception() is None]
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                        logger.warning("LLM backend %s failed before answering: %s", runners[task][0].name, error)
+                for task in winners[1:]:
+                    await task.result()[0].aclose()  # Tie: keep one stream
+                if winners:
+                    backend, role = runners[winners[0]]
+                    if role == "hedge":
+                        hedge_wins.inc()
+                    return (backend, *winners[0].result())
+
+                if not pending:
+                    started = [backend for backend, _ in runners.values()]
+                    if tier.fallback is None or tier.fallback in started:
+                        raise error
+                    failovers.inc()
+                    task = asyncio.create_task(self._first(tier.fallback, messages))
+                    runners[task] = (tier.fallback, "failover")
+                    pending = {task}
+        finally:
+            for task in runners:
+                if not task.done():
+                    task.cancel()
@@ -0,0 +1,209 @@
+"""
+Token-budgeted conversation memory.
+
+Each chat turn needs "what has been said so far" in the prompt. Reading
+and re-tokenising the whole history would make every turn slower than
+the last, so memory has two parts:
+
+- recent messages: the newest messages that fit the token budget, picked
+  using the token_count stored on each Message (no re-tokenising)
+- summary: a rolling summary of everything older, stored on the
+  conversation and extended incrementally. When the unsummarised tail
+  grows past the budget, only the messages that fell out of the window
+  are folded into the existing summary.
+
+Both parts are bounded, so assembling the prompt costs the same on turn
+5 and on turn 5,000.
+"""
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models.conversation import Conversation
+from app.models.message import Message
+from app.services.llm import ChatMessage, LLMBackend, get_llm_backend
+from app.services.tokens import count_tokens
+
+logger = logging.getLogger(__name__)
+
+summary_updates = metrics.counter("memory_summary_updates_total", "Times older turns were folded into a summary")
+folded_messages = metrics.counter("memory_folded_messages_total", "Messages folded into conversation summaries")
+
+
+def message_tokens(message: Message) -> int:
+    """Stored token count (counted once when the message was saved)."""
+    # Rows saved before token counts were recorded fall back to counting
+    return message.token_count or count_tokens(message.content)
+
+
+def format_turns(messages: List[Message]) -> str:
+    return "\n".join(f"{'User' if m.is_user else 'Assistant'}: {m.content}" for m in messages)
+
+
+class Summarizer(ABC):
+    """Extends a running summary with messages that left the recent window."""
+
+    @abstractmethod
+    async def summarize(self, previous: Optional[str], messages: List[Message], max_tokens: int) -> str:
+        """Return the new summary (at most about max_tokens tokens)."""
+
+
+class LLMSummarizer(Summarizer):
+    """
+    Asks an LLM backend to merge the new turns into the previous summary.
+
+    Only the previous summary and the newly folded messages are sent, so
+    the cost of an update does not grow with the conversation.
+    """
+
+    PROMPT = (
+        "You maintain a running summary of a tutoring conversation. "
+        "Merge the new messages into the existing summary. Keep facts, "
+        "definitions, decisions and open questions; drop small talk. "
+        "Reply with the updated summary only, in at most {max_tokens} tokens."
+    )
+
+    def __init__(self, backend: Optional[LLMBackend] = None):
+        self.backend = backend
+
+    async def summarize(self, previous: Optional[str], messages: List[Message], max_tokens: int) -> str:
+        backend = self.backend or get_llm_backend()
+        prompt = [
+            ChatMessage("system", self.PROMPT.format(max_tokens=max_tokens)),
+            ChatMessage("user", f"Existing summary:\n{previous or '(none)'}\n\nNew messages:\n{format_turns(messages)}"),
+        ]
+        return "".join([fragment async for fragment in backend.stream(prompt)]).strip()
+
+
+class ExtractiveSummarizer(Summarizer):
+    """
+    Keeps the first sentence of each folded message; no model call.
+
+    Deterministic and free, for tests and offline development. When the
+    summary outgrows max_tokens, its oldest lines are dropped first.
+    """
+
+    async def summarize(self, previous: Optional[str], messages: List[Message], max_tokens: int) -> str:
+        lines = previous.splitlines() if previous else []
+        for message in messages:
+            sentence = message.content.strip().split(". ")[0].split("\n")[0][:300]
+            lines.append(f"{'User' if message.is_user else 'Assistant'}: {sentence}")
+
+        while len(lines) > 1 and count_tokens("\n".join(lines)) > max_tokens:
+            lines.pop(0)
+        return "\n".join(lines)
+
+
+def get_summarizer() -> Summarizer:
+    """
+    The summarizer selected by MEMORY_SUMMARIZER.
+
+    - "llm": the configured LLM backend writes the summary
+    - "extractive": first sentence of each message (no model call)
+    """
+    if settings.MEMORY_SUMMARIZER == "llm":
+        return LLMSummarizer()
+
+    if settings.MEMORY_SUMMARIZER == "extractive":
+        return ExtractiveSummarizer()
+
+    raise ValueError(f"Unknown MEMORY_SUMMARIZER '{settings.MEMORY_SUMMARIZER}'")
+
+
+@dataclass
+class MemoryWindow:
+    """What goes into the prompt: the summary plus the newest messages, oldest first."""
+    summary: Optional[str] = None
+    messages: List[Message] = field(default_factory=list)
+    token_count: int = 0
+
+
+class ConversationMemory:
+    """
+    Builds prompt memory and keeps the rolling summary up to date.
+
+    Args:
+        budget: Tokens for summary + recent messages together
+        summary_max_tokens: Upper bound on the summary itself
+        max_messages: Most recent messages read per turn (a safety cap)
+        summarizer: How older turns are folded in (defaults to MEMORY_SUMMARIZER)
+    """
+
+    def __init__(
+        self,
+        budget: int = settings.MEMORY_TOKEN_BUDGET,
+        summary_max_tokens: int = settings.MEMORY_SUMMARY_MAX_TOKENS,
+        max_messages: int = settings.MEMORY_MAX_MESSAGES,
+        summarizer: Optional[Summarizer] = None
+    ):
+        self.budget = budget
+        self.summary_max_tokens = summary_max_tokens
+        self.max_messages = max_messages
+        self.summarizer = summarizer or get_summarizer()
+
+    async def _unsummarized(self, db: AsyncSession, conversation: Conversation, newest_first: bool) -> List[Message]:
+        """Messages not yet folded into the summary (at most max_messages)."""
+        statement = select(Message).where(Message.conversation_id == conversation.id)
+        if conversation.summarized_through_id is not None:
+            # Same (created_at, id) order as the history index, so this is a range scan
+            statement = statement.where(
+                tuple_(Message.created_at, Message.id)
+                > (conversation.summarized_until, conversation.summarized_through_id)
+            )
+        order = [Message.created_at.desc(), Message.id.desc()] if newest_first else [Message.created_at, Message.id]
+        result = await db.execute(statement.order_by(*order).limit(self.max_messages))
+        return list(result.scalars().all())
+
+    async def window(self, db: AsyncSession, conversation: Conversation) -> MemoryWindow:
+        """The summary plus as many of the newest messages as fit the budget."""
+        used = conversation.summary_token_count or 0
+        recent: List[Message] = []
+        for message in await self._unsummarized(db, conversation, newest_first=True):
+            tokens = message_tokens(message)
+            if used + tokens > self.budget:
+                break
+            used += tokens
+            recent.append(message)
+
+        return MemoryWindow(summary=conversation.summary, messages=list(reversed(recent)), token_count=used)
+
+    async def update(self, db: AsyncSession, conversation: Conversation) -> bool:
+        """
+        Fold the oldest unsummarised messages into the summary once they
+        no longer fit next to it. Commits if anything changed.
+
+        Returns:
+            True if the summary was updated
+        """
+        pending = await self._unsummarized(db, conversation, newest_first=False)
+        available = self.budget - self.summary_max_tokens
+        total = sum(message_tokens(message) for message in pending)
+        if total <= available and len(pending) < self.max_messages:
+            return False
+
+        # Keep the newest messages that fit; fold everything older
+        fold: List[Message] = []
+        while pending and (total > available or len(pending) >= self.max_messages):
+            message = pending.pop(0)
+            total -= message_tokens(message)
+            fold.append(message)
+
+        conversation.summary = await self.summarizer.summarize(conversation.summary, fold, self.summary_max_tokens)
+        conversation.summary_token_count = count_tokens(conversation.summary)
+        conversation.summarized_until = fold[-1].created_at
+        conversation.summarized_through_id = fold[-1].id
+        await db.commit()
+
+        summary_updates.inc()
+        folded_messages.inc(len(fold))
+        return True
+
+
+# Process-wide instance used by the chat route
+conversation_memory = ConversationMemory()
@@ -0,0 +1,85 @@
+"""
+Incremental document parsing.
+
+Each parser is a generator that yields one Segment at a time (a PDF page,
+a DOCX paragraph, a block of lines), so the whole document's text is
+never held in memory at once.
+"""
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+# Extensions we know how to read, grouped by parser
+PDF_TYPES = {".pdf"}
+DOCX_TYPES = {".docx"}
+TEXT_TYPES = {
+    ".md", ".markdown", ".txt", ".rst",
+    ".py", ".js", ".ts", ".java", ".c", ".cpp", ".h", ".hpp",
+    ".go", ".rs", ".rb", ".cs", ".sql", ".sh", ".html", ".css",
+}
+SUPPORTED_FILE_TYPES = PDF_TYPES | DOCX_TYPES | TEXT_TYPES
+
+# Lines of a text file grouped into one segment
+TEXT_BLOCK_LINES = 50
+
+
+class UnsupportedFileType(Exception):
+    """The file extension has no parser."""
+
+
+@dataclass
+class Segment:
+    """A piece of document text and the page it came from (if paged)."""
+    text: str
+    page: Optional[int] = None
+
+
+def iter_pdf_pages(path: str) -> Iterator[Segment]:
+    """Yield the text of a PDF one page at a time."""
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    for number, page in enumerate(reader.pages, start=1):
+        text = page.extract_text() or ""
+        if text.strip():
+            yield Segment(text=text, page=number)
+
+
+def iter_docx_paragraphs(path: str) -> Iterator[Segment]:
+    """Yield the text of a DOCX one paragraph at a time."""
+    import docx
+
+    for paragraph in docx.Document(path).paragraphs:
+        if paragraph.text.strip():
+            yield Segment(text=paragraph.text)
+
+
+def iter_text_blocks(path: str) -> Iterator[Segment]:
+    """Yield a text file (Markdown, code, ...) in blocks of lines."""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        block = []
+        for line in f:
+            block.append(line)
+            if len(block) >= TEXT_BLOCK_LINES:
+                yield Segment(text="".join(block))
+                block = []
+        if block:
+            yield Segment(text="".join(block))
+
+
+def iter_segments(path: str, file_type: str) -> Iterator[Segment]:
+    """
+    Pick the parser for a file type and yield its segments.
+
+    Raises:
+        UnsupportedFileType: If there is no parser for file_type
+    """
+    file_type = file_type.lower()
+
+    if file_type in PDF_TYPES:
+        return iter_pdf_pages(path)
+    if file_type in DOCX_TYPES:
+        return iter_docx_paragraphs(path)
+    if file_type in TEXT_TYPES:
+        return iter_text_blocks(path)
+
+    raise UnsupportedFileType(file_type)
@@ -0,0 +1,165 @@
+"""
+Authenticated-principal cache.
+
+get_current_user would otherwise hit Postgres on every protected request
+just to turn a token's email into a User row. This cache stores a small
+snapshot of the user (a Principal) keyed by the token, in two tiers:
+
+- local: per-worker TTL + LRU cache (no network at all)
+- redis: optional shared tier so every worker benefits from one lookup
+
+Entries never outlive the token's own expiry. When a user's flags change
+(is_active / is_superuser) call `invalidate_user` so the next request
+reloads the user. Invalidation is immediate for this worker and Redis;
+other workers' local tiers converge within PRINCIPAL_CACHE_LOCAL_TTL_SECONDS.
+"""
+import hashlib
+import json
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.redis import get_redis
+from app.models.user import User
+
+local_hits = metrics.counter("principal_cache_local_hits_total", "Principals served from the worker cache")
+redis_hits = metrics.counter("principal_cache_redis_hits_total", "Principals served from Redis")
+misses = metrics.counter("principal_cache_misses_total", "Principals loaded from the database")
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    Lightweight snapshot of an authenticated user.
+
+    Has the same attributes as UserResponse, so endpoints can return it
+    directly with response_model=UserResponse.
+    """
+    id: int
+    email: str
+    full_name: Optional[str]
+    is_active: bool
+    is_superuser: bool
+    created_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            is_active=bool(user.is_active),
+            is_superuser=bool(user.is_superuser),
+            created_at=user.created_at,
+        )
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        data["created_at"] = self.created_at.isoformat()
+        return json.dumps(data)
+
+    @classmethod
+    def from_json(cls, raw: str) -> "Principal":
+        data: Dict[str, Any] = json.loads(raw)
+        data["created_at"] = datetime.fromisoformat(data["created_at"])
+        return cls(**data)
+
+
+def _token_key(token: str) -> str:
+    # Never keep raw bearer tokens as cache keys
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class PrincipalCache:
+    """
+    Two-tier cache of Principal snapshots keyed by access token.
+
+    Args:
+        max_entries: Local tier capacity
+        local_ttl: Seconds a principal stays in the local tier
+        redis_ttl: Seconds a principal stays in Redis
+    """
+
+    KEY_PREFIX = "principal:"
+
+    def __init__(self, max_entries: int, local_ttl: int, redis_ttl: int):
+        self.local = TTLCache(max_entries=max_entries, ttl_seconds=local_ttl)
+        self.redis_ttl = redis_ttl
+
+    @staticmethod
+    def _remaining(expires_at: float) -> float:
+        return expires_at - time.time()
+
+    async def get(self, token: str) -> Optional[Principal]:
+        """Return the cached principal for this token, if any."""
+        key = _token_key(token)
+
+        principal = self.local.get(key)
+        if principal is not None:
+            local_hits.inc()
+            return principal
+
+        redis = get_redis()
+        if redis is not None:
+            raw = await redis.get(self.KEY_PREFIX + key)
+            if raw is not None:
+                redis_hits.inc()
+                principal = Principal.from_json(raw)
+                ttl = await redis.ttl(self.KEY_PREFIX + key)
+                self.local.set(key, principal, min(self.local.ttl_seconds, max(ttl, 0)))
+                return principal
+
+        misses.inc()
+        return None
+
+    async def set(self, token: str, principal: Principal, expires_at: float) -> None:
+        """
+        Cache a principal until at most `expires_at` (the token's exp claim).
+        """
+        remaining = self._remaining(expires_at)
+        if remaining <= 0:
+            return
+
+        key = _token_key(token)
+        self.local.set(key, principal, min(self.local.ttl_seconds, remaining))
+
+        redis = get_redis()
+        if redis is not None:
+            ttl = int(min(self.redis_ttl, remaining))
+            if ttl > 0:
+                user_index = f"{self.KEY_PREFIX}user:{principal.id}"
+                async with redis.pipeline(transaction=False) as pipe:
+                    pipe.set(self.KEY_PREFIX + key, principal.to_json(), ex=ttl)
+                    # Track the user's cached tokens so they can be invalidated together
+                    pipe.sadd(user_index, key)
+                    pipe.expire(user_index, self.redis_ttl)
+                    await pipe.execute()
+
+    async def invalidate_user(self, user_id: int) -> None:
+        """
+        Drop every cached principal for a user.
+
+        Call this whenever is_active or is_superuser changes.
+        """
+        self.local.delete_where(lambda _, principal: principal.id == user_id)
+
+        redis = get_redis()
+        if redis is not None:
+            user_index = f"{self.KEY_PREFIX}user:{user_id}"
+            keys = await redis.smembers(user_index)
+            doomed = [self.KEY_PREFIX + (k.decode() if isinstance(k, bytes) else k) for k in keys]
+            await redis.delete(user_index, *doomed)
+
+    def clear(self) -> None:
+        self.local.clear()
+
+
+principal_cache = PrincipalCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    local_ttl=settings.PRINCIPAL_CACHE_LOCAL_TTL_SECONDS,
+    redis_ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
@@ -0,0 +1,127 @@
+"""
+Refresh-token issuing, rotation and revocation.
+
+Renewing an access token costs one indexed lookup on
+refresh_tokens.token_hash instead of a bcrypt verify. Tokens rotate on
+every use; presenting an already-rotated token is treated as theft and
+revokes every outstanding token for that user.
+"""
+from datetime import datetime, timedelta
+from typing import Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app.core.config import settings
+from app.core.security import create_refresh_token, hash_refresh_token
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+
+
+class InvalidRefreshToken(Exception):
+    """The refresh token is unknown, expired, revoked or its user is inactive."""
+
+
+async def issue_refresh_token(db: AsyncSession, user_id: int) -> Tuple[str, RefreshToken]:
+    """
+    Create and stage a new refresh token for a user.
+
+    The caller commits the session.
+
+    Returns:
+        (raw token to hand to the client, RefreshToken row)
+    """
+    token = create_refresh_token()
+    row = RefreshToken(
+        token_hash=hash_refresh_token(token),
+        user_id=user_id,
+        expires_at=datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    )
+    db.add(row)
+    await db.flush()  # Assign row.id so it can be referenced by replaced_by_id
+    return token, row
+
+
+async def revoke_all_for_user(db: AsyncSession, user_id: int) -> None:
+    """Revoke every still-valid refresh token of a user."""
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+    )
+
+
+async def _revoke_family(db: AsyncSession, user_id: int) -> None:
+    """A rotated token was replayed: assume it leaked and end every session."""
+    await revoke_all_for_user(db, user_id)
+    await db.commit()
+
+
+async def rotate_refresh_token(db: AsyncSession, token: str) -> Tuple[User, str]:
+    """
+    Exchange a refresh token for a new one.
+
+    Commits the session: the old token is revoked and linked to its
+    replacement in the same transaction.
+
+    Returns:
+        (user the token belongs to, new raw refresh token)
+
+    Raises:
+        InvalidRefreshToken: If the token cannot be used
+    """
+    result = await db.execute(
+        select(RefreshToken)
+        .options(joinedload(RefreshToken.user))
+        .where(RefreshToken.token_hash == hash_refresh_token(token))
+    )
+    current = result.scalars().first()
+
+    if current is None:
+        raise InvalidRefreshToken()
+
+    user, user_id = current.user, current.user_id
+    if current.revoked_at is not None:
+        await _revoke_family(db, user_id)
+        raise InvalidRefreshToken()
+
+    if current.expires_at <= datetime.utcnow() or not user.is_active:
+        raise InvalidRefreshToken()
+
+    # Revoke with a conditional UPDATE, not the revoked_at read above: of two
+    # requests rotating the same token at once, only one gets the row
+    claimed = await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.id == current.id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow()),
+        execution_options={"synchronize_session": False}
+    )
+    if claimed.rowcount == 0:
+        await db.rollback()
+        await _revoke_family(db, user_id)
+        raise InvalidRefreshToken()
+
+    new_token, replacement = await issue_refresh_token(db, user_id)
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.id == current.id)
+        .values(replaced_by_id=replacement.id),
+        execution_options={"synchronize_session": False}
+    )
+    await db.commit()
+
+    return user, new_token
+
+
+async def revoke_refresh_token(db: AsyncSession, token: str) -> None:
+    """Revoke a single refresh token (logout). Unknown tokens are ignored."""
+    await db.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.token_hash == hash_refresh_token(token),
+            RefreshToken.revoked_at.is_(None)
+        )
+        .values(revoked_at=datetime.utcnow())
+    )
+    await db.commit()
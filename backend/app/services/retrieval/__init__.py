@@ -0,0 +1,47 @@
+"""
+Retrieval package.
+
+Retrievers find the chunks most relevant to a query. They all share the
+Retriever interface in base.py, so backends can be swapped via Settings.
+"""
+from app.core.config import settings
+from app.services.retrieval.base import RetrievalQuery, RetrievedChunk, Retriever
+
+
+def get_vector_retriever() -> Retriever:
+    """
+    The vector retriever selected by RETRIEVER_BACKEND.
+
+    - "pgvector": ANN search in Postgres (production)
+    - "numpy": in-process memory-mapped index (tests, local dev, small tenants)
+    """
+    if settings.RETRIEVER_BACKEND == "numpy":
+        from app.services.retrieval.inprocess import InProcessRetriever
+        return InProcessRetriever()
+
+    if settings.RETRIEVER_BACKEND == "pgvector":
+        from app.services.retrieval.pgvector import PgVectorRetriever
+        return PgVectorRetriever()
+
+    raise ValueError(f"Unknown RETRIEVER_BACKEND '{settings.RETRIEVER_BACKEND}'")
+
+
+def get_retriever() -> Retriever:
+    """
+    The retriever used to answer questions.
+
+    Hybrid (vector + Postgres full-text) when HYBRID_SEARCH_ENABLED and the
+    database is Postgres; otherwise the vector retriever alone.
+    """
+    from app.db.session import async_engine
+
+    vector = get_vector_retriever()
+    if not settings.HYBRID_SEARCH_ENABLED or async_engine.dialect.name != "postgresql":
+        return vector
+
+    from app.services.retrieval.hybrid import HybridRetriever
+    from app.services.retrieval.keyword import PostgresKeywordRetriever
+    return HybridRetriever(vector, PostgresKeywordRetriever())
+
+
+__all__ = ["RetrievalQuery", "RetrievedChunk", "Retriever", "get_retriever", "get_vector_retriever"]
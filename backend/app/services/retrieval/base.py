@@ -0,0 +1,54 @@
+"""
+Retriever interface shared by every search backend.
+"""
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from app.models.document import DocumentType
+
+
+@dataclass
+class RetrievalQuery:
+    """
+    What to search for and whose documents to search.
+
+    Attributes:
+        text: The user's question (used by keyword search)
+        embedding: Query embedding (used by vector search)
+        owner_id: Only this user's documents are searched
+        doc_type: Optionally restrict to one DocumentType
+    """
+    text: str
+    owner_id: int
+    embedding: Optional[np.ndarray] = None
+    doc_type: Optional[DocumentType] = None
+
+
+@dataclass
+class RetrievedChunk:
+    """A search hit. Higher score = more relevant (scale depends on backend)."""
+    chunk_id: int
+    document_id: int
+    score: float
+    ordinal: Optional[int] = None
+    page: Optional[int] = None
+    text: Optional[str] = None
+    token_count: Optional[int] = None
+
+
+class Retriever(ABC):
+    """
+    Base class for search backends.
+
+    Attributes:
+        needs_embedding: False if the backend can search with query.text alone
+    """
+
+    needs_embedding: bool = True
+
+    @abstractmethod
+    async def search(self, query: RetrievalQuery, k: int) -> List[RetrievedChunk]:
+        """Return up to k hits, best first."""
@@ -0,0 +1,132 @@
+"""
+Hybrid search: vector and keyword retrieval fused with reciprocal-rank fusion.
+
+Vector search finds paraphrases; keyword search finds exact terms (error
+codes, product names, acronyms) that embeddings tend to blur. The two
+stages run concurrently, each with its own timeout, so a hybrid search
+takes roughly as long as the slower stage instead of the sum of both.
+A stage that times out or fails is dropped and the other stage's hits
+are returned on their own.
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.retrieval.base import RetrievalQuery, RetrievedChunk, Retriever
+
+logger = logging.getLogger(__name__)
+
+stage_timeouts = metrics.counter("hybrid_stage_timeouts_total", "Hybrid search stages that hit their timeout")
+stage_errors = metrics.counter("hybrid_stage_errors_total", "Hybrid search stages that raised")
+vector_latency = metrics.histogram("hybrid_vector_stage_seconds", "Vector stage latency")
+keyword_latency = metrics.histogram("hybrid_keyword_stage_seconds", "Keyword stage latency")
+search_latency = metrics.histogram("hybrid_search_seconds", "End-to-end hybrid search latency")
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[List[RetrievedChunk]],
+    k: int = settings.HYBRID_RRF_K
+) -> List[RetrievedChunk]:
+    """
+    Merge ranked lists by summing 1 / (k + rank) per chunk.
+
+    Only ranks are used, so scores on different scales (cosine similarity,
+    ts_rank_cd) can be combined without normalisation. A larger k flattens
+    the difference between the top and lower ranks.
+
+    Returns:
+        One hit per chunk, best first, with score set to the fused score
+
+    Example:
+        >>> fused = reciprocal_rank_fusion([vector_hits, keyword_hits])
+    """
+    scores: Dict[int, float] = {}
+    hits: Dict[int, RetrievedChunk] = {}
+    for ranking in rankings:
+        for rank, hit in enumerate(ranking, start=1):
+            scores[hit.chunk_id] = scores.get(hit.chunk_id, 0.0) + 1.0 / (k + rank)
+            hits.setdefault(hit.chunk_id, hit)  # Keep the first copy (it carries the text)
+
+    order = sorted(scores, key=lambda chunk_id: scores[chunk_id], reverse=True)
+    return [
+        RetrievedChunk(
+            chunk_id=chunk_id,
+            document_id=hits[chunk_id].document_id,
+            score=scores[chunk_id],
+            ordinal=hits[chunk_id].ordinal,
+            page=hits[chunk_id].page,
+            text=hits[chunk_id].text,
+            token_count=hits[chunk_id].token_count,
+        )
+        for chunk_id in order
+    ]
+
+
+class HybridRetriever(Retriever):
+    """
+    Runs a vector and a keyword retriever concurrently and fuses the results.
+
+    Args:
+        vector: Vector retriever (skipped when the query has no embedding)
+        keyword: Keyword retriever (None = vector only)
+        candidates: Hits fetched from each stage before fusion
+        rrf_k: Reciprocal-rank-fusion constant
+        vector_timeout: Seconds before the vector stage is abandoned
+        keyword_timeout: Seconds before the keyword stage is abandoned
+    """
+
+    needs_embedding = False  # Falls back to keyword search alone
+
+    def __init__(
+        self,
+        vector: Retriever,
+        keyword: Optional[Retriever],
+        candidates: int = settings.HYBRID_CANDIDATES,
+        rrf_k: int = settings.HYBRID_RRF_K,
+        vector_timeout: float = settings.HYBRID_VECTOR_TIMEOUT_MS / 1000,
+        keyword_timeout: float = settings.HYBRID_KEYWORD_TIMEOUT_MS / 1000
+    ):
+        self.vector = vector
+        self.keyword = keyword
+        self.candidates = candidates
+        self.rrf_k = rrf_k
+        self.vector_timeout = vector_timeout
+        self.keyword_timeout = keyword_timeout
+
+    async def _run_stage(self, name: str, retriever: Retriever, query: RetrievalQuery,
+                         k: int, timeout: float, latency) -> List[RetrievedChunk]:
+        """Run one stage; a timeout or error yields no hits instead of failing the search."""
+        started = time.perf_counter()
+        try:
+            return await asyncio.wait_for(retriever.search(query, k), timeout)
+        except asyncio.TimeoutError:
+            stage_timeouts.inc()
+            logger.warning("Hybrid %s stage timed out after %.3fs", name, timeout)
+            return []
+        except Exception:
+            stage_errors.inc()
+            logger.exception("Hybrid %s stage failed", name)
+            return []
+        finally:
+            latency.observe(time.perf_counter() - started)
+
+    async def search(self, query: RetrievalQuery, k: int) -> List[RetrievedChunk]:
+        started = time.perf_counter()
+        n = max(k, self.candidates)
+
+        stages: List[Tuple[str, Retriever, float, object]] = []
+        if query.embedding is not None:
+            stages.append(("vector", self.vector, self.vector_timeout, vector_latency))
+        if self.keyword is not None:
+            stages.append(("keyword", self.keyword, self.keyword_timeout, keyword_latency))
+
+        rankings = await asyncio.gather(*(
+            self._run_stage(name, retriever, query, n, timeout, latency)
+            for name, retriever, timeout, latency in stages
+        ))
+
+        search_latency.observe(time.perf_counter() - started)
+        return reciprocal_rank_fusion(rankings, self.rrf_k)[:k]
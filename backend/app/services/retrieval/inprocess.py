@@ -0,0 +1,186 @@
+"""
+Retriever backed by the in-process NumPy index.
+
+Vector search happens in memory-mapped NumPy arrays (see numpy_index.py);
+the database is only used to fetch the text of the winning chunks, by
+primary key. No pgvector needed.
+"""
+from typing import List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette.concurrency import run_in_threadpool
+
+from app.db.session import AsyncSessionLocal
+from app.models.document import Document, DocumentType
+from app.models.document_chunk import DocumentChunk
+from app.services.retrieval.base import RetrievalQuery, RetrievedChunk, Retriever
+from app.services.retrieval.numpy_index import NumpyVectorStore, numpy_store
+
+
+class InProcessRetriever(Retriever):
+    """
+    Exact cosine search over an owner's memory-mapped vectors.
+
+    Owners have separate indexes and doc_type is filtered inside the
+    index before the top k is taken, so no hits are lost to filtering.
+
+    Args:
+        store: Where owner indexes live
+        session_factory: Used to load chunk text for the hits; pass None
+            to get bare hits (ids and scores only) without touching a database
+    """
+
+    def __init__(
+        self,
+        store: NumpyVectorStore = numpy_store,
+        session_factory: Optional[async_sessionmaker[AsyncSession]] = AsyncSessionLocal
+    ):
+        self.store = store
+        self.session_factory = session_factory
+
+    async def search(self, query: RetrievalQuery, k: int) -> List[RetrievedChunk]:
+        if query.embedding is None:
+            raise ValueError("InProcessRetriever needs a query embedding")
+
+        index = self.store.index_for(query.owner_id)
+        # The matrix product releases the GIL; keep it off the event loop
+        hits = await run_in_threadpool(index.search, query.embedding, k, query.doc_type)
+        if not hits:
+            return []
+
+        results = [
+            RetrievedChunk(chunk_id=chunk_id, document_id=document_id, score=score)
+            for chunk_id, document_id, score in hits
+        ]
+        if self.session_factory is None:
+            return results[:k]
+
+        return (await self._hydrate(query, results))[:k]
+
+    async def _hydrate(self, query: RetrievalQuery, results: List[RetrievedChunk]) -> List[RetrievedChunk]:
+        """Fill in chunk text/metadata, dropping chunks that no longer match."""
+        statement = (
+            select(DocumentChunk.id, DocumentChunk.ordinal, DocumentChunk.page,
+                   DocumentChunk.text, DocumentChunk.token_count)
+            .join(Document, Document.id == DocumentChunk.document_id)
+            .where(DocumentChunk.id.in_([r.chunk_id for r in results]))
+            .where(Document.owner_id == query.owner_id, Document.deleted_at.is_(None))
+        )
+        if query.doc_type is not None:
+            statement = statement.where(Document.doc_type == query.doc_type)
+
+        async with self.session_factory() as db:
+            rows = {row.id: row for row in (await db.execute(statement)).all()}
+
+        hydrated = []
+        for result in results:
+            row = rows.get(result.chunk_id)
+            if row is not None:
+                result.ordinal, result.page = row.ordinal, row.page
+                result.text, result.token_count = row.text, row.token_count
+                hydrated.append(result)
+        return hydrated
+
+
+def index_chunks(
+    owner_id: int,
+    document_id: int,
+    chunk_ids: Sequence[int],
+    embeddings: np.ndarray,
+    store: NumpyVectorStore = numpy_store,
+    doc_type: Optional[DocumentType] = None
+) -> None:
+    """Append freshly embedded chunks to their owner's in-process index."""
+    store.index_for(owner_id).append(
+        chunk_ids, [document_id] * len(chunk_ids), embeddings, [doc_type] * len(chunk_ids)
+    )
+
+
+async def index_document(
+    db: AsyncSession,
+    owner_id: int,
+    document_id: int,
+    store: NumpyVectorStore = numpy_store,
+    batch_size: int = 1000
+) -> int:
+    """
+    Append a newly committed document's embedded chunks to its owner's index.
+
+    Chunks are bulk-inserted without returning their ids, so they are read
+    back (streamed in batches) once the upload has committed.
+
+    Returns:
+        Number of vectors indexed
+    """
+    doc_type = await db.scalar(select(Document.doc_type).where(Document.id == document_id))
+    result = await db.stream(
+        select(DocumentChunk.id, DocumentChunk.embedding)
+        .where(DocumentChunk.document_id == document_id, DocumentChunk.embedding.is_not(None))
+        .order_by(DocumentChunk.ordinal)
+        .execution_options(yield_per=batch_size)
+    )
+
+    total = 0
+    async for rows in result.partitions():
+        index_chunks(
+            owner_id,
+            document_id,
+            [row.id for row in rows],
+            np.stack([np.asarray(row.embedding, dtype=np.float32) for row in rows]),
+            store,
+            doc_type
+        )
+        total += len(rows)
+    return total
+
+
+async def reindex_document(
+    db: AsyncSession,
+    owner_id: int,
+    document_id: int,
+    store: NumpyVectorStore = numpy_store
+) -> int:
+    """
+    Replace a document's vectors after a re-upload changed its chunks.
+
+    Kept chunks are read back with the new ones; nothing is re-embedded.
+    """
+    store.index_for(owner_id).delete_document(document_id)
+    return await index_document(db, owner_id, document_id, store)
+
+
+async def rebuild_owner_index(
+    db: AsyncSession,
+    owner_id: int,
+    store: NumpyVectorStore = numpy_store,
+    batch_size: int = 1000
+) -> int:
+    """
+    Rebuild an owner's in-process index from embeddings stored in the database.
+
+    Returns:
+        Number of vectors indexed
+    """
+    store.drop(owner_id)
+    index = store.index_for(owner_id)
+
+    result = await db.stream(
+        select(DocumentChunk.id, DocumentChunk.document_id, DocumentChunk.embedding, Document.doc_type)
+        .join(Document, Document.id == DocumentChunk.document_id)
+        .where(Document.owner_id == owner_id, Document.deleted_at.is_(None), DocumentChunk.embedding.is_not(None))
+        .order_by(DocumentChunk.id)
+        .execution_options(yield_per=batch_size)
+    )
+
+    total = 0
+    async for rows in result.partitions():
+        index.append(
+            [row.id for row in rows],
+            [row.document_id for row in rows],
+            np.stack([np.asarray(row.embedding, dtype=np.float32) for row in rows]),
+            [row.doc_type for row in rows]
+        )
+        total += len(rows)
+    return total
@@ -0,0 +1,82 @@
+"""
+Keyword search in Postgres full-text search.
+"""
+from typing import List
+
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.document import Document
+from app.models.document_chunk import DocumentChunk
+from app.services.retrieval.base import RetrievalQuery, RetrievedChunk, Retriever
+
+# Generated tsvector column (see migration 36625f6e53f0); not mapped on the
+# model because SQLite, used in tests, has no tsvector type
+SEARCH_VECTOR = literal_column("document_chunks.search_vector")
+
+
+class PostgresKeywordRetriever(Retriever):
+    """
+    Full-text search over document_chunks.search_vector (GIN indexed).
+
+    The question is parsed with websearch_to_tsquery, so users can type
+    plain text, "quoted phrases", OR and -exclusions, and malformed input
+    never raises. Hits are ranked with ts_rank_cd (cover density), which
+    rewards chunks where the query terms appear close together.
+
+    Score is the ts_rank_cd value (unbounded, only comparable within one
+    query).
+    """
+
+    needs_embedding = False
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        config: str = settings.TEXT_SEARCH_CONFIG
+    ):
+        self.session_factory = session_factory
+        self.config = config
+
+    async def search(self, query: RetrievalQuery, k: int) -> List[RetrievedChunk]:
+        if not query.text.strip():
+            return []
+
+        tsquery = func.websearch_to_tsquery(self.config, query.text)
+        rank = func.ts_rank_cd(SEARCH_VECTOR, tsquery).label("rank")
+        statement = (
+            select(
+                DocumentChunk.id,
+                DocumentChunk.document_id,
+                DocumentChunk.ordinal,
+                DocumentChunk.page,
+                DocumentChunk.text,
+                DocumentChunk.token_count,
+                rank,
+            )
+            .join(Document, Document.id == DocumentChunk.document_id)
+            .where(DocumentChunk.owner_id == query.owner_id, Document.deleted_at.is_(None))
+            .where(SEARCH_VECTOR.op("@@")(tsquery))
+            .order_by(rank.desc())
+            .limit(k)
+        )
+        if query.doc_type is not None:
+            statement = statement.where(DocumentChunk.doc_type == query.doc_type)
+
+        async with self.session_factory() as db:
+            rows = (await db.execute(statement)).all()
+
+        return [
+            RetrievedChunk(
+                chunk_id=row.id,
+                document_id=row.document_id,
+                score=float(row.rank),
+                ordinal=row.ordinal,
+                page=row.page,
+                text=row.text,
+                token_count=row.token_count,
+            )
+            for row in rows
+        ]
@@ -0,0 +1,415 @@
+"""
+In-process vector index backed by memory-mapped NumPy arrays.
+
+For tests, local development and small tenants, where running pgvector
+is not worth it. Each owner gets a directory holding:
+
+    vectors.f32   float32 matrix (capacity x dim), unit-normalised rows
+    ids.i64       chunk id per row (-1 = deleted)
+    docs.i64      document id per row
+    types.i8      DocumentType code per row (0 = unknown)
+    codes.i8      int8 copy of the vectors (quantized indexes only)
+    scales.f32    per-row scale of codes.i8 (quantized indexes only)
+    meta.json     {"dim", "count", "capacity", "deleted", "quantized", "generation"}
+    index.lock    flock target shared by every handle on the directory
+
+Search is one matrix-vector product plus argpartition for the top k,
+so there is no index structure to build or tune and results are exact.
+Indexes are partitioned by owner (one directory each), and a doc_type
+filter masks rows before the top k is taken, so a filtered search
+returns k hits whenever the owner has k matching chunks.
+Deletes only mark rows (tombstones); once enough rows are dead the
+files are rewritten without them (compaction).
+
+Several processes (API workers, python -m app.worker) may open the same
+owner directory. Writes take an exclusive flock on index.lock and
+searches a shared one; each handle re-reads meta.json under the lock
+and re-maps the files when another process grew or compacted them
+(compaction bumps "generation"), so rows are never written over and
+every handle sees the others' appends and deletes.
+
+With quantize=True (VECTOR_INDEX_QUANTIZATION=int8) the scan reads the
+int8 codes, a quarter of the float32 bytes, and only the best
+k * rerank_factor candidates are re-scored exactly against vectors.f32.
+Resident memory is then the codes plus a few float32 pages per query.
+An existing float32 index is quantized in place when first opened
+this way.
+"""
+import json
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.models.document import DocumentType
+
+try:
+    import fcntl
+except ImportError:  # Not on Windows: there a directory must have a single writer process
+    fcntl = None
+
+MIN_CAPACITY = 1024
+DELETED = -1
+UNKNOWN_TYPE = 0  # Rows written before doc types were stored; they match every filter
+TYPE_CODES = {doc_type: code for code, doc_type in enumerate(DocumentType, start=1)}
+FILES = ["vectors.f32", "ids.i64", "docs.i64", "types.i8"]
+QUANTIZED_FILES = ["codes.i8", "scales.f32"]
+SCAN_BLOCK_ROWS = 2048  # int8 rows widened to float32 at a time (bounds scratch memory)
+
+
+def quantize(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Symmetric per-row int8 quantization: vector ~= codes * scale.
+
+    Example:
+        >>> codes, scales = quantize(np.array([[0.5, -1.0]], dtype=np.float32))
+        >>> codes.tolist(), round(float(scales[0] * 127), 3)
+        ([[64, -127]], 1.0)
+    """
+    scales = np.abs(vectors).max(axis=1) / 127
+    scales[scales == 0] = 1
+    codes = np.rint(vectors / scales[:, None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+class OwnerVectorIndex:
+    """
+    Memory-mapped vectors of a single owner.
+
+    Args:
+        path: Directory holding the index files (created if missing)
+        dim: Embedding dimension
+        compact_ratio: Compact once deleted/count reaches this ratio
+        quantize: Scan int8 codes and re-score candidates in float32
+        rerank_factor: Candidates re-scored per requested hit
+    """
+
+    def __init__(self, path: Path, dim: int = settings.EMBEDDING_DIM,
+                 compact_ratio: float = settings.VECTOR_INDEX_COMPACT_RATIO,
+                 quantize: bool = settings.VECTOR_INDEX_QUANTIZATION == "int8",
+                 rerank_factor: int = settings.VECTOR_RERANK_FACTOR):
+        self.path = Path(path)
+        self.dim = dim
+        self.compact_ratio = compact_ratio
+        self.quantized = quantize
+        self.rerank_factor = rerank_factor
+        self._lock = threading.Lock()  # Threads of this handle; index.lock covers other handles
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._lock_file = open(self._file("index.lock"), "a+b")
+
+        with self._locked():
+            meta = self._read_meta()
+            if meta is None:
+                self.count, self.deleted, self.generation = 0, 0, 0
+                self._open(MIN_CAPACITY, grow_from=0)
+                self._write_meta()
+            else:
+                if meta["dim"] != dim:
+                    raise ValueError(f"Index at {self.path} has dim {meta['dim']}, expected {dim}")
+                self.count, self.deleted = meta["count"], meta["deleted"]
+                self.generation = meta.get("generation", 0)
+                self._open(meta["capacity"])
+                if quantize and not meta.get("quantized"):
+                    self._backfill_codes()
+
+    @contextmanager
+    def _locked(self, shared: bool = False):
+        """Hold this handle's thread lock and the directory's flock."""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            fcntl.flock(self._lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _refresh(self) -> None:
+        """Pick up what other handles wrote since our last look (caller holds the lock)."""
+        meta = self._read_meta()
+        if meta is None:  # Directory dropped under us; keep serving what is mapped
+            return
+        if meta.get("generation", 0) != self.generation or meta["capacity"] != self.capacity:
+            self.generation = meta.get("generation", 0)
+            self._open(meta["capacity"])
+        self.count, self.deleted = meta["count"], meta["deleted"]
+
+    # ----- files -----
+
+    def _file(self, name: str) -> Path:
+        return self.path / name
+
+    def _read_meta(self) -> Optional[dict]:
+        try:
+            return json.loads(self._file("meta.json").read_text())
+        except FileNotFoundError:
+            return None
+
+    def _write_meta(self) -> None:
+        # Write-then-rename so a crash never leaves a half-written meta file
+        temp = self._file("meta.json.tmp")
+        temp.write_text(json.dumps({
+            "dim": self.dim, "count": self.count, "capacity": self.capacity, "deleted": self.deleted,
+            "quantized": self.quantized, "generation": self.generation,
+        }))
+        os.replace(temp, self._file("meta.json"))
+
+    @staticmethod
+    def _map(path: Path, dtype, shape: Tuple[int, ...]) -> np.memmap:
+        size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        with open(path, "ab") as f:  # Create, or grow in place (existing bytes are kept)
+            if f.tell() < size:
+                f.truncate(size)
+        return np.memmap(path, dtype=dtype, mode="r+", shape=shape)
+
+    def _open(self, capacity: int, grow_from: Optional[int] = None) -> None:
+        """
+        (Re)map the files with room for `capacity` rows.
+
+        Rows from `grow_from` onwards are new (zero-filled) and get marked
+        as empty.
+        """
+        self.vectors = self._map(self._file("vectors.f32"), np.float32, (capacity, self.dim))
+        self.ids = self._map(self._file("ids.i64"), np.int64, (capacity,))
+        self.doc_ids = self._map(self._file("docs.i64"), np.int64, (capacity,))
+        self.types = self._map(self._file("types.i8"), np.int8, (capacity,))
+        if self.quantized:
+            self.codes = self._map(self._file("codes.i8"), np.int8, (capacity, self.dim))
+            self.scales = self._map(self._file("scales.f32"), np.float32, (capacity,))
+        if grow_from is not None:
+            self.ids[grow_from:] = DELETED
+        self.capacity = capacity
+
+    def _flush(self) -> None:
+        self.vectors.flush()
+        self.ids.flush()
+        self.doc_ids.flush()
+        self.types.flush()
+        if self.quantized:
+            self.codes.flush()
+            self.scales.flush()
+        self._write_meta()
+
+    def _arrays(self) -> List[Tuple[str, np.memmap]]:
+        """Every per-row file and its map, in FILES (+ QUANTIZED_FILES) order."""
+        arrays = [self.vectors, self.ids, self.doc_ids, self.types]
+        names = list(FILES)
+        if self.quantized:
+            arrays += [self.codes, self.scales]
+            names += QUANTIZED_FILES
+        return list(zip(names, arrays))
+
+    def _backfill_codes(self) -> None:
+        """Quantize the rows of an index that was written without codes."""
+        for start in range(0, self.count, SCAN_BLOCK_ROWS):
+            rows = slice(start, min(start + SCAN_BLOCK_ROWS, self.count))
+            self.codes[rows], self.scales[rows] = quantize(np.asarray(self.vectors[rows]))
+        self._flush()
+
+    # ----- writes -----
+
+    def append(
+        self,
+        chunk_ids: Sequence[int],
+        document_ids: Sequence[int],
+        vectors: np.ndarray,
+        doc_types: Optional[Sequence[Optional[DocumentType]]] = None
+    ) -> None:
+        """Add vectors (normalised here, so scores are cosine similarities)."""
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        if len(vectors) == 0:
+            return
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1, norms)
+
+        with self._locked():
+            self._refresh()
+            needed = self.count + len(vectors)
+            if needed > self.capacity:
+                capacity = self.capacity
+                while capacity < needed:
+                    capacity *= 2  # Amortised O(1) appends
+                self._open(capacity, grow_from=self.capacity)
+
+            rows = slice(self.count, needed)
+            self.vectors[rows] = vectors
+            if self.quantized:
+                self.codes[rows], self.scales[rows] = quantize(vectors)
+            self.doc_ids[rows] = np.asarray(document_ids, dtype=np.int64)
+            self.types[rows] = (
+                [TYPE_CODES.get(doc_type, UNKNOWN_TYPE) for doc_type in doc_types]
+                if doc_types is not None else UNKNOWN_TYPE
+            )
+            self.ids[rows] = np.asarray(chunk_ids, dtype=np.int64)
+            self.count = needed
+            self._flush()
+
+    def _tombstone(self, mask: np.ndarray) -> int:
+        """Mark rows as deleted (caller holds the lock)."""
+        mask &= self.ids[:self.count] != DELETED
+        removed = int(mask.sum())
+        if removed:
+            self.ids[:self.count][mask] = DELETED
+            self.deleted += removed
+            self._flush()
+            if self.deleted >= self.compact_ratio * self.count:
+                self._compact()
+        return removed
+
+    def delete_chunks(self, chunk_ids: Sequence[int]) -> int:
+        """Tombstone rows by chunk id; returns how many were removed."""
+        with self._locked():
+            self._refresh()
+            return self._tombstone(np.isin(self.ids[:self.count], np.asarray(chunk_ids, dtype=np.int64)))
+
+    def delete_document(self, document_id: int) -> int:
+        """Tombstone every row of a document; returns how many were removed."""
+        with self._locked():
+            self._refresh()
+            return self._tombstone(self.doc_ids[:self.count] == document_id)
+
+    def _compact(self) -> None:
+        """Rewrite the files keeping only live rows (caller holds the lock)."""
+        live = self.ids[:self.count] != DELETED
+        arrays = [(name, array[:self.count][live]) for name, array in self._arrays()]
+        kept = int(live.sum())
+
+        capacity = max(MIN_CAPACITY, 1 << max(0, int(kept - 1).bit_length()))
+        for name, array in arrays:
+            padded = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+            if name == "ids.i64":
+                padded[:] = DELETED
+            padded[:len(array)] = array
+            padded.tofile(self._file(name + ".tmp"))
+
+        # Swap files in; the new maps are opened from the renamed files
+        del self.vectors, self.ids, self.doc_ids, self.types
+        if self.quantized:
+            del self.codes, self.scales
+        for name, _ in arrays:
+            os.replace(self._file(name + ".tmp"), self._file(name))
+        self.count, self.deleted = kept, 0
+        self.generation += 1  # Other handles' maps point at the replaced files
+        self._open(capacity)
+        self._write_meta()
+
+    def compact(self) -> None:
+        with self._locked():
+            self._refresh()
+            if self.deleted:
+                self._compact()
+
+    # ----- reads -----
+
+    @property
+    def live_count(self) -> int:
+        return self.count - self.deleted
+
+    @property
+    def scan_bytes(self) -> int:
+        """Bytes of vector data a search reads in full (what must stay in RAM to be fast)."""
+        if self.quantized:
+            return self.count * (self.dim + 4)  # int8 codes + float32 scale
+        return self.count * self.dim * 4
+
+    @staticmethod
+    def _approximate_scores(codes: np.ndarray, scales: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """codes @ query * scale, widening SCAN_BLOCK_ROWS rows to float32 at a time."""
+        scores = np.empty(len(codes), dtype=np.float32)
+        for start in range(0, len(codes), SCAN_BLOCK_ROWS):
+            end = start + SCAN_BLOCK_ROWS
+            scores[start:end] = (codes[start:end].astype(np.float32) @ query) * scales[start:end]
+        return scores
+
+    def search(self, query: np.ndarray, k: int, doc_type: Optional[DocumentType] = None) -> List[Tuple[int, int, float]]:
+        """
+        Exact top-k by cosine similarity, optionally among one doc_type only.
+
+        Returns:
+            [(chunk_id, document_id, score), ...] best first
+        """
+        with self._locked(shared=True):
+            self._refresh()
+            count = self.count
+            vectors, ids, doc_ids, types = self.vectors[:count], self.ids[:count], self.doc_ids[:count], self.types[:count]
+            codes = (self.codes[:count], self.scales[:count]) if self.quantized else None
+        if count == 0 or k <= 0:
+            return []
+
+        query = np.asarray(query, dtype=np.float32).reshape(self.dim)
+        norm = np.linalg.norm(query)
+        query = query / norm if norm else query
+        excluded = ids == DELETED
+        if doc_type is not None:
+            excluded |= (types != TYPE_CODES[doc_type]) & (types != UNKNOWN_TYPE)
+
+        if codes is not None:
+            return self._search_quantized(codes, query, k, excluded, vectors, ids, doc_ids)
+
+        scores = vectors @ query
+        scores[excluded] = -np.inf
+
+        k = min(k, count)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            (int(ids[i]), int(doc_ids[i]), float(scores[i]))
+            for i in top if not excluded[i]
+        ]
+
+    def _search_quantized(self, codes, query, k, excluded, vectors, ids, doc_ids) -> List[Tuple[int, int, float]]:
+        """Approximate top candidates from the int8 codes, then exact float32 scores for those only."""
+        scores = self._approximate_scores(*codes, query)
+        scores[excluded] = -np.inf
+
+        fetch = min(len(scores), k * self.rerank_factor)
+        candidates = np.argpartition(-scores, fetch - 1)[:fetch]
+        candidates = np.sort(candidates[~excluded[candidates]])  # Sorted: sequential reads of vectors.f32
+        if len(candidates) == 0:
+            return []
+
+        exact = vectors[candidates] @ query
+        top = np.argsort(-exact)[:k]
+        return [
+            (int(ids[candidates[i]]), int(doc_ids[candidates[i]]), float(exact[i]))
+            for i in top
+        ]
+
+
+class NumpyVectorStore:
+    """
+    One OwnerVectorIndex per owner, opened lazily and kept open.
+
+    Args:
+        root: Directory holding one sub-directory per owner
+    """
+
+    def __init__(self, root: str = settings.VECTOR_INDEX_DIR, dim: int = settings.EMBEDDING_DIM):
+        self.root = Path(root)
+        self.dim = dim
+        self._indexes: Dict[int, OwnerVectorIndex] = {}
+        self._lock = threading.Lock()
+
+    def index_for(self, owner_id: int) -> OwnerVectorIndex:
+        with self._lock:
+            index = self._indexes.get(owner_id)
+            if index is None:
+                index = OwnerVectorIndex(self.root / f"owner_{owner_id}", dim=self.dim)
+                self._indexes[owner_id] = index
+            return index
+
+    def drop(self, owner_id: int) -> None:
+        """Delete an owner's index files (e.g. before a full rebuild)."""
+        with self._lock:
+            self._indexes.pop(owner_id, None)
+            shutil.rmtree(self.root / f"owner_{owner_id}", ignore_errors=True)
+
+
+# Process-wide store; other processes open their own handles on the same files
+numpy_store = NumpyVectorStore()
@@ -0,0 +1,107 @@
+"""
+Vector search in Postgres with pgvector.
+"""
+from typing import List
+
+from pgvector.sqlalchemy import HALFVEC
+from sqlalchemy import literal_column, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db import vector_index
+from app.db.session import AsyncSessionLocal
+from app.models.document import Document
+from app.models.document_chunk import DocumentChunk
+from app.services.retrieval.base import RetrievalQuery, RetrievedChunk, Retriever
+
+# Generated float16 copy of embedding (see the add_chunk_halfvec migration); not mapped on the model
+EMBEDDING_HALF = literal_column(f"{vector_index.TABLE}.{vector_index.HALF_COLUMN}", type_=HALFVEC(settings.EMBEDDING_DIM))
+
+
+class PgVectorRetriever(Retriever):
+    """
+    Approximate nearest-neighbour search over document_chunks.embedding.
+
+    Each search runs in its own short session, so several searches (e.g.
+    the stages of a hybrid search) can run concurrently. The per-query
+    index parameter (hnsw.ef_search / ivfflat.probes) is applied with
+    SET LOCAL, so it only affects this transaction.
+
+    Owner and doc_type are filtered on the chunk rows themselves: the
+    doc_type predicate matches a partial index (see app.db.vector_index),
+    and the owner filter can use the (owner_id, doc_type) btree or, with
+    an iterative scan, keep reading the ANN index until k rows qualify.
+    An iterative scan in relaxed order may return rows slightly out of
+    order, so hits are sorted again here.
+
+    With halfvec, the ANN stage orders by the float16 embedding_half
+    (whose index is half the size) and fetches k * rerank_factor
+    candidates; those are re-scored with the float32 embedding and the
+    best k returned, so scores stay exact.
+
+    Score is cosine similarity (1 - cosine distance).
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        index_type: str = settings.VECTOR_INDEX_TYPE,
+        halfvec: bool = settings.VECTOR_INDEX_HALFVEC,
+        rerank_factor: int = settings.VECTOR_RERANK_FACTOR
+    ):
+        self.session_factory = session_factory
+        self.index_type = index_type
+        self.halfvec = halfvec
+        self.rerank_factor = rerank_factor
+
+    def search_settings(self) -> List[str]:
+        """SET LOCAL statements run before each search."""
+        return vector_index.search_settings_sql(self.index_type)
+
+    async def search(self, query: RetrievalQuery, k: int) -> List[RetrievedChunk]:
+        if query.embedding is None:
+            raise ValueError("PgVectorRetriever needs a query embedding")
+
+        distance = DocumentChunk.embedding.cosine_distance(query.embedding).label("distance")
+        ann_distance = EMBEDDING_HALF.cosine_distance(query.embedding) if self.halfvec else distance
+        statement = (
+            select(
+                DocumentChunk.id,
+                DocumentChunk.document_id,
+                DocumentChunk.ordinal,
+                DocumentChunk.page,
+                DocumentChunk.text,
+                DocumentChunk.token_count,
+                distance,
+            )
+            .join(Document, Document.id == DocumentChunk.document_id)
+            .where(DocumentChunk.owner_id == query.owner_id, Document.deleted_at.is_(None))
+            .order_by(ann_distance)
+            .limit(k * self.rerank_factor if self.halfvec else k)
+        )
+        if query.doc_type is not None:
+            # A constant, so the partial index still matches under a generic plan
+            statement = statement.where(literal_column(vector_index.doc_type_predicate(query.doc_type, vector_index.TABLE)))
+        if self.halfvec:
+            # Exact float32 distance of the candidates only
+            candidates = statement.subquery()
+            statement = select(candidates).order_by(candidates.c.distance).limit(k)
+
+        async with self.session_factory() as db:
+            async with db.begin():
+                for setting in self.search_settings():
+                    await db.execute(text(setting))
+                rows = sorted((await db.execute(statement)).all(), key=lambda row: row.distance)
+
+        return [
+            RetrievedChunk(
+                chunk_id=row.id,
+                document_id=row.document_id,
+                score=1.0 - row.distance,
+                ordinal=row.ordinal,
+                page=row.page,
+                text=row.text,
+                token_count=row.token_count,
+            )
+            for row in rows
+        ]
@@ -0,0 +1,250 @@
+"""
+Request coalescing ("single flight").
+
+When an announcement goes out, dozens of students ask the same thing
+within seconds. Concurrent identical calls share one execution:
+
+- SingleFlight: awaitables (retrieval). Callers with the same key while
+  a call is running get its result.
+- StreamFlight: async iterators (LLM streams). The first caller starts
+  the upstream stream in its own task; every caller, including ones that
+  join half-way, replays the fragments produced so far and then follows
+  new ones live. The upstream is cancelled only when no caller is left.
+
+With Redis, StreamFlight also coalesces across processes: the process
+that wins `SET singleflight:<key> NX` runs the upstream and mirrors it
+to a Redis stream; other processes relay that stream to their own
+callers. If the owning process dies mid-answer (lock gone, no end
+marker), followers fall back to calling upstream themselves.
+
+The LLM key is a hash of the model and the normalised prompt. The prompt
+contains the retrieved context and the conversation memory, so two
+requests share an answer only if both saw the same context.
+"""
+import asyncio
+import hashlib
+import logging
+import uuid
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional, Sequence
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.redis import get_redis
+from app.services.embeddings.cache import normalize_text
+from app.services.llm.base import ChatMessage
+
+logger = logging.getLogger(__name__)
+
+leaders = metrics.counter("singleflight_leaders_total", "Calls that went upstream")
+coalesced = metrics.counter("singleflight_coalesced_total", "Calls that joined an identical in-flight call")
+remote_followers = metrics.counter("singleflight_remote_followers_total", "Streams relayed from another process via Redis")
+
+LOCK_PREFIX = "singleflight:"
+STREAM_TTL_SECONDS = 60  # Relayed fragments outlive the flight this long (late readers)
+RELAY_BLOCK_MS = 1000
+
+
+def prompt_key(model: str, messages: Sequence[ChatMessage]) -> str:
+    """Coalescing key of an LLM call: model + normalised prompt (which includes the context)."""
+    digest = hashlib.sha256(model.encode())
+    for message in messages:
+        digest.update(b"\0" + message.role.encode() + b"\0" + normalize_text(message.content).encode())
+    return digest.hexdigest()
+
+
+class SingleFlight:
+    """Share one in-flight awaitable per key between concurrent callers."""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._inflight.get(key)
+        if future is None:
+            leaders.inc()
+            future = asyncio.ensure_future(factory())
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            coalesced.inc()
+        # Shielded: one caller going away must not cancel the call for the others
+        return await asyncio.shield(future)
+
+    def _forget(self, key: Hashable, future: asyncio.Future) -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+
+
+class LeaderLost(Exception):
+    """The process running the upstream call died before finishing it."""
+
+
+class _Broadcast:
+    """Fragments of one upstream stream, replayable by any number of followers."""
+
+    def __init__(self):
+        self.fragments: List[str] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def publish(self, fragment: str) -> None:
+        self.fragments.append(fragment)
+        self._notify()
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        self.done, self.error = True, error
+        self._notify()
+
+    async def follow(self) -> AsyncIterator[str]:
+        position = 0
+        while True:
+            while position < len(self.fragments):
+                yield self.fragments[position]
+                position += 1
+            if self.done:
+                if self.error is not None:
+                    raise self.error
+                return
+            await self._changed.wait()
+
+
+class StreamFlight:
+    """
+    Share one upstream async iterator per key between concurrent callers.
+
+    Args:
+        redis: Optional redis.asyncio client for cross-process coalescing;
+            defaults to get_redis() (None when Redis is disabled)
+        lock_ttl: Seconds the cross-process lock lives (longest answer)
+    """
+
+    def __init__(self, redis: Any = None, lock_ttl: int = settings.SINGLE_FLIGHT_LOCK_TTL_SECONDS):
+        self._redis = redis
+        self.lock_ttl = lock_ttl
+        self._inflight: Dict[str, _Broadcast] = {}
+
+    @property
+    def redis(self):
+        return self._redis if self._redis is not None else get_redis()
+
+    async def stream(self, key: str, factory: Callable[[], AsyncIterator[str]]) -> AsyncIterator[str]:
+        broadcast = self._inflight.get(key)
+        if broadcast is None:
+            broadcast = self._inflight[key] = _Broadcast()
+            broadcast.task = asyncio.create_task(self._pump(key, broadcast, factory))
+        else:
+            coalesced.inc()
+
+        broadcast.followers += 1
+        try:
+            async for fragment in broadcast.follow():
+                yield fragment
+        finally:
+            broadcast.followers -= 1
+            if broadcast.followers == 0 and not broadcast.done:
+                broadcast.task.cancel()  # Nobody is listening any more
+
+    async def _pump(self, key: str, broadcast: _Broadcast, factory: Callable[[], AsyncIterator[str]]) -> None:
+        """Feed the broadcast from upstream, or from another process's relay."""
+        try:
+            redis = self.redis
+            if redis is None:
+                leaders.inc()
+                await self._copy(factory(), broadcast)
+            else:
+                await self._pump_shared(redis, key, broadcast, factory)
+            broadcast.finish()
+        except asyncio.CancelledError:
+            broadcast.finish(RuntimeError("Upstream call cancelled"))
+            raise
+        except Exception as exc:
+            broadcast.finish(exc)
+        finally:
+            if self._inflight.get(key) is broadcast:
+                del self._inflight[key]
+
+    @staticmethod
+    async def _copy(source: AsyncIterator[str], broadcast: _Broadcast, relay=None) -> None:
+        async for fragment in source:
+            broadcast.publish(fragment)
+            if relay is not None:
+                await relay(fragment)
+
+    async def _pump_shared(self, redis, key: str, broadcast: _Broadcast, factory) -> None:
+        lock = LOCK_PREFIX + key
+        while True:
+            flight_id = uuid.uuid4().hex
+            if await redis.set(lock, flight_id, nx=True, px=self.lock_ttl * 1000):
+                break  # This process runs the call
+            owner = await redis.get(lock)
+            if owner is None:
+                continue  # Released in between; try again
+            owner = owner.decode() if isinstance(owner, bytes) else owner
+            try:
+                remote_followers.inc()
+                await self._copy(self._relay_from(redis, lock, owner), broadcast)
+                return
+            except LeaderLost:
+                if broadcast.fragments:
+                    raise  # Cannot resume half-way through someone else's answer
+                logger.warning("Single-flight owner of %s vanished, calling upstream", key)
+                continue
+
+        leaders.inc()
+        stream_key = f"{lock}:{flight_id}"
+
+        async def relay(fragment: str) -> None:
+            await redis.xadd(stream_key, {"f": fragment})
+
+        try:
+            await self._copy(factory(), broadcast, relay)
+            await redis.xadd(stream_key, {"end": "1"})
+        except Exception as exc:
+            await redis.xadd(stream_key, {"error": str(exc) or type(exc).__name__})
+            raise
+        finally:
+            await redis.expire(stream_key, STREAM_TTL_SECONDS)
+            if await redis.get(lock) in (flight_id, flight_id.encode()):
+                await redis.delete(lock)
+
+    @staticmethod
+    async def _relay_from(redis, lock: str, flight_id: str) -> AsyncIterator[str]:
+        """Fragments another process mirrors to its Redis stream."""
+        stream_key = f"{lock}:{flight_id}"
+        last_id = "0-0"
+        while True:
+            response = await redis.xread({stream_key: last_id}, count=100, block=RELAY_BLOCK_MS)
+            if not response:
+                owner = await redis.get(lock)
+                if owner not in (flight_id, flight_id.encode()):
+                    # Lock released or taken over: finished (end marker not read yet) or crashed
+                    response = await redis.xread({stream_key: last_id}, count=100)
+                    if not response:
+                        raise LeaderLost(flight_id)
+                else:
+                    continue
+
+            for _, entries in response:
+                for entry_id, fields in entries:
+                    last_id = entry_id
+                    fields = {
+                        (k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+                        for k, v in fields.items()
+                    }
+                    if "end" in fields:
+                        return
+                    if "error" in fields:
+                        raise RuntimeError(fields["error"])
+                    yield fields["f"]
+
+
+# Process-wide flights used by the chat route
+retrieval_flight = SingleFlight()
+llm_flight = StreamFlight()
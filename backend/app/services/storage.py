@@ -0,0 +1,84 @@
+"""
+File storage for uploaded documents.
+
+Uploads are streamed straight from the request body to disk in
+fixed-size blocks, so memory use does not depend on the file size.
+The SHA-256 of the content is computed on the way through.
+"""
+import hashlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator
+
+import aiofiles
+import aiofiles.os
+
+from app.core.config import settings
+
+
+class UploadTooLarge(Exception):
+    """The upload exceeded MAX_UPLOAD_BYTES."""
+
+
+@dataclass
+class StoredFile:
+    path: str
+    size_bytes: int
+    sha256: str
+
+
+async def save_stream(
+    stream: AsyncIterator[bytes],
+    dest: Path,
+    block_size: int = settings.UPLOAD_CHUNK_SIZE,
+    max_bytes: int = settings.MAX_UPLOAD_BYTES
+) -> StoredFile:
+    """
+    Write an async byte stream to `dest` in `block_size` writes.
+
+    Incoming pieces are coalesced into fixed-size blocks (the network
+    delivers much smaller pieces), so at most one block is held in memory.
+    A partially written file is removed if anything goes wrong.
+
+    Raises:
+        UploadTooLarge: If the stream is longer than max_bytes
+    """
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    buffer = bytearray()
+
+    try:
+        async with aiofiles.open(dest, "wb") as out:
+            async for piece in stream:
+                size += len(piece)
+                if size > max_bytes:
+                    raise UploadTooLarge()
+
+                digest.update(piece)
+                buffer += piece
+                while len(buffer) >= block_size:
+                    await out.write(bytes(buffer[:block_size]))
+                    del buffer[:block_size]
+
+            if buffer:
+                await out.write(bytes(buffer))
+    except BaseException:
+        await remove_file(str(dest))
+        raise
+
+    return StoredFile(path=str(dest), size_bytes=size, sha256=digest.hexdigest())
+
+
+async def remove_file(path: str) -> None:
+    """Delete a stored file, ignoring files that are already gone."""
+    try:
+        await aiofiles.os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def upload_path(owner_id: int, name: str) -> Path:
+    """Where an owner's uploaded file lives under UPLOAD_DIR."""
+    return Path(settings.UPLOAD_DIR) / str(owner_id) / os.path.basename(name)
@@ -0,0 +1,65 @@
+"""
+Token counting.
+
+Uses tiktoken when its encoding files are available. Without network
+access (tests, offline development) tiktoken cannot download them, so we
+fall back to the usual ~4 characters per token estimate.
+"""
+import math
+from functools import lru_cache
+from typing import Optional
+
+from app.core.config import settings
+
+try:
+    import tiktoken
+except ImportError:  # Optional: only needed for exact counts
+    tiktoken = None
+
+_encoding = None
+_encoding_loaded = False
+
+
+def get_encoding() -> Optional["tiktoken.Encoding"]:
+    """Return the configured tiktoken encoding, or None if unavailable."""
+    global _encoding, _encoding_loaded
+
+    if not _encoding_loaded:
+        _encoding_loaded = True
+        if tiktoken is not None:
+            try:
+                _encoding = tiktoken.get_encoding(settings.TOKENIZER_ENCODING)
+            except Exception:
+                _encoding = None
+
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count tokens in a piece of text.
+
+    Example:
+        >>> count_tokens("hello world")
+        2
+    """
+    if not text:
+        return 0
+
+    encoding = get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+
+    return math.ceil(len(text) / 4)
+
+
+@lru_cache(maxsize=settings.TOKEN_CACHE_SIZE)
+def count_tokens_cached(text: str) -> int:
+    """
+    count_tokens behind an LRU cache.
+
+    For prompt text that recurs between requests (system prompt, passage
+    headers, conversation summaries); unique text would only churn the
+    cache, so chunk text uses its stored token_count instead.
+    """
+    return count_tokens(text)
@@ -0,0 +1,58 @@
+"""
+Standalone ingestion worker.
+
+Usage (from backend/):
+    python -m app.worker [--concurrency N] [--processes N]
+
+Run one or more of these next to the API (with REDIS_ENABLED=true and
+INGEST_WORKER_IN_PROCESS=false) so parsing and embedding never compete
+with request handling. Stops cleanly on SIGINT / SIGTERM after finishing
+the jobs in hand.
+"""
+import argparse
+import asyncio
+import logging
+import signal
+
+from app.core.config import settings
+from app.core.redis import close_redis
+from app.services.embeddings import close_embedding_provider
+from app.services.jobs import get_job_queue
+from app.services.jobs.worker import IngestionWorker, create_process_pool
+
+
+async def run_worker(concurrency: int, processes: int = None) -> None:
+    worker = IngestionWorker(
+        get_job_queue(),
+        pool=create_process_pool(processes),
+        concurrency=concurrency
+    )
+
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, worker.stop)
+
+    print(f"Ingestion worker started ({concurrency} jobs at a time)")
+    try:
+        await worker.run()
+    finally:
+        worker.pool.shutdown(cancel_futures=True)
+        await close_embedding_provider()
+        await close_redis()
+    print("Ingestion worker stopped")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.worker", description="Run the ingestion worker")
+    parser.add_argument("--concurrency", type=int, default=settings.INGEST_WORKER_CONCURRENCY,
+                        help="Jobs handled at once")
+    parser.add_argument("--processes", type=int, default=settings.INGEST_PROCESS_POOL_SIZE,
+                        help="Parse/chunk processes (default: one per core)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_worker(args.concurrency, args.processes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+"""
+Benchmarks package.
+
+Run from the backend/ folder, e.g.:
+    python -m benchmarks.bench_db_modes
+
+Without a .env file (or DATABASE_URL in the environment) the benchmarks
+fall back to a throwaway SQLite database so they can run on a laptop.
+"""
+import os
+import tempfile
+
+if not os.path.exists(".env") and "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='ragchatbot-bench-')}/bench.db"
+    os.environ.setdefault("SECRET_KEY", "bench-secret-key")
+    os.environ.setdefault("EMBEDDING_PROVIDER", "hashing")  # Offline, no API key needed
+    os.environ.setdefault("DEBUG", "false")
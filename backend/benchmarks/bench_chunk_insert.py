@@ -0,0 +1,102 @@
+"""
+Benchmark: ingesting a 1,000-page PDF into document_chunks.
+
+Measures parse + chunk throughput, then compares ways of writing the
+chunks:
+
+- ORM, flush per row:  db.add(chunk); await db.flush()  (one round-trip per row)
+- ORM, single flush:   db.add(chunk) for all, one flush at the end
+- bulk batches:        insert_chunk_batch (COPY on Postgres, multi-row INSERT elsewhere)
+
+Usage (from backend/):
+    python -m benchmarks.bench_chunk_insert --pages 1000
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import benchmarks  # noqa: F401 - applies benchmark environment defaults
+
+from app import models  # noqa: F401 - registers all tables on Base.metadata
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, Base, async_engine, engine
+from app.models.document import Document
+from app.models.document_chunk import DocumentChunk
+from app.models.user import User
+from app.services.chunk_store import insert_chunk_batch
+from app.services.ingestion import iter_document_chunks
+from benchmarks.fixtures import write_text_pdf
+
+
+async def make_document(db, owner_id: int, title: str) -> Document:
+    document = Document(title=title, file_path="bench.pdf", file_type=".pdf", size_bytes=0, owner_id=owner_id)
+    db.add(document)
+    await db.flush()
+    return document
+
+
+async def orm_flush_per_row(db, document, chunks):
+    for chunk in chunks:
+        db.add(DocumentChunk(document_id=document.id, ordinal=chunk.ordinal, text=chunk.text,
+                             page=chunk.page, token_count=chunk.token_count,
+                             owner_id=document.owner_id, doc_type=document.doc_type))
+        await db.flush()
+
+
+async def orm_single_flush(db, document, chunks):
+    for chunk in chunks:
+        db.add(DocumentChunk(document_id=document.id, ordinal=chunk.ordinal, text=chunk.text,
+                             page=chunk.page, token_count=chunk.token_count,
+                             owner_id=document.owner_id, doc_type=document.doc_type))
+    await db.flush()
+
+
+async def bulk_batches(db, document, chunks):
+    size = settings.CHUNK_INSERT_BATCH_SIZE
+    for start in range(0, len(chunks), size):
+        await insert_chunk_batch(db, document.id, chunks[start:start + size], None,
+                                 document.owner_id, document.doc_type)
+
+
+async def run(pages: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    path = os.path.join(tempfile.mkdtemp(prefix="ragchatbot-bench-"), "lecture.pdf")
+    write_text_pdf(path, pages)
+    print(f"Database: {engine.url.render_as_string(hide_password=True)}")
+    print(f"PDF: {pages} pages, {os.path.getsize(path) / 1e6:.1f} MB")
+
+    started = time.perf_counter()
+    chunks = list(iter_document_chunks(path, ".pdf"))
+    elapsed = time.perf_counter() - started
+    print(f"{'parse + chunk':<22} {len(chunks):>6} chunks  {elapsed:>7.2f} s  {len(chunks) / elapsed:>9.0f} chunks/s")
+
+    async with AsyncSessionLocal() as db:
+        owner = User(email=f"chunk-bench-{time.time()}@example.com", hashed_password="x")
+        db.add(owner)
+        await db.commit()
+
+        for name, strategy in [("ORM, flush per row", orm_flush_per_row),
+                               ("ORM, single flush", orm_single_flush),
+                               ("bulk batches", bulk_batches)]:
+            document = await make_document(db, owner.id, name)
+            started = time.perf_counter()
+            await strategy(db, document, chunks)
+            await db.commit()
+            elapsed = time.perf_counter() - started
+            db.expunge_all()
+            print(f"{name:<22} {len(chunks):>6} chunks  {elapsed:>7.2f} s  {len(chunks) / elapsed:>9.0f} chunks/s")
+
+    await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(run(args.pages))
+
+
+if __name__ == "__main__":
+    main()
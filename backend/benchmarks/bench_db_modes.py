@@ -0,0 +1,95 @@
+"""
+Benchmark: sync (threadpool) vs async database sessions.
+
+Serves the same "look up the authenticated user" query two ways and
+hammers both with concurrent requests through an in-process ASGI client:
+
+- sync:  `def` endpoint + SessionLocal (runs on Starlette's threadpool)
+- async: the real `async def` /auth/me endpoint + AsyncSession
+
+Usage (from backend/):
+    python -m benchmarks.bench_db_modes --requests 2000 --concurrency 64
+
+Point DATABASE_URL at a local Postgres to benchmark the production driver
+(psycopg2 vs asyncpg); the default is a throwaway SQLite database.
+"""
+import argparse
+import asyncio
+
+import benchmarks  # noqa: F401 - applies benchmark environment defaults
+import httpx
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.orm import Session
+
+from app import models  # noqa: F401 - registers all tables on Base.metadata
+from app.api.dependencies import security
+from app.core.security import create_access_token, decode_access_token, hash_password
+from app.db.session import Base, SessionLocal, engine, get_db
+from app.main import app
+from app.models.user import User
+from benchmarks.common import report, run_concurrent
+
+EMAIL = "bench@example.com"
+
+
+def sync_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> dict:
+    """The pre-async get_current_user, kept here only for comparison."""
+    email = decode_access_token(credentials.credentials)
+    user = db.query(User).filter(User.email == email).first()
+    if user is None:
+        raise HTTPException(status_code=401)
+    return {"id": user.id, "email": user.email}
+
+
+@app.get("/bench/sync/me")
+def sync_profile(current_user: dict = Depends(sync_current_user)):
+    return current_user
+
+
+def seed() -> str:
+    """Create the schema and a single user; return a token for them."""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        if db.query(User).filter(User.email == EMAIL).first() is None:
+            db.add(User(email=EMAIL, hashed_password=hash_password("benchpassword")))
+            db.commit()
+    finally:
+        db.close()
+    return create_access_token({"sub": EMAIL})
+
+
+async def bench(path: str, token: str, total: int, concurrency: int) -> tuple:
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Authorization": f"Bearer {token}"}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def call():
+            response = await client.get(path, headers=headers)
+            response.raise_for_status()
+
+        # Warm up connection pools before measuring
+        await run_concurrent(call, concurrency, concurrency)
+        return await run_concurrent(call, total, concurrency)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    token = seed()
+    print(f"Database: {engine.url.render_as_string(hide_password=True)}")
+    print(f"{args.requests} requests, concurrency {args.concurrency}")
+    for name, path in [("sync  (threadpool + Session)", "/bench/sync/me"),
+                       ("async (AsyncSession)", "/auth/me")]:
+        latencies, elapsed = asyncio.run(bench(path, token, args.requests, args.concurrency))
+        report(name, latencies, elapsed)
+
+
+if __name__ == "__main__":
+    main()
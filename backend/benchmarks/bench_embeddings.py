@@ -0,0 +1,72 @@
+"""
+Benchmark: local hashing embedder throughput, direct and via the scheduler.
+
+- direct, batch N:   HashingEmbeddingProvider.embed_batch on N texts at a time
+- scheduler:         many concurrent callers asking for a few texts each,
+                     merged into batches by EmbeddingScheduler
+
+Needs no network or API key, so the embedding stage of the pipeline can
+be load-tested on a laptop.
+
+Usage (from backend/):
+    python -m benchmarks.bench_embeddings --texts 20000
+"""
+import argparse
+import asyncio
+import time
+
+import benchmarks  # noqa: F401 - applies benchmark environment defaults
+
+from app.services.embeddings.hashing import HashingEmbeddingProvider
+from app.services.embeddings.scheduler import EmbeddingScheduler, batch_size
+from benchmarks.common import report, run_concurrent
+
+WORDS = ("gradient descent loss weight layer graph queue tree sort hash index "
+         "memory cache thread process kernel matrix vector proof lemma theorem").split()
+
+
+def make_texts(count: int, words_per_text: int = 150) -> list:
+    """Chunk-sized pseudo-sentences (~1,000 characters each)."""
+    return [
+        " ".join(WORDS[(i * 7 + j * 3) % len(WORDS)] + str(j % 13) for j in range(words_per_text))
+        for i in range(count)
+    ]
+
+
+async def run(count: int, concurrency: int) -> None:
+    texts = make_texts(count)
+    provider = HashingEmbeddingProvider()
+    provider.embed_batch(texts[:100])  # Warm the feature-hash cache
+    print(f"Texts: {count} x ~{sum(map(len, texts[:100])) // 100} chars, dim {provider.dim}")
+
+    for size in [1, 32, 256]:
+        started = time.perf_counter()
+        for start in range(0, count, size):
+            provider.embed_batch(texts[start:start + size])
+        elapsed = time.perf_counter() - started
+        print(f"{f'direct, batch {size}':<28} {count / elapsed:>9.0f} texts/s")
+
+    scheduler = EmbeddingScheduler(provider)
+    remaining = iter(texts)
+    calls_before = batch_size.snapshot()["count"]
+
+    async def call():
+        await scheduler.embed([next(remaining)])
+
+    latencies, elapsed = await run_concurrent(call, count, concurrency)
+    await scheduler.aclose()
+    batches = batch_size.snapshot()["count"] - calls_before
+    report(f"scheduler, {concurrency} callers", latencies, elapsed)
+    print(f"{'':<28} {count} single-text requests -> {batches} provider calls")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--texts", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=256)
+    args = parser.parse_args()
+    asyncio.run(run(args.texts, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark: message history pagination, OFFSET vs keyset cursor.
+
+Seeds one long conversation (plus a second one of the same size, so the
+index has to separate them) and times fetching page 1 and page N:
+
+- offset:  ORDER BY created_at DESC, id DESC LIMIT n OFFSET (page - 1) * n
+- keyset:  fetch_message_page with the cursor of the previous page
+
+OFFSET latency grows with the page number; keyset stays flat.
+
+Usage (from backend/):
+    python -m benchmarks.bench_message_history --pages 500 --page-size 20
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import benchmarks  # noqa: F401 - applies benchmark environment defaults
+
+from sqlalchemy import insert, select
+
+from app import models  # noqa: F401 - registers all tables on Base.metadata
+from app.db.session import AsyncSessionLocal, Base, async_engine, engine
+from app.models.conversation import Conversation
+from app.models.message import Message
+from app.models.user import User
+from app.services.history import fetch_message_page
+from benchmarks.common import percentile
+
+REPEATS = 50
+
+
+async def seed(db, owner_id: int, count: int) -> int:
+    conversation = Conversation(title="History bench", user_id=owner_id)
+    db.add(conversation)
+    await db.flush()
+
+    start = datetime(2026, 1, 1)
+    for offset in range(0, count, 5000):
+        await db.execute(insert(Message), [
+            {"content": f"message {i} " + "lorem ipsum " * 10, "is_user": i % 2 == 0,
+             "conversation_id": conversation.id, "token_count": 30,
+             "created_at": start + timedelta(seconds=i), "updated_at": start + timedelta(seconds=i)}
+            for i in range(offset, min(count, offset + 5000))
+        ])
+    await db.commit()
+    return conversation.id
+
+
+async def offset_page(db, conversation_id: int, page: int, size: int):
+    result = await db.execute(
+        select(Message)
+        .where(Message.conversation_id == conversation_id)
+        .order_by(Message.created_at.desc(), Message.id.desc())
+        .limit(size)
+        .offset((page - 1) * size)
+    )
+    return result.scalars().all()
+
+
+async def timed(call) -> float:
+    samples = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        await call()
+        samples.append(time.perf_counter() - started)
+    return percentile(samples, 50)
+
+
+async def run(pages: int, size: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    print(f"Database: {engine.url.render_as_string(hide_password=True)}")
+
+    async with AsyncSessionLocal() as db:
+        owner = User(email=f"history-bench-{time.time()}@example.com", hashed_password="x")
+        db.add(owner)
+        await db.flush()
+        conversation_id = await seed(db, owner.id, pages * size)
+        await seed(db, owner.id, pages * size)  # Noise: another conversation of the same size
+        print(f"Messages: {pages * size} in the conversation, {2 * pages * size} total; page size {size}")
+
+        # Walk to the cursor that starts the last page
+        cursors = {1: None}
+        cursor = None
+        for page in range(1, pages):
+            _, cursor = await fetch_message_page(db, conversation_id, size, cursor)
+            cursors[page + 1] = cursor
+
+        for page in [1, pages]:
+            offset_ms = await timed(lambda: offset_page(db, conversation_id, page, size)) * 1000
+            keyset_ms = await timed(lambda: fetch_message_page(db, conversation_id, size, cursors[page])) * 1000
+            db.expunge_all()
+            print(f"page {page:<5}  offset p50 {offset_ms:>7.2f} ms   keyset p50 {keyset_ms:>7.2f} ms")
+
+    await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--page-size", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.pages, args.page_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark: compressed embeddings with float32 re-rank vs the uncompressed path.
+
+- numpy (default, runs anywhere): the in-process index as float32 vs
+  int8 codes (VECTOR_INDEX_QUANTIZATION=int8) re-scored in float32
+- pgvector: HNSW/IVFFlat over embedding vs over the halfvec copy
+  embedding_half (VECTOR_INDEX_HALFVEC) re-scored in float32; needs
+  PostgreSQL with pgvector 0.7+ (DATABASE_URL=postgresql://...)
+
+Reports, per path: the bytes searches keep hot (vectors scanned, or the
+index size), queries per second and recall@k against exact float32 top-k.
+
+Usage (from backend/):
+    python -m benchmarks.bench_quantization --rows 200000 --dim 1536
+    python -m benchmarks.bench_quantization --backend pgvector --rows 50000 --type hnsw
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+
+import benchmarks  # noqa: F401 - applies benchmark environment defaults
+import numpy as np
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db import vector_index
+from app.db.session import Base, async_engine, engine
+from app.services.retrieval.numpy_index import OwnerVectorIndex
+from app.services.retrieval.pgvector import PgVectorRetriever
+from benchmarks.bench_vector_index import clustered_vectors, measure, seed
+
+HEADER = f"{'path':<26} {'hot memory':>12} {'QPS':>9} {'recall@{k}':>10}"
+
+
+def row(label: str, memory_bytes: int, qps: float, recall: float) -> str:
+    return f"{label:<26} {memory_bytes / 1e6:>9.1f} MB {qps:>9.0f} {recall:>10.3f}"
+
+
+def bench_numpy(rows: int, queries: int, k: int, dim: int, rerank_factor: int) -> None:
+    vectors = clustered_vectors(rows + queries, dim)
+    corpus, probes = vectors[:rows], vectors[rows:]
+    ids = np.arange(rows)
+    truth = [set(ids[np.argpartition(-(corpus @ q), k)[:k]]) for q in probes]
+
+    print(f"{rows} rows x {dim} dims, {queries} queries, k={k}")
+    print(HEADER.format(k=k))
+    for label, quantize in [("float32 scan", False), (f"int8 + rerank x{rerank_factor}", True)]:
+        index = OwnerVectorIndex(tempfile.mkdtemp(prefix="ragchatbot-bench-"), dim=dim,
+                                 quantize=quantize, rerank_factor=rerank_factor)
+        for start in range(0, rows, 10000):
+            index.append(ids[start:start + 10000], [1] * len(ids[start:start + 10000]), corpus[start:start + 10000])
+
+        index.search(probes[0], k)  # Warm the page cache
+        started = time.perf_counter()
+        results = [index.search(q, k) for q in probes]
+        elapsed = time.perf_counter() - started
+        recall = np.mean([len({h[0] for h in hits} & expected) / k for hits, expected in zip(results, truth)])
+        print(row(label, index.scan_bytes, queries / elapsed, recall))
+
+
+async def index_bytes(index_type: str, halfvec: bool) -> int:
+    async with async_engine.connect() as conn:
+        return await conn.scalar(text(
+            f"SELECT pg_relation_size('{vector_index.index_name(index_type, halfvec=halfvec)}')"
+        ))
+
+
+async def bench_pgvector(rows: int, queries: int, k: int, index_type: str, rerank_factor: int) -> None:
+    if engine.dialect.name != "postgresql":
+        raise SystemExit("The pgvector path needs PostgreSQL with pgvector (set DATABASE_URL)")
+
+    dim = settings.EMBEDDING_DIM
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:  # Normally added by the add_chunk_halfvec migration
+        conn.execute(text(
+            f"ALTER TABLE document_chunks ADD COLUMN IF NOT EXISTS {vector_index.HALF_COLUMN} halfvec({dim}) "
+            f"GENERATED ALWAYS AS (embedding::halfvec({dim})) STORED"
+        ))
+
+    vectors = clustered_vectors(rows + queries, dim)
+    corpus, probes = vectors[:rows], vectors[rows:]
+    owner_id, ids = await seed(corpus)
+    truth = [ids[np.argpartition(-(corpus @ q), k)[:k]] for q in probes]
+
+    print(f"{rows} rows x {dim} dims, {queries} queries, k={k}, {index_type}")
+    print(HEADER.format(k=k))
+    for label, halfvec in [("vector (float32)", False), (f"halfvec + rerank x{rerank_factor}", True)]:
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for statement in vector_index.rebuild_statements(index_type, halfvec=halfvec):
+                conn.execute(text(statement))
+        retriever = PgVectorRetriever(index_type=index_type, halfvec=halfvec, rerank_factor=rerank_factor)
+        await measure(retriever, owner_id, probes[:5], k, truth[:5])  # Warm up
+        started = time.perf_counter()
+        recall, _ = await measure(retriever, owner_id, probes, k, truth)
+        elapsed = time.perf_counter() - started
+        print(row(label, await index_bytes(index_type, halfvec), queries / elapsed, recall))
+
+    await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backend", choices=["numpy", "pgvector"], default="numpy")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--dim", type=int, default=settings.EMBEDDING_DIM, help="numpy only")
+    parser.add_argument("--type", choices=sorted(vector_index.INDEX_NAMES), default=settings.VECTOR_INDEX_TYPE)
+    parser.add_argument("--rerank-factor", type=int, default=settings.VECTOR_RERANK_FACTOR)
+    args = parser.parse_args()
+
+    if args.backend == "numpy":
+        bench_numpy(args.rows, args.queries, args.k, args.dim, args.rerank_factor)
+    else:
+        asyncio.run(bench_pgvector(args.rows, args.queries, args.k, args.type, args.rerank_factor))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark: CPU cost of renewing a session via /auth/login vs /auth/refresh.
+
+/auth/login verifies the password with bcrypt (12 rounds) on every call.
+/auth/refresh looks the refresh token up by its SHA-256 hash instead.
+CPU time is measured with time.process_time(), so it includes the work
+done on the password-hashing threads.
+
+Usage (from backend/):
+    python -m benchmarks.bench_token_renewal --renewals 50
+"""
+import argparse
+import asyncio
+import time
+
+import benchmarks  # noqa: F401 - applies benchmark environment defaults
+import httpx
+
+from app import models  # noqa: F401 - registers all tables on Base.metadata
+from app.db.session import Base, engine
+from app.main import app
+
+EMAIL = "renewal-bench@example.com"
+PASSWORD = "benchpassword123"
+
+
+async def run(renewals: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/auth/register", json={"email": EMAIL, "password": PASSWORD})
+        tokens = (await client.post("/auth/login", json={"email": EMAIL, "password": PASSWORD})).json()
+
+        async def login():
+            response = await client.post("/auth/login", json={"email": EMAIL, "password": PASSWORD})
+            response.raise_for_status()
+
+        refresh_token = tokens["refresh_token"]
+
+        async def refresh():
+            nonlocal refresh_token
+            response = await client.post("/auth/refresh", json={"refresh_token": refresh_token})
+            response.raise_for_status()
+            refresh_token = response.json()["refresh_token"]
+
+        results = {}
+        for name, call in [("login (bcrypt verify)", login), ("refresh (SHA-256 lookup)", refresh)]:
+            cpu_start, wall_start = time.process_time(), time.perf_counter()
+            for _ in range(renewals):
+                await call()
+            cpu = (time.process_time() - cpu_start) / renewals
+            wall = (time.perf_counter() - wall_start) / renewals
+            results[name] = cpu
+            print(f"{name:<26} CPU {cpu * 1000:>8.2f} ms/renewal   wall {wall * 1000:>8.2f} ms/renewal")
+
+        login_cpu, refresh_cpu = results.values()
+        print(f"CPU saved per renewal: {(login_cpu - refresh_cpu) * 1000:.2f} ms "
+              f"({login_cpu / refresh_cpu:.1f}x cheaper)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--renewals", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.renewals))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Benchmark: recall vs latency of the pgvector index against exact search.
+
+Seeds document_chunks with clustered random unit vectors, computes the
+exact top-k in NumPy as ground truth, then runs the same queries through
+PgVectorRetriever for a range of ef_search (HNSW) or probes (IVFFlat)
+values, plus an exact scan with index scans disabled.
+
+Requires PostgreSQL with pgvector (DATABASE_URL=postgresql://...).
+
+Usage (from backend/):
+    python -m benchmarks.bench_vector_index --rows 50000 --queries 200 --type hnsw
+"""
+import argparse
+import asyncio
+import time
+
+import benchmarks  # noqa: F401 - applies benchmark environment defaults
+import numpy as np
+from sqlalchemy import select, text
+
+from app import models  # noqa: F401 - registers all tables on Base.metadata
+from app.core.config import settings
+from app.db import vector_index
+from app.db.session import AsyncSessionLocal, Base, async_engine, engine
+from app.models.document import Document
+from app.models.document_chunk import DocumentChunk
+from app.models.user import User
+from app.services.chunk_store import insert_chunk_batch
+from app.services.chunking import Chunk
+from app.services.retrieval.base import RetrievalQuery
+from app.services.retrieval.pgvector import PgVectorRetriever
+from benchmarks.common import percentile
+
+
+def clustered_vectors(rows: int, dim: int, clusters: int = 64, seed: int = 0) -> np.ndarray:
+    """Unit vectors drawn around random centres (closer to real embeddings than uniform noise)."""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((clusters, dim)).astype(np.float32)
+    vectors = centres[rng.integers(0, clusters, rows)] + 0.5 * rng.standard_normal((rows, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+async def seed(vectors: np.ndarray) -> tuple:
+    """Insert one document holding every vector; return (owner_id, chunk ids by row)."""
+    async with AsyncSessionLocal() as db:
+        owner = User(email=f"vector-bench-{time.time()}@example.com", hashed_password="x")
+        db.add(owner)
+        await db.flush()
+        document = Document(title="bench", file_path="bench", file_type=".txt", size_bytes=0, owner_id=owner.id)
+        db.add(document)
+        await db.flush()
+
+        batch = settings.CHUNK_INSERT_BATCH_SIZE
+        for start in range(0, len(vectors), batch):
+            chunks = [Chunk(ordinal=i, text=f"chunk {i}", page=None, token_count=2)
+                      for i in range(start, min(start + batch, len(vectors)))]
+            await insert_chunk_batch(db, document.id, chunks, vectors[start:start + batch])
+        await db.commit()
+
+        ids = (await db.execute(
+            select(DocumentChunk.id).where(DocumentChunk.document_id == document.id).order_by(DocumentChunk.ordinal)
+        )).scalars().all()
+        return owner.id, np.array(ids)
+
+
+async def measure(retriever, owner_id, queries, k, truth) -> tuple:
+    latencies, recalls = [], []
+    for query, expected in zip(queries, truth):
+        started = time.perf_counter()
+        hits = await retriever.search(RetrievalQuery(text="", owner_id=owner_id, embedding=query), k)
+        latencies.append(time.perf_counter() - started)
+        recalls.append(len({h.chunk_id for h in hits} & set(expected)) / k)
+    return float(np.mean(recalls)), latencies
+
+
+class ExactRetriever(PgVectorRetriever):
+    """PgVectorRetriever with index scans disabled, i.e. exact search."""
+
+    def search_settings(self):
+        return ["SET LOCAL enable_indexscan = off"]
+
+
+async def run(rows: int, queries: int, k: int, index_type: str) -> None:
+    if engine.dialect.name != "postgresql":
+        raise SystemExit("This benchmark needs PostgreSQL with pgvector (set DATABASE_URL)")
+
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+    Base.metadata.create_all(bind=engine)
+
+    vectors = clustered_vectors(rows + queries, settings.EMBEDDING_DIM)
+    corpus, probes = vectors[:rows], vectors[rows:]
+    owner_id, ids = await seed(corpus)
+    truth = [ids[np.argpartition(-(corpus @ q), k)[:k]] for q in probes]
+
+    started = time.perf_counter()
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for statement in vector_index.rebuild_statements(index_type):
+            conn.execute(text(statement))
+    print(f"{rows} rows x {settings.EMBEDDING_DIM} dims; built {index_type} "
+          f"({vector_index.build_options(index_type)}) in {time.perf_counter() - started:.1f}s")
+    print(f"{'setting':<18} {'recall@' + str(k):>10} {'p50 ms':>9} {'p99 ms':>9}")
+
+    recall, latencies = await measure(ExactRetriever(), owner_id, probes, k, truth)
+    print(f"{'exact scan':<18} {recall:>10.3f} {percentile(latencies, 50) * 1000:>9.2f} {percentile(latencies, 99) * 1000:>9.2f}")
+
+    retriever = PgVectorRetriever(index_type=index_type)
+    values = [10, 20, 40, 80, 160, 320] if index_type == "hnsw" else [1, 2, 5, 10, 20, 50]
+    for value in values:
+        if index_type == "hnsw":
+            settings.HNSW_EF_SEARCH = value
+            label = f"ef_search={value}"
+        else:
+            settings.IVFFLAT_PROBES = value
+            label = f"probes={value}"
+        recall, latencies = await measure(retriever, owner_id, probes, k, truth)
+        print(f"{label:<18} {recall:>10.3f} {percentile(latencies, 50) * 1000:>9.2f} {percentile(latencies, 99) * 1000:>9.2f}")
+
+    await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--type", choices=sorted(vector_index.INDEX_NAMES), default=settings.VECTOR_INDEX_TYPE)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.queries, args.k, args.type))
+
+
+if __name__ == "__main__":
+    main()
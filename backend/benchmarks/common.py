@@ -0,0 +1,52 @@
+"""
+Shared helpers for the benchmark scripts.
+"""
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, List
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_concurrent(
+    call: Callable[[], Awaitable[None]],
+    total: int,
+    concurrency: int
+) -> tuple:
+    """
+    Run `call` `total` times with at most `concurrency` in flight.
+
+    Returns:
+        (latencies in seconds, wall-clock seconds)
+    """
+    latencies: List[float] = []
+    remaining = iter(range(total))
+
+    async def worker():
+        for _ in remaining:
+            started = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, time.perf_counter() - started
+
+
+def report(name: str, latencies: List[float], elapsed: float) -> None:
+    """Print throughput and latency percentiles for one benchmark run."""
+    print(
+        f"{name:<28} "
+        f"{len(latencies) / elapsed:>9.1f} req/s  "
+        f"p50 {percentile(latencies, 50) * 1000:>7.2f} ms  "
+        f"p99 {percentile(latencies, 99) * 1000:>7.2f} ms  "
+        f"mean {statistics.fmean(latencies) * 1000:>7.2f} ms"
+    )
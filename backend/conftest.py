@@ -0,0 +1,25 @@
+"""
+Pytest configuration.
+
+Settings are read from the environment when app.core.config is imported,
+so test defaults must be in place before any test module imports the app.
+API tests run against a throwaway SQLite database (override with
+TEST_DATABASE_URL) so they never touch the development database.
+"""
+import os
+import tempfile
+
+_test_dir = tempfile.mkdtemp(prefix="ragchatbot-test-")
+
+os.environ["DATABASE_URL"] = os.environ.get(
+    "TEST_DATABASE_URL", f"sqlite:///{_test_dir}/test.db"
+)
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("EMBEDDING_PROVIDER", "fake")  # Never call the OpenAI API from tests
+os.environ.setdefault("DEBUG", "false")
+os.environ.setdefault("UPLOAD_DIR", f"{_test_dir}/uploads")
+os.environ.setdefault("INGEST_ASYNC", "false")  # Uploads ingest in the request unless a test queues them
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("MEMORY_SUMMARIZER", "extractive")
+os.environ.setdefault("RETRIEVER_BACKEND", "numpy")  # SQLite has no pgvector
+os.environ.setdefault("VECTOR_INDEX_DIR", f"{_test_dir}/vector_index")
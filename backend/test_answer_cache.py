@@ -0,0 +1,121 @@
+import json
+import numpy as np
+from fastapi.testclient import TestClient
+from app import models  # noqa: F401 - registers all tables on Base.metadata
+from app.db.session import Base, engine
+from app.main import app
+from app.services.answer_cache import AnswerCache, CachedAnswer, cost_saved
+
+client = TestClient(app)
+
+
+def setup_module():
+    """Create the schema in the test database."""
+    Base.metadata.create_all(bind=engine)
+
+
+def auth_headers(email: str) -> dict:
+    """Register a user and return Authorization headers for them."""
+    client.post("/auth/register", json={"email": email, "password": "securepassword123"})
+    token = client.post("/auth/login", json={
+        "email": email,
+        "password": "securepassword123",
+    }).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def parse_events(body: str) -> list:
+    """Split an SSE body into (event, data) pairs."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_similarity_threshold_and_scopes():
+    """Test hits for nearby questions only, within one scope."""
+    print("🎯 Testing semantic lookups...")
+
+    rng = np.random.default_rng(0)
+    cache = AnswerCache(threshold=0.95, max_entries=2, max_scopes=10, ttl=60)
+    question = rng.normal(size=64)
+    paraphrase = question + rng.normal(scale=0.05, size=64)
+    unrelated = rng.normal(size=64)
+    scope = cache.scope_key(1, None, 0)
+
+    assert cache.lookup(scope, question) is None
+    cache.store(scope, question, CachedAnswer("q", "a", [], latency=2.0, cost=0.01))
+    entry, similarity = cache.lookup(scope, paraphrase)
+    assert entry.answer == "a" and similarity >= 0.95
+    assert cache.lookup(scope, unrelated) is None
+    print(f"✓ Paraphrase hit (similarity {similarity:.3f}), unrelated question missed")
+
+    assert cache.lookup(cache.scope_key(1, None, 1), question) is None
+    assert cache.lookup(cache.scope_key(1, "course", 0), question) is None
+    assert cache.lookup(cache.scope_key(2, None, 0), question) is None
+    print("✓ New corpus version, other doc_type and other owner all miss")
+
+    for i in range(3):
+        cache.store(scope, rng.normal(size=64), CachedAnswer(f"q{i}", "b", [], latency=1.0, cost=0.0))
+    assert cache.lookup(scope, question) is None
+    print("✓ Oldest answer dropped once the scope is full")
+
+
+def ask(conversation_id: int, question: str, headers: dict) -> list:
+    with client.stream(
+        "POST", f"/conversations/{conversation_id}/chat", json={"content": question}, headers=headers
+    ) as response:
+        assert response.status_code == 200
+        return parse_events(response.read().decode())
+
+
+def test_chat_uses_answer_cache():
+    """Test that a repeated question is served from the cache until documents change."""
+    print("🗄️  Testing answer cache in chat...")
+
+    headers = auth_headers("cached-chat@example.com")
+    notes = ("Binary search halves the search interval on every comparison. " * 30).encode()
+    client.post("/documents", params={"filename": "search.md"}, content=notes, headers=headers)
+    question = "How does binary search work?"
+
+    first = ask(client.post("/conversations", json={}, headers=headers).json()["id"], question, headers)
+    assert "cached" not in first[-1][1]
+
+    saved_before = cost_saved.value
+    conversation = client.post("/conversations", json={}, headers=headers).json()
+    second = ask(conversation["id"], question, headers)
+    assert second[-1][0] == "done" and second[-1][1]["cached"] is True
+    assert second[0] == first[0]  # Same sources
+    answer = "".join(data["text"] for event, data in first if event == "token")
+    assert second[1][1]["text"] == answer
+    assert cost_saved.value > saved_before
+    print("✓ Second asker got the stored answer and sources")
+
+    history = client.get(f"/conversations/{conversation['id']}/messages", headers=headers).json()
+    assert [m["content"] for m in history["items"]] == [question, answer]
+    print("✓ Cached answer saved to the conversation")
+
+    follow_up = ask(conversation["id"], question, headers)
+    assert "cached" not in follow_up[-1][1]
+    print("✓ Follow-up inside a conversation bypasses the cache")
+
+    client.post("/documents", params={"filename": "more.md"}, content=b"Interpolation search guesses.", headers=headers)
+    third = ask(client.post("/conversations", json={}, headers=headers).json()["id"], question, headers)
+    assert "cached" not in third[-1][1]
+    print("✓ Uploading a document invalidated the cached answer")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Answer Cache Test")
+    print("=" * 60)
+    print()
+
+    setup_module()
+    test_similarity_threshold_and_scopes()
+    test_chat_uses_answer_cache()
+
+    print("=" * 60)
+    print("✅ All answer cache tests passed!")
+    print("=" * 60)
@@ -0,0 +1,206 @@
+import asyncio
+from fastapi.testclient import TestClient
+from app import models  # noqa: F401 - registers all tables on Base.metadata
+from app.db.session import AsyncSessionLocal, Base, SessionLocal, engine
+from app.main import app
+from app.models.user import User
+from app.services.principal_cache import local_hits
+from app.services.refresh_tokens import InvalidRefreshToken, rotate_refresh_token
+
+client = TestClient(app)
+
+
+def setup_module():
+    """Create a fresh schema in the test database."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+
+def test_register_login_and_profile():
+    """Test the async auth routes end to end."""
+    print("🔑 Testing register -> login -> /auth/me...")
+
+    response = client.post("/auth/register", json={
+        "email": "student@example.com",
+        "password": "securepassword123",
+        "full_name": "Test Student",
+    })
+    assert response.status_code == 201, response.text
+    assert response.json()["email"] == "student@example.com"
+    print("✓ Registered user")
+
+    duplicate = client.post("/auth/register", json={
+        "email": "student@example.com",
+        "password": "securepassword123",
+    })
+    assert duplicate.status_code == 400
+    print("✓ Duplicate email rejected")
+
+    response = client.post("/auth/login", json={
+        "email": "student@example.com",
+        "password": "securepassword123",
+    })
+    assert response.status_code == 200, response.text
+    token = response.json()["access_token"]
+    print("✓ Logged in")
+
+    response = client.get("/auth/me", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200, response.text
+    assert response.json()["full_name"] == "Test Student"
+    print("✓ Fetched profile with token")
+
+
+def test_login_rejects_bad_credentials():
+    """Test that wrong passwords and bad tokens are rejected."""
+    print("🚫 Testing rejected credentials...")
+
+    client.post("/auth/register", json={
+        "email": "other@example.com",
+        "password": "securepassword123",
+    })
+
+    response = client.post("/auth/login/form", data={
+        "username": "other@example.com",
+        "password": "wrongpassword",
+    })
+    assert response.status_code == 401
+    print("✓ Wrong password rejected")
+
+    response = client.get("/auth/me", headers={"Authorization": "Bearer invalid.token.here"})
+    assert response.status_code == 401
+    print("✓ Invalid token rejected")
+
+
+def register_and_login(email: str) -> str:
+    """Create a user and return their bearer token."""
+    client.post("/auth/register", json={"email": email, "password": "securepassword123"})
+    response = client.post("/auth/login", json={"email": email, "password": "securepassword123"})
+    return response.json()["access_token"]
+
+
+def test_principal_cache_and_invalidation():
+    """Test that profiles are cached and admin changes invalidate them."""
+    print("🗃️  Testing principal cache...")
+
+    admin_token = register_and_login("admin@example.com")
+    db = SessionLocal()
+    admin = db.query(User).filter(User.email == "admin@example.com").first()
+    admin.is_superuser = True
+    db.commit()
+    db.close()
+
+    token = register_and_login("cached@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    first = client.get("/auth/me", headers=headers)
+    hits_before = local_hits.value
+    second = client.get("/auth/me", headers=headers)
+    assert first.json() == second.json()
+    assert local_hits.value == hits_before + 1
+    print("✓ Second request served from cache")
+
+    user_id = first.json()["id"]
+    response = client.patch(
+        f"/users/{user_id}",
+        json={"is_active": False},
+        headers={"Authorization": f"Bearer {admin_token}"},
+    )
+    assert response.status_code == 200, response.text
+
+    response = client.get("/auth/me", headers=headers)
+    assert response.status_code == 400
+    print("✓ Deactivation took effect immediately")
+
+    client.patch(
+        f"/users/{user_id}",
+        json={"is_active": True},
+        headers={"Authorization": f"Bearer {admin_token}"},
+    )
+    response = client.patch(f"/users/{user_id}", json={"is_superuser": True}, headers=headers)
+    assert response.status_code == 403
+    print("✓ Admin route rejected a non-admin")
+
+
+def test_refresh_token_rotation():
+    """Test refresh, rotation, reuse detection and logout."""
+    print("🔄 Testing refresh tokens...")
+
+    client.post("/auth/register", json={"email": "refresh@example.com", "password": "securepassword123"})
+    tokens = client.post("/auth/login", json={
+        "email": "refresh@example.com",
+        "password": "securepassword123",
+    }).json()
+    assert tokens["refresh_token"]
+
+    renewed = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert renewed.status_code == 200, renewed.text
+    renewed = renewed.json()
+    assert renewed["refresh_token"] != tokens["refresh_token"]
+    response = client.get("/auth/me", headers={"Authorization": f"Bearer {renewed['access_token']}"})
+    assert response.status_code == 200
+    print("✓ Refresh token exchanged for a new pair")
+
+    # Replaying the rotated token revokes the whole family
+    replay = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert replay.status_code == 401
+    response = client.post("/auth/refresh", json={"refresh_token": renewed["refresh_token"]})
+    assert response.status_code == 401
+    print("✓ Token reuse revoked every session")
+
+    tokens = client.post("/auth/login", json={
+        "email": "refresh@example.com",
+        "password": "securepassword123",
+    }).json()
+    assert client.post("/auth/logout", json={"refresh_token": tokens["refresh_token"]}).status_code == 204
+    response = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 401
+    print("✓ Logged-out token rejected")
+
+
+def test_concurrent_refresh_rotates_once():
+    """Test that two simultaneous rotations of one token cannot both succeed."""
+    print("🏁 Testing concurrent refresh...")
+
+    client.post("/auth/register", json={"email": "racer@example.com", "password": "securepassword123"})
+    token = client.post("/auth/login", json={
+        "email": "racer@example.com",
+        "password": "securepassword123",
+    }).json()["refresh_token"]
+
+    async def rotate():
+        async with AsyncSessionLocal() as db:
+            try:
+                return (await rotate_refresh_token(db, token))[1]
+            except InvalidRefreshToken:
+                return None
+
+    async def race():
+        return await asyncio.gather(rotate(), rotate())
+
+    results = asyncio.run(race())
+    winners = [new_token for new_token in results if new_token is not None]
+    assert len(winners) == 1
+    print("✓ Exactly one rotation succeeded")
+
+    # The losing request counts as reuse, so the winner's token is revoked too
+    response = client.post("/auth/refresh", json={"refresh_token": winners[0]})
+    assert response.status_code == 401
+    print("✓ The race revoked the whole family")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Auth API Test")
+    print("=" * 60)
+    print()
+
+    setup_module()
+    test_register_login_and_profile()
+    test_login_rejects_bad_credentials()
+    test_principal_cache_and_invalidation()
+    test_refresh_token_rotation()
+    test_concurrent_refresh_rotates_once()
+
+    print("=" * 60)
+    print("✅ All auth API tests passed!")
+    print("=" * 60)
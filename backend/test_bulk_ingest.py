@@ -0,0 +1,116 @@
+import asyncio
+import json
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from sqlalchemy import func, select
+from app import models  # noqa: F401 - registers all tables on Base.metadata
+from app.db.session import Base, SessionLocal, engine
+from app.models.document import Document, DocumentStatus, DocumentType
+from app.models.document_chunk import DocumentChunk
+from app.models.user import User
+from app.services.bulk_ingestion import BulkIngester, IngestJournal
+from app.services.jobs.worker import create_process_pool
+
+
+def setup_module():
+    """Create the schema in the test database."""
+    Base.metadata.create_all(bind=engine)
+
+
+def make_archive(root: Path) -> None:
+    """A small course archive: nested folders, a few file types, one broken file."""
+    for week in range(3):
+        folder = root / f"week{week}"
+        folder.mkdir(parents=True)
+        for lecture in range(4):
+            text = "\n\n".join(f"Week {week} lecture {lecture} paragraph {i} on sorting." for i in range(20))
+            (folder / f"lecture{lecture}.md").write_text(text)
+        (folder / "solution.py").write_text(f"def week{week}():\n    return sorted([3, 1, 2])\n")
+        (folder / "notes.bin").write_bytes(b"\x00unsupported")
+    (root / "week0" / "broken.pdf").write_bytes(b"not really a pdf")
+
+
+def create_owner(email: str) -> int:
+    db = SessionLocal()
+    user = User(email=email, hashed_password="x")
+    db.add(user)
+    db.commit()
+    owner_id = user.id
+    db.close()
+    return owner_id
+
+
+def owner_counts(owner_id: int):
+    db = SessionLocal()
+    documents = db.scalar(select(func.count()).select_from(Document).where(Document.owner_id == owner_id))
+    chunks = db.scalar(
+        select(func.count()).select_from(DocumentChunk).join(Document).where(Document.owner_id == owner_id)
+    )
+    statuses = set(db.scalars(select(Document.status).where(Document.owner_id == owner_id)))
+    db.close()
+    return documents, chunks, statuses
+
+
+def test_bulk_ingest_directory():
+    """Test ingesting an archive with a process pool, then resuming."""
+    print("📚 Testing bulk ingestion...")
+
+    owner_id = create_owner("archive@example.com")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "archive"
+        make_archive(root)
+        journal = IngestJournal(Path(tmp) / "state.jsonl")
+        reports = []
+
+        pool = create_process_pool(2)
+        try:
+            ingester = BulkIngester(owner_id, DocumentType.COURSE, journal, pool, report=reports.append)
+            stats = asyncio.run(ingester.run(root))
+        finally:
+            pool.shutdown()
+
+        assert stats.files == 15 and stats.failed == 1 and stats.skipped == 0
+        documents, chunks, statuses = owner_counts(owner_id)
+        assert documents == 15 and chunks == stats.chunks and statuses == {DocumentStatus.READY}
+        assert reports and stats.files_per_second > 0 and stats.chunks_per_second > 0
+        print(f"✓ {stats.summary()}")
+
+        # Simulate crashes: a group journalled but never committed, and a
+        # file copied to storage before its group was formed
+        entries = journal.load()
+        orphan = Path(tmp) / "copied.md"
+        orphan.write_text("Copied, never committed.")
+        journal.record([
+            {"source": "week2/lecture9.md", "document_id": 10**9, "file_path": str(Path(tmp) / "gone.md")},
+            {"source": "week2/lecture8.md", "file_path": str(orphan)},
+        ])
+        (root / "week2" / "lecture9.md").write_text("Added after the first run.")
+
+        ingester = BulkIngester(owner_id, DocumentType.COURSE, journal, ThreadPoolExecutor(2))
+        stats = asyncio.run(ingester.run(root))
+        assert stats.skipped == 15 and stats.files == 1 and stats.failed == 1
+        assert owner_counts(owner_id)[0] == 16
+        assert not orphan.exists()
+        assert len(journal.load()) == len(entries) + 2 + 3  # lecture9 and broken.pdf copied, lecture9 committed
+        print("✓ Resumed run skipped committed files, redid the uncommitted one and removed the orphan copy")
+
+        lines = [json.loads(line) for line in (Path(tmp) / "state.jsonl").read_text().splitlines()]
+        broken = [entry for entry in lines if entry["source"] == "week0/broken.pdf"]
+        assert broken and all("document_id" not in entry for entry in broken)
+        assert not any(Path(entry["file_path"]).exists() for entry in broken)
+        print("✓ Broken file was skipped and its copy removed")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Bulk Ingestion Test")
+    print("=" * 60)
+    print()
+
+    setup_module()
+    test_bulk_ingest_directory()
+
+    print("=" * 60)
+    print("✅ All bulk ingestion tests passed!")
+    print("=" * 60)
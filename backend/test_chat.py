@@ -0,0 +1,164 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from app import models  # noqa: F401 - registers all tables on Base.metadata
+from app.db.session import Base, SessionLocal, engine
+from app.main import app
+from app.models.conversation import Conversation
+from app.models.message import Message
+from app.services.chat import ChatTurn, stream_chat
+from app.services.llm import ChatMessage
+from app.services.llm.fake import FakeLLMBackend
+
+client = TestClient(app)
+
+
+def setup_module():
+    """Create the schema in the test database."""
+    Base.metadata.create_all(bind=engine)
+
+
+def auth_headers(email: str) -> dict:
+    """Register a user and return Authorization headers for them."""
+    client.post("/auth/register", json={"email": email, "password": "securepassword123"})
+    token = client.post("/auth/login", json={
+        "email": email,
+        "password": "securepassword123",
+    }).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def parse_events(body: str) -> list:
+    """Split an SSE body into (event, data) pairs."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_chat_streams_and_persists():
+    """Test the SSE chat endpoint end to end with the fake LLM."""
+    print("💬 Testing streaming chat...")
+
+    headers = auth_headers("chatter@example.com")
+    notes = ("Dynamic programming stores the answers to overlapping subproblems. " * 40).encode()
+    client.post(
+        "/documents",
+        params={"filename": "dp.md", "doc_type": "course"},
+        content=notes,
+        headers={**headers, "Content-Type": "application/octet-stream"},
+    )
+
+    conversation = client.post("/conversations", json={}, headers=headers).json()
+    with client.stream(
+        "POST", f"/conversations/{conversation['id']}/chat",
+        json={"content": "What does dynamic programming store?"},
+        headers=headers,
+    ) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = parse_events(response.read().decode())
+
+    names = [name for name, _ in events]
+    assert names[0] == "sources" and names[-1] == "done"
+    assert names.count("token") > 3
+    sources = events[0][1]
+    assert sources and sources[0]["index"] == 1
+    answer = "".join(data["text"] for name, data in events if name == "token")
+    assert "Dynamic programming stores the answers" in answer
+    print(f"✓ Streamed {names.count('token')} tokens: {answer}")
+
+    db = SessionLocal()
+    messages = db.query(Message).filter(Message.conversation_id == conversation["id"]).order_by(Message.id).all()
+    assert [m.is_user for m in messages] == [True, False]
+    assert messages[1].content == answer
+    assert messages[1].sources == sources
+    assert messages[1].token_count == events[-1][1]["token_count"] > 0
+    title = db.get(Conversation, conversation["id"]).title
+    db.close()
+    assert title == "What does dynamic programming store?"
+    print("✓ Question and answer saved after the stream, title set")
+
+    other = auth_headers("stranger@example.com")
+    response = client.post(f"/conversations/{conversation['id']}/chat", json={"content": "hi"}, headers=other)
+    assert response.status_code == 404
+    print("✓ Other users cannot chat in the conversation")
+
+
+def test_stream_reports_backend_failure():
+    """Test that a failing backend ends the stream with an error event."""
+    print("🧯 Testing backend failure...")
+
+    class BrokenBackend(FakeLLMBackend):
+        async def stream(self, messages):
+            yield "Partial "
+            raise RuntimeError("connection reset")
+
+    async def run():
+        turn = ChatTurn(conversation_id=1, question="q", sources=[])
+        events = [event async for event in stream_chat(turn, BrokenBackend(), [ChatMessage("user", "q")])]
+        return turn, events
+
+    turn, events = asyncio.run(run())
+    assert events[-1].startswith("event: error")
+    assert not turn.completed
+    print("✓ error event sent, answer not marked complete")
+
+
+def test_history_keyset_pagination():
+    """Test cursor pages cover the history exactly once, newest page first."""
+    print("📜 Testing message history pages...")
+
+    headers = auth_headers("historian@example.com")
+    conversation = client.post("/conversations", json={"title": "Long session"}, headers=headers).json()
+
+    db = SessionLocal()
+    start = datetime(2026, 1, 1)
+    db.add_all([
+        # Pairs share a timestamp, so the id tie-breaker matters
+        Message(content=f"message {i}", is_user=i % 2 == 0, conversation_id=conversation["id"],
+                token_count=2, created_at=start + timedelta(seconds=i // 2))
+        for i in range(125)
+    ])
+    db.commit()
+    db.close()
+
+    pages, cursor = [], None
+    while True:
+        params = {"limit": 50, **({"cursor": cursor} if cursor else {})}
+        response = client.get(f"/conversations/{conversation['id']}/messages", params=params, headers=headers)
+        assert response.status_code == 200, response.text
+        page = response.json()
+        pages.append([m["content"] for m in page["items"]])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert [len(page) for page in pages] == [50, 50, 25]
+    assert pages[0][-1] == "message 124" and pages[-1][0] == "message 0"
+    flattened = [content for page in reversed(pages) for content in page]
+    assert flattened == [f"message {i}" for i in range(125)]
+    print("✓ 3 pages, every message exactly once, in order")
+
+    response = client.get(f"/conversations/{conversation['id']}/messages",
+                          params={"cursor": "not-a-cursor"}, headers=headers)
+    assert response.status_code == 400
+    print("✓ Invalid cursor rejected")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Chat Test")
+    print("=" * 60)
+    print()
+
+    setup_module()
+    test_chat_streams_and_persists()
+    test_stream_reports_backend_failure()
+    test_history_keyset_pagination()
+
+    print("=" * 60)
+    print("✅ All chat tests passed!")
+    print("=" * 60)
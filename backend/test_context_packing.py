@@ -0,0 +1,128 @@
+from app.services.chat import build_messages, prompt_token_count
+from app.services.chunking import chunk_segments
+from app.services.context import duplicate_passages, merged_chunks, pack_context
+from app.services.memory import MemoryWindow
+from app.services.parsing import Segment
+from app.services.retrieval import RetrievedChunk
+from app.services.tokens import count_tokens, count_tokens_cached
+
+TOPICS = ["heaps", "graphs", "tries", "stacks", "queues", "hash maps", "B-trees", "skip lists"]
+
+
+def page_text(topic, sentences=40):
+    return " ".join(f"Fact {i} about {topic} is number {i * 7} in the study guide." for i in range(sentences))
+
+
+def hits(document_id, page, topic, score, first_ordinal=0):
+    """Retrieved chunks for one page, produced by the real chunker (so they overlap)."""
+    chunks = list(chunk_segments([Segment(page_text(topic), page=page)], chunk_size=400, overlap=100))
+    return [
+        RetrievedChunk(
+            chunk_id=document_id * 1000 + first_ordinal + chunk.ordinal, document_id=document_id,
+            score=score - 0.01 * chunk.ordinal, ordinal=first_ordinal + chunk.ordinal,
+            page=page, text=chunk.text, token_count=chunk.token_count
+        )
+        for chunk in chunks
+    ]
+
+
+def test_adjacent_chunks_are_merged():
+    """Test that consecutive chunks of a page become one passage without repeated overlap."""
+    print("🧩 Testing adjacent chunk merging...")
+
+    page = hits(1, 3, "heaps", 0.9)[:3]
+    merged_before = merged_chunks.value
+    packed = pack_context(page, budget=10_000)
+
+    assert len(packed.chunks) == 1 and merged_chunks.value == merged_before + 2
+    passage = packed.chunks[0]
+    assert passage.chunk_id == page[0].chunk_id and passage.score == page[0].score
+    for i in range(8):
+        assert passage.text.count(f"Fact {i} about heaps ") <= 1
+    assert page[0].text in passage.text and page[2].text in passage.text
+    print("✓ Three overlapping chunks -> one passage, overlap kept once")
+
+    assert abs(passage.token_count - count_tokens(passage.text)) <= 3
+    print(f"✓ Stored token counts add up ({passage.token_count} vs {count_tokens(passage.text)} counted)")
+
+    # A gap in the ordinals or another page keeps passages apart
+    apart = pack_context([page[0], page[2]] + hits(1, 4, "stacks", 0.5)[:1], budget=10_000)
+    assert len(apart.chunks) == 3
+    print("✓ Non-adjacent chunks and other pages stay separate")
+
+
+def test_near_duplicates_are_dropped():
+    """Test that the same text from another document is only included once."""
+    print("👯 Testing near-duplicate removal...")
+
+    original = hits(1, 1, "graphs", 0.8)[:1]
+    copy = hits(2, 1, "graphs", 0.9)[:1]  # Same notes uploaded twice
+    other = hits(3, 1, "tries", 0.7)[:1]
+    duplicates_before = duplicate_passages.value
+
+    packed = pack_context(original + copy + other, budget=10_000)
+    assert [chunk.document_id for chunk in packed.chunks] == [2, 3]
+    assert duplicate_passages.value == duplicates_before + 1
+    print("✓ Lower-scored copy dropped, best copy kept")
+
+
+def test_greedy_packing_respects_budget():
+    """Test that passages are packed best first without exceeding the budget."""
+    print("📦 Testing token budget packing...")
+
+    candidates = []
+    for n, topic in enumerate(TOPICS):
+        candidates += hits(10 + n, 1, topic, 0.9 - 0.05 * n, first_ordinal=0)[:1]
+    passage_tokens = candidates[0].token_count
+
+    budget = 3 * passage_tokens + 60
+    packed = pack_context(candidates, budget=budget)
+    assert len(packed.chunks) == 3
+    assert [chunk.document_id for chunk in packed.chunks] == [10, 11, 12]
+    assert packed.token_count <= budget
+    print(f"✓ Best 3 of {len(candidates)} passages fit {budget} tokens")
+
+    messages = build_messages("What is a heap?", packed.chunks, MemoryWindow())
+    counted = count_tokens(messages[0].content) + count_tokens(messages[1].content)
+    estimated = prompt_token_count("What is a heap?", packed, MemoryWindow())
+    assert abs(counted - estimated) <= 5, (counted, estimated)
+    tagged = build_messages("What is a heap?", packed.chunks, MemoryWindow(), context_tokens=packed.token_count)
+    assert [m.content for m in tagged] == [m.content for m in messages]
+    assert sum(m.tokens for m in tagged) == estimated
+    print(f"✓ Prompt size from stored counts matches a full count ({estimated} vs {counted})")
+
+    # A merged passage too big for the budget falls back to its best piece
+    page = hits(20, 1, "heaps", 0.95)[:3]
+    packed = pack_context(page, budget=page[0].token_count + 40)
+    assert [chunk.chunk_id for chunk in packed.chunks] == [page[0].chunk_id]
+    print("✓ Oversized merged passage retried piece by piece")
+
+    assert pack_context([], budget=100).token_count == 0
+
+
+def test_token_cache():
+    """Test that recurring prompt text is counted once."""
+    print("🗂️  Testing the token count cache...")
+
+    count_tokens_cached.cache_clear()
+    for _ in range(3):
+        assert count_tokens_cached("[1] (document 4, page 2)\n") == count_tokens("[1] (document 4, page 2)\n")
+    info = count_tokens_cached.cache_info()
+    assert info.misses == 1 and info.hits == 2
+    print("✓ Repeated header counted once")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Context Packing Test")
+    print("=" * 60)
+    print()
+
+    test_adjacent_chunks_are_merged()
+    test_near_duplicates_are_dropped()
+    test_greedy_packing_respects_budget()
+    test_token_cache()
+
+    print("=" * 60)
+    print("✅ All context packing tests passed!")
+    print("=" * 60)
@@ -0,0 +1,265 @@
+import asyncio
+import io
+import os
+import docx
+from fastapi.testclient import TestClient
+from app import models  # noqa: F401 - registers all tables on Base.metadata
+from app.db.session import AsyncSessionLocal, Base, SessionLocal, engine
+from app.main import app
+from app.models.document import Document
+from app.models.document_chunk import DocumentChunk
+from app.services.chunking import chunk_segments
+from app.services.deletion import purge_document
+from app.services.embeddings.fake import FakeEmbeddingProvider
+from app.services.ingestion import apply_chunk_diff, diff_chunks
+from app.services.parsing import Segment
+
+client = TestClient(app)
+
+
+def setup_module():
+    """Create the schema in the test database."""
+    Base.metadata.create_all(bind=engine)
+
+
+def auth_headers(email: str) -> dict:
+    """Register a user and return Authorization headers for them."""
+    client.post("/auth/register", json={"email": email, "password": "securepassword123"})
+    token = client.post("/auth/login", json={
+        "email": email,
+        "password": "securepassword123",
+    }).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_chunking_overlap_and_pages():
+    """Test chunk sizes, overlap and page boundaries."""
+    print("✂️  Testing chunker...")
+
+    words = " ".join(f"word{i}" for i in range(600))
+    chunks = list(chunk_segments(
+        [Segment(words, page=1), Segment("short second page", page=2)],
+        chunk_size=500,
+        overlap=100,
+    ))
+
+    assert [c.ordinal for c in chunks] == list(range(len(chunks)))
+    assert all(len(c.text) <= 500 for c in chunks)
+    assert chunks[-1].page == 2 and chunks[-1].text == "short second page"
+    assert all(c.page == 1 for c in chunks[:-1])
+    print(f"✓ {len(chunks)} chunks, none across pages")
+
+    # Consecutive chunks share text
+    first_tail = chunks[0].text.split()[-3:]
+    assert " ".join(first_tail) in chunks[1].text
+    print("✓ Consecutive chunks overlap")
+
+
+def test_upload_markdown_and_docx():
+    """Test streaming uploads of text and DOCX files."""
+    print("📄 Testing document upload...")
+
+    headers = auth_headers("uploader@example.com")
+    markdown = ("# Lecture 1\n\n" + "Gradient descent minimizes a loss. " * 200).encode()
+
+    response = client.post(
+        "/documents",
+        params={"filename": "lecture1.md", "doc_type": "course"},
+        content=markdown,
+        headers={**headers, "Content-Type": "application/octet-stream"},
+    )
+    assert response.status_code == 201, response.text
+    document = response.json()
+    assert document["size_bytes"] == len(markdown)
+    assert document["file_type"] == ".md"
+    assert document["title"] == "lecture1.md"
+    assert document["chunk_count"] > 1
+    print(f"✓ Markdown upload: {document['chunk_count']} chunks")
+
+    db = SessionLocal()
+    stored = (
+        db.query(DocumentChunk)
+        .filter(DocumentChunk.document_id == document["id"])
+        .order_by(DocumentChunk.ordinal)
+        .all()
+    )
+    db.close()
+    assert len(stored) == document["chunk_count"]
+    assert [c.ordinal for c in stored] == list(range(len(stored)))
+    assert all(c.token_count > 0 for c in stored)
+    print("✓ Chunks stored in bulk")
+
+    buffer = io.BytesIO()
+    word_doc = docx.Document()
+    for i in range(20):
+        word_doc.add_paragraph(f"Paragraph {i} about binary search trees. " * 10)
+    word_doc.save(buffer)
+
+    response = client.post(
+        "/documents",
+        params={"filename": "notes.docx", "title": "Notes"},
+        content=buffer.getvalue(),
+        headers=headers,
+    )
+    assert response.status_code == 201, response.text
+    assert response.json()["chunk_count"] > 1
+    print("✓ DOCX upload parsed")
+
+    listed = client.get("/documents", headers=headers).json()
+    assert {d["title"] for d in listed} == {"lecture1.md", "Notes"}
+    print("✓ Listed own documents")
+
+
+def test_upload_rejections_and_ownership():
+    """Test unsupported types and access to other users' documents."""
+    print("🚫 Testing upload rejections...")
+
+    headers = auth_headers("owner@example.com")
+    response = client.post("/documents", params={"filename": "movie.mp4"}, content=b"x", headers=headers)
+    assert response.status_code == 415
+    print("✓ Unsupported type rejected")
+
+    response = client.post("/documents", params={"filename": "a.txt"}, content=b"hello", headers=headers)
+    document_id = response.json()["id"]
+
+    other = auth_headers("intruder@example.com")
+    assert client.get(f"/documents/{document_id}", headers=other).status_code == 404
+    assert client.get(f"/documents/{document_id}", headers=headers).status_code == 200
+    print("✓ Other users cannot see the document")
+
+
+def test_delete_document_in_background():
+    """Test delete returns at once, hides the document, and purges in batches."""
+    print("🗑️  Testing document delete...")
+
+    headers = auth_headers("deleter@example.com")
+    text = ("Heaps support insert and extract-min in logarithmic time. " * 300).encode()
+    document = client.post("/documents", params={"filename": "heaps.md"}, content=text, headers=headers).json()
+    assert document["chunk_count"] > 5
+
+    # Purge in small batches directly, so several transactions are needed
+    db = SessionLocal()
+    stored = db.get(Document, document["id"])
+    stored.deleted_at = stored.created_at
+    db.commit()
+    file_path = stored.file_path
+    db.close()
+    assert client.get(f"/documents/{document['id']}", headers=headers).status_code == 404
+
+    deleted = asyncio.run(purge_document(document["id"], batch_size=2))
+    assert deleted == document["chunk_count"]
+    db = SessionLocal()
+    assert db.get(Document, document["id"]) is None
+    assert db.query(DocumentChunk).filter(DocumentChunk.document_id == document["id"]).count() == 0
+    db.close()
+    assert not os.path.exists(file_path)
+    print(f"✓ {deleted} chunks purged 2 at a time, row and file removed")
+
+    document = client.post("/documents", params={"filename": "again.md"}, content=text, headers=headers).json()
+    response = client.delete(f"/documents/{document['id']}", headers=headers)
+    assert response.status_code == 204
+    assert all(d["id"] != document["id"] for d in client.get("/documents", headers=headers).json())
+    db = SessionLocal()
+    assert db.query(DocumentChunk).filter(DocumentChunk.document_id == document["id"]).count() == 0
+    db.close()
+    print("✓ DELETE /documents/{id} returned 204 and the background job purged it")
+
+
+def test_reupload_only_embeds_changed_chunks():
+    """Test that a re-upload keeps unchanged chunks and embeds only edits."""
+    print("♻️  Testing incremental re-upload...")
+
+    headers = auth_headers("reuploader@example.com")
+    sections = [f"Section {i}: " + f"topic{i} covers sorting and searching. " * 20 for i in range(12)]
+    version1 = "\n\n".join(sections)
+    document = client.post(
+        "/documents", params={"filename": "lecture.md"}, content=version1.encode(), headers=headers
+    ).json()
+    assert document["content_hash"]
+
+    def stored_chunks():
+        db = SessionLocal()
+        rows = db.query(DocumentChunk).filter(DocumentChunk.document_id == document["id"]).order_by(DocumentChunk.ordinal).all()
+        db.close()
+        return rows
+
+    before = stored_chunks()
+    assert len(before) == document["chunk_count"] and all(c.content_hash for c in before)
+
+    response = client.put(f"/documents/{document['id']}", content=version1.encode(), headers=headers)
+    assert response.status_code == 200 and [c.id for c in stored_chunks()] == [c.id for c in before]
+    print("✓ Identical re-upload is a no-op")
+
+    # Edit one section (same length, so later chunk boundaries do not move) and drop the last one
+    sections[5] = sections[5].replace("sorting", "hashing")
+    version2 = "\n\n".join(sections[:-1])
+    chunks = list(chunk_segments([Segment(version2, page=None)]))
+    diff = asyncio.run(diff_chunks_for(document["id"], chunks))
+    assert diff.added and diff.removed and diff.kept > len(diff.added)
+
+    embedder = FakeEmbeddingProvider()
+    asyncio.run(apply_diff_for(document["id"], diff, embedder))
+    assert sum(embedder.calls) == len(diff.added)
+    after = stored_chunks()
+    assert [c.content_hash for c in after] == [c.content_hash for c in chunks]
+    assert len({c.id for c in before} & {c.id for c in after}) == diff.kept
+    print(f"✓ Diff embedded {len(diff.added)} of {len(chunks)} chunks, removed {len(diff.removed)}")
+
+    version3 = version2.replace("Section 0:", "Chapter 0:")
+    response = client.put(f"/documents/{document['id']}", content=version3.encode(), headers=headers)
+    assert response.status_code == 200, response.text
+    updated = response.json()
+    assert updated["content_hash"] != document["content_hash"]
+    assert updated["chunk_count"] == len(stored_chunks()) == len(chunks)
+    assert len({c.id for c in after} & {c.id for c in stored_chunks()}) == len(chunks) - 1
+    print("✓ PUT /documents/{id} replaced one chunk and updated chunk_count")
+
+
+async def diff_chunks_for(document_id, chunks):
+    async with AsyncSessionLocal() as db:
+        return await diff_chunks(db, document_id, chunks)
+
+
+async def apply_diff_for(document_id, diff, embedder):
+    async with AsyncSessionLocal() as db:
+        await apply_chunk_diff(db, document_id, diff, embedder)
+        await db.commit()
+
+
+def test_delete_conversation_cascades():
+    """Test that deleting a conversation removes its messages in the database."""
+    print("🧹 Testing conversation delete...")
+    from app.models.message import Message
+
+    headers = auth_headers("forgetful@example.com")
+    conversation = client.post("/conversations", json={}, headers=headers).json()
+    db = SessionLocal()
+    db.add_all([Message(content=f"m{i}", is_user=True, conversation_id=conversation["id"]) for i in range(20)])
+    db.commit()
+    db.close()
+
+    assert client.delete(f"/conversations/{conversation['id']}", headers=headers).status_code == 204
+    db = SessionLocal()
+    assert db.query(Message).filter(Message.conversation_id == conversation["id"]).count() == 0
+    db.close()
+    assert client.get(f"/conversations/{conversation['id']}", headers=headers).status_code == 404
+    print("✓ Messages removed by ON DELETE CASCADE")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Documents Test")
+    print("=" * 60)
+    print()
+
+    setup_module()
+    test_chunking_overlap_and_pages()
+    test_upload_markdown_and_docx()
+    test_upload_rejections_and_ownership()
+    test_delete_document_in_background()
+    test_reupload_only_embeds_changed_chunks()
+    test_delete_conversation_cascades()
+
+    print("=" * 60)
+    print("✅ All document tests passed!")
+    print("=" * 60)
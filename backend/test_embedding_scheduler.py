@@ -0,0 +1,133 @@
+import asyncio
+import numpy as np
+from app.services.embeddings import scheduler as scheduler_module
+from app.services.embeddings.fake import FakeEmbeddingProvider
+from app.services.embeddings.scheduler import EmbeddingScheduler
+
+DIM = 16
+
+
+def test_concurrent_callers_share_batches():
+    """Test that many small concurrent requests become a few provider calls."""
+    print("📦 Testing micro-batching...")
+
+    provider = FakeEmbeddingProvider(dim=DIM, latency=0.01)
+    scheduler = EmbeddingScheduler(provider, max_batch_size=32, max_wait=0.05)
+
+    async def run():
+        requests = [[f"question {i}-{j}" for j in range(i % 3 + 1)] for i in range(40)]
+        results = await asyncio.gather(*(scheduler.embed(texts) for texts in requests))
+        await scheduler.aclose()
+        return requests, results
+
+    batches_before = scheduler_module.batch_size.snapshot()["count"]
+    requests, results = asyncio.run(run())
+
+    total = sum(len(texts) for texts in requests)
+    assert sum(provider.calls) == total
+    assert len(provider.calls) <= -(-total // 32) + 1
+    assert max(provider.calls) <= 32
+    assert scheduler_module.batch_size.snapshot()["count"] == batches_before + len(provider.calls)
+    print(f"✓ {len(requests)} requests ({total} texts) sent as {len(provider.calls)} batches")
+
+    # Every caller got its own vectors, in order
+    for texts, vectors in zip(requests, results):
+        assert vectors.shape == (len(texts), DIM)
+        for text, vector in zip(texts, vectors):
+            assert np.allclose(vector, provider._vector(text))
+    print("✓ Results fanned back out to the right callers")
+
+
+def test_lone_request_waits_at_most_max_wait():
+    """Test that a partial batch is flushed at the deadline."""
+    print("⏳ Testing max-wait flush...")
+
+    provider = FakeEmbeddingProvider(dim=DIM)
+    scheduler = EmbeddingScheduler(provider, max_batch_size=1000, max_wait=0.02)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await scheduler.embed(["only one"])
+        elapsed = loop.time() - started
+        await scheduler.aclose()
+        return elapsed
+
+    elapsed = asyncio.run(run())
+    assert provider.calls == [1]
+    assert elapsed < 0.5
+    print(f"✓ Flushed after {elapsed * 1000:.0f}ms")
+
+
+def test_large_request_and_provider_errors():
+    """Test splitting a large request and propagating provider failures."""
+    print("🧯 Testing splits and errors...")
+
+    provider = FakeEmbeddingProvider(dim=DIM)
+    scheduler = EmbeddingScheduler(provider, max_batch_size=10, max_wait=0.01)
+
+    async def split():
+        vectors = await scheduler.embed([f"chunk {i}" for i in range(25)])
+        await scheduler.aclose()
+        return vectors
+
+    assert asyncio.run(split()).shape == (25, DIM)
+    assert provider.calls == [10, 10, 5]
+    print("✓ 25 texts split into batches of 10, 10, 5")
+
+    class FailingProvider(FakeEmbeddingProvider):
+        async def embed(self, texts):
+            raise RuntimeError("rate limited")
+
+    failing = EmbeddingScheduler(FailingProvider(dim=DIM), max_wait=0.01)
+
+    async def fail():
+        try:
+            await failing.embed(["x"])
+        except RuntimeError as exc:
+            return str(exc)
+        finally:
+            await failing.aclose()
+
+    assert asyncio.run(fail()) == "rate limited"
+    print("✓ Provider error raised in the caller")
+
+
+def test_aclose_fails_waiting_callers():
+    """Test that closing the scheduler answers every caller and stops its tasks."""
+    print("🛑 Testing shutdown...")
+
+    provider = FakeEmbeddingProvider(dim=DIM, latency=10)
+    scheduler = EmbeddingScheduler(provider, max_batch_size=1, max_wait=10, max_concurrent_batches=1)
+
+    async def run():
+        in_flight = asyncio.ensure_future(scheduler.embed(["sent"]))
+        queued = asyncio.ensure_future(scheduler.embed(["waiting"]))
+        await asyncio.sleep(0.05)
+        assert provider.calls == [1]  # First batch at the provider, second waiting for a slot
+
+        state = scheduler._state
+        await asyncio.wait_for(scheduler.aclose(), 1)
+        results = await asyncio.wait_for(asyncio.gather(in_flight, queued, return_exceptions=True), 1)
+        return state, results
+
+    state, results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert state.worker.done() and not state.in_flight
+    print("✓ Queued and in-flight callers failed, worker and batches cancelled")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Embedding Scheduler Test")
+    print("=" * 60)
+    print()
+
+    test_concurrent_callers_share_batches()
+    test_lone_request_waits_at_most_max_wait()
+    test_large_request_and_provider_errors()
+    test_aclose_fails_waiting_callers()
+
+    print("=" * 60)
+    print("✅ All embedding scheduler tests passed!")
+    print("=" * 60)
@@ -0,0 +1,165 @@
+import asyncio
+import tempfile
+import numpy as np
+from app import models  # noqa: F401 - registers all tables on Base.metadata
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, Base, engine
+from app.models.document import Document
+from app.models.document_chunk import DocumentChunk
+from app.models.user import User
+from app.services.embeddings import cache as embedding_cache_module
+from app.services.embeddings.base import EmbeddingProvider
+from app.services.embeddings.cache import CachedEmbeddingProvider, EmbeddingCache, cache_key
+from app.services.ingestion import ingest_document
+from sqlalchemy import func, select
+
+DIM = settings.EMBEDDING_DIM
+
+
+class CountingProvider(EmbeddingProvider):
+    """Deterministic fake that records every text it embeds."""
+
+    model = "fake-model"
+    dim = DIM
+
+    def __init__(self):
+        self.embedded = []
+
+    async def embed(self, texts):
+        self.embedded.extend(texts)
+        return np.stack([
+            np.random.default_rng(abs(hash(text)) % 2**32).standard_normal(DIM).astype(np.float32)
+            for text in texts
+        ])
+
+
+class FakeRedis:
+    """The few Redis commands the embedding cache uses."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        redis = self
+
+        class Pipeline:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            def set(self, key, value, ex=None):
+                redis.data[key] = value
+
+            async def execute(self):
+                return []
+        return Pipeline()
+
+
+def new_cache() -> EmbeddingCache:
+    return EmbeddingCache(max_entries=100, local_ttl=60, redis_ttl=60)
+
+
+def test_cache_key_normalization():
+    """Test that whitespace-only differences share a key, and models don't."""
+    print("🔑 Testing embedding cache keys...")
+
+    assert cache_key("m", "Gradient  descent\n minimizes") == cache_key("m", " Gradient descent minimizes ")
+    assert cache_key("m", "text") != cache_key("other-model", "text")
+    assert cache_key("m", "Text") != cache_key("m", "text")
+    print("✓ Keys ignore whitespace, include model and case")
+
+
+def test_cached_provider_skips_known_texts():
+    """Test that repeated texts are embedded once, within and across calls."""
+    print("🗃️  Testing cached embedder...")
+
+    provider = CountingProvider()
+    embedder = CachedEmbeddingProvider(provider, new_cache())
+
+    first = asyncio.run(embedder.embed(["alpha", "beta", "alpha"]))
+    assert provider.embedded == ["alpha", "beta"]
+    assert np.array_equal(first[0], first[2])
+    print("✓ Duplicate within a batch embedded once")
+
+    hits_before = embedding_cache_module.local_hits.value
+    second = asyncio.run(embedder.embed(["beta", "alpha"]))
+    assert provider.embedded == ["alpha", "beta"]
+    assert np.array_equal(second[0], first[1])
+    assert embedding_cache_module.local_hits.value == hits_before + 2
+    print("✓ Second call made no provider calls")
+
+
+def test_redis_tier_stores_float32_bytes():
+    """Test the shared tier with a fake Redis client."""
+    print("🧱 Testing Redis tier...")
+
+    fake = FakeRedis()
+    original = embedding_cache_module.get_redis
+    embedding_cache_module.get_redis = lambda: fake
+    try:
+        provider = CountingProvider()
+        vectors = asyncio.run(CachedEmbeddingProvider(provider, new_cache()).embed(["shared text"]))
+        raw = next(iter(fake.data.values()))
+        assert len(raw) == DIM * 4
+        print(f"✓ Stored {len(raw)} bytes per {DIM}-dim vector")
+
+        # Another worker (empty local tier) is served from Redis
+        other = CachedEmbeddingProvider(CountingProvider(), new_cache())
+        assert np.array_equal(asyncio.run(other.embed(["shared text"])), vectors)
+        assert other.provider.embedded == []
+        print("✓ Second worker served from Redis")
+    finally:
+        embedding_cache_module.get_redis = original
+
+
+def test_duplicate_upload_costs_no_embedding_calls():
+    """Test ingesting the same document twice embeds its chunks once."""
+    print("📚 Testing duplicate ingestion...")
+    Base.metadata.create_all(bind=engine)
+
+    path = tempfile.mktemp(suffix=".md")
+    with open(path, "w") as f:
+        f.write(" ".join(f"Step {i}: backpropagation computes gradients layer by layer." for i in range(100)))
+
+    provider = CountingProvider()
+    embedder = CachedEmbeddingProvider(provider, new_cache())
+
+    async def ingest_twice():
+        async with AsyncSessionLocal() as db:
+            user = User(email="embedcache@example.com", hashed_password="x")
+            db.add(user)
+            await db.flush()
+            for _ in range(2):
+                await ingest_document(db, Document(
+                    title="Lecture", file_path=path, file_type=".md", size_bytes=0, owner_id=user.id
+                ), embedder=embedder)
+            await db.commit()
+            return await db.scalar(
+                select(func.count()).select_from(DocumentChunk)
+                .join(Document).where(Document.owner_id == user.id, DocumentChunk.embedding.is_not(None))
+            )
+
+    stored = asyncio.run(ingest_twice())
+    assert stored == 2 * len(provider.embedded)
+    print(f"✓ {stored} chunks stored, {len(provider.embedded)} embedded")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Embedding Cache Test")
+    print("=" * 60)
+    print()
+
+    test_cache_key_normalization()
+    test_cached_provider_skips_known_texts()
+    test_redis_tier_stores_float32_bytes()
+    test_duplicate_upload_costs_no_embedding_calls()
+
+    print("=" * 60)
+    print("✅ All embedding cache tests passed!")
+    print("=" * 60)
@@ -0,0 +1,97 @@
+import asyncio
+import threading
+from app.core.hashing import (
+    PasswordHashExecutor,
+    PasswordHasherSaturated,
+    hash_password_async,
+    verify_password_async,
+)
+
+
+def test_async_hash_roundtrip():
+    """Test hashing and verifying through the executor."""
+    print("🔐 Testing async password hashing...")
+
+    async def roundtrip():
+        hashed = await hash_password_async("mysecretpassword123")
+        assert await verify_password_async("mysecretpassword123", hashed)
+        assert not await verify_password_async("wrongpassword", hashed)
+
+    asyncio.run(roundtrip())
+    print("✓ Hash verified through executor")
+
+
+def test_executor_rejects_when_saturated():
+    """Test that a full backlog raises instead of queueing forever."""
+    print("🚦 Testing executor saturation...")
+
+    executor = PasswordHashExecutor(max_workers=1, max_queue=1, retry_after=3)
+    release = threading.Event()
+
+    async def saturate():
+        # One job running, one waiting -> capacity reached
+        running = asyncio.ensure_future(executor.run(release.wait))
+        waiting = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+
+        try:
+            await executor.run(release.wait)
+            raise AssertionError("Third job should have been rejected")
+        except PasswordHasherSaturated as exc:
+            assert exc.retry_after == 3
+        finally:
+            release.set()
+
+        await asyncio.gather(running, waiting)
+
+        # Capacity is released once jobs finish
+        assert await executor.run(lambda: "ok") == "ok"
+
+    asyncio.run(saturate())
+    executor.shutdown()
+    print("✓ Saturated executor rejected the extra job")
+
+
+def test_cancelled_caller_keeps_slot_until_job_ends():
+    """Test that cancelling a caller does not free capacity its job still uses."""
+    print("🧵 Testing cancelled hash jobs...")
+
+    executor = PasswordHashExecutor(max_workers=1, max_queue=0)
+    release = threading.Event()
+
+    async def cancel_running():
+        caller = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+        caller.cancel()
+        await asyncio.sleep(0.05)
+
+        # The thread is still busy, so the executor is still full
+        try:
+            await asyncio.wait_for(executor.run(lambda: "too soon"), 1)
+            raise AssertionError("Job should have been rejected while the thread is busy")
+        except PasswordHasherSaturated:
+            pass
+        finally:
+            release.set()
+
+        await asyncio.sleep(0.05)
+        assert await executor.run(lambda: "ok") == "ok"
+
+    asyncio.run(cancel_running())
+    executor.shutdown()
+    print("✓ Slot freed when the job finished, not when its caller gave up")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Password Hashing Executor Test")
+    print("=" * 60)
+    print()
+
+    test_async_hash_roundtrip()
+    test_executor_rejects_when_saturated()
+    test_cancelled_caller_keeps_slot_until_job_ends()
+
+    print("=" * 60)
+    print("✅ All hashing tests passed!")
+    print("=" * 60)
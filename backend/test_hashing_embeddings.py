@@ -0,0 +1,92 @@
+import asyncio
+import tempfile
+import numpy as np
+from app import models  # noqa: F401 - registers all tables on Base.metadata
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, Base, engine
+from app.models.document import Document
+from app.models.user import User
+from app.services.embeddings.hashing import HashingEmbeddingProvider
+from app.services.ingestion import ingest_document
+from app.services.retrieval.base import RetrievalQuery
+from app.services.retrieval.inprocess import InProcessRetriever, index_document
+from app.services.retrieval.numpy_index import NumpyVectorStore
+
+
+def test_hashing_embeddings_are_deterministic_and_similar():
+    """Test batch/single equivalence, determinism and lexical similarity."""
+    print("#️⃣  Testing hashing embedder...")
+
+    provider = HashingEmbeddingProvider(dim=512)
+    texts = [
+        "Gradient descent updates weights using the learning rate.",
+        "The learning rate controls each gradient descent step.",
+        "Binary search trees keep keys in sorted order.",
+        "",
+    ]
+    batch = provider.embed_batch(texts)
+    assert batch.shape == (4, 512) and batch.dtype == np.float32
+    assert np.allclose(batch[1], provider.embed_batch([texts[1]])[0])
+    assert np.allclose(batch, HashingEmbeddingProvider(dim=512).embed_batch(texts))
+    print("✓ Same vectors in a batch, alone, and in a new instance")
+
+    assert np.allclose(np.linalg.norm(batch[:3], axis=1), 1.0)
+    assert not batch[3].any()
+    assert batch[0] @ batch[1] > batch[0] @ batch[2]
+    print(f"✓ Related sentences {batch[0] @ batch[1]:.2f} vs unrelated {batch[0] @ batch[2]:.2f}")
+
+
+def test_offline_pipeline_ingest_and_retrieve():
+    """Test ingest -> embed -> in-process index -> search with no network."""
+    print("🔌 Testing offline RAG retrieval...")
+    Base.metadata.create_all(bind=engine)
+
+    folder = tempfile.mkdtemp()
+    sources = {
+        "ml.md": "Backpropagation computes the gradient of the loss with respect to each weight. " * 30,
+        "algo.md": "Dijkstra's algorithm finds shortest paths in a weighted graph using a priority queue. " * 30,
+    }
+    for name, text in sources.items():
+        with open(f"{folder}/{name}", "w") as f:
+            f.write(text)
+
+    provider = HashingEmbeddingProvider()
+    store = NumpyVectorStore(root=tempfile.mkdtemp(), dim=settings.EMBEDDING_DIM)
+
+    async def run():
+        async with AsyncSessionLocal() as db:
+            user = User(email="offline@example.com", hashed_password="x")
+            db.add(user)
+            await db.flush()
+            documents = {}
+            for name in sources:
+                documents[name] = await ingest_document(db, Document(
+                    title=name, file_path=f"{folder}/{name}", file_type=".md", size_bytes=0, owner_id=user.id
+                ), embedder=provider)
+            await db.commit()
+            for document in documents.values():
+                await index_document(db, user.id, document.id, store)
+
+        question = "How are shortest paths found in a graph?"
+        query = RetrievalQuery(text=question, owner_id=user.id, embedding=(await provider.embed([question]))[0])
+        hits = await InProcessRetriever(store=store).search(query, 3)
+        return documents, hits
+
+    documents, hits = asyncio.run(run())
+    assert hits and all(hit.document_id == documents["algo.md"].id for hit in hits)
+    assert "Dijkstra" in hits[0].text
+    print(f"✓ Top {len(hits)} hits all from the graph-algorithms document")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Hashing Embeddings Test")
+    print("=" * 60)
+    print()
+
+    test_hashing_embeddings_are_deterministic_and_similar()
+    test_offline_pipeline_ingest_and_retrieve()
+
+    print("=" * 60)
+    print("✅ All hashing embedding tests passed!")
+    print("=" * 60)
@@ -0,0 +1,114 @@
+import asyncio
+import time
+import numpy as np
+from sqlalchemy.dialects import postgresql
+from app.services.retrieval.base import RetrievalQuery, RetrievedChunk, Retriever
+from app.services.retrieval.hybrid import HybridRetriever, reciprocal_rank_fusion
+
+
+class FakeRetriever(Retriever):
+    """Returns fixed chunk ids after a delay."""
+
+    def __init__(self, chunk_ids, delay=0.0, fail=False):
+        self.chunk_ids = chunk_ids
+        self.delay = delay
+        self.fail = fail
+
+    async def search(self, query, k):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("backend down")
+        return [RetrievedChunk(chunk_id=i, document_id=1, score=1.0, text=f"chunk {i}") for i in self.chunk_ids[:k]]
+
+
+QUERY = RetrievalQuery(text="error E1234", owner_id=1, embedding=np.ones(4, dtype=np.float32))
+
+
+def test_reciprocal_rank_fusion():
+    """Test that chunks found by both stages rise to the top."""
+    print("🔀 Testing reciprocal-rank fusion...")
+
+    vector = [RetrievedChunk(chunk_id=i, document_id=1, score=0.9) for i in [1, 2, 3]]
+    keyword = [RetrievedChunk(chunk_id=i, document_id=1, score=5.0) for i in [3, 4, 1]]
+    fused = reciprocal_rank_fusion([vector, keyword], k=60)
+
+    assert [hit.chunk_id for hit in fused][:2] == [1, 3]
+    assert fused[0].score == 1 / 61 + 1 / 63
+    assert {hit.chunk_id for hit in fused} == {1, 2, 3, 4}
+    print("✓ Fused order:", [hit.chunk_id for hit in fused])
+
+
+def test_stages_run_concurrently_with_timeouts():
+    """Test hybrid latency ~ max(stage), and that slow or failing stages are dropped."""
+    print("⏱️  Testing concurrent stages...")
+
+    hybrid = HybridRetriever(FakeRetriever([1, 2], delay=0.2), FakeRetriever([2, 3], delay=0.2))
+    started = time.perf_counter()
+    hits = asyncio.run(hybrid.search(QUERY, 3))
+    elapsed = time.perf_counter() - started
+    assert hits[0].chunk_id == 2
+    assert elapsed < 0.35, elapsed
+    print(f"✓ Two 200ms stages took {elapsed * 1000:.0f}ms")
+
+    hybrid = HybridRetriever(
+        FakeRetriever([1, 2]), FakeRetriever([3], delay=1.0), keyword_timeout=0.05
+    )
+    started = time.perf_counter()
+    hits = asyncio.run(hybrid.search(QUERY, 3))
+    assert [hit.chunk_id for hit in hits] == [1, 2]
+    assert time.perf_counter() - started < 0.5
+    print("✓ Slow keyword stage dropped at its timeout")
+
+    hybrid = HybridRetriever(FakeRetriever([1], fail=True), FakeRetriever([3]))
+    assert [hit.chunk_id for hit in asyncio.run(hybrid.search(QUERY, 3))] == [3]
+    print("✓ Failing vector stage dropped")
+
+    no_embedding = RetrievalQuery(text="E1234", owner_id=1)
+    hybrid = HybridRetriever(FakeRetriever([1], fail=True), FakeRetriever([3]))
+    assert [hit.chunk_id for hit in asyncio.run(hybrid.search(no_embedding, 3))] == [3]
+    print("✓ Query without embedding uses keyword search only")
+
+
+def test_keyword_query_uses_full_text_search():
+    """Test the keyword retriever's SQL on the Postgres dialect."""
+    print("🔎 Testing keyword SQL...")
+    from app.services.retrieval import keyword
+
+    captured = {}
+
+    class CapturingSession:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def execute(self, statement):
+            captured["sql"] = str(statement.compile(dialect=postgresql.dialect()))
+
+            class Result:
+                def all(self):
+                    return []
+            return Result()
+
+    retriever = keyword.PostgresKeywordRetriever(session_factory=CapturingSession)
+    assert asyncio.run(retriever.search(QUERY, 5)) == []
+    assert "websearch_to_tsquery" in captured["sql"]
+    assert "document_chunks.search_vector @@" in captured["sql"]
+    assert "ts_rank_cd" in captured["sql"]
+    print("✓ websearch_to_tsquery + ts_rank_cd over search_vector")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Hybrid Search Test")
+    print("=" * 60)
+    print()
+
+    test_reciprocal_rank_fusion()
+    test_stages_run_concurrently_with_timeouts()
+    test_keyword_query_uses_full_text_search()
+
+    print("=" * 60)
+    print("✅ All hybrid search tests passed!")
+    print("=" * 60)
@@ -0,0 +1,465 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from fastapi.testclient import TestClient
+from app import models  # noqa: F401 - registers all tables on Base.metadata
+from app.core.config import settings
+from app.db.session import Base, SessionLocal, engine
+from app.main import app
+from app.models.document import Document, DocumentStatus
+from app.models.document_chunk import DocumentChunk
+from app.services.embeddings.fake import FakeEmbeddingProvider
+from app.services.jobs import InMemoryJobQueue, RedisJobQueue, get_job_queue, ingest_job
+from app.services.jobs.redis_queue import USER_SLOT_TTL_SECONDS
+from app.services.jobs.worker import IngestionWorker, create_process_pool
+
+client = TestClient(app)
+
+NOTES = "\n\n".join(f"Paragraph {i} about queues, workers and retries." for i in range(40))
+
+
+def setup_module():
+    """Create the schema in the test database."""
+    Base.metadata.create_all(bind=engine)
+
+
+def auth_headers(email: str) -> dict:
+    """Register a user and return Authorization headers for them."""
+    client.post("/auth/register", json={"email": email, "password": "securepassword123"})
+    token = client.post("/auth/login", json={
+        "email": email,
+        "password": "securepassword123",
+    }).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def queued_upload(headers: dict, filename: str, body: bytes) -> dict:
+    """Upload with INGEST_ASYNC on, so the document is only queued."""
+    settings.INGEST_ASYNC = True
+    try:
+        response = client.post(
+            "/documents",
+            params={"filename": filename},
+            content=body,
+            headers={**headers, "Content-Type": "application/octet-stream"},
+        )
+    finally:
+        settings.INGEST_ASYNC = False
+    assert response.status_code == 202, response.text
+    return response.json()
+
+
+async def drain(worker: IngestionWorker, timeout: float = 0.1) -> int:
+    """Process queued jobs until none is ready; returns how many were handled."""
+    handled = 0
+    while (job := await worker.queue.dequeue(timeout)) is not None:
+        await worker.process(job)
+        handled += 1
+    return handled
+
+
+class FlakyEmbedder(FakeEmbeddingProvider):
+    """Embeds the first batch, then fails every call."""
+
+    async def embed(self, texts):
+        if self.calls:
+            raise RuntimeError("embedding API unavailable")
+        return await super().embed(texts)
+
+
+class FlakyQueue(InMemoryJobQueue):
+    """Fails the first dequeue, as Redis does when it drops the connection."""
+
+    def __init__(self):
+        super().__init__()
+        self.failures = 1
+
+    async def dequeue(self, timeout):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("connection reset by peer")
+        return await super().dequeue(timeout)
+
+
+class FakeRedis:
+    """The few Redis commands RedisJobQueue uses (no blocking, no real expiry)."""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+
+    async def lpush(self, key, value):
+        self.data.setdefault(key, []).insert(0, value)
+
+    async def blmove(self, source, destination, timeout, src="RIGHT", dest="LEFT"):
+        if not self.data.get(source):
+            return None
+        value = self.data[source].pop()
+        self.data.setdefault(destination, []).insert(0, value)
+        return value
+
+    async def lrem(self, key, count, value):
+        items = self.data.get(key, [])
+        if value in items:
+            items.remove(value)
+            return 1
+        return 0
+
+    async def lrange(self, key, start, end):
+        return list(self.data.get(key, []))
+
+    async def llen(self, key):
+        return len(self.data.get(key, []))
+
+    async def zadd(self, key, mapping, nx=False):
+        scores = self.data.setdefault(key, {})
+        for member, score in mapping.items():
+            if not (nx and member in scores):
+                scores[member] = score
+
+    async def zrem(self, key, member):
+        return 1 if self.data.get(key, {}).pop(member, None) is not None else 0
+
+    async def zrangebyscore(self, key, low, high):
+        return [m for m, score in sorted(self.data.get(key, {}).items(), key=lambda i: i[1]) if low <= score <= high]
+
+    async def zcard(self, key):
+        return len(self.data.get(key, {}))
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        self.ttls[key] = ex
+        return True
+
+    async def incr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) + 1
+        return self.data[key]
+
+    async def decr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) - 1
+        return self.data[key]
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+        self.ttls.pop(key, None)
+
+    def pipeline(self, transaction=True):
+        redis = self
+
+        class Pipeline:
+            def __init__(self):
+                self.calls = []
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            def __getattr__(self, name):
+                return lambda *args, **kwargs: self.calls.append(getattr(redis, name)(*args, **kwargs))
+
+            async def execute(self):
+                return [await call for call in self.calls]
+        return Pipeline()
+
+
+def load(document_id: int) -> Document:
+    db = SessionLocal()
+    try:
+        return db.get(Document, document_id)
+    finally:
+        db.close()
+
+
+def test_queued_upload_is_ingested_by_worker():
+    """Test 202 + pending on upload, then a worker process pool ingesting it."""
+    print("📬 Testing queued ingestion...")
+
+    headers = auth_headers("queued@example.com")
+    document = queued_upload(headers, "notes.md", NOTES.encode())
+    assert document["status"] == "pending" and document["chunk_count"] == 0
+
+    status = client.get(f"/documents/{document['id']}/status", headers=headers).json()
+    assert status == {"id": document["id"], "status": "pending", "progress": 0, "chunk_count": 0, "error": None}
+    print("✓ Upload returned 202 with the document pending")
+
+    pool = create_process_pool(1)
+    try:
+        worker = IngestionWorker(get_job_queue(), pool=pool)
+        assert asyncio.run(drain(worker)) == 1
+    finally:
+        pool.shutdown()
+
+    status = client.get(f"/documents/{document['id']}/status", headers=headers).json()
+    assert status["status"] == "ready" and status["progress"] == 100
+    assert status["chunk_count"] > 0
+    print(f"✓ Worker parsed in a subprocess and stored {status['chunk_count']} chunks")
+
+    other = auth_headers("stranger@example.com")
+    assert client.get(f"/documents/{document['id']}/status", headers=other).status_code == 404
+    print("✓ Status hidden from other users")
+
+
+def test_failed_jobs_retry_then_fail():
+    """Test that a broken file is retried, then marked failed with the error."""
+    print("🔁 Testing retries...")
+
+    headers = auth_headers("retry@example.com")
+    document = queued_upload(headers, "broken.pdf", b"this is not a pdf")
+
+    worker = IngestionWorker(get_job_queue(), pool=ThreadPoolExecutor(1), max_attempts=2, retry_backoff=0)
+    job = asyncio.run(worker.queue.dequeue(0.1))
+    asyncio.run(worker.process(job))
+
+    row = load(document["id"])
+    assert row.status == DocumentStatus.PENDING and row.attempts == 1 and row.error
+    print("✓ First failure requeued the job")
+
+    assert asyncio.run(drain(worker)) == 1
+    status = client.get(f"/documents/{document['id']}/status", headers=headers).json()
+    assert status["status"] == "failed" and status["error"]
+    assert load(document["id"]).attempts == 2
+    print("✓ Marked failed after the last attempt")
+
+
+def test_per_user_concurrency_limit():
+    """Test that a user at the limit has jobs deferred, not run."""
+    print("🚦 Testing per-user limit...")
+
+    headers = auth_headers("busy@example.com")
+    document = queued_upload(headers, "busy.md", NOTES.encode())
+    user_id = client.get("/auth/me", headers=headers).json()["id"]
+
+    queue = InMemoryJobQueue()
+    worker = IngestionWorker(queue, pool=ThreadPoolExecutor(1), max_jobs_per_user=1)
+
+    async def scenario():
+        assert await queue.acquire_user_slot(user_id, 1)  # Another job of this user is running
+        await worker.process(ingest_job(document["id"], user_id))
+        assert await queue.size() == 1
+        assert load(document["id"]).status == DocumentStatus.PENDING
+
+        await queue.release_user_slot(user_id)
+        return await drain(worker, timeout=2)
+
+    assert asyncio.run(scenario()) == 1
+    assert load(document["id"]).status == DocumentStatus.READY
+    print("✓ Deferred while the user was busy, ingested once a slot freed up")
+
+
+def test_consumer_survives_queue_errors():
+    """Test that a failing dequeue is logged and retried, not fatal."""
+    print("🩹 Testing consumer error handling...")
+
+    headers = auth_headers("outage@example.com")
+    document = queued_upload(headers, "outage.md", NOTES.encode())
+    user_id = client.get("/auth/me", headers=headers).json()["id"]
+
+    queue = FlakyQueue()
+    worker = IngestionWorker(queue, pool=ThreadPoolExecutor(1), concurrency=1, poll_interval=0.05)
+
+    async def scenario():
+        await queue.enqueue(ingest_job(document["id"], user_id))
+        consumer = asyncio.create_task(worker.run())
+        for _ in range(100):
+            if load(document["id"]).status == DocumentStatus.READY:
+                break
+            await asyncio.sleep(0.05)
+        worker.stop()
+        await consumer
+
+    asyncio.run(scenario())
+    assert queue.failures == 0 and load(document["id"]).status == DocumentStatus.READY
+    print("✓ Consumer kept going after the queue error and ingested the job")
+
+
+def test_failed_upload_leaves_no_chunks():
+    """Test that chunks committed by a first ingestion that fails for good are deleted."""
+    print("🧹 Testing failed upload cleanup...")
+
+    headers = auth_headers("halfway@example.com")
+    document = queued_upload(headers, "halfway.md", NOTES.encode())
+    user_id = client.get("/auth/me", headers=headers).json()["id"]
+
+    queue = InMemoryJobQueue()
+    worker = IngestionWorker(
+        queue, embedder=FlakyEmbedder(), pool=ThreadPoolExecutor(1), max_attempts=1, batch_size=1
+    )
+
+    def stored_chunks():
+        db = SessionLocal()
+        try:
+            return db.query(DocumentChunk).filter(DocumentChunk.document_id == document["id"]).count()
+        finally:
+            db.close()
+
+    original = worker._record_failure
+    seen = []
+
+    async def record_failure(*args):
+        seen.append(stored_chunks())  # Chunks the failed attempt committed
+        await original(*args)
+
+    worker._record_failure = record_failure
+    asyncio.run(worker.process(ingest_job(document["id"], user_id)))
+
+    row = load(document["id"])
+    assert seen == [1]
+    assert row.status == DocumentStatus.FAILED and row.chunk_count == 0
+    assert stored_chunks() == 0
+    print("✓ Failed document left no searchable chunks")
+
+
+def test_failure_bookkeeping_errors_requeue_the_job():
+    """Test that a job is put back, not dropped, when recording its failure fails."""
+    print("📝 Testing failed failure bookkeeping...")
+
+    headers = auth_headers("bookkeeping@example.com")
+    document = queued_upload(headers, "ledger.pdf", b"this is not a pdf either")
+    user_id = client.get("/auth/me", headers=headers).json()["id"]
+
+    queue = InMemoryJobQueue()
+    worker = IngestionWorker(queue, pool=ThreadPoolExecutor(1), max_attempts=2, retry_backoff=0)
+    record_failure = worker._record_failure
+    calls = []
+
+    async def flaky_record_failure(*args):
+        calls.append(args)
+        if len(calls) == 1:
+            raise ConnectionError("database unavailable")
+        await record_failure(*args)
+
+    worker._record_failure = flaky_record_failure
+
+    async def scenario():
+        await worker.process(ingest_job(document["id"], user_id))
+        assert await queue.size() == 1  # Put back despite the error
+        return await drain(worker)
+
+    assert asyncio.run(scenario()) == 1
+    row = load(document["id"])
+    assert len(calls) == 2 and row.status == DocumentStatus.FAILED and row.attempts == 2
+    print("✓ Job requeued after the bookkeeping error, then failed normally")
+
+
+def test_redis_queue_requeues_lost_jobs():
+    """Test that jobs left in jobs:processing by a dead worker are put back."""
+    print("⚰️  Testing stale job reaper...")
+
+    fake = FakeRedis()
+    queue = RedisJobQueue(fake, lease_seconds=60)
+
+    async def scenario():
+        await queue.enqueue(ingest_job(1, 7))
+        await queue.enqueue(ingest_job(2, 7))
+        lost = await queue.dequeue(0)
+        done = await queue.dequeue(0)
+        await queue.complete(done)
+        assert await queue.requeue_stale() == 0  # Lease still running
+
+        fake.data[queue.leases][lost._raw] = 0  # Lease ran out
+        assert await queue.requeue_stale() == 1
+        again = await queue.dequeue(0)
+        assert again.payload == lost.payload
+
+        # Taken by a worker that died before recording a lease
+        fake.data[queue.leases].pop(again._raw)
+        assert await queue.requeue_stale() == 0
+        assert again._raw in fake.data[queue.leases]
+
+    asyncio.run(scenario())
+    print("✓ Expired lease requeued, completed job left alone, lease-less job adopted")
+
+
+def test_redis_user_slot_ttl_set_once():
+    """Test that the slot counter's TTL is set when created, not on every acquire."""
+    print("⏳ Testing user slot TTL...")
+
+    fake = FakeRedis()
+    queue = RedisJobQueue(fake)
+    key = f"{queue.user_prefix}7"
+
+    async def scenario():
+        assert await queue.acquire_user_slot(7, 2)
+        fake.ttls[key] = 5  # Time passes
+        assert await queue.acquire_user_slot(7, 2)
+        assert fake.ttls[key] == 5
+        assert not await queue.acquire_user_slot(7, 2)
+        assert fake.data[key] == 2
+
+        await queue.release_user_slot(7)
+        await queue.release_user_slot(7)
+        assert key not in fake.data
+        assert await queue.acquire_user_slot(7, 2)
+        assert fake.ttls[key] == USER_SLOT_TTL_SECONDS
+
+    asyncio.run(scenario())
+    print("✓ TTL set only on creation; an idle counter is deleted")
+
+
+def test_failed_reupload_restores_previous_version():
+    """Test that a re-upload failing for good leaves the previous version in place."""
+    print("⏪ Testing failed re-upload rollback...")
+
+    headers = auth_headers("rollback@example.com")
+    document = client.post(
+        "/documents", params={"filename": "v1.md"}, content=NOTES.encode(), headers=headers
+    ).json()
+    assert document["status"] == "ready"
+    db = SessionLocal()
+    before = {c.id for c in db.query(DocumentChunk).filter(DocumentChunk.document_id == document["id"])}
+    db.close()
+
+    version2 = "\n\n".join(f"Rewritten paragraph {i} about leases and reapers." for i in range(40))
+    settings.INGEST_ASYNC = True
+    try:
+        response = client.put(f"/documents/{document['id']}", content=version2.encode(), headers=headers)
+        assert response.status_code == 202 and response.json()["status"] == "pending"
+        again = client.put(f"/documents/{document['id']}", content=b"third version", headers=headers)
+        assert again.status_code == 409
+    finally:
+        settings.INGEST_ASYNC = False
+    new_path = load(document["id"]).file_path
+    assert new_path != document["file_path"] and os.path.exists(document["file_path"])
+    print("✓ Re-upload queued, previous file kept, concurrent PUT rejected")
+
+    worker = IngestionWorker(
+        get_job_queue(), embedder=FlakyEmbedder(), pool=ThreadPoolExecutor(1), max_attempts=1, batch_size=2
+    )
+    asyncio.run(drain(worker))
+
+    row = load(document["id"])
+    assert row.status == DocumentStatus.READY and row.error
+    assert row.file_path == document["file_path"] and row.chunk_count == document["chunk_count"]
+    assert row.content_hash == document["content_hash"]
+    db = SessionLocal()
+    after = {c.id for c in db.query(DocumentChunk).filter(DocumentChunk.document_id == document["id"])}
+    db.close()
+    assert after == before
+    assert os.path.exists(document["file_path"]) and not os.path.exists(new_path)
+    print("✓ Inserted chunks deleted, previous file and chunk count restored")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Ingestion Job Queue Test")
+    print("=" * 60)
+    print()
+
+    setup_module()
+    test_queued_upload_is_ingested_by_worker()
+    test_failed_jobs_retry_then_fail()
+    test_per_user_concurrency_limit()
+    test_consumer_survives_queue_errors()
+    test_failed_upload_leaves_no_chunks()
+    test_failure_bookkeeping_errors_requeue_the_job()
+    test_redis_queue_requeues_lost_jobs()
+    test_redis_user_slot_ttl_set_once()
+    test_failed_reupload_restores_previous_version()
+
+    print("=" * 60)
+    print("✅ All ingestion job tests passed!")
+    print("=" * 60)
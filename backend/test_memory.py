@@ -0,0 +1,114 @@
+import asyncio
+from datetime import datetime, timedelta
+from app import models  # noqa: F401 - registers all tables on Base.metadata
+from app.db.session import AsyncSessionLocal, Base, engine
+from app.models.conversation import Conversation
+from app.models.message import Message
+from app.models.user import User
+from app.services.memory import ConversationMemory, ExtractiveSummarizer
+
+
+class RecordingSummarizer(ExtractiveSummarizer):
+    """Extractive summarizer that remembers which messages it was given."""
+
+    def __init__(self):
+        self.folded = []
+
+    async def summarize(self, previous, messages, max_tokens):
+        self.folded.append([m.content for m in messages])
+        return await super().summarize(previous, messages, max_tokens)
+
+
+def setup_module():
+    """Create the schema in the test database."""
+    Base.metadata.create_all(bind=engine)
+
+
+async def new_conversation(db) -> Conversation:
+    user = User(email=f"memory-{datetime.utcnow().timestamp()}@example.com", hashed_password="x")
+    db.add(user)
+    await db.flush()
+    conversation = Conversation(title="Memory", user_id=user.id)
+    db.add(conversation)
+    await db.flush()
+    return conversation
+
+
+async def add_messages(db, conversation, start: int, count: int, tokens: int) -> None:
+    base = datetime(2026, 1, 1)
+    db.add_all([
+        Message(content=f"Turn {i}. Details follow.", is_user=i % 2 == 0, conversation_id=conversation.id,
+                token_count=tokens, created_at=base + timedelta(seconds=i))
+        for i in range(start, start + count)
+    ])
+    await db.commit()
+
+
+def test_window_uses_stored_token_counts():
+    """Test the window picks the newest messages that fit the budget."""
+    print("🧠 Testing memory window...")
+
+    async def run():
+        async with AsyncSessionLocal() as db:
+            conversation = await new_conversation(db)
+            # Short texts with large stored counts: the stored counts must win
+            await add_messages(db, conversation, 0, 10, tokens=100)
+            memory = ConversationMemory(budget=350, summary_max_tokens=100, summarizer=RecordingSummarizer())
+            return await memory.window(db, conversation)
+
+    window = asyncio.run(run())
+    assert [m.content.split(".")[0] for m in window.messages] == ["Turn 7", "Turn 8", "Turn 9"]
+    assert window.token_count == 300 and window.summary is None
+    print("✓ Newest 3 x 100-token messages fit a 350-token budget")
+
+
+def test_summary_is_updated_incrementally():
+    """Test that only messages leaving the window are summarised, once each."""
+    print("📝 Testing incremental summary...")
+
+    summarizer = RecordingSummarizer()
+    memory = ConversationMemory(budget=500, summary_max_tokens=100, summarizer=summarizer)
+
+    async def run():
+        async with AsyncSessionLocal() as db:
+            conversation = await new_conversation(db)
+            await add_messages(db, conversation, 0, 4, tokens=100)
+            assert not await memory.update(db, conversation)  # 400 tokens fit next to the summary
+
+            await add_messages(db, conversation, 4, 2, tokens=100)
+            assert await memory.update(db, conversation)
+            first_summary = conversation.summary
+
+            await add_messages(db, conversation, 6, 2, tokens=100)
+            assert await memory.update(db, conversation)
+            window = await memory.window(db, conversation)
+            return first_summary, conversation, window
+
+    first_summary, conversation, window = asyncio.run(run())
+    assert summarizer.folded == [
+        ["Turn 0. Details follow.", "Turn 1. Details follow."],
+        ["Turn 2. Details follow.", "Turn 3. Details follow."],
+    ]
+    print("✓ Each update folded only the messages that fell out of the window")
+
+    assert first_summary == "User: Turn 0\nAssistant: Turn 1"
+    assert conversation.summary.endswith("User: Turn 2\nAssistant: Turn 3")
+    assert conversation.summary_token_count > 0
+    assert [m.content.split(".")[0] for m in window.messages] == ["Turn 4", "Turn 5", "Turn 6", "Turn 7"]
+    assert window.summary == conversation.summary
+    print("✓ Window = summary + the 4 newest messages")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Conversation Memory Test")
+    print("=" * 60)
+    print()
+
+    setup_module()
+    test_window_uses_stored_token_counts()
+    test_summary_is_updated_incrementally()
+
+    print("=" * 60)
+    print("✅ All conversation memory tests passed!")
+    print("=" * 60)
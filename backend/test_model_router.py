@@ -0,0 +1,169 @@
+import asyncio
+from app.services.llm import ChatMessage
+from app.services.llm.fake import FakeLLMBackend
+from app.services.llm.router import LatencyTracker, ModelRouter, Tier, hedge_wins, hedges, failovers, routed_cost
+from app.services.tokens import count_tokens
+
+CONTEXT = "Context from the user's documents:\n\n[1] (document 1, page 1)\nA heap is a tree-shaped priority queue. It is stored in an array."
+
+
+class FailingBackend(FakeLLMBackend):
+    """Fake LLM that errors before its first token."""
+
+    async def stream(self, messages):
+        raise RuntimeError("provider unavailable")
+        yield
+
+
+def make_router(fast, strong, **kwargs):
+    return ModelRouter(
+        fast=Tier("fast", fast, fallback=strong, prompt_cost=0.15, completion_cost=0.6),
+        strong=Tier("strong", strong, fallback=fast, prompt_cost=2.5, completion_cost=10),
+        latency=LatencyTracker(window=50),
+        **kwargs
+    )
+
+
+def prompt(question, context=CONTEXT):
+    return [ChatMessage("system", context), ChatMessage("user", question)]
+
+
+async def collect(router, messages):
+    return "".join([fragment async for fragment in router.stream(messages)])
+
+
+def test_router_picks_tier():
+    """Test that long, context-heavy or complex prompts go to the strong tier."""
+    print("🧭 Testing tier selection...")
+
+    router = make_router(FakeLLMBackend(name="t_fast"), FakeLLMBackend(name="t_strong"),
+                         strong_query_tokens=20, strong_context_tokens=200)
+
+    assert router.choose(prompt("What is a heap?"))[0].name == "fast"
+    print("✓ Short lookup question -> fast")
+
+    assert router.choose(prompt("Why is a heap stored in an array?")) == (router.strong, "complex question")
+    assert router.choose(prompt("Compare heaps and binary search trees"))[0].name == "strong"
+    print("✓ Reasoning question -> strong")
+
+    long_question = "What is " + " and ".join(["a heap"] * 20) + "?"
+    assert router.choose(prompt(long_question)) == (router.strong, "long question")
+    big_context = CONTEXT + "\n" + " ".join(f"word{i}" for i in range(400))
+    assert router.choose(prompt("What is a heap?", big_context)) == (router.strong, "large context")
+    print("✓ Long question / large context -> strong")
+
+    # Stored counts are used as given, not re-counted
+    counted = [ChatMessage("system", CONTEXT, tokens=500), ChatMessage("user", "What is a heap?", tokens=5)]
+    assert router.choose(counted) == (router.strong, "large context")
+    print("✓ Precomputed token counts drive the choice")
+
+    answer = asyncio.run(collect(router, prompt("What is a heap?")))
+    assert answer == "According to your notes [1]: A heap is a tree-shaped priority queue."
+    print("✓ Routed answer streamed")
+
+
+def test_slow_primary_is_hedged():
+    """Test that a request slower than the primary's p95 is hedged to the fallback."""
+    print("🏁 Testing hedged requests...")
+
+    fast = FakeLLMBackend(name="h_fast")
+    strong = FakeLLMBackend(name="h_strong", model="strong-llm")
+    router = make_router(fast, strong, min_samples=5, hedge_percentile=95)
+
+    for _ in range(5):
+        router.latency.observe(fast, 0.01)
+    assert router.latency.budget(fast, 95, 5) == 0.01
+
+    fast.first_token_delay = 1.0  # Provider stalls
+    hedges_before, wins_before = hedges.value, hedge_wins.value
+
+    async def timed():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        answer = await collect(router, prompt("What is a heap?"))
+        return answer, loop.time() - started
+
+    answer, elapsed = asyncio.run(timed())
+    assert answer.startswith("According to your notes [1]")
+    assert elapsed < 0.5, elapsed
+    assert hedges.value == hedges_before + 1 and hedge_wins.value == wins_before + 1
+    assert router.latency.histogram(fast).count == 6  # The cancelled primary, as a lower bound
+    assert router.latency.budget(fast, 95, 5) >= 0.01
+    assert router.latency.histogram(strong).count == 1
+    print(f"✓ Fallback answered first ({elapsed * 1000:.0f} ms instead of 1000 ms)")
+
+    # Cold backends (too few samples) are never hedged
+    cold = make_router(FakeLLMBackend(name="c_fast", first_token_delay=0.05), FakeLLMBackend(name="c_strong"))
+    asyncio.run(collect(cold, prompt("What is a heap?")))
+    assert hedges.value == hedges_before + 1
+    print("✓ No hedging before the latency budget is known")
+
+
+def test_degraded_primary_stops_hedging():
+    """Test that a primary that got persistently slower raises its budget instead of hedging forever."""
+    print("🐢 Testing a degraded primary...")
+
+    fast = FakeLLMBackend(name="d_fast")
+    strong = FakeLLMBackend(name="d_strong", model="strong-llm", first_token_delay=0.03)
+    router = make_router(fast, strong, min_samples=5, hedge_percentile=95)
+    for _ in range(5):
+        router.latency.observe(fast, 0.01)
+
+    fast.first_token_delay = 0.15  # From now on, every request is slow
+
+    async def run(requests):
+        hedged = []
+        for _ in range(requests):
+            before = hedges.value
+            await collect(router, prompt("What is a heap?"))
+            hedged.append(hedges.value > before)
+        return hedged
+
+    hedged = asyncio.run(run(20))
+    assert hedged[0] and not any(hedged[-3:]), hedged
+    assert router.latency.budget(fast, 95, 5) >= 0.15
+    print(f"✓ Hedged {sum(hedged)} of {len(hedged)} requests, then the budget caught up")
+
+
+def test_failed_primary_fails_over():
+    """Test that an error before the first token falls back to the other tier."""
+    print("🛟 Testing failover...")
+
+    router = make_router(FailingBackend(name="f_fast"), FakeLLMBackend(name="f_strong"))
+    failovers_before = failovers.value
+
+    cost_before = routed_cost.value
+
+    answer = asyncio.run(collect(router, prompt("What is a heap?")))
+    assert answer.startswith("According to your notes [1]")
+    assert failovers.value == failovers_before + 1
+    print("✓ Fallback answered after the primary failed")
+
+    messages = prompt("What is a heap?")
+    strong_price = sum(count_tokens(m.content) for m in messages) / 1000 * 2.5 + count_tokens(answer) / 1000 * 10
+    assert abs(routed_cost.value - cost_before - strong_price) < 1e-9
+    print("✓ Cost charged at the strong tier's prices, which answered")
+
+    broken = make_router(FailingBackend(name="b_fast"), FailingBackend(name="b_strong"))
+    try:
+        asyncio.run(collect(broken, prompt("What is a heap?")))
+        assert False, "expected the error to surface"
+    except RuntimeError:
+        pass
+    print("✓ Error surfaces when both tiers fail")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Model Router Test")
+    print("=" * 60)
+    print()
+
+    test_router_picks_tier()
+    test_slow_primary_is_hedged()
+    test_degraded_primary_stops_hedging()
+    test_failed_primary_fails_over()
+
+    print("=" * 60)
+    print("✅ All model router tests passed!")
+    print("=" * 60)
@@ -0,0 +1,189 @@
+import asyncio
+from app.services.llm import ChatMessage
+from app.services.llm.fake import FakeLLMBackend
+from app.services.single_flight import SingleFlight, StreamFlight, prompt_key
+
+
+class CountingBackend(FakeLLMBackend):
+    """Fake LLM that counts upstream calls."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.calls = 0
+
+    async def stream(self, messages):
+        self.calls += 1
+        async for fragment in super().stream(messages):
+            yield fragment
+
+
+class FakeRedis:
+    """The few Redis commands StreamFlight uses (locks and streams)."""
+
+    def __init__(self):
+        self.data = {}
+        self.streams = {}
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+    async def expire(self, key, seconds):
+        pass
+
+    async def xadd(self, key, fields):
+        entries = self.streams.setdefault(key, [])
+        entries.append((f"{len(entries) + 1}-0", dict(fields)))
+
+    async def xread(self, streams, count=None, block=None):
+        (key, last_id), = streams.items()
+        for _ in range(max(1, (block or 0) // 10)):
+            position = int(last_id.split("-")[0])
+            entries = self.streams.get(key, [])[position:position + (count or 100)]
+            if entries:
+                return [(key, entries)]
+            if block:
+                await asyncio.sleep(0.01)
+        return []
+
+
+MESSAGES = [
+    ChatMessage("system", "Context:\n\n[1] (document 1)\nMerge sort splits the list in half. Then it merges."),
+    ChatMessage("user", "How does merge sort work?"),
+]
+
+
+async def collect(flight: StreamFlight, backend, messages=MESSAGES, stop_after=None):
+    parts = []
+    async for fragment in flight.stream(prompt_key(backend.model, messages), lambda: backend.stream(messages)):
+        parts.append(fragment)
+        if stop_after is not None and len(parts) == stop_after:
+            break
+    return "".join(parts)
+
+
+def test_single_flight_shares_awaitables():
+    """Test that concurrent calls with one key run the factory once."""
+    print("🛫 Testing SingleFlight...")
+    calls = []
+
+    async def search():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return ["chunk"]
+
+    async def scenario():
+        flight = SingleFlight()
+        results = await asyncio.gather(*(flight.do(("owner", "question"), search) for _ in range(10)))
+        again = await flight.do(("owner", "question"), search)
+        return results, again
+
+    results, again = asyncio.run(scenario())
+    assert len(calls) == 2 and all(r == ["chunk"] for r in results) and again == ["chunk"]
+    print("✓ 10 concurrent callers shared one call; a later caller ran its own")
+
+
+def test_stream_fanout_in_process():
+    """Test that concurrent streams share one upstream call, including late joiners."""
+    print("📡 Testing StreamFlight fan-out...")
+    backend = CountingBackend(token_delay=0.01)
+    expected = backend.answer_for(MESSAGES)
+
+    async def scenario():
+        flight = StreamFlight(redis=None)
+        early = [asyncio.create_task(collect(flight, backend)) for _ in range(5)]
+        quitter = asyncio.create_task(collect(flight, backend, stop_after=1))
+        await asyncio.sleep(0.03)  # Join after a few fragments were produced
+        late = asyncio.create_task(collect(flight, backend))
+        return await asyncio.gather(*early, late), await quitter
+
+    answers, partial = asyncio.run(scenario())
+    assert backend.calls == 1
+    assert all(answer == expected for answer in answers)
+    assert expected.startswith(partial)
+    print(f"✓ 6 full streams and 1 early quitter from {backend.calls} upstream call")
+
+    other = [ChatMessage("system", "Context:\n\n[1] (document 2)\nQuick sort picks a pivot."), MESSAGES[1]]
+    assert prompt_key(backend.model, other) != prompt_key(backend.model, MESSAGES)
+    spaced = [ChatMessage(m.role, m.content.replace(" ", "  ")) for m in MESSAGES]
+    assert prompt_key(backend.model, spaced) == prompt_key(backend.model, MESSAGES)
+    print("✓ Key depends on the context, not on whitespace")
+
+
+def test_stream_errors_reach_every_waiter():
+    """Test that an upstream failure is raised in every follower."""
+    print("💥 Testing error fan-out...")
+
+    async def failing():
+        yield "partial "
+        await asyncio.sleep(0.01)
+        raise RuntimeError("model overloaded")
+
+    async def follow(flight):
+        parts = []
+        try:
+            async for fragment in flight.stream("key", failing):
+                parts.append(fragment)
+        except RuntimeError as exc:
+            return parts, str(exc)
+
+    async def scenario():
+        flight = StreamFlight(redis=None)
+        return await asyncio.gather(*(follow(flight) for _ in range(3)))
+
+    assert asyncio.run(scenario()) == [(["partial "], "model overloaded")] * 3
+    print("✓ Every waiter saw the fragments and then the error")
+
+
+def test_stream_coalesced_across_processes():
+    """Test two processes (two StreamFlights) sharing one call through Redis."""
+    print("🌐 Testing cross-process relay...")
+    redis = FakeRedis()
+    backend = CountingBackend(token_delay=0.01)
+    expected = backend.answer_for(MESSAGES)
+
+    async def scenario():
+        first, second = StreamFlight(redis=redis), StreamFlight(redis=redis)
+        leader = asyncio.create_task(collect(first, backend))
+        await asyncio.sleep(0.02)
+        return await asyncio.gather(leader, collect(second, backend), collect(second, backend))
+
+    assert asyncio.run(scenario()) == [expected] * 3
+    assert backend.calls == 1 and not redis.data
+    print("✓ Second process relayed the first one's stream; lock released")
+
+    async def orphaned():
+        # A lock left by a crashed process: followers give up and call upstream
+        redis.data["singleflight:" + prompt_key(backend.model, MESSAGES)] = "dead-flight"
+        flight = StreamFlight(redis=redis)
+        task = asyncio.create_task(collect(flight, backend))
+        await asyncio.sleep(0.05)
+        del redis.data["singleflight:" + prompt_key(backend.model, MESSAGES)]
+        return await task
+
+    assert asyncio.run(orphaned()) == expected and backend.calls == 2
+    print("✓ Follower recovered from a vanished owner")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Single-Flight Test")
+    print("=" * 60)
+    print()
+
+    test_single_flight_shares_awaitables()
+    test_stream_fanout_in_process()
+    test_stream_errors_reach_every_waiter()
+    test_stream_coalesced_across_processes()
+
+    print("=" * 60)
+    print("✅ All single-flight tests passed!")
+    print("=" * 60)
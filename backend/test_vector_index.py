@@ -0,0 +1,233 @@
+import asyncio
+import tempfile
+import numpy as np
+from sqlalchemy import select
+from app import models  # noqa: F401 - registers all tables on Base.metadata
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, Base, engine
+from app.models.document import Document, DocumentType
+from app.models.document_chunk import DocumentChunk
+from app.models.user import User
+from app.services.chunk_store import insert_chunk_batch
+from app.services.chunking import Chunk
+from app.services.retrieval.base import RetrievalQuery
+from app.services.retrieval.inprocess import InProcessRetriever, rebuild_owner_index
+from app.services.retrieval.numpy_index import NumpyVectorStore, OwnerVectorIndex
+
+DIM = 32
+
+
+def unit_vectors(n: int, seed: int = 0, dim: int = DIM) -> np.ndarray:
+    vectors = np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def brute_force(vectors: np.ndarray, ids: np.ndarray, query: np.ndarray, k: int) -> list:
+    return list(ids[np.argsort(-(vectors @ query))[:k]])
+
+
+def test_search_matches_brute_force_and_persists():
+    """Test top-k against brute force, growth past capacity, and reopening."""
+    print("🧮 Testing in-process vector index...")
+
+    path = tempfile.mkdtemp()
+    index = OwnerVectorIndex(path, dim=DIM)
+    vectors = unit_vectors(3000)
+    ids = np.arange(100, 3100)
+    for start in range(0, 3000, 700):  # Several appends, growing past MIN_CAPACITY
+        index.append(ids[start:start + 700], [1] * len(ids[start:start + 700]), vectors[start:start + 700])
+
+    query = unit_vectors(1, seed=1)[0]
+    hits = index.search(query, 10)
+    assert [h[0] for h in hits] == brute_force(vectors, ids, query, 10)
+    assert hits[0][2] >= hits[-1][2]
+    print("✓ Top-10 matches brute force")
+
+    reopened = OwnerVectorIndex(path, dim=DIM)
+    assert reopened.search(query, 10) == hits
+    print("✓ Index reloaded from disk")
+
+
+def test_tombstones_and_compaction():
+    """Test deletes are hidden immediately and compaction keeps live rows."""
+    print("🪦 Testing deletes and compaction...")
+
+    index = OwnerVectorIndex(tempfile.mkdtemp(), dim=DIM, compact_ratio=0.5)
+    vectors = unit_vectors(1000)
+    ids = np.arange(1000)
+    index.append(ids[:600], [1] * 600, vectors[:600])
+    index.append(ids[600:], [2] * 400, vectors[600:])
+
+    query = vectors[10]  # Exactly matches chunk 10 of document 1
+    assert index.search(query, 1)[0][0] == 10
+
+    assert index.delete_chunks([10]) == 1
+    assert 10 not in [h[0] for h in index.search(query, 50)]
+    assert index.count == 1000 and index.deleted == 1
+    print("✓ Tombstoned chunk hidden from search")
+
+    assert index.delete_document(1) == 599  # Crosses the ratio -> compaction
+    assert index.count == 400 and index.deleted == 0
+    expected = brute_force(vectors[600:], ids[600:], query, 5)
+    assert [h[0] for h in index.search(query, 5)] == expected
+    print("✓ Compaction kept only live rows")
+
+
+def test_doc_type_filter_before_top_k():
+    """Test that a rare doc_type still gets k hits, across compaction and reopening."""
+    print("🗂️  Testing doc_type pre-filtering...")
+
+    path = tempfile.mkdtemp()
+    index = OwnerVectorIndex(path, dim=DIM, compact_ratio=0.5)
+    vectors = unit_vectors(2000, seed=5)
+    ids = np.arange(2000)
+    # 1% code chunks, far from the query, buried under 99% course notes
+    types = [DocumentType.CODE if i % 100 == 0 else DocumentType.COURSE for i in range(2000)]
+    index.append(ids, [1] * 2000, vectors, types)
+
+    code = ids[::100]
+    query = vectors[1]
+    hits = index.search(query, 10, doc_type=DocumentType.CODE)
+    assert len(hits) == 10 and all(h[0] % 100 == 0 for h in hits)
+    assert [h[0] for h in hits] == brute_force(vectors[code], code, query, 10)
+    print("✓ 10 of 20 code chunks found among 2000 rows (exact top-k within the type)")
+
+    index.delete_chunks(list(range(1, 1100)))  # Crosses the ratio -> compaction
+    reopened = OwnerVectorIndex(path, dim=DIM)
+    assert reopened.search(query, 10, doc_type=DocumentType.CODE) == index.search(query, 10, doc_type=DocumentType.CODE)
+    course = np.array([i for i in range(1100, 2000) if i % 100])
+    assert [h[0] for h in reopened.search(query, 10, doc_type=DocumentType.COURSE)] == \
+        brute_force(vectors[course], course, query, 10)
+    print("✓ Types survive compaction and reopening")
+
+    # Rows indexed before types were stored match every filter
+    legacy = OwnerVectorIndex(tempfile.mkdtemp(), dim=DIM)
+    legacy.append(ids[:50], [1] * 50, vectors[:50])
+    assert len(legacy.search(query, 5, doc_type=DocumentType.ACADEMIC)) == 5
+    print("✓ Untyped rows are left to the database filter")
+
+
+def test_int8_quantized_search_with_rerank():
+    """Test int8 scans re-scored in float32 against the exact float32 index."""
+    print("🗜️  Testing int8 quantized index...")
+
+    path = tempfile.mkdtemp()
+    exact = OwnerVectorIndex(path, dim=DIM)
+    vectors = unit_vectors(3000, seed=7)
+    ids = np.arange(3000)
+    types = [DocumentType.CODE if i % 10 == 0 else DocumentType.COURSE for i in range(3000)]
+    exact.append(ids, [1] * 3000, vectors, types)
+    queries = unit_vectors(20, seed=8)
+    expected = [exact.search(q, 10) for q in queries]
+
+    # Opening the float32 index quantized backfills its codes
+    quantized = OwnerVectorIndex(path, dim=DIM, quantize=True, rerank_factor=4)
+    assert quantized.scan_bytes < exact.scan_bytes / 3
+    results = [quantized.search(q, 10) for q in queries]
+    recall = np.mean([len({h[0] for h in a} & {h[0] for h in b}) / 10 for a, b in zip(results, expected)])
+    assert recall >= 0.95, recall
+    for query, hits in zip(queries, results):
+        assert all(abs(score - float(vectors[chunk_id] @ query)) < 1e-5 for chunk_id, _, score in hits)
+    print(f"✓ recall@10 = {recall:.2f} with {quantized.scan_bytes / exact.scan_bytes:.0%} of the scanned bytes; scores exact")
+
+    quantized.append(np.arange(3000, 3100), [2] * 100, unit_vectors(100, seed=9), [DocumentType.CODE] * 100)
+    quantized.delete_document(1)  # Crosses the ratio -> compaction
+    reopened = OwnerVectorIndex(path, dim=DIM, quantize=True)
+    query = unit_vectors(100, seed=9)[42]
+    assert reopened.search(query, 1, doc_type=DocumentType.CODE)[0][0] == 3042
+    print("✓ Codes kept through appends, compaction and reopening")
+
+
+def test_two_handles_share_one_directory():
+    """Test handles in different workers see each other's writes and never overwrite rows."""
+    print("👥 Testing two handles on one index directory...")
+
+    path = tempfile.mkdtemp()
+    api, worker = OwnerVectorIndex(path, dim=DIM, compact_ratio=0.5), OwnerVectorIndex(path, dim=DIM, compact_ratio=0.5)
+    vectors = unit_vectors(1500, seed=11)
+    ids = np.arange(1500)
+    api.append(ids[:500], [1] * 500, vectors[:500])
+    worker.append(ids[500:1000], [2] * 500, vectors[500:1000])  # Starts after the api's rows
+    api.append(ids[1000:], [3] * 500, vectors[1000:])  # Grows past MIN_CAPACITY
+
+    query = unit_vectors(1, seed=12)[0]
+    expected = brute_force(vectors, ids, query, 10)
+    assert [h[0] for h in api.search(query, 10)] == expected
+    assert [h[0] for h in worker.search(query, 10)] == expected
+    assert api.count == worker.count == 1500
+    print("✓ Appends from both handles land in distinct rows; both see all of them")
+
+    api.delete_document(1)
+    assert all(h[1] != 1 for h in worker.search(query, 10))
+    worker.delete_document(2)  # Crosses the ratio -> compaction in the worker
+    assert worker.count == 500 and worker.deleted == 0
+    assert all(h[1] == 3 for h in api.search(query, 10)) and api.count == 500
+    api.append(ids[:100], [4] * 100, vectors[:100])  # Written into the compacted files
+    live = np.concatenate([ids[1000:], ids[:100]])
+    expected = brute_force(vectors[live], live, query, 10)
+    assert [h[0] for h in worker.search(query, 10)] == expected
+    assert [h[0] for h in OwnerVectorIndex(path, dim=DIM).search(query, 10)] == expected
+    print("✓ Deletes and compaction in one handle are picked up by the other")
+
+
+def test_inprocess_retriever_with_database():
+    """Test rebuilding from stored embeddings and hydrating chunk text."""
+    print("🔎 Testing InProcessRetriever...")
+
+    Base.metadata.create_all(bind=engine)
+    # Stored embeddings must match the document_chunks.embedding column
+    store = NumpyVectorStore(tempfile.mkdtemp(), dim=settings.EMBEDDING_DIM)
+    vectors = unit_vectors(20, seed=3, dim=settings.EMBEDDING_DIM)
+
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            owner = User(email="numpy-retriever@example.com", hashed_password="x")
+            db.add(owner)
+            await db.flush()
+            notes = Document(title="notes", file_path="n", file_type=".md", size_bytes=1,
+                             owner_id=owner.id, doc_type=DocumentType.COURSE)
+            code = Document(title="code", file_path="c", file_type=".py", size_bytes=1,
+                            owner_id=owner.id, doc_type=DocumentType.CODE)
+            db.add_all([notes, code])
+            await db.flush()
+            for document, rows in [(notes, range(0, 10)), (code, range(10, 20))]:
+                chunks = [Chunk(ordinal=i, text=f"chunk {i}", page=1, token_count=2) for i in rows]
+                await insert_chunk_batch(db, document.id, chunks, vectors[list(rows)])
+            await db.commit()
+
+            assert await rebuild_owner_index(db, owner.id, store=store) == 20
+
+            rows = (await db.execute(
+                select(DocumentChunk.owner_id, DocumentChunk.doc_type).where(DocumentChunk.document_id == code.id)
+            )).all()
+            assert set(rows) == {(owner.id, DocumentType.CODE)}
+
+        retriever = InProcessRetriever(store=store)
+        hits = await retriever.search(RetrievalQuery(text="", owner_id=owner.id, embedding=vectors[12]), 3)
+        assert hits[0].text == "chunk 12" and hits[0].page == 1
+
+        hits = await retriever.search(RetrievalQuery(
+            text="", owner_id=owner.id, embedding=vectors[12], doc_type=DocumentType.COURSE
+        ), 3)
+        assert len(hits) == 3 and all(h.document_id == notes.id for h in hits)
+
+    asyncio.run(scenario())
+    print("✓ Chunks carry owner and doc_type; hits hydrated and filtered by doc_type")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Vector Index Test")
+    print("=" * 60)
+    print()
+
+    test_search_matches_brute_force_and_persists()
+    test_tombstones_and_compaction()
+    test_doc_type_filter_before_top_k()
+    test_int8_quantized_search_with_rerank()
+    test_two_handles_share_one_directory()
+    test_inprocess_retriever_with_database()
+
+    print("=" * 60)
+    print("✅ All vector index tests passed!")
+    print("=" * 60)